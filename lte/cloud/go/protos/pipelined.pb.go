@@ -1268,6 +1268,123 @@ func (m *PacketDropTableId) GetTableId() int32 {
 	return 0
 }
 
+type ActivateFlowsBatchRequest struct {
+	Requests             []*ActivateFlowsRequest `protobuf:"bytes,1,rep,name=requests,proto3" json:"requests,omitempty"`
+	XXX_NoUnkeyedLiteral struct{}                `json:"-"`
+	XXX_unrecognized     []byte                  `json:"-"`
+	XXX_sizecache        int32                   `json:"-"`
+}
+
+func (m *ActivateFlowsBatchRequest) Reset()         { *m = ActivateFlowsBatchRequest{} }
+func (m *ActivateFlowsBatchRequest) String() string { return proto.CompactTextString(m) }
+func (*ActivateFlowsBatchRequest) ProtoMessage()    {}
+func (*ActivateFlowsBatchRequest) Descriptor() ([]byte, []int) {
+	return fileDescriptor_e17e923ef6f5752e, []int{20}
+}
+
+func (m *ActivateFlowsBatchRequest) XXX_Unmarshal(b []byte) error {
+	return xxx_messageInfo_ActivateFlowsBatchRequest.Unmarshal(m, b)
+}
+func (m *ActivateFlowsBatchRequest) XXX_Marshal(b []byte, deterministic bool) ([]byte, error) {
+	return xxx_messageInfo_ActivateFlowsBatchRequest.Marshal(b, m, deterministic)
+}
+func (m *ActivateFlowsBatchRequest) XXX_Merge(src proto.Message) {
+	xxx_messageInfo_ActivateFlowsBatchRequest.Merge(m, src)
+}
+func (m *ActivateFlowsBatchRequest) XXX_Size() int {
+	return xxx_messageInfo_ActivateFlowsBatchRequest.Size(m)
+}
+func (m *ActivateFlowsBatchRequest) XXX_DiscardUnknown() {
+	xxx_messageInfo_ActivateFlowsBatchRequest.DiscardUnknown(m)
+}
+
+var xxx_messageInfo_ActivateFlowsBatchRequest proto.InternalMessageInfo
+
+func (m *ActivateFlowsBatchRequest) GetRequests() []*ActivateFlowsRequest {
+	if m != nil {
+		return m.Requests
+	}
+	return nil
+}
+
+type ActivateFlowsBatchResult struct {
+	Results              []*ActivateFlowsResult `protobuf:"bytes,1,rep,name=results,proto3" json:"results,omitempty"`
+	XXX_NoUnkeyedLiteral struct{}               `json:"-"`
+	XXX_unrecognized     []byte                 `json:"-"`
+	XXX_sizecache        int32                  `json:"-"`
+}
+
+func (m *ActivateFlowsBatchResult) Reset()         { *m = ActivateFlowsBatchResult{} }
+func (m *ActivateFlowsBatchResult) String() string { return proto.CompactTextString(m) }
+func (*ActivateFlowsBatchResult) ProtoMessage()    {}
+func (*ActivateFlowsBatchResult) Descriptor() ([]byte, []int) {
+	return fileDescriptor_e17e923ef6f5752e, []int{21}
+}
+
+func (m *ActivateFlowsBatchResult) XXX_Unmarshal(b []byte) error {
+	return xxx_messageInfo_ActivateFlowsBatchResult.Unmarshal(m, b)
+}
+func (m *ActivateFlowsBatchResult) XXX_Marshal(b []byte, deterministic bool) ([]byte, error) {
+	return xxx_messageInfo_ActivateFlowsBatchResult.Marshal(b, m, deterministic)
+}
+func (m *ActivateFlowsBatchResult) XXX_Merge(src proto.Message) {
+	xxx_messageInfo_ActivateFlowsBatchResult.Merge(m, src)
+}
+func (m *ActivateFlowsBatchResult) XXX_Size() int {
+	return xxx_messageInfo_ActivateFlowsBatchResult.Size(m)
+}
+func (m *ActivateFlowsBatchResult) XXX_DiscardUnknown() {
+	xxx_messageInfo_ActivateFlowsBatchResult.DiscardUnknown(m)
+}
+
+var xxx_messageInfo_ActivateFlowsBatchResult proto.InternalMessageInfo
+
+func (m *ActivateFlowsBatchResult) GetResults() []*ActivateFlowsResult {
+	if m != nil {
+		return m.Results
+	}
+	return nil
+}
+
+type DeactivateFlowsBatchRequest struct {
+	Requests             []*DeactivateFlowsRequest `protobuf:"bytes,1,rep,name=requests,proto3" json:"requests,omitempty"`
+	XXX_NoUnkeyedLiteral struct{}                  `json:"-"`
+	XXX_unrecognized     []byte                    `json:"-"`
+	XXX_sizecache        int32                     `json:"-"`
+}
+
+func (m *DeactivateFlowsBatchRequest) Reset()         { *m = DeactivateFlowsBatchRequest{} }
+func (m *DeactivateFlowsBatchRequest) String() string { return proto.CompactTextString(m) }
+func (*DeactivateFlowsBatchRequest) ProtoMessage()    {}
+func (*DeactivateFlowsBatchRequest) Descriptor() ([]byte, []int) {
+	return fileDescriptor_e17e923ef6f5752e, []int{22}
+}
+
+func (m *DeactivateFlowsBatchRequest) XXX_Unmarshal(b []byte) error {
+	return xxx_messageInfo_DeactivateFlowsBatchRequest.Unmarshal(m, b)
+}
+func (m *DeactivateFlowsBatchRequest) XXX_Marshal(b []byte, deterministic bool) ([]byte, error) {
+	return xxx_messageInfo_DeactivateFlowsBatchRequest.Marshal(b, m, deterministic)
+}
+func (m *DeactivateFlowsBatchRequest) XXX_Merge(src proto.Message) {
+	xxx_messageInfo_DeactivateFlowsBatchRequest.Merge(m, src)
+}
+func (m *DeactivateFlowsBatchRequest) XXX_Size() int {
+	return xxx_messageInfo_DeactivateFlowsBatchRequest.Size(m)
+}
+func (m *DeactivateFlowsBatchRequest) XXX_DiscardUnknown() {
+	xxx_messageInfo_DeactivateFlowsBatchRequest.DiscardUnknown(m)
+}
+
+var xxx_messageInfo_DeactivateFlowsBatchRequest proto.InternalMessageInfo
+
+func (m *DeactivateFlowsBatchRequest) GetRequests() []*DeactivateFlowsRequest {
+	if m != nil {
+		return m.Requests
+	}
+	return nil
+}
+
 func init() {
 	proto.RegisterEnum("magma.lte.SetupFlowsResult_Result", SetupFlowsResult_Result_name, SetupFlowsResult_Result_value)
 	proto.RegisterEnum("magma.lte.RequestOriginType_OriginType", RequestOriginType_OriginType_name, RequestOriginType_OriginType_value)
@@ -1296,106 +1413,113 @@ func init() {
 	proto.RegisterType((*AllTableAssignments)(nil), "magma.lte.AllTableAssignments")
 	proto.RegisterType((*SerializedRyuPacket)(nil), "magma.lte.SerializedRyuPacket")
 	proto.RegisterType((*PacketDropTableId)(nil), "magma.lte.PacketDropTableId")
+	proto.RegisterType((*ActivateFlowsBatchRequest)(nil), "magma.lte.ActivateFlowsBatchRequest")
+	proto.RegisterType((*ActivateFlowsBatchResult)(nil), "magma.lte.ActivateFlowsBatchResult")
+	proto.RegisterType((*DeactivateFlowsBatchRequest)(nil), "magma.lte.DeactivateFlowsBatchRequest")
 }
 
 func init() { proto.RegisterFile("lte/protos/pipelined.proto", fileDescriptor_e17e923ef6f5752e) }
 
 var fileDescriptor_e17e923ef6f5752e = []byte{
-	// 1504 bytes of a gzipped FileDescriptorProto
-	0x1f, 0x8b, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0xff, 0xb4, 0x58, 0x5d, 0x6f, 0xdb, 0x36,
-	0x17, 0x8e, 0x6c, 0xc7, 0x8e, 0x8f, 0x9d, 0xc4, 0x61, 0xd2, 0xc4, 0x71, 0x9a, 0x36, 0xd5, 0xfb,
-	0x16, 0xcb, 0x86, 0xc1, 0x01, 0xb2, 0xa1, 0x1d, 0x5a, 0x60, 0x85, 0xea, 0x8f, 0xd4, 0x5b, 0x3e,
-	0x5c, 0xda, 0xe9, 0xb2, 0x5d, 0x4c, 0xa0, 0x25, 0xc2, 0x15, 0x2a, 0x59, 0xaa, 0x48, 0x77, 0xcd,
-	0x30, 0xec, 0x72, 0xd7, 0xbb, 0xde, 0xed, 0x2e, 0x77, 0x3f, 0x60, 0xff, 0x60, 0x77, 0xfb, 0x01,
-	0xfb, 0x0d, 0xfb, 0x0f, 0x83, 0x48, 0xda, 0x51, 0x64, 0x27, 0xe9, 0x47, 0x76, 0x65, 0x91, 0x3c,
-	0xe7, 0x39, 0x0f, 0x0f, 0x1f, 0x1e, 0x92, 0x86, 0x8a, 0xcb, 0xe9, 0x4e, 0x10, 0xfa, 0xdc, 0x67,
-	0x3b, 0x81, 0x13, 0x50, 0xd7, 0x19, 0x50, 0xbb, 0x2a, 0x3a, 0x50, 0xde, 0x23, 0x7d, 0x8f, 0x54,
-	0x5d, 0x4e, 0x2b, 0xeb, 0x7e, 0x68, 0x7d, 0x16, 0x8e, 0x0c, 0x2d, 0xdf, 0xf3, 0xfc, 0x81, 0xb4,
-	0xaa, 0xac, 0xc7, 0x11, 0x7c, 0xd7, 0xb1, 0x4e, 0xed, 0x9e, 0x1a, 0xda, 0x8a, 0x0d, 0x31, 0xca,
-	0x98, 0xe3, 0x0f, 0x4c, 0x8f, 0x0c, 0x48, 0x9f, 0x86, 0xca, 0x62, 0x33, 0x6e, 0x31, 0xec, 0x31,
-	0x2b, 0x74, 0x7a, 0x34, 0x1c, 0x01, 0xe8, 0x7f, 0x68, 0xb0, 0xd4, 0xa1, 0x7c, 0x18, 0x34, 0x5d,
-	0xff, 0x3b, 0x86, 0xe9, 0xcb, 0x21, 0x65, 0x1c, 0x3d, 0x84, 0xb9, 0x50, 0x7e, 0xb2, 0xb2, 0xb6,
-	0x95, 0xde, 0x2e, 0xec, 0xde, 0xae, 0x8e, 0xa9, 0x56, 0x0d, 0x8b, 0x3b, 0xaf, 0x08, 0xa7, 0x71,
-	0x17, 0x3c, 0x76, 0x40, 0x2b, 0x30, 0x4b, 0x03, 0xdf, 0x7a, 0x5e, 0x4e, 0x6d, 0x69, 0xdb, 0x19,
-	0x2c, 0x1b, 0xe8, 0x29, 0xcc, 0xbf, 0x1c, 0xfa, 0x9c, 0x98, 0xc3, 0xc0, 0x26, 0x9c, 0xb2, 0x72,
-	0x7a, 0x4b, 0xdb, 0x2e, 0xec, 0x7e, 0x1c, 0xc3, 0x3d, 0x16, 0x23, 0x9d, 0x31, 0xc9, 0xa7, 0x91,
-	0x7d, 0x87, 0x13, 0x4e, 0x47, 0x41, 0x8a, 0x02, 0x42, 0xda, 0x31, 0xbd, 0xa7, 0xa8, 0x1f, 0x37,
-	0x0e, 0x88, 0x35, 0xa2, 0x7e, 0x7f, 0x82, 0xfa, 0x46, 0x3c, 0x44, 0x64, 0x1a, 0xf1, 0x7e, 0x43,
-	0xda, 0x7a, 0x1f, 0x90, 0x88, 0xd1, 0x16, 0x79, 0xff, 0xef, 0xf2, 0xa3, 0xff, 0xa0, 0x26, 0x23,
-	0x26, 0x3d, 0x8a, 0x33, 0x91, 0x34, 0xed, 0x7d, 0x93, 0x76, 0x41, 0xf4, 0x9f, 0x34, 0x28, 0xc5,
-	0x65, 0xc0, 0x86, 0x2e, 0x47, 0x0f, 0x20, 0x1b, 0x8a, 0x2f, 0x11, 0x76, 0x61, 0x57, 0x8f, 0x85,
-	0x4d, 0x1a, 0x57, 0xe5, 0x0f, 0x56, 0x1e, 0xfa, 0x3d, 0xc8, 0x2a, 0x94, 0x02, 0xe4, 0x3a, 0xc7,
-	0xb5, 0x5a, 0xa3, 0xd3, 0x29, 0xcd, 0x44, 0x8d, 0xa6, 0xd1, 0xda, 0x3f, 0xc6, 0x8d, 0x92, 0x86,
-	0x10, 0x2c, 0x1c, 0x1d, 0x77, 0xeb, 0x46, 0xb7, 0x51, 0x37, 0x1b, 0xed, 0xa3, 0xda, 0x93, 0x52,
-	0x4a, 0x1f, 0xc0, 0x92, 0xe2, 0x7d, 0x14, 0x3a, 0x7d, 0x67, 0xd0, 0x3d, 0x0d, 0x28, 0x7a, 0x08,
-	0x19, 0x7e, 0x1a, 0x50, 0x45, 0xe3, 0x83, 0x18, 0x8d, 0x09, 0xdb, 0xea, 0xd9, 0x27, 0x16, 0x4e,
-	0xfa, 0x4d, 0x80, 0x18, 0x54, 0x16, 0x52, 0x7b, 0x27, 0xa5, 0x19, 0xf1, 0xfb, 0x75, 0x49, 0xd3,
-	0x7f, 0x4f, 0xc1, 0xca, 0xb4, 0xf5, 0x42, 0x1f, 0x42, 0x9a, 0x39, 0xb6, 0x4a, 0xf8, 0x5a, 0x7c,
-	0xe6, 0xe3, 0x54, 0xb7, 0xea, 0x38, 0xb2, 0x41, 0x6b, 0x90, 0x73, 0x02, 0x93, 0xd8, 0x76, 0x28,
-	0x92, 0x9a, 0xc7, 0x59, 0x27, 0x30, 0x6c, 0x3b, 0x44, 0xeb, 0x30, 0x17, 0x0e, 0x5d, 0x6a, 0x3a,
-	0x76, 0x24, 0xf7, 0xf4, 0x76, 0x1e, 0xe7, 0xa2, 0x76, 0xcb, 0x66, 0xe8, 0x01, 0xcc, 0xdb, 0xa7,
-	0x03, 0xe2, 0x39, 0x96, 0x19, 0x75, 0xb1, 0x72, 0x46, 0xc8, 0xe8, 0x46, 0x2c, 0x90, 0x92, 0xdc,
-	0xd0, 0xa5, 0xb8, 0xa8, 0x6c, 0xa3, 0x06, 0x43, 0x35, 0x58, 0x50, 0x62, 0x32, 0x7d, 0x31, 0xb3,
-	0xf2, 0xac, 0x60, 0x79, 0xf3, 0xb2, 0xc4, 0xe0, 0xf9, 0x30, 0xde, 0x85, 0x3e, 0x87, 0x39, 0x12,
-	0x0c, 0x4c, 0xe2, 0xf5, 0xc2, 0x72, 0x56, 0xb8, 0xff, 0x2f, 0x2e, 0xe1, 0x7e, 0x3f, 0xa4, 0x7d,
-	0xc2, 0xa9, 0x7d, 0x40, 0x5e, 0x3b, 0xde, 0xd0, 0x7b, 0xec, 0xf0, 0x30, 0xd2, 0x54, 0x8e, 0x04,
-	0x03, 0xc3, 0xeb, 0x85, 0xfa, 0xaf, 0x1a, 0xac, 0xd6, 0x29, 0x79, 0xcf, 0xd4, 0xc5, 0x33, 0x94,
-	0x3a, 0x9f, 0xa1, 0xc9, 0x59, 0xa6, 0xdf, 0x7a, 0x96, 0xfa, 0x2f, 0x1a, 0xcc, 0x47, 0x49, 0x3b,
-	0xf0, 0x6d, 0x25, 0xc7, 0x35, 0xc8, 0xa9, 0x88, 0x82, 0x60, 0x1e, 0x67, 0x65, 0x40, 0x74, 0x7f,
-	0xac, 0xf6, 0x94, 0x90, 0x59, 0x7c, 0x47, 0x9f, 0x83, 0x48, 0x4a, 0xfd, 0xfe, 0x74, 0xa9, 0x2f,
-	0xc3, 0x62, 0xdb, 0xc0, 0xdd, 0x96, 0xb1, 0x6f, 0x8e, 0x3a, 0xb5, 0xb8, 0xfe, 0x53, 0xfa, 0x6f,
-	0x1a, 0x2c, 0x27, 0xb4, 0x27, 0x60, 0x9e, 0xc0, 0x32, 0xe3, 0x84, 0x2b, 0x69, 0x98, 0x32, 0xcc,
-	0xa8, 0xd0, 0x94, 0x2f, 0xa2, 0x85, 0x97, 0xa4, 0x93, 0x10, 0x8c, 0x74, 0x41, 0x5f, 0xc0, 0x4a,
-	0x5c, 0x65, 0x63, 0xa8, 0xd4, 0x15, 0x50, 0x28, 0xa6, 0x37, 0x85, 0xa5, 0xff, 0xac, 0xc1, 0x8d,
-	0x89, 0x05, 0x17, 0x7c, 0x1f, 0x25, 0xea, 0x44, 0x7c, 0x83, 0x4e, 0xf5, 0xb8, 0xae, 0x62, 0xf1,
-	0x4f, 0x0a, 0x0a, 0xb1, 0x62, 0x8e, 0x3e, 0x82, 0x59, 0x8f, 0x70, 0xeb, 0xb9, 0x92, 0xde, 0x4a,
-	0x8c, 0x47, 0x64, 0x76, 0x10, 0x8d, 0x61, 0x69, 0x12, 0x29, 0x8f, 0x04, 0x81, 0x39, 0x20, 0x1e,
-	0x55, 0xbb, 0x36, 0x47, 0x82, 0xe0, 0x90, 0x78, 0x34, 0x1a, 0xea, 0x9d, 0x72, 0xca, 0xcc, 0xf0,
-	0xb5, 0xd0, 0x5c, 0x06, 0xe7, 0x44, 0x1b, 0xbf, 0x46, 0x77, 0xa0, 0xc8, 0x68, 0xf8, 0xca, 0xb1,
-	0xa8, 0x29, 0x2a, 0x52, 0x46, 0x78, 0x16, 0x54, 0x9f, 0xa8, 0x30, 0x6b, 0x90, 0x63, 0xa1, 0x65,
-	0x7a, 0xc4, 0x12, 0xdb, 0x32, 0x8f, 0xb3, 0x2c, 0xb4, 0x0e, 0x88, 0x15, 0x0d, 0xd8, 0x8c, 0x8b,
-	0x81, 0xac, 0x1c, 0xb0, 0x19, 0x8f, 0x06, 0xee, 0xc1, 0x6c, 0xb4, 0x74, 0xb4, 0x9c, 0x13, 0xe9,
-	0xdb, 0x4a, 0xd0, 0x56, 0xb3, 0x13, 0xdf, 0xb2, 0xb0, 0x4b, 0x73, 0xdd, 0x87, 0xfc, 0xb8, 0x0f,
-	0x95, 0xa0, 0xd8, 0xdc, 0x3f, 0xfa, 0xca, 0xac, 0xe1, 0x46, 0x94, 0xa3, 0xd2, 0x0c, 0xba, 0x0d,
-	0x1b, 0xa2, 0x67, 0xa4, 0xc2, 0xda, 0xbe, 0xd1, 0xe9, 0xb4, 0x9a, 0xad, 0x9a, 0xd1, 0x6d, 0x1d,
-	0x1d, 0x96, 0x34, 0xb4, 0x09, 0xeb, 0xc2, 0xa0, 0xd9, 0x3a, 0x9c, 0x1c, 0x4e, 0x8d, 0x11, 0x1b,
-	0x27, 0xed, 0x16, 0x6e, 0xd4, 0x4b, 0x69, 0xfd, 0x47, 0x28, 0x4a, 0x42, 0x2c, 0xf0, 0x07, 0x8c,
-	0xa2, 0x7b, 0x89, 0x85, 0xbf, 0x35, 0xc1, 0x5c, 0x1a, 0x5e, 0xd7, 0x7a, 0xff, 0xa5, 0x41, 0x29,
-	0x79, 0x82, 0xbf, 0x65, 0xb5, 0xf1, 0x88, 0x15, 0xaf, 0xd4, 0x39, 0x8f, 0x58, 0xa2, 0x54, 0xaf,
-	0x42, 0xd6, 0x63, 0x0e, 0xb3, 0x65, 0x95, 0xc9, 0x63, 0xd5, 0x42, 0xb7, 0xa0, 0x40, 0x02, 0x73,
-	0xec, 0x25, 0xd7, 0x3b, 0x4f, 0x82, 0x03, 0xe5, 0xb7, 0x06, 0x39, 0xa2, 0x54, 0xa4, 0x56, 0x9b,
-	0x48, 0x11, 0xfd, 0x1f, 0x16, 0x02, 0x3b, 0x30, 0x19, 0x27, 0x21, 0x37, 0xb9, 0xe3, 0x51, 0xb1,
-	0xe8, 0x19, 0x5c, 0x0c, 0xec, 0xa0, 0x13, 0x75, 0x76, 0x1d, 0x8f, 0xea, 0x7f, 0x6b, 0x70, 0x23,
-	0x71, 0x76, 0xcb, 0x83, 0xfa, 0x9a, 0xa6, 0xd5, 0x84, 0x82, 0xbc, 0x3a, 0x48, 0xb9, 0xa6, 0xc5,
-	0x32, 0xdd, 0x9d, 0x8a, 0x16, 0x0b, 0x5e, 0x15, 0xa5, 0x14, 0xa4, 0x67, 0xf4, 0xad, 0x7f, 0x0a,
-	0x19, 0x21, 0xee, 0x45, 0x28, 0x3c, 0x33, 0xf6, 0x5b, 0x75, 0xf3, 0xe9, 0xf1, 0x51, 0xd7, 0x28,
-	0xcd, 0xa0, 0x22, 0xcc, 0x1d, 0x1e, 0xa9, 0x96, 0x86, 0xe6, 0x21, 0xdf, 0x6d, 0xe0, 0x83, 0xd6,
-	0xa1, 0xd1, 0x8d, 0x0a, 0x9c, 0x09, 0x77, 0xae, 0xbc, 0x9e, 0xa0, 0x07, 0x90, 0x3b, 0xbb, 0xdd,
-	0x44, 0x65, 0x69, 0xeb, 0x2a, 0x7a, 0x78, 0xe4, 0xa0, 0x87, 0xb0, 0xd8, 0x25, 0x3d, 0x97, 0x1a,
-	0x8c, 0x39, 0xfd, 0x81, 0x47, 0x07, 0xfc, 0xdc, 0xbe, 0xd6, 0xce, 0xef, 0xeb, 0x4d, 0x00, 0x8f,
-	0x38, 0x03, 0x93, 0x47, 0x2e, 0xea, 0xfe, 0x93, 0x8f, 0x7a, 0x04, 0x06, 0xba, 0x0b, 0x0b, 0xcc,
-	0x0a, 0xa3, 0xe2, 0x20, 0x2d, 0xe4, 0x99, 0x9d, 0xc1, 0xf3, 0xaa, 0x57, 0x58, 0x31, 0xfd, 0x5b,
-	0x58, 0x36, 0x5c, 0x37, 0x11, 0x96, 0xa1, 0x3d, 0x58, 0x12, 0x5e, 0x26, 0x39, 0xeb, 0x54, 0x13,
-	0xaa, 0xc4, 0x26, 0x94, 0xf0, 0xc3, 0x25, 0x9e, 0x00, 0xd2, 0x1f, 0xc2, 0x72, 0x87, 0x86, 0x0e,
-	0x71, 0x9d, 0xef, 0xa9, 0x8d, 0x4f, 0x87, 0x6d, 0x62, 0xbd, 0xa0, 0x1c, 0x95, 0x20, 0x1d, 0xbc,
-	0x90, 0x1b, 0xad, 0x88, 0xa3, 0x4f, 0x84, 0x20, 0xe3, 0x78, 0xcc, 0x51, 0x4b, 0x2e, 0xbe, 0xf5,
-	0x2a, 0x2c, 0x49, 0xfb, 0x7a, 0xe8, 0x07, 0x22, 0x56, 0x4b, 0xe8, 0x43, 0x52, 0x53, 0x7a, 0x9a,
-	0xc5, 0x39, 0x2e, 0x87, 0x76, 0xff, 0x9c, 0x83, 0x7c, 0x7b, 0xf4, 0x28, 0x41, 0x6d, 0x75, 0x09,
-	0x94, 0x37, 0x0f, 0x51, 0xb0, 0xd1, 0x66, 0xf2, 0xd2, 0x77, 0xee, 0x26, 0x5c, 0xd9, 0xb8, 0xe4,
-	0x4e, 0xa8, 0xcf, 0x20, 0x0c, 0xf3, 0xe7, 0x4e, 0x38, 0x74, 0xd5, 0x3d, 0xb9, 0x72, 0xeb, 0x62,
-	0x03, 0x85, 0x79, 0x02, 0x8b, 0x89, 0x53, 0x05, 0xdd, 0xb9, 0xec, 0xc4, 0x91, 0xb8, 0x5b, 0x57,
-	0x1d, 0x4a, 0xfa, 0x0c, 0x32, 0x60, 0x61, 0x8f, 0x72, 0x39, 0xc1, 0x63, 0x46, 0xfa, 0x14, 0x2d,
-	0x29, 0x2f, 0xf1, 0x38, 0xab, 0x3e, 0xf3, 0x1d, 0xbb, 0x52, 0x49, 0x9c, 0x9a, 0x98, 0x5a, 0x7e,
-	0x68, 0x8b, 0x5c, 0xeb, 0x33, 0xe8, 0x11, 0x40, 0x2d, 0xa4, 0x0a, 0x19, 0xad, 0x4e, 0x2f, 0xe5,
-	0x95, 0xb5, 0x0b, 0x0a, 0xa5, 0x04, 0xc0, 0xd4, 0xf3, 0x5f, 0xbd, 0x33, 0x40, 0x1d, 0x16, 0xe5,
-	0x36, 0x19, 0x9d, 0x0d, 0xec, 0x5d, 0x50, 0x0e, 0x61, 0xf1, 0xec, 0x39, 0x22, 0x93, 0x7c, 0x33,
-	0xb9, 0xd4, 0xf1, 0xa7, 0xca, 0x55, 0x42, 0xa0, 0x50, 0xb9, 0xb8, 0x14, 0xa0, 0xb7, 0x7a, 0xd0,
-	0xbc, 0x09, 0xed, 0xf1, 0x29, 0x31, 0x85, 0x76, 0xfc, 0xb9, 0x78, 0x15, 0xed, 0x26, 0x14, 0x0d,
-	0xdb, 0x1e, 0xa3, 0xa1, 0xcb, 0xde, 0x92, 0x97, 0xf1, 0x6a, 0x45, 0x9a, 0x75, 0x29, 0xa7, 0xd7,
-	0x02, 0x25, 0x53, 0xd4, 0x6a, 0x37, 0x5b, 0x27, 0xef, 0x05, 0xf5, 0x25, 0xac, 0xee, 0x51, 0x3e,
-	0xad, 0x9a, 0x4d, 0xd1, 0xfd, 0xb9, 0x8d, 0x39, 0xe9, 0xf2, 0x78, 0xe3, 0x9b, 0x75, 0x61, 0xb0,
-	0xe3, 0x72, 0xba, 0x63, 0xb9, 0xfe, 0xd0, 0xde, 0xe9, 0xfb, 0xea, 0x9f, 0x87, 0x5e, 0x56, 0xfc,
-	0x7e, 0xf2, 0x6f, 0x00, 0x00, 0x00, 0xff, 0xff, 0x3c, 0x36, 0xa0, 0x27, 0x0d, 0x11, 0x00, 0x00,
+	// 1565 bytes of a gzipped FileDescriptorProto
+	0x1f, 0x8b, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0xff, 0xb5, 0x58, 0x5b, 0x73, 0xdb, 0x44,
+	0x14, 0xae, 0x2f, 0xb1, 0xeb, 0x63, 0x3b, 0x71, 0x36, 0x69, 0xea, 0x38, 0x4d, 0x9b, 0xaa, 0x2d,
+	0x14, 0x86, 0x71, 0x66, 0x02, 0xd3, 0x76, 0xe8, 0x40, 0xc7, 0x75, 0xec, 0x56, 0x25, 0x89, 0x5d,
+	0xd9, 0x2e, 0x81, 0x61, 0xd0, 0xc8, 0xd6, 0x8e, 0xd1, 0xd4, 0xb6, 0x54, 0x49, 0x2e, 0x0d, 0xc3,
+	0xf0, 0xc8, 0x2b, 0x3c, 0xf3, 0xca, 0x23, 0xef, 0xcc, 0xf0, 0x2b, 0xf8, 0x01, 0xfc, 0x06, 0xfe,
+	0x03, 0x67, 0x2f, 0x76, 0x64, 0xd9, 0x8e, 0x7b, 0x09, 0x4f, 0xd2, 0xee, 0x9e, 0xcb, 0xb7, 0xe7,
+	0x7c, 0x7b, 0xce, 0x4a, 0x50, 0xe8, 0xf9, 0x74, 0xd7, 0x71, 0x6d, 0xdf, 0xf6, 0x76, 0x1d, 0xcb,
+	0xa1, 0x3d, 0x6b, 0x40, 0xcd, 0x22, 0x9f, 0x20, 0xa9, 0xbe, 0xd1, 0xed, 0x1b, 0x45, 0x94, 0x28,
+	0x6c, 0xda, 0x6e, 0xe7, 0x9e, 0x3b, 0x12, 0xec, 0xd8, 0xfd, 0xbe, 0x3d, 0x10, 0x52, 0x85, 0xcd,
+	0xa0, 0x05, 0xbb, 0x67, 0x75, 0x4e, 0xcc, 0xb6, 0x5c, 0xda, 0x09, 0x2c, 0x79, 0xd4, 0xf3, 0x2c,
+	0x7b, 0xa0, 0xf7, 0x8d, 0x81, 0xd1, 0xa5, 0xae, 0x94, 0xd8, 0x0e, 0x4a, 0x0c, 0xdb, 0x5e, 0xc7,
+	0xb5, 0xda, 0xd4, 0x1d, 0x19, 0x50, 0xfe, 0x8a, 0xc0, 0x6a, 0x83, 0xfa, 0x43, 0xa7, 0xda, 0xb3,
+	0xbf, 0xf7, 0x34, 0xfa, 0x62, 0x48, 0x3d, 0x9f, 0xdc, 0x87, 0x8b, 0xae, 0x78, 0xf5, 0xf2, 0x91,
+	0x9d, 0xd8, 0xed, 0xf4, 0xde, 0xb5, 0xe2, 0x18, 0x6a, 0xb1, 0xd4, 0xf1, 0xad, 0x97, 0x86, 0x4f,
+	0x83, 0x2a, 0xda, 0x58, 0x81, 0xac, 0xc3, 0x12, 0x75, 0xec, 0xce, 0x77, 0xf9, 0xe8, 0x4e, 0xe4,
+	0x76, 0x5c, 0x13, 0x03, 0xf2, 0x14, 0xb2, 0x2f, 0x86, 0xb6, 0x6f, 0xe8, 0x43, 0xc7, 0x44, 0x5d,
+	0x2f, 0x1f, 0xc3, 0xd5, 0xf4, 0xde, 0x47, 0x01, 0xbb, 0x2d, 0xbe, 0xd2, 0x18, 0x83, 0x7c, 0xca,
+	0xe4, 0x1b, 0x3e, 0xce, 0x8d, 0x9c, 0x64, 0xb8, 0x09, 0x21, 0xe7, 0x29, 0x6d, 0x09, 0xbd, 0x55,
+	0x39, 0x34, 0x3a, 0x23, 0xe8, 0x77, 0xa7, 0xa0, 0x6f, 0x05, 0x5d, 0x30, 0x51, 0x86, 0xfb, 0x35,
+	0x61, 0x2b, 0x5d, 0x20, 0xdc, 0x47, 0x9d, 0xc7, 0xfd, 0xff, 0x8b, 0x8f, 0xf2, 0xa3, 0xdc, 0x0c,
+	0xdf, 0xf4, 0xc8, 0xcf, 0x54, 0xd0, 0x22, 0xef, 0x1a, 0xb4, 0x39, 0xde, 0x7f, 0x8e, 0x40, 0x2e,
+	0x48, 0x03, 0x6f, 0xd8, 0xf3, 0xc9, 0xa7, 0x90, 0x70, 0xf9, 0x1b, 0x77, 0xbb, 0xbc, 0xa7, 0x04,
+	0xdc, 0x86, 0x85, 0x8b, 0xe2, 0xa1, 0x49, 0x0d, 0xe5, 0x0e, 0x24, 0xa4, 0x95, 0x34, 0x24, 0x1b,
+	0xad, 0x72, 0xb9, 0xd2, 0x68, 0xe4, 0x2e, 0xb0, 0x41, 0xb5, 0xa4, 0x1e, 0xb4, 0xb4, 0x4a, 0x2e,
+	0x42, 0x08, 0x2c, 0xd7, 0x5a, 0xcd, 0xfd, 0x52, 0xb3, 0xb2, 0xaf, 0x57, 0xea, 0xb5, 0xf2, 0xe3,
+	0x5c, 0x54, 0x19, 0xc0, 0xaa, 0xc4, 0x5d, 0x73, 0xad, 0xae, 0x35, 0x68, 0x9e, 0x38, 0x14, 0xc3,
+	0x1d, 0xf7, 0xf1, 0x29, 0x61, 0xbc, 0x1f, 0x80, 0x31, 0x25, 0x5b, 0x3c, 0x7d, 0xd5, 0xb8, 0x92,
+	0x72, 0x05, 0x20, 0x60, 0x2a, 0x01, 0xd1, 0x47, 0xc7, 0x08, 0x84, 0x3d, 0xbf, 0xca, 0x45, 0x94,
+	0x3f, 0xa3, 0xb0, 0x3e, 0x2b, 0x5f, 0xe4, 0x03, 0x88, 0x79, 0x96, 0x29, 0x03, 0x7e, 0x39, 0xb8,
+	0xf3, 0x71, 0xa8, 0xd5, 0x7d, 0x8d, 0xc9, 0x90, 0xcb, 0x90, 0xb4, 0x1c, 0xdd, 0x30, 0x4d, 0x97,
+	0x07, 0x35, 0xa5, 0x25, 0x2c, 0xa7, 0x84, 0x23, 0xb2, 0x89, 0x34, 0x19, 0xf6, 0xa8, 0x6e, 0x99,
+	0x8c, 0xee, 0x31, 0x5c, 0x49, 0xb2, 0xb1, 0x6a, 0x7a, 0x18, 0xdb, 0xac, 0x79, 0x32, 0x30, 0xfa,
+	0x56, 0x47, 0x67, 0x53, 0x5e, 0x3e, 0xce, 0x69, 0x74, 0x29, 0xe0, 0x48, 0x52, 0x0e, 0x57, 0xb5,
+	0x8c, 0x94, 0x65, 0x03, 0x8f, 0x94, 0x61, 0x59, 0x92, 0x49, 0xb7, 0xf9, 0xce, 0xf2, 0x4b, 0x1c,
+	0xe5, 0x95, 0xb3, 0x02, 0xa3, 0x65, 0xdd, 0xe0, 0x14, 0xf9, 0x1c, 0x2e, 0x1a, 0xce, 0x40, 0x37,
+	0xfa, 0x6d, 0x37, 0x9f, 0xe0, 0xea, 0x37, 0x82, 0x14, 0xee, 0x76, 0x5d, 0xda, 0xc5, 0x98, 0x98,
+	0x87, 0xc6, 0x2b, 0xab, 0x3f, 0xec, 0x3f, 0xb4, 0x7c, 0x97, 0x71, 0x2a, 0x89, 0x4a, 0x25, 0xd4,
+	0x51, 0x7e, 0x8f, 0xc0, 0xc6, 0x3e, 0x35, 0xde, 0x31, 0x74, 0xc1, 0x08, 0x45, 0x27, 0x23, 0x34,
+	0xbd, 0xcb, 0xd8, 0x1b, 0xef, 0x52, 0xf9, 0x2d, 0x02, 0x59, 0x16, 0xb4, 0x43, 0xdb, 0x94, 0x74,
+	0xc4, 0x64, 0x49, 0x8f, 0x1c, 0x20, 0x26, 0x4b, 0x38, 0xc4, 0xc2, 0x31, 0x62, 0x7b, 0x94, 0xd3,
+	0x2c, 0x78, 0xa2, 0x27, 0x4c, 0x84, 0xa9, 0x7e, 0x77, 0x36, 0xd5, 0xd7, 0x60, 0xa5, 0x5e, 0xd2,
+	0x9a, 0x6a, 0xe9, 0x40, 0x1f, 0x4d, 0x46, 0x82, 0xfc, 0x8f, 0x2a, 0x7f, 0x44, 0x60, 0x2d, 0xc4,
+	0x3d, 0x6e, 0xe6, 0x31, 0xac, 0x79, 0x78, 0x80, 0x25, 0x35, 0x74, 0xe1, 0x66, 0x54, 0x68, 0xf2,
+	0xf3, 0x60, 0x69, 0xab, 0x42, 0x89, 0x13, 0x46, 0xa8, 0x90, 0x27, 0xb0, 0x1e, 0x64, 0xd9, 0xd8,
+	0x54, 0x74, 0x81, 0x29, 0x12, 0xe0, 0x9b, 0xb4, 0xa5, 0xfc, 0x1a, 0x81, 0x4b, 0x53, 0x09, 0xe7,
+	0x78, 0x1f, 0x84, 0xea, 0x44, 0xf0, 0x80, 0xce, 0xd4, 0x38, 0xaf, 0x62, 0xf1, 0x6f, 0x14, 0xd2,
+	0x81, 0x62, 0x4e, 0x3e, 0x84, 0xa5, 0xbe, 0xe1, 0x63, 0x6d, 0x13, 0xd4, 0x5b, 0x0f, 0xe0, 0x60,
+	0x62, 0x87, 0x6c, 0x4d, 0x13, 0x22, 0x8c, 0x79, 0x86, 0xe3, 0xe8, 0xb8, 0x4d, 0x2a, 0x4f, 0x2d,
+	0x52, 0xdb, 0x39, 0xc2, 0x21, 0x5b, 0x6a, 0x9f, 0x60, 0xad, 0xd4, 0xdd, 0x57, 0x9c, 0x73, 0x71,
+	0x2d, 0xc9, 0xc7, 0xda, 0x2b, 0x72, 0x1d, 0x32, 0x1e, 0x75, 0x5f, 0x5a, 0x1d, 0xaa, 0xf3, 0x8a,
+	0x14, 0xe7, 0x9a, 0x69, 0x39, 0xc7, 0x2b, 0x0c, 0x12, 0xcc, 0x73, 0x3b, 0xd8, 0x85, 0x3b, 0xfc,
+	0x58, 0x22, 0xc1, 0x70, 0x88, 0x5d, 0x87, 0x2d, 0x98, 0x48, 0x66, 0xb6, 0x90, 0x10, 0x0b, 0x38,
+	0x64, 0x0b, 0x77, 0x60, 0x89, 0xa5, 0x8e, 0xe6, 0x93, 0x3c, 0x7c, 0x3b, 0x21, 0xd8, 0x72, 0x77,
+	0xfc, 0x5d, 0x14, 0x76, 0x21, 0xae, 0xd8, 0x90, 0x1a, 0xcf, 0x91, 0x1c, 0x64, 0xaa, 0x07, 0xb5,
+	0x2f, 0xf5, 0xb2, 0x56, 0x61, 0x31, 0xc2, 0xf0, 0x5d, 0x83, 0x2d, 0x3e, 0x33, 0x62, 0x61, 0xf9,
+	0xa0, 0xd4, 0x68, 0xa8, 0x55, 0xb5, 0x5c, 0x6a, 0xaa, 0xb5, 0x23, 0x0c, 0xe9, 0x36, 0x6c, 0x72,
+	0x81, 0xaa, 0x7a, 0x34, 0xbd, 0x1c, 0x1d, 0x5b, 0xac, 0x1c, 0xd7, 0x55, 0x0d, 0x2d, 0xc6, 0x94,
+	0x9f, 0x70, 0x86, 0x03, 0xf2, 0x1c, 0x7b, 0xe0, 0x51, 0x04, 0x3e, 0x99, 0xf8, 0xab, 0x53, 0xc8,
+	0x85, 0xe0, 0x79, 0xe5, 0xfb, 0x6f, 0xec, 0x52, 0xe1, 0x0e, 0xfe, 0x86, 0xd5, 0x06, 0xa3, 0x1f,
+	0xac, 0xd4, 0x49, 0x1c, 0xf3, 0x52, 0xbd, 0x01, 0x89, 0xbe, 0x67, 0x79, 0xa6, 0xa8, 0x32, 0x98,
+	0x1b, 0x31, 0x22, 0x57, 0x21, 0x6d, 0x38, 0xfa, 0x58, 0x4b, 0xe4, 0x3b, 0x65, 0x38, 0x87, 0x52,
+	0x0f, 0x93, 0x6a, 0x48, 0x16, 0xc9, 0x6c, 0x1b, 0x82, 0x44, 0x37, 0x61, 0xd9, 0x31, 0x1d, 0x1d,
+	0x33, 0xe5, 0xfa, 0xba, 0x6f, 0xe1, 0x7a, 0x82, 0x53, 0x29, 0x83, 0xb3, 0x0d, 0x36, 0xd9, 0xc4,
+	0x39, 0xe5, 0x1f, 0x3c, 0x54, 0xa1, 0xde, 0x2d, 0x1a, 0xf5, 0x39, 0x6d, 0xab, 0x0a, 0x69, 0x71,
+	0x75, 0x10, 0x74, 0x8d, 0xf1, 0x34, 0xdd, 0x9a, 0x69, 0x2d, 0xe0, 0xbc, 0xc8, 0x4b, 0x29, 0x08,
+	0x4d, 0xf6, 0xae, 0x7c, 0x02, 0x71, 0x4e, 0xee, 0x15, 0x48, 0x3f, 0x2b, 0x1d, 0xa8, 0xfb, 0xfa,
+	0xd3, 0x56, 0xad, 0x59, 0xc2, 0x9c, 0x65, 0xe0, 0xe2, 0x51, 0x4d, 0x8e, 0x22, 0x24, 0x0b, 0xa9,
+	0x66, 0x45, 0x3b, 0x44, 0x3e, 0x35, 0x59, 0x81, 0xd3, 0xe1, 0xfa, 0xc2, 0xeb, 0x09, 0x76, 0xc2,
+	0xe4, 0xe9, 0xed, 0x86, 0x95, 0xa5, 0x9d, 0x45, 0xf0, 0xb4, 0x91, 0x82, 0xe2, 0xc2, 0x4a, 0xd3,
+	0x68, 0xf7, 0x68, 0x09, 0x6f, 0xbe, 0xdd, 0x41, 0x9f, 0x0e, 0xfc, 0x89, 0x73, 0x1d, 0x99, 0x3c,
+	0xd7, 0xdb, 0x00, 0x7d, 0xc3, 0x1a, 0xe8, 0x3e, 0x53, 0x91, 0xf7, 0x9f, 0x14, 0x9b, 0xe1, 0x36,
+	0xc8, 0x2d, 0x58, 0x46, 0x5f, 0xac, 0x38, 0x08, 0x09, 0xd1, 0xb3, 0xe3, 0x5a, 0x56, 0xce, 0x72,
+	0x29, 0x4f, 0xf9, 0x16, 0x8b, 0x76, 0xaf, 0x17, 0x72, 0xeb, 0x91, 0x47, 0xb0, 0xca, 0xb5, 0x74,
+	0xe3, 0x74, 0x52, 0x6e, 0xa8, 0x10, 0xd8, 0x50, 0x48, 0x4f, 0xcb, 0xf9, 0x21, 0x43, 0xca, 0x7d,
+	0x58, 0x6b, 0x50, 0xd7, 0x32, 0x7a, 0xd6, 0x0f, 0xd4, 0xd4, 0x4e, 0x86, 0x75, 0xa3, 0xf3, 0x9c,
+	0xfa, 0x78, 0x1a, 0x63, 0xce, 0x73, 0x71, 0xd0, 0x32, 0x1a, 0x7b, 0xc5, 0x13, 0x12, 0xb7, 0x90,
+	0xa5, 0x32, 0xe5, 0xfc, 0x5d, 0x29, 0xc2, 0xaa, 0x90, 0xdf, 0x77, 0x6d, 0x87, 0xfb, 0x52, 0x39,
+	0x3f, 0x04, 0x34, 0xc9, 0xa7, 0x25, 0x2d, 0xe9, 0x8b, 0x25, 0xe5, 0x18, 0x36, 0x27, 0x3a, 0xd0,
+	0x43, 0x5e, 0x22, 0xcf, 0xe1, 0x96, 0xab, 0x34, 0x21, 0x3f, 0xcb, 0x32, 0x3f, 0xf5, 0xf7, 0xb0,
+	0x07, 0x4f, 0x34, 0xb5, 0xab, 0xf3, 0xed, 0xf2, 0xc2, 0x31, 0x12, 0x57, 0xbe, 0x81, 0xad, 0x50,
+	0x47, 0x99, 0x40, 0xfc, 0xd9, 0x14, 0xe2, 0xeb, 0x67, 0xf5, 0xa2, 0x10, 0xe6, 0xbd, 0x5f, 0x00,
+	0x52, 0xf5, 0xd1, 0x27, 0x1a, 0xa9, 0xcb, 0x2b, 0xb1, 0xb8, 0x87, 0x71, 0x15, 0xb2, 0x1d, 0xbe,
+	0x02, 0x4f, 0x7c, 0x17, 0x14, 0xb6, 0xce, 0xb8, 0x21, 0x2b, 0x17, 0x88, 0x06, 0xd9, 0x89, 0xdd,
+	0x91, 0x45, 0xf1, 0x2c, 0x2c, 0x08, 0x0c, 0xda, 0x3c, 0x86, 0x95, 0xd0, 0xbe, 0xc8, 0xe2, 0x3d,
+	0x17, 0x76, 0x16, 0xb5, 0x68, 0xb4, 0x6c, 0x00, 0x99, 0xce, 0x20, 0xb9, 0x39, 0x0f, 0x51, 0x30,
+	0x11, 0x85, 0x1b, 0x0b, 0xa4, 0xa4, 0x8b, 0x36, 0xac, 0xcf, 0x4a, 0x27, 0x79, 0x6f, 0x3e, 0xbc,
+	0x09, 0x37, 0xaf, 0xb3, 0x8d, 0x12, 0x2c, 0x3f, 0xa2, 0xbe, 0xc8, 0x53, 0xcb, 0xc3, 0x2f, 0x63,
+	0xb2, 0x2a, 0xb5, 0xf8, 0x17, 0x77, 0xf1, 0x99, 0x6d, 0x99, 0x85, 0x42, 0xe8, 0x2a, 0xa4, 0xd1,
+	0x8e, 0xed, 0x9a, 0xfc, 0x00, 0xa1, 0x89, 0x07, 0x00, 0x65, 0x97, 0x4a, 0xcb, 0x64, 0x63, 0x76,
+	0x7f, 0x2e, 0x5c, 0x9e, 0xd3, 0xfd, 0x84, 0x01, 0x8d, 0xf6, 0xed, 0x97, 0x6f, 0x6d, 0x60, 0x1f,
+	0x56, 0x44, 0xed, 0x1b, 0x35, 0x7c, 0xef, 0x6d, 0xac, 0x1c, 0xc1, 0xca, 0xe9, 0x37, 0xa6, 0xe0,
+	0xca, 0x95, 0x30, 0x63, 0x83, 0xdf, 0x9f, 0x8b, 0xf8, 0x4c, 0xa1, 0x30, 0xbf, 0xbe, 0x93, 0x37,
+	0xfa, 0x4a, 0x7d, 0x1d, 0xd8, 0xe3, 0xd6, 0x3f, 0x03, 0x76, 0xf0, 0x1f, 0xc0, 0x22, 0xd8, 0x55,
+	0xc8, 0x60, 0x73, 0x1c, 0x5b, 0x23, 0x67, 0xfd, 0x20, 0x38, 0x0b, 0x97, 0xca, 0x8e, 0x5e, 0x8f,
+	0xfa, 0xf4, 0x5c, 0x4c, 0x89, 0x10, 0xa9, 0xf5, 0xaa, 0x7a, 0xfc, 0x4e, 0xa6, 0xbe, 0x80, 0x0d,
+	0xe4, 0xfb, 0xac, 0x16, 0x35, 0x83, 0xf7, 0x13, 0xf5, 0x65, 0x5a, 0xe5, 0xe1, 0xd6, 0xd7, 0x9b,
+	0x5c, 0x60, 0x97, 0xfd, 0x45, 0xea, 0xf4, 0xec, 0xa1, 0xb9, 0xdb, 0xb5, 0xe5, 0xef, 0xa4, 0x76,
+	0x82, 0x3f, 0x3f, 0xfe, 0x0f, 0x01, 0x46, 0x61, 0xfe, 0xe2, 0x12, 0x00, 0x00,
 }
 
 // Reference imports to suppress errors if they are not otherwise used.
@@ -1416,6 +1540,11 @@ type PipelinedClient interface {
 	ActivateFlows(ctx context.Context, in *ActivateFlowsRequest, opts ...grpc.CallOption) (*ActivateFlowsResult, error)
 	// Deactivate flows for a subscriber
 	DeactivateFlows(ctx context.Context, in *DeactivateFlowsRequest, opts ...grpc.CallOption) (*DeactivateFlowsResult, error)
+	// Activate flows for many subscribers, the flows of all the subscribers
+	// are installed together (used when many sessions are created at once)
+	ActivateFlowsBatch(ctx context.Context, in *ActivateFlowsBatchRequest, opts ...grpc.CallOption) (*ActivateFlowsBatchResult, error)
+	// Deactivate flows for many subscribers
+	DeactivateFlowsBatch(ctx context.Context, in *DeactivateFlowsBatchRequest, opts ...grpc.CallOption) (*DeactivateFlowsResult, error)
 	// Get policy usage stats
 	GetPolicyUsage(ctx context.Context, in *protos.Void, opts ...grpc.CallOption) (*RuleRecordTable, error)
 	// Add new dpi flow
@@ -1476,6 +1605,24 @@ func (c *pipelinedClient) DeactivateFlows(ctx context.Context, in *DeactivateFlo
 	return out, nil
 }
 
+func (c *pipelinedClient) ActivateFlowsBatch(ctx context.Context, in *ActivateFlowsBatchRequest, opts ...grpc.CallOption) (*ActivateFlowsBatchResult, error) {
+	out := new(ActivateFlowsBatchResult)
+	err := c.cc.Invoke(ctx, "/magma.lte.Pipelined/ActivateFlowsBatch", in, out, opts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *pipelinedClient) DeactivateFlowsBatch(ctx context.Context, in *DeactivateFlowsBatchRequest, opts ...grpc.CallOption) (*DeactivateFlowsResult, error) {
+	out := new(DeactivateFlowsResult)
+	err := c.cc.Invoke(ctx, "/magma.lte.Pipelined/DeactivateFlowsBatch", in, out, opts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
 func (c *pipelinedClient) GetPolicyUsage(ctx context.Context, in *protos.Void, opts ...grpc.CallOption) (*RuleRecordTable, error) {
 	out := new(RuleRecordTable)
 	err := c.cc.Invoke(ctx, "/magma.lte.Pipelined/GetPolicyUsage", in, out, opts...)
@@ -1583,6 +1730,11 @@ type PipelinedServer interface {
 	ActivateFlows(context.Context, *ActivateFlowsRequest) (*ActivateFlowsResult, error)
 	// Deactivate flows for a subscriber
 	DeactivateFlows(context.Context, *DeactivateFlowsRequest) (*DeactivateFlowsResult, error)
+	// Activate flows for many subscribers, the flows of all the subscribers
+	// are installed together (used when many sessions are created at once)
+	ActivateFlowsBatch(context.Context, *ActivateFlowsBatchRequest) (*ActivateFlowsBatchResult, error)
+	// Deactivate flows for many subscribers
+	DeactivateFlowsBatch(context.Context, *DeactivateFlowsBatchRequest) (*DeactivateFlowsResult, error)
 	// Get policy usage stats
 	GetPolicyUsage(context.Context, *protos.Void) (*RuleRecordTable, error)
 	// Add new dpi flow
@@ -1621,6 +1773,12 @@ func (*UnimplementedPipelinedServer) ActivateFlows(ctx context.Context, req *Act
 func (*UnimplementedPipelinedServer) DeactivateFlows(ctx context.Context, req *DeactivateFlowsRequest) (*DeactivateFlowsResult, error) {
 	return nil, status.Errorf(codes.Unimplemented, "method DeactivateFlows not implemented")
 }
+func (*UnimplementedPipelinedServer) ActivateFlowsBatch(ctx context.Context, req *ActivateFlowsBatchRequest) (*ActivateFlowsBatchResult, error) {
+	return nil, status.Errorf(codes.Unimplemented, "method ActivateFlowsBatch not implemented")
+}
+func (*UnimplementedPipelinedServer) DeactivateFlowsBatch(ctx context.Context, req *DeactivateFlowsBatchRequest) (*DeactivateFlowsResult, error) {
+	return nil, status.Errorf(codes.Unimplemented, "method DeactivateFlowsBatch not implemented")
+}
 func (*UnimplementedPipelinedServer) GetPolicyUsage(ctx context.Context, req *protos.Void) (*RuleRecordTable, error) {
 	return nil, status.Errorf(codes.Unimplemented, "method GetPolicyUsage not implemented")
 }
@@ -1713,6 +1871,42 @@ func _Pipelined_DeactivateFlows_Handler(srv interface{}, ctx context.Context, de
 	return interceptor(ctx, in, info, handler)
 }
 
+func _Pipelined_ActivateFlowsBatch_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(ActivateFlowsBatchRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(PipelinedServer).ActivateFlowsBatch(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: "/magma.lte.Pipelined/ActivateFlowsBatch",
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(PipelinedServer).ActivateFlowsBatch(ctx, req.(*ActivateFlowsBatchRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _Pipelined_DeactivateFlowsBatch_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(DeactivateFlowsBatchRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(PipelinedServer).DeactivateFlowsBatch(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: "/magma.lte.Pipelined/DeactivateFlowsBatch",
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(PipelinedServer).DeactivateFlowsBatch(ctx, req.(*DeactivateFlowsBatchRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
 func _Pipelined_GetPolicyUsage_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
 	in := new(protos.Void)
 	if err := dec(in); err != nil {
@@ -1927,6 +2121,14 @@ var _Pipelined_serviceDesc = grpc.ServiceDesc{
 			MethodName: "DeactivateFlows",
 			Handler:    _Pipelined_DeactivateFlows_Handler,
 		},
+		{
+			MethodName: "ActivateFlowsBatch",
+			Handler:    _Pipelined_ActivateFlowsBatch_Handler,
+		},
+		{
+			MethodName: "DeactivateFlowsBatch",
+			Handler:    _Pipelined_DeactivateFlowsBatch_Handler,
+		},
 		{
 			MethodName: "GetPolicyUsage",
 			Handler:    _Pipelined_GetPolicyUsage_Handler,
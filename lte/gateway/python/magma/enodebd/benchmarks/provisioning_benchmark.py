@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Provisioning benchmark of the TR-069 server of enodebd with simulated
+Baicells eNodeBs, reports the time to provision all of them for increasing
+numbers of radios.
+
+The TR-069 server runs in a thread of the benchmark, as in enodebd, with
+the state machines of enodebd. Every simulated eNodeB connects from its own
+loopback address in 127.3.0.0/16, sends an Inform and answers the requests
+of the ACS from its data model until the ACS ends the session, taking
+--cpe-delay seconds to answer each request. The data model starts with the
+values of the Baicells provisioning tests, so that provisioning reads the
+parameters, sets the non invasive ones and ends without a reboot. As in the
+enodebd tests, the gateway configuration isn't read from /etc/magma.
+
+The servers compared are:
+
+    single:   the single threaded WSGIServer of wsgiref, serving one
+              connection at a time
+    threaded: Tr069WSGIServer, serving the connections concurrently
+
+Usage:
+    python3 -m magma.enodebd.benchmarks.provisioning_benchmark \
+        --radios 1 2 4 8 16 32 --cpe-delay 0.2
+"""
+
+import argparse
+import asyncio
+import http.client
+import ipaddress
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from unittest import mock
+from wsgiref.simple_server import WSGIServer
+from xml.sax.saxutils import escape
+
+from spyne.server.wsgi import WsgiApplication
+
+from magma.enodebd.devices.device_utils import EnodebDeviceName
+from magma.enodebd.logger import EnodebdLogger as logger
+from magma.enodebd.state_machines.enb_acs_manager import StateMachineManager
+from magma.enodebd.tests.test_utils import mock_functions
+from magma.enodebd.tests.test_utils.config_builder import EnodebConfigBuilder
+from magma.enodebd.tests.test_utils.tr069_msg_builder import \
+    Tr069MessageBuilder
+from magma.enodebd.tr069 import models
+from magma.enodebd.tr069.rpc_methods import AutoConfigServer
+from magma.enodebd.tr069.server import Tr069WSGIServer, \
+    tr069_WSGIRequestHandler
+from magma.enodebd.tr069.spyne_mods import Tr069Application, Tr069Soap11
+
+SERVER_IP = '127.0.0.1'
+FIRST_ENODEB_IP = ipaddress.IPv4Address('127.3.0.1')
+SOAP_ENV_NS = 'http://schemas.xmlsoap.org/soap/envelope/'
+REM_STATUS = 'Device.Services.FAPService.1.REM.X_BAICELLS_COM_REM_Status'
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+SOAP_ENVELOPE = (
+    '<soapenv:Envelope xmlns:soapenv="%s" '
+    'xmlns:soap="http://schemas.xmlsoap.org/soap/encoding/" '
+    'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xmlns:cwmp="%s">'
+    '<soapenv:Header>'
+    '<cwmp:ID soapenv:mustUnderstand="1">%%s</cwmp:ID>'
+    '</soapenv:Header>'
+    '<soapenv:Body>%%s</soapenv:Body>'
+    '</soapenv:Envelope>' % (SOAP_ENV_NS, models.CWMP_NS))
+# Fault of a CPE asked for a parameter it doesn't have
+INVALID_PARAMETER_FAULT = (
+    '<soapenv:Fault><faultcode>Client</faultcode>'
+    '<faultstring>CWMP fault</faultstring><detail><cwmp:Fault>'
+    '<FaultCode>9005</FaultCode><FaultString>Invalid parameter name'
+    '</FaultString></cwmp:Fault></detail></soapenv:Fault>')
+
+
+class _Service:
+    """ The parts of MagmaService used by the state machines """
+
+    def __init__(self):
+        self.config = EnodebConfigBuilder.get_service_config()
+        self.mconfig = EnodebConfigBuilder.get_mconfig(
+            EnodebDeviceName.BAICELLS)
+        # The timers of the state machines are scheduled, but don't run
+        self.loop = asyncio.new_event_loop()
+
+
+def _get_params(msg):
+    return [(param.Name, param.Value.type, param.Value.Data)
+            for param in msg.ParameterList.ParameterValueStruct]
+
+
+def _get_param_list_xml(params):
+    return '<ParameterList soap:arrayType="cwmp:ParameterValueStruct[%d]">' \
+        '%s</ParameterList>' % (len(params), ''.join(
+            '<ParameterValueStruct><Name>%s</Name>'
+            '<Value xsi:type="xsd:%s">%s</Value></ParameterValueStruct>' % (
+                escape(name), val_type, escape(str(data)))
+            for name, val_type, data in params))
+
+
+class _SimulatedEnodeb:
+    """ Baicells eNodeB provisioned by the TR-069 server """
+
+    def __init__(self, index, port, cpe_delay):
+        self.ip = str(FIRST_ENODEB_IP + index)
+        self.serial = '120200002618AGP%04d' % index
+        self._port = port
+        self._cpe_delay = cpe_delay
+        self._inform = Tr069MessageBuilder.get_inform(
+            enb_serial=self.serial, event_codes=['0 BOOTSTRAP'])
+        self._data_model = {}
+        for msg in (
+                self._inform,
+                Tr069MessageBuilder.get_read_only_param_values_response(),
+                Tr069MessageBuilder.get_regular_param_values_response(
+                    admin_state=False, earfcndl=39150),
+                Tr069MessageBuilder.get_object_param_values_response()):
+            for name, val_type, data in _get_params(msg):
+                self._data_model[name] = (val_type, data)
+        # Not in the responses of the tests, read during provisioning
+        self._data_model[REM_STATUS] = ('boolean', '1')
+        self.params_set = 0
+        self.provisioning_time = None
+        self.error = None
+
+    def provision(self):
+        """ Run TR-069 sessions until the parameters are set """
+        start = time.perf_counter()
+        try:
+            while not self.params_set:
+                self._run_session()
+            self.provisioning_time = time.perf_counter() - start
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            self.error = e
+
+    def _run_session(self):
+        connection = http.client.HTTPConnection(
+            SERVER_IP, self._port, source_address=(self.ip, 0))
+        try:
+            body = self._post(connection, self._get_inform_xml())
+            if not body or self._get_body_element(body).tag != \
+                    '{%s}InformResponse' % models.CWMP_NS:
+                raise ValueError('Inform not answered')
+            # An empty message lets the ACS send its requests
+            body = self._post(connection, '')
+            while body:
+                time.sleep(self._cpe_delay)
+                body = self._post(connection, self._answer(body))
+        finally:
+            connection.close()
+
+    def _post(self, connection, body):
+        connection.request('POST', '/', body.encode('utf-8'),
+                           {'Content-Type': 'text/xml; charset=utf-8'})
+        response = connection.getresponse()
+        return response.read()
+
+    @staticmethod
+    def _get_body_element(body):
+        return ET.fromstring(body).find('{%s}Body' % SOAP_ENV_NS)[0]
+
+    def _get_inform_xml(self):
+        inform = self._inform
+        device_id = inform.DeviceId
+        return SOAP_ENVELOPE % ('1', (
+            '<cwmp:Inform><DeviceId><Manufacturer>%s</Manufacturer>'
+            '<OUI>%s</OUI><ProductClass>%s</ProductClass>'
+            '<SerialNumber>%s</SerialNumber></DeviceId>'
+            '<Event soap:arrayType="cwmp:EventStruct[%d]">%s</Event>'
+            '<MaxEnvelopes>1</MaxEnvelopes>'
+            '<CurrentTime>1970-01-01T00:00:00Z</CurrentTime>'
+            '<RetryCount>0</RetryCount>%s</cwmp:Inform>') % (
+                device_id.Manufacturer, device_id.OUI,
+                device_id.ProductClass, device_id.SerialNumber,
+                len(inform.Event.EventStruct), ''.join(
+                    '<EventStruct><EventCode>%s</EventCode>'
+                    '<CommandKey></CommandKey></EventStruct>' %
+                    event.EventCode for event in inform.Event.EventStruct),
+                _get_param_list_xml(_get_params(inform))))
+
+    def _answer(self, body):
+        """ Answer a request of the ACS from the data model """
+        request = self._get_body_element(body)
+        method = request.tag.split('}')[1]
+        if method == 'GetParameterValues':
+            names = [name.text for name in request.iter('string')]
+            if any(name not in self._data_model for name in names):
+                response = INVALID_PARAMETER_FAULT
+            else:
+                response = \
+                    '<cwmp:GetParameterValuesResponse>%s' \
+                    '</cwmp:GetParameterValuesResponse>' % \
+                    _get_param_list_xml([
+                        (name,) + self._data_model[name] for name in names])
+        elif method == 'SetParameterValues':
+            for param in request.iter('ParameterValueStruct'):
+                value = param.find('Value')
+                self._data_model[param.findtext('Name')] = (
+                    value.get(XSI_TYPE, 'xsd:string').split(':')[-1],
+                    value.text or '')
+                self.params_set += 1
+            response = '<cwmp:SetParameterValuesResponse><Status>0</Status>' \
+                       '</cwmp:SetParameterValuesResponse>'
+        else:
+            raise ValueError('Unexpected request %s' % method)
+        return SOAP_ENVELOPE % (escape(request.findtext('.//ID') or '1'),
+                                response)
+
+
+def _start_server(server_mode, port):
+    state_machine_manager = StateMachineManager(_Service())
+    AutoConfigServer.set_state_machine_manager(state_machine_manager)
+    app = Tr069Application([AutoConfigServer], models.CWMP_NS,
+                           in_protocol=Tr069Soap11(validator='soft'),
+                           out_protocol=Tr069Soap11())
+    if server_mode == 'single':
+        server = WSGIServer((SERVER_IP, port), tr069_WSGIRequestHandler)
+    else:
+        server = Tr069WSGIServer((SERVER_IP, port), tr069_WSGIRequestHandler)
+    server.set_app(WsgiApplication(app))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _provision(args, server_mode, num_radios):
+    server = _start_server(server_mode, args.port)
+    enodebs = [_SimulatedEnodeb(i, args.port, args.cpe_delay)
+               for i in range(num_radios)]
+    threads = [threading.Thread(target=enodeb.provision)
+               for enodeb in enodebs]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    errors = [enodeb.error for enodeb in enodebs if enodeb.error]
+    times = sorted(enodeb.provisioning_time for enodeb in enodebs
+                   if enodeb.provisioning_time is not None)
+    if not times:
+        print('%s, %d radios: no radio provisioned, %r' % (
+            server_mode, num_radios, errors[0] if errors else None))
+        return
+    print('%s, %d radios: %d provisioned in %.2f s, per radio p50 %.2f s, '
+          'max %.2f s, %d errors%s' % (
+              server_mode, num_radios, len(times), elapsed,
+              times[len(times) // 2], times[-1], len(errors),
+              ' (%r)' % errors[0] if errors else ''))
+
+
+def run(args):
+    print('Simulated eNodeBs answering each request in %.2f s' %
+          args.cpe_delay)
+    with mock.patch(mock_functions.GET_IP_FROM_IF_PATH,
+                    side_effect=mock_functions.mock_get_ip_from_if), \
+            mock.patch(mock_functions.LOAD_SERVICE_MCONFIG_PATH,
+                       side_effect=mock_functions.
+                       mock_load_service_mconfig_as_json):
+        for num_radios in args.radios:
+            for server_mode in args.servers:
+                _provision(args, server_mode, num_radios)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Provisioning benchmark of the enodebd TR-069 server',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--radios', type=int, nargs='+',
+                            default=[1, 2, 4, 8, 16, 32],
+                            help='Numbers of radios to provision')
+    arg_parser.add_argument('--servers', nargs='+',
+                            choices=['single', 'threaded'],
+                            default=['single', 'threaded'],
+                            help='TR-069 servers to benchmark')
+    arg_parser.add_argument('--cpe-delay', type=float, default=0.2,
+                            help='Seconds an eNodeB takes to answer a '
+                                 'request')
+    arg_parser.add_argument('--port', type=int, default=48080,
+                            help='Port of the TR-069 server')
+    args = arg_parser.parse_args()
+    # The state machines log warnings for every radio
+    logging.getLogger(logger.__module__).setLevel(logging.ERROR)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import threading
 from typing import Any, List, Optional
 
 from magma.common.service import MagmaService
@@ -31,6 +32,10 @@ class StateMachineManager:
     """
     Delegates tr069 message handling to a dedicated state machine for the
     device.
+
+    Messages can be handled from several threads at once. The messages from
+    an eNB IP are handled one at a time, so that the state machine of the
+    eNB sees them in order, while the other eNBs are served concurrently.
     """
     def __init__(
         self,
@@ -39,6 +44,9 @@ class StateMachineManager:
         self._ip_serial_mapping = IpToSerialMapping()
         self._service = service
         self._state_machine_by_ip = {}
+        # Protects the device mappings and the locks by IP
+        self._lock = threading.Lock()
+        self._lock_by_ip = {}
 
     def handle_tr069_message(
         self,
@@ -47,9 +55,18 @@ class StateMachineManager:
     ) -> Any:
         """ Delegate message handling to the appropriate eNB state machine """
         client_ip = self._get_client_ip(ctx)
+        with self._get_ip_lock(client_ip):
+            return self._handle_tr069_message(client_ip, tr069_message)
+
+    def _handle_tr069_message(
+        self,
+        client_ip: str,
+        tr069_message: ComplexModelBase,
+    ) -> Any:
         if isinstance(tr069_message, models.Inform):
             try:
-                self._update_device_mapping(client_ip, tr069_message)
+                with self._lock:
+                    self._update_device_mapping(client_ip, tr069_message)
             except UnrecognizedEnodebError as err:
                 logger.warning('Received TR-069 Inform message from an '
                                 'unrecognized device. '
@@ -88,6 +105,14 @@ class StateMachineManager:
     ) -> EnodebAcsStateMachine:
         return self._state_machine_by_ip[client_ip]
 
+    def _get_ip_lock(self, client_ip: str) -> threading.Lock:
+        with self._lock:
+            lock = self._lock_by_ip.get(client_ip)
+            if lock is None:
+                lock = threading.Lock()
+                self._lock_by_ip[client_ip] = lock
+            return lock
+
     def _update_device_mapping(
         self,
         client_ip: str,
@@ -10,6 +10,9 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import http.client
+import socket
+import threading
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 from unittest import TestCase, mock
@@ -19,6 +22,8 @@ from magma.enodebd.tests.test_utils.enb_acs_builder import \
     EnodebAcsStateMachineBuilder
 from magma.enodebd.tr069 import models
 from magma.enodebd.tr069.rpc_methods import AutoConfigServer
+from magma.enodebd.tr069.server import Tr069WSGIServer, \
+    tr069_WSGIRequestHandler
 from magma.enodebd.tr069.spyne_mods import Tr069Application, Tr069Soap11
 from spyne import MethodContext
 from spyne.server import ServerBase
@@ -465,6 +470,32 @@ class Tr069Test(TestCase):
 
         self.assertEqual(b''.join(ctx.out_string), b'')
 
+    def test_set_out_message_name(self):
+        """
+        Test that naming the output message of a request doesn't change the
+        method descriptor shared with the concurrent requests
+        """
+        server = ServerBase(self.app)
+
+        def generate(name):
+            ctx = MethodContext(server, MethodContext.SERVER)
+            ctx.in_string = [b'']
+            ctx, = server.generate_contexts(ctx)
+            server.get_in_object(ctx)
+            AutoConfigServer._set_out_message_name(ctx, name)
+            ctx.out_object = [models.AcsToCpeRequests(
+                ParameterNames=models.ParameterNames(string=['foo']))]
+            server.get_out_string(ctx)
+            return ctx
+
+        shared_descriptor = generate('EmptyHttp').descriptor
+        ctx = generate('GetParameterValues')
+        self.assertIn(b'GetParameterValues', b''.join(ctx.out_string))
+        self.assertEqual(b''.join(generate('EmptyHttp').out_string), b'')
+        # The descriptors of a name are reused
+        self.assertIs(generate('EmptyHttp').descriptor, shared_descriptor)
+        self.assertIsNot(ctx.descriptor, shared_descriptor)
+
     def test_generate_get_parameter_values_string(self):
         """
         Test that correct string is generated for SetParameterValues ACS->CPE
@@ -765,6 +796,41 @@ class Tr069Test(TestCase):
         server.get_in_object(ctx)
 
 
+class Tr069WSGIServerTest(TestCase):
+    """ Tests for the serving of the eNodeB connections """
+
+    def setUp(self):
+        def app(_environ, start_response):
+            start_response('200 OK', [('Content-Length', '0')])
+            return [b'']
+
+        self.server = Tr069WSGIServer(('127.0.0.1', 0),
+                                      tr069_WSGIRequestHandler,
+                                      max_connections=2)
+        self.server.set_app(app)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_concurrent_connections(self):
+        """
+        Test that an eNodeB is served while another one holds its
+        connection without sending anything
+        """
+        # The listen backlog follows the number of connections
+        self.assertEqual(self.server.request_queue_size, 2)
+        port = self.server.server_address[1]
+        idle = socket.create_connection(('127.0.0.1', port))
+        self.addCleanup(idle.close)
+
+        connection = http.client.HTTPConnection('127.0.0.1', port,
+                                                timeout=5)
+        self.addCleanup(connection.close)
+        connection.request('POST', '/', b'')
+        self.assertEqual(connection.getresponse().status, 200)
+
+
 class XmlTree():
 
     @staticmethod
@@ -11,6 +11,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import copy
+
 from magma.enodebd.logger import EnodebdLogger as logger
 from magma.enodebd.state_machines.enb_acs_manager import StateMachineManager
 from spyne.decorator import rpc
@@ -62,8 +64,9 @@ class AutoConfigServer(ServiceBase):
         Per spyne documentation, this class is never instantiated, so all RPC
         functions are implicitly staticmethods. Hence use static class variables
         to hold state.
-        This also means that only a single thread can be used (since there are
-        no locks).
+        The messages of different eNodeBs are handled concurrently, so the
+        shared method descriptors are never modified, and the state machine
+        manager serializes the messages of each eNodeB.
         Note that staticmethod decorator can't be used in conjunction with rpc
         decorator.
     """
@@ -71,6 +74,8 @@ class AutoConfigServer(ServiceBase):
     __in_header__ = models.ID
     _acs_to_cpe_queue = None
     _cpe_to_acs_queue = None
+    # Copies of the method descriptors by (descriptor, out message name)
+    _descriptors_by_out_name = {}
 
     """ Set maxEnvelopes to 1, as per TR-069 spec """
     _max_envelopes = 1
@@ -109,11 +114,30 @@ class AutoConfigServer(ServiceBase):
         # Set return message name
         if isinstance(req, models.DummyInput):
             # Generate 'empty' request to CPE using empty message name
-            ctx.descriptor.out_message.Attributes.sub_name = 'EmptyHttp'
+            cls._set_out_message_name(ctx, 'EmptyHttp')
             return models.AcsToCpeRequests()
-        ctx.descriptor.out_message.Attributes.sub_name = req.__class__.__name__
+        cls._set_out_message_name(ctx, req.__class__.__name__)
         return cls._generate_acs_to_cpe_request_copy(req)
 
+    @classmethod
+    def _set_out_message_name(
+        cls,
+        ctx: WsgiMethodContext,
+        name: str,
+    ) -> None:
+        """ Name the message sent back. The method descriptor is shared by
+            the concurrent requests, so the context is given a copy of it
+            with an out message of that name.
+        """
+        key = (ctx.descriptor, name)
+        descriptor = cls._descriptors_by_out_name.get(key)
+        if descriptor is None:
+            descriptor = copy.copy(ctx.descriptor)
+            descriptor.out_message = \
+                ctx.descriptor.out_message.customize(sub_name=name)
+            cls._descriptors_by_out_name[key] = descriptor
+        ctx.descriptor = descriptor
+
     @classmethod
     def __get_tr069_response_from_sm(
             cls,
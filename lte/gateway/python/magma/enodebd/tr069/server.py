@@ -12,10 +12,12 @@ limitations under the License.
 """
 
 import _thread
+import queue
+import threading
 from magma.enodebd.logger import EnodebdLogger as logger
 import socket
 from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, \
-    WSGIServer, make_server
+    WSGIServer
 from spyne.server.wsgi import WsgiApplication
 from magma.common.misc_utils import get_ip_from_if
 from magma.configuration.service_configs import load_service_config
@@ -29,6 +31,48 @@ from .spyne_mods import Tr069Application, Tr069Soap11
 # measured at 168secs. Should also be set smaller than ENB_CONNECTION_TIMEOUT,
 # to avoid incorrectly detecting eNodeB timeout.
 SOCKET_TIMEOUT = 240
+# Number of eNodeB connections served at the same time, the others wait for
+# one of them to close
+MAX_CONNECTIONS = 32
+
+
+class Tr069WSGIServer(WSGIServer):
+    """
+    WSGI server serving each eNodeB connection in its own thread, from a
+    bounded pool of threads. A slow eNodeB, such as one answering a
+    GetParameterValues of its entire data model, doesn't hold the others.
+
+    The StateMachineManager serializes the messages of each eNodeB.
+    """
+    def __init__(self, *args, max_connections=MAX_CONNECTIONS, **kwargs):
+        # Listen backlog, read when the server starts listening
+        self.request_queue_size = max_connections
+        super().__init__(*args, **kwargs)
+        self._connections = queue.Queue()
+        for _ in range(max_connections):
+            # Daemon threads, so that a connection left open doesn't keep
+            # the process from exiting
+            threading.Thread(target=self._serve_connections,
+                             daemon=True).start()
+
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+
+    def _serve_connections(self):
+        while True:
+            request, client_address = self._connections.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:  # pylint: disable=broad-except
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        """ Log errors with the python logging framework, not to stderr """
+        logger.exception('Error serving TR-069 connection from %s',
+                         client_address[0])
+
 
 class tr069_WSGIRequestHandler(WSGIRequestHandler):
     timeout = 10
@@ -127,11 +171,12 @@ def tr069_server(state_machine_manager: StateMachineManager) -> None:
     socket.setdefaulttimeout(SOCKET_TIMEOUT)
     logger.info('Starting TR-069 server on %s:%s',
                  ip_address, config['tr069']['port'])
-    server = make_server(ip_address,
-                         config['tr069']['port'], wsgi_app,
-                         WSGIServer, tr069_WSGIRequestHandler)
+    server = Tr069WSGIServer(
+        (ip_address, config['tr069']['port']), tr069_WSGIRequestHandler,
+        max_connections=config['tr069'].get('max_connections',
+                                            MAX_CONNECTIONS))
+    server.set_app(wsgi_app)
 
-    # Note: use single-thread server, to avoid state contention
     try:
         server.serve_forever()
     finally:
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Attaches UEs through IPAddressManager and reports how the allocation rate
+evolves with the number of attached UEs, and the rate of IP to SID lookups
+once they are all attached. State is kept in memory unless --persist is set,
+in which case the Redis server configured in redis.yml is used.
+
+Usage:
+    python3 -m magma.mobilityd.benchmarks.ip_address_man_benchmark \
+        --ues 50000 --window 5000
+"""
+
+import argparse
+import logging
+import time
+from ipaddress import ip_network
+
+from lte.protos.mconfig.mconfigs_pb2 import MobilityD
+
+from magma.mobilityd.ip_address_man import IPAddressManager
+
+
+def _create_manager(ip_block, persist):
+    config = {
+        'persist_to_redis': persist,
+        'redis_port': 6379,
+    }
+    mconfig = MobilityD(ip_allocator_type=MobilityD.IP_POOL,
+                        static_ip_enabled=False)
+    manager = IPAddressManager(recycling_interval=None, config=config,
+                               mconfig=mconfig)
+    manager.add_ip_block(ip_block)
+    return manager
+
+
+def _get_sid(ue):
+    return 'IMSI%015d' % ue
+
+
+def run(args):
+    ip_block = ip_network(args.ip_block)
+    manager = _create_manager(ip_block, args.persist)
+
+    print('Attaching %d UEs from %s' % (args.ues, ip_block))
+    ips = []
+    window_start = time.perf_counter()
+    for ue in range(args.ues):
+        ip, _ = manager.alloc_ip_address(_get_sid(ue))
+        ips.append(ip)
+        if (ue + 1) % args.window == 0:
+            elapsed = time.perf_counter() - window_start
+            print('UEs %d-%d: %.0f allocations/s' % (
+                ue + 2 - args.window, ue + 1, args.window / elapsed))
+            window_start = time.perf_counter()
+
+    start = time.perf_counter()
+    for ue, ip in enumerate(ips):
+        assert manager.get_sid_for_ip(ip) == _get_sid(ue)
+    elapsed = time.perf_counter() - start
+    print('get_sid_for_ip with %d UEs attached: %.0f lookups/s' % (
+        len(ips), len(ips) / elapsed))
+
+    manager.remove_ip_blocks(ip_block, force=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for mobilityd IP allocation with many UEs',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--ues', type=int, default=50000,
+                            help='Number of UEs to attach')
+    arg_parser.add_argument('--window', type=int, default=5000,
+                            help='Number of allocations per reported rate')
+    arg_parser.add_argument('--ip-block', default='10.128.0.0/16',
+                            help='IP block to allocate from')
+    arg_parser.add_argument('--persist', action='store_true',
+                            help='Persist state to Redis')
+    args = arg_parser.parse_args()
+    # remove_ip_blocks logs the blocks at warning level
+    logging.getLogger().setLevel(logging.ERROR)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Measures the IP allocation and release rate of IpAllocatorPool for IP
+blocks of different sizes. State is kept in memory unless a Redis port is
+given, in which case the Redis database is used as mobilityd would.
+
+Usage:
+    python3 -m magma.mobilityd.benchmarks.ip_alloc_benchmark \
+        --prefix-lens 24 16 12 --allocations 10000
+"""
+
+import argparse
+import logging
+import time
+from ipaddress import ip_network
+
+from magma.mobilityd.ip_allocator_pool import IpAllocatorPool
+from magma.mobilityd.ip_descriptor import IPState
+from magma.mobilityd.ip_descriptor_map import IpDescriptorMap
+
+
+def _create_pool(ip_block, redis_port):
+    ip_state_map = IpDescriptorMap(persist_to_redis=bool(redis_port),
+                                   redis_port=redis_port)
+    pool = IpAllocatorPool(set(), ip_state_map, {})
+    pool.add_ip_block(ip_block)
+    return pool, ip_state_map
+
+
+def _allocate(pool, ip_state_map, count):
+    ip_descs = []
+    for i in range(count):
+        ip_desc = pool.alloc_ip_address('IMSI%015d' % i, 0)
+        ip_state_map.add_ip_to_state(ip_desc.ip, ip_desc, IPState.ALLOCATED)
+        ip_descs.append(ip_desc)
+    return ip_descs
+
+
+def _release(ip_state_map, ip_descs):
+    """ Walk the IPs through the same states as IPAddressManager """
+    for ip_desc in ip_descs:
+        ip_state_map.mark_ip_state(ip_desc.ip, IPState.RELEASED)
+        ip_state_map.mark_ip_state(ip_desc.ip, IPState.REAPED)
+        ip_desc = ip_state_map.mark_ip_state(ip_desc.ip, IPState.FREE)
+        ip_desc.sid = None
+
+
+def _rate(count, elapsed):
+    return count / elapsed if elapsed else float('inf')
+
+
+def run(args):
+    for prefix_len in args.prefix_lens:
+        ip_block = ip_network('10.0.0.0/%d' % prefix_len)
+
+        start = time.perf_counter()
+        pool, ip_state_map = _create_pool(ip_block, args.redis_port)
+        setup_time = time.perf_counter() - start
+        free_ips = ip_state_map.get_ip_count(IPState.FREE)
+        count = min(args.allocations, free_ips)
+
+        start = time.perf_counter()
+        ip_descs = _allocate(pool, ip_state_map, count)
+        alloc_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _release(ip_state_map, ip_descs)
+        release_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pool.remove_ip_blocks([ip_block], _force=True)
+        remove_time = time.perf_counter() - start
+
+        print('%s: %d free IPs, add_ip_block %.1f ms, '
+              '%d allocations at %.0f/s, releases at %.0f/s, '
+              'remove_ip_blocks %.1f ms' % (
+                  ip_block, free_ips, setup_time * 1000, count,
+                  _rate(count, alloc_time), _rate(count, release_time),
+                  remove_time * 1000))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for mobilityd IP pool allocation',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--prefix-lens', type=int, nargs='+',
+                            default=[24, 16, 12],
+                            help='Prefix lengths of the IP blocks to test')
+    arg_parser.add_argument('--allocations', type=int, default=10000,
+                            help='Max number of IPs allocated per block')
+    arg_parser.add_argument('--redis-port', type=int, default=0,
+                            help='Persist state to the Redis server on this '
+                                 'port, in memory if 0')
+    args = arg_parser.parse_args()
+    # remove_ip_blocks logs the blocks at warning level
+    logging.getLogger().setLevel(logging.ERROR)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Free list of the IP addresses of an IP block.
+
+The free addresses of a block are kept as a bitmap indexed by the offset of
+the address in the block, which is what gets persisted to Redis (8KB for a
+/16), and as a dense array of free offsets with a reverse position table, so
+that a random free address can be taken, and any address added or removed,
+in O(1).
+"""
+
+from array import array
+from ipaddress import ip_address, ip_network
+from random import randrange
+from typing import Iterator, Optional
+
+import redis
+from magma.mobilityd.mobility_store import FREE_IPS_REDIS_TYPE
+
+# Largest block tracked with a free list, larger blocks (ex. IPv6) would
+# need too much memory for the position table
+MAX_FREE_LIST_ADDRESSES = 1 << 24
+
+
+class IPBlockFreeList:
+    """
+    Free addresses of a single IP block.
+
+    If a Redis client is given, the bitmap is loaded from and written
+    through to the FREE_IPS_REDIS_TYPE string of the block with SETBIT, so
+    every change costs a single round trip.
+    """
+
+    def __init__(self, ip_block: ip_network,
+                 client: Optional[redis.Redis] = None):
+        self.ip_block = ip_block
+        self._first_ip = int(ip_block.network_address)
+        self._redis = client
+        self._redis_key = FREE_IPS_REDIS_TYPE.format(ip_block.with_prefixlen)
+
+        num_addresses = ip_block.num_addresses
+        self._bitmap = bytearray((num_addresses + 7) // 8)
+        self._free = array('I')  # Dense array of the free offsets
+        # Position of every offset in self._free, -1 if not free
+        self._positions = array('i', [-1]) * num_addresses
+        if client is not None:
+            self._load(client.get(self._redis_key))
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def __contains__(self, ip: ip_address) -> bool:
+        offset = self._get_offset(ip)
+        return offset is not None and self._positions[offset] >= 0
+
+    def __iter__(self) -> Iterator[ip_address]:
+        for offset in self._free:
+            yield ip_address(self._first_ip + offset)
+
+    def add(self, ip: ip_address) -> bool:
+        """ Mark an IP as free, returns False if it already was """
+        offset = self._get_offset(ip)
+        if offset is None:
+            raise ValueError("IP %s is not in block %s" % (ip, self.ip_block))
+        if self._positions[offset] >= 0:
+            return False
+        self._positions[offset] = len(self._free)
+        self._free.append(offset)
+        self._set_bit(offset, 1)
+        return True
+
+    def add_range(self, first_ip: ip_address, last_ip: ip_address) -> int:
+        """
+        Mark all IPs from first_ip to last_ip included as free. The bitmap
+        is persisted with a single write.
+
+        Returns:
+            The number of IPs that were not free yet
+        """
+        first = self._get_offset(first_ip)
+        last = self._get_offset(last_ip)
+        if first is None or last is None:
+            raise ValueError("Range %s-%s is not in block %s"
+                             % (first_ip, last_ip, self.ip_block))
+        if self._free:
+            added = self._extend(array('I', (
+                offset for offset in range(first, last + 1)
+                if self._positions[offset] < 0)))
+        else:
+            added = self._set_range(first, last)
+        if self._redis is not None and added:
+            self._redis.set(self._redis_key, bytes(self._bitmap))
+        return added
+
+    def remove(self, ip: ip_address) -> bool:
+        """ Mark an IP as not free, returns False if it wasn't free """
+        offset = self._get_offset(ip)
+        if offset is None or self._positions[offset] < 0:
+            return False
+        self._remove_offset(offset)
+        return True
+
+    def pop_random(self) -> ip_address:
+        """ Take a random free IP. Raises IndexError if there is none """
+        if not self._free:
+            raise IndexError("No free IP in block %s" % self.ip_block)
+        offset = self._free[randrange(len(self._free))]
+        self._remove_offset(offset)
+        return ip_address(self._first_ip + offset)
+
+    def delete(self):
+        """ Drop all free IPs of the block, including the persisted bitmap """
+        self._bitmap = bytearray(len(self._bitmap))
+        self._free = array('I')
+        self._positions = array('i', [-1]) * self.ip_block.num_addresses
+        if self._redis is not None:
+            self._redis.delete(self._redis_key)
+
+    def _get_offset(self, ip: ip_address) -> Optional[int]:
+        offset = int(ip) - self._first_ip
+        if ip.version != self.ip_block.version or \
+                not 0 <= offset < len(self._positions):
+            return None
+        return offset
+
+    def _remove_offset(self, offset: int):
+        # Move the last free offset into the slot of the removed one
+        position = self._positions[offset]
+        last = self._free.pop()
+        if last != offset:
+            self._free[position] = last
+            self._positions[last] = position
+        self._positions[offset] = -1
+        self._set_bit(offset, 0)
+
+    def _set_bit(self, offset: int, value: int):
+        mask = 0x80 >> (offset & 7)  # Same bit order as Redis SETBIT
+        if value:
+            self._bitmap[offset >> 3] |= mask
+        else:
+            self._bitmap[offset >> 3] &= 0xFF ^ mask
+        if self._redis is not None:
+            self._redis.setbit(self._redis_key, offset, value)
+
+    def _extend(self, offsets: array) -> int:
+        """ Append offsets that are not free yet, without persisting """
+        start = len(self._free)
+        self._free.extend(offsets)
+        for index, offset in enumerate(offsets, start):
+            self._positions[offset] = index
+            self._bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+        return len(offsets)
+
+    def _set_range(self, first: int, last: int) -> int:
+        """ Mark first to last as free in bulk, the list must be empty """
+        count = last - first + 1
+        self._free = array('I', range(first, last + 1))
+        self._positions[first:last + 1] = array('i', range(count))
+        # Whole bytes are set at once, only the partial ones bit by bit
+        first_byte = (first + 7) >> 3
+        last_byte = (last + 1) >> 3
+        if first_byte < last_byte:
+            self._bitmap[first_byte:last_byte] = \
+                b'\xff' * (last_byte - first_byte)
+            partial = list(range(first, first_byte << 3)) + \
+                list(range(last_byte << 3, last + 1))
+        else:
+            partial = range(first, last + 1)
+        for offset in partial:
+            self._bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+        return count
+
+    def _load(self, bitmap: Optional[bytes]):
+        if not bitmap:
+            return
+        num_addresses = len(self._positions)
+        offsets = array('I')
+        for byte_index, byte in enumerate(bitmap[:len(self._bitmap)]):
+            if not byte:
+                continue
+            base = byte_index * 8
+            if byte == 0xFF and base + 8 <= num_addresses:
+                offsets.extend(range(base, base + 8))
+                continue
+            offsets.extend(base + bit for bit in range(8)
+                           if byte & (0x80 >> bit)
+                           and base + bit < num_addresses)
+        self._extend(offsets)
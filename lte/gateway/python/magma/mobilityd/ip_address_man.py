@@ -107,6 +107,7 @@ class IPAddressManager:
             - self._assigned_ip_blocks: {ip_block}
             - self.ip_state_map: {state=>{ip=>ip_desc}}
             - self.sid_ips_map: {SID=>[IPDesc]}
+            - self._ip_sid_map: {ip=>SID}, reverse index of sid_ips_map
 
         The utilized redis_containers store a cache of state in local memory,
         so reads are the same speed as without persistence. For writes, state
@@ -149,6 +150,7 @@ class IPAddressManager:
         if not persist_to_redis:
             self._assigned_ip_blocks = set()  # {ip_block}
             self.sid_ips_map = defaultdict(IPDesc)  # {SID=>IPDesc}
+            self._ip_sid_map = {}  # {ip=>SID}
             self._dhcp_gw_info = UplinkGatewayInfo(defaultdict(str))
             self._dhcp_store = {}  # mac => DHCP_State
         else:
@@ -158,6 +160,8 @@ class IPAddressManager:
             client = get_default_client()
             self._assigned_ip_blocks = store.AssignedIpBlocksSet(client)
             self.sid_ips_map = store.IPDescDict(client)
+            self._ip_sid_map = store.ip_to_sid(client)
+            self._build_ip_sid_map()
             self._dhcp_gw_info = UplinkGatewayInfo(store.GatewayInfoMap())
             self._dhcp_store = store.MacToIP()  # mac => DHCP_State
 
@@ -341,6 +345,7 @@ class IPAddressManager:
 
             self.ip_state_map.add_ip_to_state(ip_desc.ip, ip_desc, IPState.ALLOCATED)
             self.sid_ips_map[sid] = ip_desc
+            self._ip_sid_map[ip_desc.ip.exploded] = sid
 
             logging.debug("Allocating New IP: %s", str(ip_desc))
             IP_ALLOCATED_TOTAL.inc()
@@ -366,10 +371,23 @@ class IPAddressManager:
     def get_sid_for_ip(self, requested_ip: ip_address) -> Optional[str]:
         """ If ip is associated with an sid, return the sid, else None """
         with self._lock:
-            for sid, ip_desc in self.sid_ips_map.items():
-                if requested_ip == ip_desc.ip:
-                    return sid
-            return None
+            sid = self._ip_sid_map.get(requested_ip.exploded)
+            if sid is None:
+                return None
+            ip_desc = self.sid_ips_map.get(sid)
+            if ip_desc is None or ip_desc.ip != requested_ip:
+                # The SID mapping was dropped without the index, ex. when
+                # removing IP blocks
+                del self._ip_sid_map[requested_ip.exploded]
+                return None
+            return sid
+
+    def _build_ip_sid_map(self):
+        """ Index the SID mappings persisted before the index existed """
+        if len(self._ip_sid_map) or not len(self.sid_ips_map):
+            return
+        self._ip_sid_map.update({ip_desc.ip.exploded: sid for sid, ip_desc
+                                 in self.sid_ips_map.scan_items()})
 
     def release_ip_address(self, sid: str, ip: ip_address):
         """ Release an IP address.
@@ -432,6 +450,7 @@ class IPAddressManager:
                 self.ip_allocator.release_ip(ip_desc)
                 # update SID-IP map
                 del self.sid_ips_map[ip_desc.sid]
+                self._ip_sid_map.pop(ip.exploded, None)
 
             # Set timer for the next round of recycling
             self._recycle_timer = None
@@ -24,6 +24,7 @@ from ipaddress import ip_address, ip_network
 from typing import List, Set
 
 from copy import deepcopy
+from magma.mobilityd.free_ip_list import MAX_FREE_LIST_ADDRESSES
 from magma.mobilityd.ip_descriptor import IPDesc, IPState, IPType
 from .ip_descriptor_map import IpDescriptorMap
 from .ip_allocator_base import IPAllocator, NoAvailableIPError, \
@@ -67,14 +68,27 @@ class IpAllocatorPool(IPAllocator):
         # TODO(oramadan) t23793559 HACK reserve the GW address for
         #  gtp_br0 iface and test VM
         num_reserved_addresses = 11
-        for ip in ipblock.hosts():
-            state = IPState.RESERVED if num_reserved_addresses > 0 \
-                else IPState.FREE
-            ip_desc = IPDesc(ip=ip, state=state,
+        hosts = ipblock.hosts()
+        for ip in hosts:
+            ip_desc = IPDesc(ip=ip, state=IPState.RESERVED,
                              ip_block=ipblock, sid=None, ip_type=IPType.IP_POOL)
-            self._ip_state_map.add_ip_to_state(ip, ip_desc, state)
-            if num_reserved_addresses > 0:
-                num_reserved_addresses -= 1
+            self._ip_state_map.add_ip_to_state(ip, ip_desc, IPState.RESERVED)
+            num_reserved_addresses -= 1
+            if num_reserved_addresses == 0:
+                break
+
+        # The remaining hosts are added as a single range, only the
+        # descriptors of IPs leaving the FREE state get stored
+        if not _has_host_range(ipblock):
+            for ip in hosts:
+                ip_desc = IPDesc(ip=ip, state=IPState.FREE, ip_block=ipblock,
+                                 sid=None, ip_type=IPType.IP_POOL)
+                self._ip_state_map.add_ip_to_state(ip, ip_desc, IPState.FREE)
+            return
+        first_free_ip = next(hosts, None)
+        if first_free_ip is not None:
+            self._ip_state_map.add_free_ips(ipblock, first_free_ip,
+                                            ipblock.broadcast_address - 1)
 
     def remove_ip_blocks(self, ipblocks: List[ip_network],
                          _force: bool = False) -> List[ip_network]:
@@ -121,28 +135,27 @@ class IpAllocatorPool(IPAllocator):
             del allocated_ip_block_set
 
         # Remove the associated IP addresses
-        remove_ips = \
-            (ip for block in remove_blocks for ip in block.hosts())
-        for ip in remove_ips:
-            for state in (IPState.FREE, IPState.RELEASED, IPState.REAPED):
-                self._ip_state_map.remove_ip_from_state(ip, state)
-            if _force:
-                self._ip_state_map.remove_ip_from_state(ip, IPState.ALLOCATED)
-            else:
-                assert not self._ip_state_map.test_ip_state(ip, IPState.ALLOCATED), \
-                    "Unexpected ALLOCATED IP %s from a soft IP block " \
-                    "removal "
-
-            # Clean up SID maps
-            for sid in list(self._sid_ips_map):
-                self._sid_ips_map.pop(sid)
+        states = [IPState.FREE, IPState.RELEASED, IPState.REAPED,
+                  IPState.RESERVED]
+        if _force:
+            states.append(IPState.ALLOCATED)
+        for block in remove_blocks:
+            self._ip_state_map.remove_ip_block(block, states)
+        if not _force:
+            assert not any(
+                ip in block
+                for ip in self._ip_state_map.list_ips(IPState.ALLOCATED)
+                for block in remove_blocks), \
+                "Unexpected ALLOCATED IP from a soft IP block removal"
 
         # Remove the IP blocks
         self._assigned_ip_blocks -= remove_blocks
 
-        # Can't use generators here
-        remove_sids = tuple(sid for sid in self._sid_ips_map
-                            if not self._sid_ips_map[sid])
+        # Clean up SID maps, can't use generators here
+        remove_sids = tuple(
+            sid for sid, ip_desc in self._sid_ips_map.items()
+            if not ip_desc or ip_desc.ip is None or any(
+                ip_desc.ip in block for block in remove_blocks))
         for sid in remove_sids:
             self._sid_ips_map.pop(sid)
 
@@ -176,8 +189,8 @@ class IpAllocatorPool(IPAllocator):
             logging.error("Listing an unknown IP block: %s", ipblock)
             raise IPBlockNotFoundError(ipblock)
 
-        res = [ip for ip in ipblock \
-               if self._ip_state_map.test_ip_state(ip, IPState.ALLOCATED)]
+        allocated_ips = self._ip_state_map.list_ips(IPState.ALLOCATED)
+        res = sorted(ip for ip in allocated_ips if ip in ipblock)
         return res
 
     def alloc_ip_address(self, sid: str, vlan: int) -> IPDesc:
@@ -209,3 +222,9 @@ class IpAllocatorPool(IPAllocator):
 
     def release_ip(self, ip_desc: IPDesc):
         pass
+
+
+def _has_host_range(ipblock: ip_network) -> bool:
+    """ Whether the hosts of ipblock are all its IPs but the first and last """
+    return ipblock.version == 4 and ipblock.prefixlen < 31 and \
+        ipblock.num_addresses <= MAX_FREE_LIST_ADDRESSES
@@ -37,17 +37,28 @@ from __future__ import absolute_import, division, print_function, \
 
 from collections import defaultdict
 from ipaddress import ip_address, ip_network
-from typing import List, Set
+from typing import List, Optional, Set
 
 import redis
 from magma.mobilityd import mobility_store as store
-from magma.mobilityd.ip_descriptor import IPDesc, IPState
-from random import choice
+from magma.mobilityd.free_ip_list import IPBlockFreeList, \
+    MAX_FREE_LIST_ADDRESSES
+from magma.mobilityd.ip_descriptor import IPDesc, IPState, IPType
+from random import choice, randrange
 
 DEFAULT_IP_RECYCLE_INTERVAL = 15
 
 
 class IpDescriptorMap:
+    """
+    IP descriptors by state.
+
+    FREE IPs of IP_POOL blocks are not stored as descriptors: every block
+    has an IPBlockFreeList, which allocates, adds and removes free IPs in
+    O(1) and persists the free IPs of the block as a bitmap. Their
+    descriptors are rebuilt when an IP leaves the FREE state. Other FREE
+    IPs, ex. static IPs being recycled, are kept with the other states.
+    """
 
     def __init__(self,
                  persist_to_redis: bool = True,
@@ -59,8 +70,11 @@ class IpDescriptorMap:
                 else write state to Redis service
             redis_port (int): redis server port number.
         """
+        self._free_lists = {}  # {ip_block=>IPBlockFreeList}
         if not persist_to_redis:
             self.ip_states = defaultdict(dict)  # {state=>{ip=>ip_desc}}
+            self._client = None
+            self._free_ip_blocks = set()
         else:
             if not redis_port:
                 raise ValueError(
@@ -68,6 +82,12 @@ class IpDescriptorMap:
             client = redis.Redis(host='localhost', port=redis_port)
             self.ip_states = store.defaultdict_key(
                 lambda key: store.ip_states(client, key))
+            self._client = client
+            self._free_ip_blocks = store.FreeIpBlocksSet(client)
+            for ip_block in self._free_ip_blocks:
+                self._free_lists[ip_block] = \
+                    IPBlockFreeList(ip_block, client)
+            self._migrate_free_ips()
 
     def add_ip_to_state(self, ip: ip_address, ip_desc: IPDesc,
                         state: IPState):
@@ -77,12 +97,57 @@ class IpDescriptorMap:
             % (ip_desc.state, state)
         assert state in IPState, "unknown state %s" % state
 
+        if state == IPState.FREE and _has_free_list(ip_desc):
+            self._get_free_list(ip_desc.ip_block).add(ip)
+            return
         self.ip_states[state][ip.exploded] = ip_desc
 
+    def add_free_ips(self, ip_block: ip_network, first_ip: ip_address,
+                     last_ip: ip_address) -> int:
+        """
+        Mark a range of IPs of an IP_POOL block as FREE. The range is stored
+        as a whole in the free list of the block, which takes a single
+        write whatever the size of the range.
+
+        Returns:
+            The number of IPs added to the FREE state
+        """
+        assert ip_block.num_addresses <= MAX_FREE_LIST_ADDRESSES, \
+            "IP block %s is too large for a free list" % ip_block
+        return self._get_free_list(ip_block).add_range(first_ip, last_ip)
+
+    def remove_ip_block(self, ip_block: ip_network,
+                        states: List[IPState]) -> List[IPDesc]:
+        """
+        Remove all IPs of a block from the given states. The free list of
+        the block is dropped at once if FREE is one of them, other states
+        are filtered by block.
+
+        Returns:
+            The removed descriptors, other than FREE ones
+        """
+        removed = []
+        for state in states:
+            assert state in IPState, "unknown state %s" % state
+            if state == IPState.FREE:
+                free_list = self._free_lists.pop(ip_block, None)
+                if free_list is not None:
+                    free_list.delete()
+                    self._free_ip_blocks.discard(ip_block)
+            ip_descs = self.ip_states[state]
+            for ip in [ip for ip, ip_desc in ip_descs.items()
+                       if ip_desc.ip in ip_block]:
+                removed.append(ip_descs.pop(ip))
+        return removed
+
     def remove_ip_from_state(self, ip: ip_address, state: IPState) -> IPDesc:
         """ Remove an IP from a internal dict """
         assert state in IPState, "unknown state %s" % state
 
+        if state == IPState.FREE:
+            free_list = self._find_free_list(ip)
+            if free_list is not None and free_list.remove(ip):
+                return _make_free_ip_desc(ip, free_list.ip_block)
         ip_desc = self.ip_states[state].pop(ip.exploded, None)
         return ip_desc
 
@@ -90,6 +155,12 @@ class IpDescriptorMap:
         """ Pop an IP from a internal dict """
         assert state in IPState, "unknown state %s" % state
 
+        if state == IPState.FREE:
+            free_list = self._choose_free_list()
+            if free_list is not None:
+                ip = free_list.pop_random()
+                return _make_free_ip_desc(ip, free_list.ip_block)
+
         ip_state_key = choice(list(self.ip_states[state].keys()))
         ip_desc = self.ip_states[state].pop(ip_state_key)
         return ip_desc
@@ -98,12 +169,20 @@ class IpDescriptorMap:
         """ Return number of IPs in a state """
         assert state in IPState, "unknown state %s" % state
 
-        return len(self.ip_states[state])
+        count = len(self.ip_states[state])
+        if state == IPState.FREE:
+            count += sum(len(free_list)
+                         for free_list in self._free_lists.values())
+        return count
 
     def test_ip_state(self, ip: ip_address, state: IPState) -> bool:
         """ check if IP is in state X """
         assert state in IPState, "unknown state %s" % state
 
+        if state == IPState.FREE:
+            free_list = self._find_free_list(ip)
+            if free_list is not None and ip in free_list:
+                return True
         return ip.exploded in self.ip_states[state]
 
     def get_ip_state(self, ip: ip_address) -> IPState:
@@ -117,14 +196,18 @@ class IpDescriptorMap:
         """ return a list of IPs in state X """
         assert state in IPState, "unknown state %s" % state
 
-        return [ip_address(ip) for ip in self.ip_states[state]]
+        ips = [ip_address(ip) for ip in self.ip_states[state]]
+        if state == IPState.FREE:
+            for free_list in self._free_lists.values():
+                ips.extend(free_list)
+        return ips
 
     def mark_ip_state(self, ip: ip_address, state: IPState) -> IPDesc:
         """ Remove, mark, add: move IP to a new state """
         assert state in IPState, "unknown state %s" % state
 
         old_state = self.get_ip_state(ip)
-        ip_desc = self.ip_states[old_state][ip.exploded]
+        ip_desc = self._get_ip_desc(ip, old_state)
 
         # some internal checks
         assert ip_desc.state != state, \
@@ -156,4 +239,65 @@ class IpDescriptorMap:
             ret_str = ret_str + "\n{}".format(state)
             for _ip, ip_desc in self.ip_states[state].items():
                 ret_str = ret_str + "\n{}".format(str(ip_desc))
+            if state != IPState.FREE:
+                continue
+            for free_list in self._free_lists.values():
+                for ip in free_list:
+                    ip_desc = _make_free_ip_desc(ip, free_list.ip_block)
+                    ret_str = ret_str + "\n{}".format(str(ip_desc))
         return ret_str
+
+    def _get_ip_desc(self, ip: ip_address, state: IPState) -> IPDesc:
+        if state == IPState.FREE:
+            free_list = self._find_free_list(ip)
+            if free_list is not None and ip in free_list:
+                return _make_free_ip_desc(ip, free_list.ip_block)
+        return self.ip_states[state][ip.exploded]
+
+    def _get_free_list(self, ip_block: ip_network) -> IPBlockFreeList:
+        free_list = self._free_lists.get(ip_block)
+        if free_list is None:
+            free_list = IPBlockFreeList(ip_block, self._client)
+            self._free_lists[ip_block] = free_list
+            self._free_ip_blocks.add(ip_block)
+        return free_list
+
+    def _find_free_list(self, ip: ip_address) -> Optional[IPBlockFreeList]:
+        # There are only a handful of blocks, no need for a lookup structure
+        for ip_block, free_list in self._free_lists.items():
+            if ip in ip_block:
+                return free_list
+        return None
+
+    def _choose_free_list(self) -> Optional[IPBlockFreeList]:
+        """ Pick a block with free IPs, weighted by its number of free IPs """
+        total = sum(len(free_list) for free_list in self._free_lists.values())
+        if not total:
+            return None
+        index = randrange(total)
+        for free_list in self._free_lists.values():
+            if index < len(free_list):
+                return free_list
+            index -= len(free_list)
+        return None
+
+    def _migrate_free_ips(self):
+        """ Move FREE descriptors stored by older versions to free lists """
+        free_ips = self.ip_states[IPState.FREE]
+        for ip, ip_desc in list(free_ips.items()):
+            if _has_free_list(ip_desc):
+                self._get_free_list(ip_desc.ip_block).add(ip_desc.ip)
+                del free_ips[ip]
+
+
+def _has_free_list(ip_desc: IPDesc) -> bool:
+    """ Only FREE IPs that can be rebuilt from their block use free lists """
+    return ip_desc.type == IPType.IP_POOL and \
+        ip_desc.ip_block is not None and \
+        ip_desc.vlan_id == 0 and \
+        ip_desc.ip_block.num_addresses <= MAX_FREE_LIST_ADDRESSES
+
+
+def _make_free_ip_desc(ip: ip_address, ip_block: ip_network) -> IPDesc:
+    return IPDesc(ip=ip, state=IPState.FREE, sid=None, ip_block=ip_block,
+                  ip_type=IPType.IP_POOL)
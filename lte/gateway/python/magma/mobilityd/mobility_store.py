@@ -24,6 +24,9 @@ from magma.common.redis.client import get_default_client
 IPDESC_REDIS_TYPE = "mobilityd_ipdesc_record"
 IPSTATES_REDIS_TYPE = "mobilityd:ip_states:{}"
 IPBLOCKS_REDIS_TYPE = "mobilityd:assigned_ip_blocks"
+FREE_IPBLOCKS_REDIS_TYPE = "mobilityd:free_ip_blocks"
+FREE_IPS_REDIS_TYPE = "mobilityd:free_ips:{}"
+IP_TO_SID_REDIS_TYPE = "mobilityd:ip_to_sid"
 MAC_TO_IP_REDIS_TYPE = "mobilityd_mac_to_ip"
 DHCP_GW_INFO_REDIS_TYPE = "mobilityd_gw_info"
 
@@ -38,13 +41,24 @@ class AssignedIpBlocksSet(RedisSet):
         )
 
 
+class FreeIpBlocksSet(RedisSet):
+    """ IP blocks with a free IP bitmap, see IPBlockFreeList """
+    def __init__(self, client):
+        super().__init__(
+            client,
+            FREE_IPBLOCKS_REDIS_TYPE,
+            serialize_utils.serialize_ip_block,
+            serialize_utils.deserialize_ip_block,
+        )
+
+
 class IPDescDict(RedisFlatDict):
     def __init__(self, client):
         serde = RedisSerde(IPDESC_REDIS_TYPE,
                            serialize_utils.serialize_ip_desc,
                            serialize_utils.deserialize_ip_desc,
                            )
-        super().__init__(client, serde)
+        super().__init__(client, serde, indexed=True)
 
 
 def ip_states(client, key):
@@ -54,10 +68,22 @@ def ip_states(client, key):
         IPSTATES_REDIS_TYPE.format(key),
         serialize_utils.serialize_ip_desc,
         serialize_utils.deserialize_ip_desc,
+        local_cache=True,
     )
     return redis_dict
 
 
+def ip_to_sid(client):
+    """ Get Redis view of the IP to SID index. """
+    return RedisHashDict(
+        client,
+        IP_TO_SID_REDIS_TYPE,
+        get_json_serializer(),
+        get_json_deserializer(),
+        local_cache=True,
+    )
+
+
 class defaultdict_key(defaultdict):
     """
     Same as standard lib's defaultdict, but takes the key as a parameter.
@@ -170,6 +170,17 @@ class IPAllocatorTests(unittest.TestCase):
         self.assertIsNone(
             self._allocator.get_sid_for_ip(ipaddress.ip_address('1.1.1.1')))
 
+    def test_get_sid_for_recycled_ip(self):
+        """ Recycled and removed IPs are not mapped to their old sid """
+        self._new_ip_allocator(0)  # Immediately recycle
+        ip0, _ = self._allocator.alloc_ip_address('SID0')
+        ip1, _ = self._allocator.alloc_ip_address('SID1')
+        self._allocator.release_ip_address('SID0', ip0)
+        self.assertIsNone(self._allocator.get_sid_for_ip(ip0))
+
+        self._allocator.remove_ip_blocks(self._block, force=True)
+        self.assertIsNone(self._allocator.get_sid_for_ip(ip1))
+
     def test_allocate_allocate(self):
         """ Duplicated IP requests for the same UE returns same IP """
         ip0, _ = self._allocator.alloc_ip_address('SID0')
@@ -312,6 +323,25 @@ class IPAllocatorTests(unittest.TestCase):
         self.assertTrue(
             ip1 in self._allocator.list_allocated_ips(self._block))
 
+    def test_remove_keeps_other_blocks(self):
+        """ removing a block keeps the IPs allocated from other blocks """
+        block = ipaddress.ip_network('10.0.0.0/28')
+        self._allocator.add_ip_block(block)
+        sid_ips = {}
+        for i in range(6):
+            sid = 'SID%d' % i
+            sid_ips[sid], _ = self._allocator.alloc_ip_address(sid)
+
+        self.assertEqual(
+            {self._block},
+            self._allocator.remove_ip_blocks(self._block, force=True))
+        for sid, ip in sid_ips.items():
+            if ip in block:
+                self.assertEqual(sid, self._allocator.get_sid_for_ip(ip))
+                self.assertIn(ip, self._allocator.list_allocated_ips(block))
+            else:
+                self.assertIsNone(self._allocator.get_sid_for_ip(ip))
+
     def test_reap_after_forced_remove(self):
         """
         test reaping after a forced remove and readding the reaped ips doesn't
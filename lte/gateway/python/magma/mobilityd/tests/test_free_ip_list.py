@@ -0,0 +1,96 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+from ipaddress import ip_address, ip_network
+
+from magma.common.redis.mocks.mock_redis import MockRedis
+from magma.mobilityd.free_ip_list import IPBlockFreeList
+
+
+class IPBlockFreeListTests(unittest.TestCase):
+    def setUp(self):
+        self._block = ip_network('192.168.0.0/28')
+
+    def test_add_remove(self):
+        free_list = IPBlockFreeList(self._block)
+        for ip in self._block.hosts():
+            self.assertTrue(free_list.add(ip))
+        self.assertFalse(free_list.add(ip_address('192.168.0.1')))
+        self.assertEqual(14, len(free_list))
+
+        self.assertTrue(free_list.remove(ip_address('192.168.0.5')))
+        self.assertFalse(free_list.remove(ip_address('192.168.0.5')))
+        self.assertFalse(free_list.remove(ip_address('10.0.0.1')))
+        self.assertNotIn(ip_address('192.168.0.5'), free_list)
+        self.assertIn(ip_address('192.168.0.6'), free_list)
+        self.assertEqual(13, len(free_list))
+
+        with self.assertRaises(ValueError):
+            free_list.add(ip_address('10.0.0.1'))
+
+    def test_pop_random(self):
+        free_list = IPBlockFreeList(self._block)
+        for ip in self._block.hosts():
+            free_list.add(ip)
+
+        popped = {free_list.pop_random() for _ in range(14)}
+        self.assertEqual(set(self._block.hosts()), popped)
+        self.assertEqual(0, len(free_list))
+        with self.assertRaises(IndexError):
+            free_list.pop_random()
+
+    def test_persisted_bitmap(self):
+        client = MockRedis('localhost', 6379)
+        block = ip_network('10.10.0.0/24')
+        free_list = IPBlockFreeList(block, client)
+        for ip in block.hosts():
+            free_list.add(ip)
+        free_list.remove(ip_address('10.10.0.7'))
+        ip = free_list.pop_random()
+
+        loaded = IPBlockFreeList(block, client)
+        self.assertEqual(252, len(loaded))
+        self.assertEqual(set(free_list), set(loaded))
+        self.assertNotIn(ip, loaded)
+        self.assertNotIn(ip_address('10.10.0.7'), loaded)
+
+        loaded.delete()
+        self.assertEqual(0, len(IPBlockFreeList(block, client)))
+
+    def test_add_range(self):
+        client = MockRedis('localhost', 6379)
+        block = ip_network('10.20.0.0/16')
+        free_list = IPBlockFreeList(block, client)
+        self.assertEqual(65008, free_list.add_range(
+            ip_address('10.20.0.11'), ip_address('10.20.253.250')))
+        self.assertNotIn(ip_address('10.20.0.10'), free_list)
+        self.assertIn(ip_address('10.20.0.11'), free_list)
+        self.assertIn(ip_address('10.20.253.250'), free_list)
+        self.assertNotIn(ip_address('10.20.253.251'), free_list)
+
+        # Only the IPs that were not free yet are added
+        free_list.remove(ip_address('10.20.0.20'))
+        self.assertEqual(2, free_list.add_range(
+            ip_address('10.20.0.10'), ip_address('10.20.0.20')))
+        self.assertEqual(65009, len(free_list))
+
+        loaded = IPBlockFreeList(block, client)
+        self.assertEqual(set(free_list), set(loaded))
+        with self.assertRaises(ValueError):
+            free_list.add_range(ip_address('10.20.0.1'),
+                                ip_address('10.21.0.1'))
+
+
+if __name__ == "__main__":
+    unittest.main()
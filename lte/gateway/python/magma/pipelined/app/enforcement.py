@@ -256,6 +256,20 @@ class EnforcementController(PolicyMixin, MagmaController):
 
         return self._wait_for_rule_responses(imsi, rule, chan)
 
+    def _get_rule_install_msgs(self, imsi, ip_addr, apn_ambr, rule):
+        """
+        Get the flow mods installing a rule for a batched activation.
+        Redirection rules and rules without flows are left to
+        _install_flow_for_rule.
+        """
+        if rule.redirect.support == rule.redirect.ENABLED or \
+                not rule.flow_list:
+            return None
+        return self._get_rule_match_flow_msgs(imsi, ip_addr, apn_ambr, rule)
+
+    def _handle_failed_rule_install(self, imsi, rule):
+        self._deactivate_flow_for_rule(imsi, rule.id)
+
     def _wait_for_rule_responses(self, imsi, rule, chan):
         def fail(err):
             self.logger.error(
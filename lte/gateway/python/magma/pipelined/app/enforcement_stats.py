@@ -12,7 +12,6 @@ limitations under the License.
 """
 
 from typing import List
-from collections import defaultdict
 
 from lte.protos.pipelined_pb2 import RuleModResult
 from lte.protos.session_manager_pb2 import RuleRecord, \
@@ -34,6 +33,7 @@ from magma.pipelined.openflow.messages import MsgChannel, MessageHub
 
 from magma.pipelined.openflow.registers import Direction, DIRECTION_REG, \
     IMSI_REG, RULE_VERSION_REG, SCRATCH_REGS
+from magma.pipelined.usage_table import FlowUsageKey, RuleUsageTable
 
 
 ETH_FRAME_SIZE_BYTES = 14
@@ -75,9 +75,8 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
         self.sessiond = kwargs['rpc_stubs']['sessiond']
         self._msg_hub = MessageHub(self.logger)
         self.unhandled_stats_msgs = []  # Store multi-part responses from ovs
-        self.total_usage = {}  # Store total usage
-        # Store last usage excluding deleted flows for calculating deltas
-        self.last_usage_for_delta = {}
+        # Store per flow usage counters for calculating deltas
+        self._usage_table = RuleUsageTable()
         self.failed_usage = {}  # Store failed usage to retry rpc to sessiond
         self._unmatched_bytes = 0  # Store bytes matched by default rule if any
         self._clean_restart = kwargs['config']['clean_restart']
@@ -92,8 +91,7 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
         flows will have reset stat counters
         """
         self.unhandled_stats_msgs = []
-        self.total_usage = {}
-        self.last_usage_for_delta = {}
+        self._usage_table.clear()
         self.failed_usage = {}
         self._unmatched_bytes = 0
 
@@ -169,6 +167,9 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
 
         return RuleModResult.SUCCESS
 
+    def _get_rule_install_msgs(self, imsi, ip_addr, apn_ambr, rule):
+        return self._get_rule_match_flow_msgs(imsi, ip_addr, apn_ambr, rule)
+
     @set_ev_cls(ofp_event.EventOFPBarrierReply, MAIN_DISPATCHER)
     def _handle_barrier(self, ev):
         self._msg_hub.handle_barrier(ev)
@@ -247,7 +248,7 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
 
     def get_policy_usage(self, fut):
         record_table = RuleRecordTable(
-            records=self.total_usage.values(),
+            records=self._usage_table.get_totals().values(),
             epoch=global_epoch)
         fut.set_result(record_table)
 
@@ -302,28 +303,27 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
 
     def _handle_flow_stats(self, stats_msgs):
         """
-        Aggregate flow stats by rule, and report to session manager
+        Update the per flow usage counters, and report the usage deltas to
+        session manager
         """
         stat_count = sum(len(flow_stats) for flow_stats in stats_msgs)
         if stat_count == 0:
             return
 
         self.logger.debug("Processing %s stats responses", len(stats_msgs))
-        # Aggregate flows into rule records
-        current_usage = defaultdict(RuleRecord)
+        old_flow_stats = []
+        self._usage_table.begin_poll()
         for flow_stats in stats_msgs:
             self.logger.debug("Processing stats of %d flows", len(flow_stats))
             for stat in flow_stats:
                 if stat.table_id != self.tbl_num:
                     # this update is not intended for policy
                     return
-                current_usage = self._update_usage_from_flow_stat(
-                    current_usage, stat)
+                if self._update_usage_from_flow_stat(stat):
+                    old_flow_stats.append(stat)
 
-        # Calculate the delta values from last stat update
-        delta_usage = _delta_usage_maps(current_usage,
-                                        self.last_usage_for_delta)
-        self.total_usage = current_usage
+        # Only the flows that changed since the last poll are reported
+        delta_usage = self._usage_table.end_poll()
 
         # Append any records which we couldn't send to session manager earlier
         delta_usage = _merge_usage_maps(delta_usage, self.failed_usage)
@@ -333,7 +333,7 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
         # recognize when flows have ended
         self._report_usage(delta_usage)
 
-        self._delete_old_flows(stats_msgs)
+        self._delete_old_flows(old_flow_stats)
 
     def _report_usage(self, delta_usage):
         """
@@ -357,94 +357,76 @@ class EnforcementStatsController(PolicyMixin, MagmaController):
             self.failed_usage = _merge_usage_maps(
                 delta_usage, self.failed_usage)
 
-    def _update_usage_from_flow_stat(self, current_usage, flow_stat):
-        """
-        Update the rule record map with the flow stat and return the
-        updated map.
+    def _update_usage_from_flow_stat(self, flow_stat) -> bool:
         """
-        rule_id = self._get_rule_id(flow_stat)
-        # Rule not found, must be default flow
-        if rule_id == "":
-            default_flow_matched = \
-                flow_stat.cookie == self.DEFAULT_FLOW_COOKIE and \
-                flow_stat.byte_count != 0 and \
-                self._unmatched_bytes != flow_stat.byte_count
-            if default_flow_matched:
-                self.logger.error('%s bytes total not reported.',
-                                  flow_stat.byte_count)
-                self._unmatched_bytes = flow_stat.byte_count
-            return current_usage
-        # If this is a pass through app name flow ignore stats
-        if flow_stat.match[SCRATCH_REGS[1]] == IGNORE_STATS:
-            return current_usage
-        sid = _get_sid(flow_stat)
-
-        # use a compound key to separate flows for the same rule but for
-        # different subscribers
-        key = sid + "|" + rule_id
-        record = current_usage[key]
-        record.rule_id = rule_id
-        record.sid = sid
-        if flow_stat.match[DIRECTION_REG] == Direction.IN:
+        Update the usage counters of the flow in the usage table.
+
+        Returns:
+            True if the version of the flow is older than the current version
+            of the rule, and the flow should be deleted
+        """
+        # OFPMatch lookups rebuild a dict on every access, so build it once
+        match = dict(flow_stat.match.items())
+        key = FlowUsageKey(imsi=match.get(IMSI_REG),
+                           rule_num=flow_stat.cookie,
+                           version=match.get(RULE_VERSION_REG),
+                           direction=match.get(DIRECTION_REG))
+        # The sid and rule id are only resolved the first time a flow is seen
+        names = self._usage_table.get_names(key)
+        if names is None:
+            rule_id = self._get_rule_id(flow_stat)
+            # Rule not found, must be default flow
+            if rule_id == "":
+                default_flow_matched = \
+                    flow_stat.cookie == self.DEFAULT_FLOW_COOKIE and \
+                    flow_stat.byte_count != 0 and \
+                    self._unmatched_bytes != flow_stat.byte_count
+                if default_flow_matched:
+                    self.logger.error('%s bytes total not reported.',
+                                      flow_stat.byte_count)
+                    self._unmatched_bytes = flow_stat.byte_count
+                return False
+            sid = _get_sid(flow_stat)
+        else:
+            sid, rule_id = names
+
+        current_ver = \
+            self._session_rule_version_mapper.get_version(sid, rule_id)
+        is_old_flow = current_ver != key.version
+
+        if match.get(SCRATCH_REGS[1]) == IGNORE_STATS:
+            # If this is a pass through app name flow ignore stats
+            byte_count = 0
+        elif key.direction == Direction.IN:
             # HACK decrement byte count for downlink packets by the length
             # of an ethernet frame. Only IP and below should be counted towards
             # a user's data. Uplink does this already because the GTP port is
             # an L3 port.
-            record.bytes_rx += _get_downlink_byte_count(flow_stat)
+            byte_count = _get_downlink_byte_count(flow_stat)
         else:
-            record.bytes_tx += flow_stat.byte_count
-        current_usage[key] = record
-        return current_usage
+            byte_count = flow_stat.byte_count
+        self._usage_table.add(key, byte_count, sid, rule_id)
+        return is_old_flow
 
-    def _delete_old_flows(self, stats_msgs):
+    def _delete_old_flows(self, old_flow_stats):
         """
-        Check if the version of any flow is older than the current version. If
-        so, delete the flow and update last_usage_for_delta so we calculate the
-        correct usage delta for the next poll.
+        Delete the flows with a version older than the current version. The
+        usage counters of the deleted flows are dropped from the usage table
+        on the next poll, as the flows won't be part of it anymore.
         """
-        deleted_flow_usage = defaultdict(RuleRecord)
-        for deletable_stat in self._old_flow_stats(stats_msgs):
+        for deletable_stat in old_flow_stats:
             stat_rule_id = self._get_rule_id(deletable_stat)
             stat_sid = _get_sid(deletable_stat)
             rule_version = _get_version(deletable_stat)
 
             try:
                 self._delete_flow(deletable_stat, stat_sid, rule_version)
-                # Only remove the usage of the deleted flow if deletion
-                # is successful.
-                self._update_usage_from_flow_stat(deleted_flow_usage,
-                                                  deletable_stat)
             except MagmaOFError as e:
                 self.logger.error(
                     'Failed to delete rule %s for subscriber %s '
                     '(version: %s): %s', stat_rule_id,
                     stat_sid, rule_version, e)
 
-        self.last_usage_for_delta = _delta_usage_maps(self.total_usage,
-                                                      deleted_flow_usage)
-
-    def _old_flow_stats(self, stats_msgs):
-        """
-        Generator function to filter the flow stats that should be deleted from
-        the stats messages.
-        """
-        for flow_stats in stats_msgs:
-            for stat in flow_stats:
-                if stat.table_id != self.tbl_num:
-                    # this update is not intended for policy
-                    return
-
-                rule_id = self._get_rule_id(stat)
-                sid = _get_sid(stat)
-                rule_version = _get_version(stat)
-                if rule_id == "":
-                    continue
-
-                current_ver = \
-                    self._session_rule_version_mapper.get_version(sid, rule_id)
-                if current_ver != rule_version:
-                    yield stat
-
     def _delete_flow(self, flow_stat, sid, version):
         cookie, mask = (
             flow_stat.cookie, flows.OVS_COOKIE_MATCH_ALL)
@@ -481,34 +463,15 @@ def _generate_rule_match(imsi, rule_num, version, direction):
                       reg2=rule_num, rule_version=version)
 
 
-def _delta_usage_maps(current_usage, last_usage):
-    """
-    Calculate the delta between the 2 usage maps and returns a new
-    usage map.
-    """
-    if len(last_usage) == 0:
-        return current_usage
-    new_usage = {}
-    for key, current in current_usage.items():
-        last = last_usage.get(key, None)
-        if last is not None:
-            rec = RuleRecord()
-            rec.MergeFrom(current)  # copy metadata
-            rec.bytes_rx = current.bytes_rx - last.bytes_rx
-            rec.bytes_tx = current.bytes_tx - last.bytes_tx
-            new_usage[key] = rec
-        else:
-            new_usage[key] = current
-    return new_usage
-
-
 def _merge_usage_maps(current_usage, last_usage):
     """
-    Merge the usage records from 2 map into a single map
+    Merge the usage records from 2 map into a single map. As only the records
+    that changed are reported, records of the last map are kept even if they
+    are not in the current map.
     """
     if len(last_usage) == 0:
         return current_usage
-    new_usage = {}
+    new_usage = dict(last_usage)
     for key, current in current_usage.items():
         last = last_usage.get(key, None)
         if last is not None:
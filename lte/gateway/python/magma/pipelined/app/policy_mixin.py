@@ -10,6 +10,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import logging
 from typing import List
 from abc import ABCMeta, abstractmethod
 
@@ -17,6 +18,7 @@ from ryu.ofproto.ofproto_v1_4_parser import OFPFlowStats
 
 from lte.protos.pipelined_pb2 import RuleModResult, SetupFlowsResult, \
     ActivateFlowsResult, ActivateFlowsRequest
+from lte.protos.subscriberdb_pb2 import SubscriberID
 from magma.pipelined.app.base import ControllerNotReadyException
 from magma.pipelined.openflow import flows
 from magma.policydb.rule_store import PolicyRuleDict
@@ -64,7 +66,7 @@ class PolicyMixin(metaclass=ABCMeta):
                 return SetupFlowsResult.FAILURE
         try:
             startup_flows = \
-                self._startup_flow_controller.get_flows(self.tbl_num)
+                self._startup_flow_controller.get_flow_index(self.tbl_num)
         except ControllerNotReadyException as err:
             self.logger.error('Setup failed: %s', err)
             return SetupFlowsResult(result=SetupFlowsResult.FAILURE)
@@ -73,12 +75,17 @@ class PolicyMixin(metaclass=ABCMeta):
         remaining_flows = self._install_default_flows_if_not_installed(
             self._datapath, startup_flows)
 
-        self.logger.debug('Startup flows before filstering -> %s',
-            [flow.match for flow in startup_flows])
+        # Don't build the list of matches of every flow of the table unless
+        # it is logged
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Startup flows before filstering -> %s',
+                [flow.match for flow in startup_flows])
         extra_flows = self._add_missing_flows(requests, remaining_flows)
 
-        self.logger.debug('Startup flows after filtering will be deleted -> %s',
-            [flow.match for flow in startup_flows])
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                'Startup flows after filtering will be deleted -> %s',
+                [flow.match for flow in extra_flows])
         self._remove_extra_flows(extra_flows)
 
         # For now just reinsert redirection rules, this is a bit of a hack but
@@ -182,49 +189,119 @@ class PolicyMixin(metaclass=ABCMeta):
             static_rule_ids (string []): list of static rules to activate
             dynamic_rules (PolicyRule []): list of dynamic rules to activate
         """
+        return self.activate_rules_batch([ActivateFlowsRequest(
+            sid=SubscriberID(id=imsi),
+            ip_addr=ip_addr,
+            apn_ambr=apn_ambr,
+            rule_ids=static_rule_ids,
+            dynamic_rules=dynamic_rules,
+        )])[0]
+
+    def activate_rules_batch(self,
+                             requests: List[ActivateFlowsRequest]
+                             ) -> List[ActivateFlowsResult]:
+        """
+        Activate the flows for many subscribers at once. The flow mods of all
+        the rules are sent together and followed by a single barrier, errors
+        are mapped back to the rules by the xid of the failed flow mod. Rules
+        that the app doesn't install with flow mods are installed one by one.
+        During activation, a default flow may be installed for the
+        subscribers.
+
+        Args:
+            requests (ActivateFlowsRequest []): subscribers and rules to
+                activate
+        Returns:
+            The ActivateFlowsResult of every request, in the same order
+        """
         if self._datapath is None:
             self.logger.error('Datapath not initialized for adding flows')
-            return ActivateFlowsResult(
+            return [ActivateFlowsResult(
                 static_rule_results=[RuleModResult(
                     rule_id=rule_id,
                     result=RuleModResult.FAILURE,
-                ) for rule_id in static_rule_ids],
+                ) for rule_id in request.rule_ids],
                 dynamic_rule_results=[RuleModResult(
                     rule_id=rule.id,
                     result=RuleModResult.FAILURE,
-                ) for rule in dynamic_rules],
-            )
-        static_results = []
-        for rule_id in static_rule_ids:
-            res = self._install_flow_for_static_rule(imsi, ip_addr, apn_ambr, rule_id)
-            static_results.append(RuleModResult(rule_id=rule_id, result=res))
-        dyn_results = []
-        for rule in dynamic_rules:
-            res = self._install_flow_for_rule(imsi, ip_addr, apn_ambr, rule)
-            dyn_results.append(RuleModResult(rule_id=rule.id, result=res))
+                ) for rule in request.dynamic_rules],
+            ) for request in requests]
 
-        # Install a base flow for when no rule is matched.
-        self._install_default_flow_for_subscriber(imsi)
-        return ActivateFlowsResult(
-            static_rule_results=static_results,
-            dynamic_rule_results=dyn_results,
-        )
+        results = []
+        msg_list = []
+        # (imsi, rule, RuleModResult) of every message in msg_list
+        msg_rules = []
+        for request in requests:
+            result = ActivateFlowsResult()
+            for rule_id in request.rule_ids:
+                rule_result = result.static_rule_results.add(rule_id=rule_id)
+                rule = self._policy_dict[rule_id]
+                if rule is None:
+                    self.logger.error("Could not find rule for rule_id: %s",
+                                      rule_id)
+                    rule_result.result = RuleModResult.FAILURE
+                    continue
+                self._add_rule_msgs(request, rule, rule_result, msg_list,
+                                    msg_rules)
+            for rule in request.dynamic_rules:
+                rule_result = result.dynamic_rule_results.add(rule_id=rule.id)
+                self._add_rule_msgs(request, rule, rule_result, msg_list,
+                                    msg_rules)
 
-    def _install_flow_for_static_rule(self, imsi, ip_addr, apn_ambr, rule_id):
-        """
-        Install a flow to get stats for a particular static rule id. The rule
-        will be loaded from Redis and installed.
+            results.append(result)
 
-        Args:
-            imsi (string): subscriber to install rule for
-            ip_addr (string): subscriber session ipv4 address
-            rule_id (string): policy rule id
-        """
-        rule = self._policy_dict[rule_id]
-        if rule is None:
-            self.logger.error("Could not find rule for rule_id: %s", rule_id)
-            return RuleModResult.FAILURE
-        return self._install_flow_for_rule(imsi, ip_addr, apn_ambr, rule)
+        if msg_list:
+            self._wait_for_rule_batch_responses(msg_list, msg_rules)
+        # Install a base flow for when no rule is matched.
+        for request in requests:
+            self._install_default_flow_for_subscriber(request.sid.id)
+        return results
+
+    def _add_rule_msgs(self, request, rule, rule_result, msg_list,
+                       msg_rules):
+        imsi = request.sid.id
+        try:
+            flow_adds = self._get_rule_install_msgs(
+                imsi, request.ip_addr, request.apn_ambr, rule)
+        except FlowMatchError:
+            self.logger.error("Failed to verify rule_id %s for subscriber %s",
+                              rule.id, imsi)
+            rule_result.result = RuleModResult.FAILURE
+            return
+        if flow_adds is None:
+            rule_result.result = self._install_flow_for_rule(
+                imsi, request.ip_addr, request.apn_ambr, rule)
+            return
+        rule_result.result = RuleModResult.SUCCESS
+        msg_list.extend(flow_adds)
+        msg_rules.extend([(imsi, rule, rule_result)] * len(flow_adds))
+
+    def _wait_for_rule_batch_responses(self, msg_list, msg_rules):
+        def fail(imsi, rule, rule_result, err):
+            if rule_result.result == RuleModResult.FAILURE:
+                return
+            self.logger.error(
+                "Failed to install rule %s for subscriber %s: %s",
+                rule.id, imsi, err)
+            rule_result.result = RuleModResult.FAILURE
+            self._handle_failed_rule_install(imsi, rule)
+
+        chan = self._msg_hub.send(msg_list, self._datapath)
+        rules_by_xid = {msg.xid: msg_rule
+                        for msg, msg_rule in zip(msg_list, msg_rules)}
+        for _ in range(len(msg_list)):
+            try:
+                result = chan.get()
+            except MsgChannel.Timeout:
+                # The barrier didn't come back, none of the flows are known
+                # to be installed
+                for msg_rule in rules_by_xid.values():
+                    fail(*msg_rule, err="No response from OVS")
+                return
+            msg_rule = rules_by_xid.pop(result.xid)
+            if not result.ok():
+                fail(*msg_rule, err=result.exception())
+        self._msg_hub.release_channel(chan)
 
     def _wait_for_responses(self, chan, response_count):
         def fail(err):
@@ -238,6 +315,36 @@ class PolicyMixin(metaclass=ABCMeta):
                 return fail("No response from OVS policy mixin")
             if not result.ok():
                 return fail(result.exception())
+        self._msg_hub.release_channel(chan)
+
+    def _get_rule_install_msgs(self, imsi, ip_addr, apn_ambr, rule):
+        """
+        Get the flow mods installing a rule, so that activate_rules_batch can
+        send them with the flow mods of the other rules. Subclasses that
+        install their rules with flow mods should override this.
+
+        Args:
+            imsi (string): subscriber to install rule for
+            ip_addr (string): subscriber session ipv4 address
+            rule (PolicyRule): policy rule proto
+        Raises:
+            FlowMatchError: if the rule can't be converted to flow mods
+        Returns:
+            The flow mods, or None if the rule has to be installed with
+            _install_flow_for_rule
+        """
+        return None
+
+    def _handle_failed_rule_install(self, imsi, rule):
+        """
+        Called by activate_rules_batch when installing the flow mods of a rule
+        failed, to remove the ones that were installed.
+
+        Args:
+            imsi (string): subscriber id
+            rule (PolicyRule): policy rule proto
+        """
+        pass
 
     @abstractmethod
     def _install_flow_for_rule(self, imsi, ip_addr, apn_ambr, rule):
@@ -19,6 +19,7 @@ from ryu.ofproto.ofproto_v1_4 import OFPMPF_REPLY_MORE
 from magma.pipelined.app.base import ControllerNotReadyException, \
     MagmaController, ControllerType
 from magma.pipelined.openflow import messages
+from magma.pipelined.openflow.messages import FlowIndex
 from magma.pipelined.openflow.exceptions import MagmaOFError
 
 
@@ -45,6 +46,7 @@ class StartupFlows(MagmaController):
         self._datapath = None
         self._startup_flows = []
         self._table_flows = {}
+        self._flow_indexes = {}
         self._flows_received = False
         self._clean_restart = kwargs['config']['clean_restart']
         if self._clean_restart:
@@ -79,6 +81,20 @@ class StartupFlows(MagmaController):
         else:
             return []
 
+    def get_flow_index(self, tbl_num: int) -> FlowIndex:
+        """
+        Get the flows of the specified table number as a FlowIndex, built
+        on the first call for the table
+
+        Args:
+            tbl_num: int
+        """
+        flow_index = self._flow_indexes.get(tbl_num, None)
+        if flow_index is None:
+            flow_index = FlowIndex(self.get_flows(tbl_num))
+            self._flow_indexes[tbl_num] = flow_index
+        return flow_index
+
     def delete_all_flows(self, datapath):
         pass
 
@@ -92,6 +108,7 @@ class StartupFlows(MagmaController):
             if resp.table_id not in self._table_flows:
                 self._table_flows[resp.table_id] = []
             self._table_flows[resp.table_id].append(resp)
+            self._flow_indexes.pop(resp.table_id, None)
 
         # There will be more stats, we have to wait
         if ev.msg.flags == OFPMPF_REPLY_MORE:
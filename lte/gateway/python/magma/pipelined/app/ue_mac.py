@@ -10,6 +10,8 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import socket
+import struct
 import threading
 from typing import List
 
@@ -32,6 +34,25 @@ from magma.pipelined.openflow.exceptions import MagmaOFError
 from magma.pipelined.openflow.magma_match import MagmaMatch
 from magma.pipelined.openflow.registers import IMSI_REG, load_passthrough
 
+# Offsets of the fields of the DHCP packet-ins, for an untagged Ethernet
+# frame with an IPv4 header without options
+_IPV4_OFFSET = 14
+_UDP_OFFSET = _IPV4_OFFSET + 20
+_DHCP_OFFSET = _UDP_OFFSET + 8
+_DHCP_HLEN_OFFSET = _DHCP_OFFSET + 2
+_DHCP_YIADDR_OFFSET = _DHCP_OFFSET + 16
+_DHCP_CHADDR_OFFSET = _DHCP_OFFSET + 28
+_DHCP_MAGIC_COOKIE_OFFSET = _DHCP_OFFSET + 236
+_DHCP_OPTIONS_OFFSET = _DHCP_MAGIC_COOKIE_OFFSET + 4
+# Version 4 and a header length of 5 words
+_IPV4_VERSION_IHL = 0x45
+_IPV4_FRAG_MASK = 0x3fff
+_DHCP_MAGIC_COOKIE = b'\x63\x82\x53\x63'
+_DHCP_PAD_OPT = 0
+_DHCP_END_OPT = 255
+_MAC_ADDRESS_LEN = 6
+_SERVER_TO_CLIENT_PORTS = (67, 68)
+
 
 class UEMacAddressController(MagmaController):
     """
@@ -311,11 +332,19 @@ class UEMacAddressController(MagmaController):
             self.logger.error("Error obtaining IMSI from pkt-in: %s", e)
             return
 
-        pkt = packet.Packet(msg.data)
-        dhcp_header = pkt.get_protocols(dhcp.dhcp)[0]
+        dhcp_reply = _parse_dhcp_reply(msg.data)
+        if dhcp_reply is None:
+            dhcp_reply = _parse_dhcp_reply_with_ryu(msg.data)
+        if dhcp_reply is None:
+            self.logger.error("Error parsing DHCP packet-in for IMSI %s",
+                              imsi)
+            return
+        msg_type, yiaddr, chaddr = dhcp_reply
+        if msg_type != dhcp.DHCP_ACK:
+            return
         # DHCP yiaddr is the client(UE) ip addr
         #      chaddr is the client mac address
-        self.add_arp_response_flow(imsi, dhcp_header.yiaddr, dhcp_header.chaddr)
+        self.add_arp_response_flow(imsi, yiaddr, chaddr)
 
     def _install_default_flows(self):
         """
@@ -355,3 +384,76 @@ def _get_encoded_imsi_from_packetin(msg):
     if imsi is None:
         raise MagmaOFError('IMSI not found in OFPMatch')
     return imsi
+
+
+def _parse_dhcp_reply(data):
+    """
+    Read the message type, yiaddr and chaddr of a DHCP reply at the offsets
+    of the DHCP packet-ins, without parsing the other fields and headers.
+    They are returned as (message type, yiaddr text, chaddr text).
+
+    Returns None if the packet isn't a DHCP reply in an untagged Ethernet
+    frame with an IPv4 header without options and a message type option,
+    it has to go through _parse_dhcp_reply_with_ryu then.
+    """
+    if len(data) < _DHCP_OPTIONS_OFFSET:
+        return None
+    eth_type, = struct.unpack_from('!H', data, _IPV4_OFFSET - 2)
+    if eth_type != ether_types.ETH_TYPE_IP or \
+            data[_IPV4_OFFSET] != _IPV4_VERSION_IHL or \
+            data[_IPV4_OFFSET + 9] != IPPROTO_UDP:
+        return None
+    frag, = struct.unpack_from('!H', data, _IPV4_OFFSET + 6)
+    if frag & _IPV4_FRAG_MASK or \
+            struct.unpack_from('!HH', data, _UDP_OFFSET) != \
+            _SERVER_TO_CLIENT_PORTS or \
+            data[_DHCP_HLEN_OFFSET] != _MAC_ADDRESS_LEN or \
+            data[_DHCP_MAGIC_COOKIE_OFFSET:_DHCP_OPTIONS_OFFSET] != \
+            _DHCP_MAGIC_COOKIE:
+        return None
+
+    msg_type = _get_dhcp_msg_type(data, _DHCP_OPTIONS_OFFSET)
+    if msg_type is None:
+        # Could be in the overloaded sname or file fields
+        return None
+    yiaddr = socket.inet_ntoa(
+        data[_DHCP_YIADDR_OFFSET:_DHCP_YIADDR_OFFSET + 4])
+    chaddr = '%02x:%02x:%02x:%02x:%02x:%02x' % tuple(
+        data[_DHCP_CHADDR_OFFSET:_DHCP_CHADDR_OFFSET + _MAC_ADDRESS_LEN])
+    return msg_type, yiaddr, chaddr
+
+
+def _get_dhcp_msg_type(data, offset):
+    """
+    Find the DHCP message type option in the options starting at offset
+    """
+    end = len(data)
+    while offset < end:
+        tag = data[offset]
+        if tag == _DHCP_PAD_OPT:
+            offset += 1
+            continue
+        if tag == _DHCP_END_OPT or offset + 2 >= end:
+            return None
+        if tag == dhcp.DHCP_MESSAGE_TYPE_OPT:
+            return data[offset + 2]
+        offset += 2 + data[offset + 1]
+    return None
+
+
+def _parse_dhcp_reply_with_ryu(data):
+    """
+    Parse the packet with the Ryu packet library, for the encapsulations
+    _parse_dhcp_reply doesn't handle, such as VLAN tags or IPv4 options.
+    Returns None if the packet isn't a DHCP packet, and a message type of
+    None if it doesn't have the option.
+    """
+    dhcp_header = packet.Packet(data).get_protocol(dhcp.dhcp)
+    if dhcp_header is None:
+        return None
+    msg_type = None
+    if dhcp_header.options is not None:
+        for option in dhcp_header.options.option_list:
+            if option.tag == dhcp.DHCP_MESSAGE_TYPE_OPT:
+                msg_type = option.value[0]
+    return msg_type, dhcp_header.yiaddr, dhcp_header.chaddr
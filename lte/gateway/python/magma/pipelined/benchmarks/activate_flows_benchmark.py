@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Activates the rules of many subscribers in EnforcementStatsController and
+EnforcementController, as done for GX ActivateFlows requests, against a
+FakeDatapath. The datapath serializes the messages and answers every
+barrier after a simulated OVS round trip and per flow mod processing time.
+No OVS bridge or Redis is needed, the rule mappers are backed by plain
+dicts.
+
+Three ways of installing the rules are compared:
+    per-rule:       one barrier per rule and app, the previous ActivateFlows
+    per-subscriber: one barrier per subscriber and app, ActivateFlows
+    batch:          one barrier per batch of subscribers and app,
+                    ActivateFlowsBatch
+
+Usage:
+    python3 -m magma.pipelined.benchmarks.activate_flows_benchmark \
+        --subscribers 1000 --rules 20 --batch-size 100
+"""
+
+import argparse
+import ipaddress
+import logging
+import time
+
+from lte.protos.pipelined_pb2 import ActivateFlowsRequest, RuleModResult
+from lte.protos.policydb_pb2 import FlowDescription, FlowMatch, PolicyRule
+from lte.protos.subscriberdb_pb2 import SubscriberID
+
+from magma.pipelined.app.enforcement import EnforcementController
+from magma.pipelined.app.enforcement_stats import EnforcementStatsController
+from magma.pipelined.benchmarks.fake_datapath import FakeDatapath
+from magma.pipelined.openflow.messages import MessageHub
+from magma.pipelined.rule_mappers import SessionRuleToVersionMapper
+
+ENFORCEMENT_TABLE = 5
+ENFORCEMENT_STATS_TABLE = 6
+NEXT_TABLE = 7
+
+
+class RuleMapper(object):
+    """ RuleIDToNumMapper backed by plain dicts instead of Redis """
+
+    def __init__(self):
+        self._rule_nums = {}
+        self._rule_ids = {}
+
+    def get_or_create_rule_num(self, rule_id):
+        rule_num = self._rule_nums.get(rule_id)
+        if rule_num is None:
+            rule_num = len(self._rule_nums) + 1
+            self._rule_nums[rule_id] = rule_num
+            self._rule_ids[rule_num] = rule_id
+        return rule_num
+
+    def get_rule_num(self, rule_id):
+        return self._rule_nums[rule_id]
+
+    def get_rule_id(self, rule_num):
+        return self._rule_ids[rule_num]
+
+
+def create_version_mapper():
+    """ SessionRuleToVersionMapper backed by a plain dict """
+    version_mapper = SessionRuleToVersionMapper()
+    version_mapper._version_by_imsi_and_rule = {}
+    return version_mapper
+
+
+def create_controllers(datapath, rules, rule_mapper=None,
+                       version_mapper=None):
+    """
+    Create the controllers without starting the ryu apps, with only the
+    state used by the rule activation. The rule mappers are shared by the
+    controllers of a pipelined restart, as they are kept in Redis.
+    """
+    if rule_mapper is None:
+        rule_mapper = RuleMapper()
+    if version_mapper is None:
+        version_mapper = create_version_mapper()
+    policy_dict = {rule.id: rule for rule in rules}
+
+    stats = EnforcementStatsController.__new__(EnforcementStatsController)
+    stats.tbl_num = ENFORCEMENT_STATS_TABLE
+    stats.next_table = NEXT_TABLE
+
+    enforcement = EnforcementController.__new__(EnforcementController)
+    enforcement.tbl_num = ENFORCEMENT_TABLE
+    enforcement.next_main_table = NEXT_TABLE
+    enforcement._enforcement_stats_scratch = ENFORCEMENT_STATS_TABLE
+    enforcement._qos_mgr = None
+    enforcement._redirect_manager = None
+
+    for controller in (stats, enforcement):
+        controller.logger = logging.getLogger('activate_flows_benchmark')
+        controller._msg_hub = MessageHub(controller.logger)
+        controller._datapath = datapath
+        controller._rule_mapper = rule_mapper
+        controller._session_rule_version_mapper = version_mapper
+        controller._policy_dict = policy_dict
+        datapath.register_app(controller)
+    return stats, enforcement, version_mapper
+
+
+def create_rules(num_rules):
+    rules = []
+    for i in range(num_rules):
+        # Allow traffic to and from a different server for every rule
+        server = str(ipaddress.IPv4Address('10.0.0.1') + i)
+        rules.append(PolicyRule(
+            id='rule_%d' % i,
+            priority=i + 1,
+            flow_list=[
+                FlowDescription(match=FlowMatch(
+                    ipv4_dst=server, direction=FlowMatch.UPLINK)),
+                FlowDescription(match=FlowMatch(
+                    ipv4_src=server, direction=FlowMatch.DOWNLINK)),
+            ]))
+    return rules
+
+
+def create_requests(num_subscribers, rules):
+    return [ActivateFlowsRequest(
+        sid=SubscriberID(id='IMSI001010%09d' % sub),
+        ip_addr=str(ipaddress.IPv4Address('192.168.128.1') + sub),
+        rule_ids=[rule.id for rule in rules])
+        for sub in range(num_subscribers)]
+
+
+def _activate_per_rule(stats, enforcement, requests, _):
+    """ What ActivateFlows did before, a barrier for every rule and app """
+    results = []
+    for request in requests:
+        imsi = request.sid.id
+        for app in (stats, enforcement):
+            for rule_id in request.rule_ids:
+                results.append(app._install_flow_for_rule(
+                    imsi, request.ip_addr, request.apn_ambr,
+                    app._policy_dict[rule_id]))
+            app._install_default_flow_for_subscriber(imsi)
+    return results
+
+
+def _activate_batches(stats, enforcement, requests, batch_size):
+    results = []
+    for i in range(0, len(requests), batch_size):
+        batch = requests[i:i + batch_size]
+        for app in (stats, enforcement):
+            for activate_result in app.activate_rules_batch(batch):
+                results.extend(
+                    res.result for res in activate_result.static_rule_results)
+    return results
+
+
+MODES = [
+    ('per-rule', _activate_per_rule, None),
+    ('per-subscriber', _activate_batches, 1),
+    ('batch', _activate_batches, None),
+]
+
+
+def run(args):
+    rules = create_rules(args.rules)
+    requests = create_requests(args.subscribers, rules)
+    print('Activating %d rules with %d flows each for %d subscribers, '
+          '%.2f ms round trip, %d us per flow mod' % (
+              args.rules, len(rules[0].flow_list), args.subscribers,
+              args.rtt_ms, args.flow_mod_us))
+
+    for name, activate, batch_size in MODES:
+        datapath = FakeDatapath(args.rtt_ms / 1000, args.flow_mod_us / 1e6)
+        stats, enforcement, version_mapper = \
+            create_controllers(datapath, rules)
+        for request in requests:
+            for rule_id in request.rule_ids:
+                version_mapper.update_version(request.sid.id, rule_id)
+
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        results = activate(stats, enforcement, requests,
+                           batch_size or args.batch_size)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        failures = sum(1 for res in results if res != RuleModResult.SUCCESS)
+        print('%s: %.2f s, %.0f subscribers/s, %.1f s CPU, %d flow mods, '
+              '%d barriers, %d failed rules' % (
+                  name, elapsed, args.subscribers / elapsed, cpu,
+                  datapath.flow_mods, datapath.barriers, failures))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for the rule activation of pipelined',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=1000,
+                            help='Number of subscribers')
+    arg_parser.add_argument('--rules', type=int, default=20,
+                            help='Number of static rules per subscriber')
+    arg_parser.add_argument('--batch-size', type=int, default=100,
+                            help='Number of subscribers per batch')
+    arg_parser.add_argument('--rtt-ms', type=float, default=0.5,
+                            help='Round trip time of a barrier to OVS')
+    arg_parser.add_argument('--flow-mod-us', type=int, default=20,
+                            help='Time OVS takes to process a flow mod')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
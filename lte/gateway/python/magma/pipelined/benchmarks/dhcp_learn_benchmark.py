@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Replays the DHCP server packets of pcaps as packet-ins to the DHCP learning
+handler of UEMacAddressController, as during an association storm, and
+reports the packet-ins handled per second:
+
+    fast: the handler as is, reading the DHCP fields at fixed offsets and
+          parsing the other encapsulations with Ryu
+    ryu:  every packet parsed with the Ryu packet library, as before the
+          fast path
+
+The DHCP server packets are the UDP packets from port 67, they are the ones
+sent to the controller. The ARP flows aren't installed, only the learned
+entries are counted.
+
+Usage:
+    python3 -m magma.pipelined.benchmarks.dhcp_learn_benchmark \
+        --pcaps magma/pipelined/tests/pcaps/dhcp_learn.pcap --repeat 10000
+"""
+
+import argparse
+import glob
+import os
+import time
+from unittest.mock import patch
+
+from ryu.controller import ofp_event
+from ryu.lib import pcaplib
+from ryu.lib.packet import packet, udp
+from ryu.ofproto import ofproto_v1_4_parser
+
+from magma.pipelined.app import ue_mac
+from magma.pipelined.imsi import encode_imsi
+from magma.pipelined.openflow.registers import IMSI_REG
+
+PCAP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                        'tests', 'pcaps')
+DHCP_LEARN_TABLE = 201
+DHCP_SERVER_PORT = 67
+IMSI = 'IMSI001010000000013'
+
+
+class _Logger:
+    def error(self, *args):
+        pass
+
+    def debug(self, *args):
+        pass
+
+
+def _read_dhcp_replies(pcaps):
+    replies = []
+    skipped = 0
+    for pcap in pcaps:
+        with open(pcap, 'rb') as f:
+            for _, buf in pcaplib.Reader(f):
+                udp_header = packet.Packet(buf).get_protocol(udp.udp)
+                if udp_header is None or \
+                        udp_header.src_port != DHCP_SERVER_PORT:
+                    skipped += 1
+                    continue
+                replies.append(bytearray(buf))
+    return replies, skipped
+
+
+def _create_packet_ins(replies):
+    match = ofproto_v1_4_parser.OFPMatch(**{IMSI_REG: encode_imsi(IMSI)})
+    return [ofp_event.EventOFPPacketIn(ofproto_v1_4_parser.OFPPacketIn(
+        None, table_id=DHCP_LEARN_TABLE, match=match, data=data))
+            for data in replies]
+
+
+def _create_controller():
+    controller = ue_mac.UEMacAddressController.__new__(
+        ue_mac.UEMacAddressController)
+    controller.logger = _Logger()
+    controller._dhcp_learn_scratch = DHCP_LEARN_TABLE
+    controller.learned = 0
+
+    def _add_arp_response_flow(imsi, yiaddr, chaddr):
+        controller.learned += 1
+
+    controller.add_arp_response_flow = _add_arp_response_flow
+    return controller
+
+
+def _replay(events, repeat):
+    controller = _create_controller()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for ev in events:
+            controller._learn_arp_entry(ev)
+    return time.perf_counter() - start, controller.learned
+
+
+def run(args):
+    pcaps = args.pcaps or sorted(glob.glob(os.path.join(PCAP_DIR, '*cap')))
+    replies, skipped = _read_dhcp_replies(pcaps)
+    if not replies:
+        print('No DHCP server packets in %s' % ', '.join(pcaps))
+        return
+    fast_path = sum(1 for data in replies
+                    if ue_mac._parse_dhcp_reply(data) is not None)
+    print('%d DHCP server packets from %d pcaps, %d other packets skipped, '
+          '%d on the fast path, replayed %d times' % (
+              len(replies), len(pcaps), skipped, fast_path, args.repeat))
+
+    events = _create_packet_ins(replies)
+    num_packets = len(events) * args.repeat
+    for mode in args.modes:
+        if mode == 'ryu':
+            with patch.object(ue_mac, '_parse_dhcp_reply',
+                              return_value=None):
+                elapsed, learned = _replay(events, args.repeat)
+        else:
+            elapsed, learned = _replay(events, args.repeat)
+        print('%s: %.0f packet-ins/s, %.1f us per packet-in, %d learned' % (
+            mode, num_packets / elapsed, elapsed / num_packets * 1e6,
+            learned))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Replay benchmark of the DHCP learning packet-ins',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--pcaps', nargs='+',
+                            help='Pcaps to replay, all the pcaps of the '
+                                 'pipelined tests by default')
+    arg_parser.add_argument('--repeat', type=int, default=10000,
+                            help='Number of times the packets are replayed')
+    arg_parser.add_argument('--modes', nargs='+', choices=['fast', 'ryu'],
+                            default=['fast', 'ryu'],
+                            help='Parsing modes to benchmark')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
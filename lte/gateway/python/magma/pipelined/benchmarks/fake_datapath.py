@@ -0,0 +1,282 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import inspect
+import random
+import time
+from collections import defaultdict
+
+from ryu.controller import ofp_event
+from ryu.lib import hub
+from ryu.ofproto import ofproto_v1_4, ofproto_v1_4_parser
+from ryu.ofproto.ofproto_v1_4 import OFPMPF_REPLY_MORE
+
+from magma.pipelined.openflow.registers import IMSI_REG
+
+
+class FakeFlow:
+    """ Flow of a FakeDatapath table, with its stats counters """
+    __slots__ = ['table_id', 'priority', 'cookie', 'match', 'fields',
+                 'instructions', 'idle_timeout', 'hard_timeout', 'flags',
+                 'packet_count', 'byte_count', 'created']
+
+    def __init__(self, flow_mod, fields):
+        self.table_id = flow_mod.table_id
+        self.priority = flow_mod.priority
+        self.cookie = flow_mod.cookie
+        self.match = flow_mod.match
+        self.fields = fields
+        self.instructions = flow_mod.instructions
+        self.idle_timeout = flow_mod.idle_timeout
+        self.hard_timeout = flow_mod.hard_timeout
+        self.flags = flow_mod.flags
+        self.packet_count = 0
+        self.byte_count = 0
+        self.created = time.monotonic()
+
+    def matches(self, fields, cookie, cookie_mask):
+        """
+        Whether the flow is selected by a non strict match, which is
+        simplified to the flow having every field of the match with the same
+        value, wildcards and masks aren't interpreted
+        """
+        if self.cookie & cookie_mask != cookie & cookie_mask:
+            return False
+        for field, value in fields.items():
+            if self.fields.get(field) != value:
+                return False
+        return True
+
+    def to_stats(self):
+        duration = time.monotonic() - self.created
+        return ofproto_v1_4_parser.OFPFlowStats(
+            table_id=self.table_id,
+            duration_sec=int(duration),
+            duration_nsec=int(duration % 1 * 1e9),
+            priority=self.priority,
+            idle_timeout=self.idle_timeout,
+            hard_timeout=self.hard_timeout,
+            flags=self.flags,
+            importance=0,
+            cookie=self.cookie,
+            packet_count=self.packet_count,
+            byte_count=self.byte_count,
+            match=self.match,
+            instructions=self.instructions)
+
+
+class _FlowTable:
+    """
+    Flows of a table by priority and match, also indexed by the subscriber
+    IMSI so that the flows of a subscriber are found without a table scan
+    """
+
+    def __init__(self):
+        self.flows = {}
+        self._flows_by_imsi = defaultdict(dict)
+
+    def add(self, key, flow):
+        self.remove(key)
+        self.flows[key] = flow
+        imsi = flow.fields.get(IMSI_REG)
+        if imsi is not None:
+            self._flows_by_imsi[imsi][key] = flow
+
+    def remove(self, key):
+        flow = self.flows.pop(key, None)
+        if flow is None:
+            return
+        imsi = flow.fields.get(IMSI_REG)
+        if imsi is not None:
+            imsi_flows = self._flows_by_imsi[imsi]
+            del imsi_flows[key]
+            if not imsi_flows:
+                del self._flows_by_imsi[imsi]
+
+    def get_subscriber_flows(self):
+        for imsi_flows in self._flows_by_imsi.values():
+            yield from imsi_flows.values()
+
+    def select(self, fields, cookie, cookie_mask):
+        imsi = fields.get(IMSI_REG)
+        if imsi is None:
+            candidates = self.flows
+        else:
+            candidates = self._flows_by_imsi.get(imsi, {})
+        return [(key, flow) for key, flow in candidates.items()
+                if flow.matches(fields, cookie, cookie_mask)]
+
+
+class FakeDatapath:
+    """
+    In-process Ryu datapath standing in for an OVS bridge, for benchmarks
+    and tests that can't run OVS.
+
+    Flow mods are serialized, as Ryu does before sending them, and applied
+    to in-memory flow tables. Barriers and flow stats requests are answered
+    once OVS would have processed the flow mods sent before them: OVS
+    handles the messages one at a time, taking flow_mod_time per flow mod,
+    and every answer takes a further rtt. Flow stats are answered with
+    multipart replies of up to stats_per_reply flows, their counters are
+    advanced with add_traffic.
+
+    A fraction error_rate of the flow mods fail, they aren't applied and
+    are answered with an OFPErrorMsg before the next answer.
+
+    The answers are dispatched to the Ryu event handlers registered with
+    register_app, in a green thread as Ryu does.
+    """
+
+    def __init__(self, rtt=0.0005, flow_mod_time=0.00002,
+                 stats_per_reply=1000, error_rate=0.0, seed=1):
+        self.id = 1
+        self.ofproto = ofproto_v1_4
+        self.ofproto_parser = ofproto_v1_4_parser
+        self.xid = 0
+        self.rtt = rtt
+        self.flow_mod_time = flow_mod_time
+        self.stats_per_reply = stats_per_reply
+        self.error_rate = error_rate
+        self.flow_mods = 0
+        self.barriers = 0
+        self.stats_requests = 0
+        self.errors = 0
+        self._tables = defaultdict(_FlowTable)
+        self._handlers = defaultdict(list)
+        self._rng = random.Random(seed)
+        self._pending_flow_mods = 0
+        self._pending_errors = []
+        self._busy_until = 0
+
+    def register_handler(self, ev_cls, handler):
+        self._handlers[ev_cls].append(handler)
+
+    def register_app(self, app):
+        """ Register the event handlers of app, set with set_ev_cls """
+        for ev_cls, handler in _get_event_handlers(app):
+            self.register_handler(ev_cls, handler)
+
+    def unregister_app(self, app):
+        """ Stop sending events to app, as if it was disconnected """
+        for ev_cls, handler in _get_event_handlers(app):
+            self._handlers[ev_cls].remove(handler)
+
+    def get_flows(self, table_id):
+        return list(self._tables[table_id].flows.values())
+
+    def add_traffic(self, active_ratio, max_packets=100, packet_size=1400):
+        """
+        Add packets to the counters of a random subset of the flows of the
+        subscribers
+        """
+        for table in self._tables.values():
+            for flow in table.get_subscriber_flows():
+                if self._rng.random() >= active_ratio:
+                    continue
+                packets = self._rng.randint(1, max_packets)
+                flow.packet_count += packets
+                flow.byte_count += packets * packet_size
+
+    def set_xid(self, msg):
+        self.xid += 1
+        msg.set_xid(self.xid)
+        return self.xid
+
+    def send_msg(self, msg):
+        if msg.xid is None:
+            self.set_xid(msg)
+        msg.serialize()
+        if isinstance(msg, ofproto_v1_4_parser.OFPFlowMod):
+            self._handle_flow_mod(msg)
+        elif isinstance(msg, ofproto_v1_4_parser.OFPBarrierRequest):
+            self.barriers += 1
+            reply = ofproto_v1_4_parser.OFPBarrierReply(self)
+            reply.xid = msg.xid
+            self._reply([ofp_event.EventOFPBarrierReply(reply)])
+        elif isinstance(msg, ofproto_v1_4_parser.OFPFlowStatsRequest):
+            self.stats_requests += 1
+            self._reply(self._get_flow_stats_replies(msg))
+        return True
+
+    def _get_tables(self, table_id):
+        if table_id == ofproto_v1_4.OFPTT_ALL:
+            return [table for _, table in sorted(self._tables.items())]
+        return [self._tables[table_id]]
+
+    def _handle_flow_mod(self, msg):
+        self.flow_mods += 1
+        self._pending_flow_mods += 1
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            error = ofproto_v1_4_parser.OFPErrorMsg(
+                self, type_=ofproto_v1_4.OFPET_FLOW_MOD_FAILED,
+                code=ofproto_v1_4.OFPFMFC_TABLE_FULL, data=msg.buf[:64])
+            error.xid = msg.xid
+            self._pending_errors.append(ofp_event.EventOFPErrorMsg(error))
+            return
+
+        fields = dict(msg.match.items())
+        key = (msg.priority, frozenset(fields.items()))
+        if msg.command == ofproto_v1_4.OFPFC_ADD:
+            self._tables[msg.table_id].add(key, FakeFlow(msg, fields))
+            return
+        strict = msg.command in (ofproto_v1_4.OFPFC_MODIFY_STRICT,
+                                 ofproto_v1_4.OFPFC_DELETE_STRICT)
+        for table in self._get_tables(msg.table_id):
+            for flow_key, flow in table.select(fields, msg.cookie,
+                                               msg.cookie_mask):
+                if strict and flow_key != key:
+                    continue
+                if msg.command in (ofproto_v1_4.OFPFC_DELETE,
+                                   ofproto_v1_4.OFPFC_DELETE_STRICT):
+                    table.remove(flow_key)
+                else:
+                    flow.instructions = msg.instructions
+
+    def _get_flow_stats_replies(self, msg):
+        fields = dict(msg.match.items()) if msg.match is not None else {}
+        stats = [flow.to_stats()
+                 for table in self._get_tables(msg.table_id)
+                 for _, flow in table.select(fields, msg.cookie,
+                                             msg.cookie_mask)]
+        events = []
+        for i in range(0, max(len(stats), 1), self.stats_per_reply):
+            body = stats[i:i + self.stats_per_reply]
+            more = i + self.stats_per_reply < len(stats)
+            reply = ofproto_v1_4_parser.OFPFlowStatsReply(
+                self, body=body, flags=OFPMPF_REPLY_MORE if more else 0)
+            reply.xid = msg.xid
+            events.append(ofp_event.EventOFPFlowStatsReply(reply))
+        return events
+
+    def _reply(self, events):
+        now = time.monotonic()
+        self._busy_until = max(now, self._busy_until) + \
+            self._pending_flow_mods * self.flow_mod_time
+        self._pending_flow_mods = 0
+        # Errors are sent as soon as the failed flow mods are processed
+        events = self._pending_errors + events
+        self._pending_errors = []
+        hub.spawn_after(self._busy_until - now + self.rtt, self._dispatch,
+                        events)
+
+    def _dispatch(self, events):
+        for ev in events:
+            for handler in self._handlers[ev.__class__]:
+                handler(ev)
+
+
+def _get_event_handlers(app):
+    for _, method in inspect.getmembers(app, inspect.ismethod):
+        for ev_cls in getattr(method, 'callers', {}):
+            yield ev_cls, method
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Replays synthetic OFPFlowStats batches through
+EnforcementStatsController._handle_flow_stats and reports the time spent per
+poll. No OVS bridge, Redis or sessiond is needed, the rule mappers are backed
+by plain dicts and the sessiond report is replaced with an in-memory list.
+
+Usage:
+    python3 -m magma.pipelined.benchmarks.flow_stats_benchmark \
+        --subscribers 25000 --rules 2 --polls 10 --active-ratio 0.1
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from ryu.ofproto import ofproto_v1_4_parser as parser
+
+from magma.pipelined.app.enforcement_stats import EnforcementStatsController
+from magma.pipelined.imsi import encode_imsi
+from magma.pipelined.openflow.registers import Direction, DIRECTION_REG, \
+    IMSI_REG, RULE_VERSION_REG, SCRATCH_REGS
+from magma.pipelined.rule_mappers import SessionRuleToVersionMapper
+from magma.pipelined.usage_table import RuleUsageTable
+
+TABLE_NUM = 12
+RULE_VERSION = 1
+
+
+class _RuleMapper:
+    def __init__(self, num_rules):
+        self._rules_by_rule_num = {
+            num: 'rule_%d' % num for num in range(1, num_rules + 1)
+        }
+
+    def get_rule_id(self, rule_num):
+        return self._rules_by_rule_num[rule_num]
+
+
+def _create_version_mapper(num_subscribers, num_rules):
+    """ Version mapper backed by a plain dict instead of Redis """
+    mapper = SessionRuleToVersionMapper()
+    mapper._version_by_imsi_and_rule = {}
+    for sub in range(num_subscribers):
+        for rule_num in range(1, num_rules + 1):
+            mapper.update_version(_get_imsi(sub), 'rule_%d' % rule_num)
+    return mapper
+
+
+def _get_imsi(sub):
+    return 'IMSI001010%09d' % sub
+
+
+def _create_controller(num_subscribers, num_rules):
+    """
+    Create an EnforcementStatsController without starting the ryu app, with
+    only the state used by the stats handling path.
+    """
+    controller = EnforcementStatsController.__new__(EnforcementStatsController)
+    controller.tbl_num = TABLE_NUM
+    controller.logger = logging.getLogger('flow_stats_benchmark')
+    controller._usage_table = RuleUsageTable()
+    controller.failed_usage = {}
+    controller._unmatched_bytes = 0
+    controller._rule_mapper = _RuleMapper(num_rules)
+    controller._session_rule_version_mapper = \
+        _create_version_mapper(num_subscribers, num_rules)
+    controller.reported = []
+    controller._report_usage = controller.reported.append
+    controller._delete_old_flows = lambda _: None
+    return controller
+
+
+def _create_flow_stats(num_subscribers, num_rules):
+    flow_stats = []
+    for sub in range(num_subscribers):
+        imsi = encode_imsi(_get_imsi(sub))
+        for rule_num in range(1, num_rules + 1):
+            for direction in (Direction.IN, Direction.OUT):
+                match = parser.OFPMatch(**{
+                    IMSI_REG: imsi,
+                    DIRECTION_REG: direction.value,
+                    'reg2': rule_num,
+                    RULE_VERSION_REG: RULE_VERSION,
+                    SCRATCH_REGS[1]: 0,
+                })
+                flow_stats.append(parser.OFPFlowStats(
+                    table_id=TABLE_NUM, cookie=rule_num, packet_count=0,
+                    byte_count=0, match=match))
+    return flow_stats
+
+
+def _advance_counters(flow_stats, active_ratio):
+    """ Add traffic to a random subset of the flows """
+    num_active = int(len(flow_stats) * active_ratio)
+    for stat in random.sample(flow_stats, num_active):
+        packets = random.randint(1, 100)
+        stat.packet_count += packets
+        stat.byte_count += packets * 1400
+
+
+def _batch(flow_stats, batch_size):
+    """ Split the flows into multipart reply bodies """
+    return [flow_stats[i:i + batch_size]
+            for i in range(0, len(flow_stats), batch_size)]
+
+
+def run(args):
+    controller = _create_controller(args.subscribers, args.rules)
+    flow_stats = _create_flow_stats(args.subscribers, args.rules)
+    print('Replaying %d polls of %d flows (%d%% active per poll)' %
+          (args.polls, len(flow_stats), args.active_ratio * 100))
+
+    durations = []
+    for poll in range(args.polls + 1):
+        if poll > 0:
+            _advance_counters(flow_stats, args.active_ratio)
+        stats_msgs = _batch(flow_stats, args.batch_size)
+        start = time.perf_counter()
+        controller._handle_flow_stats(stats_msgs)
+        elapsed = time.perf_counter() - start
+        records = len(controller.reported[-1])
+        # The first poll populates the usage table, report it separately
+        if poll == 0:
+            print('Initial poll: %.1f ms, %d records' %
+                  (elapsed * 1000, records))
+            continue
+        durations.append(elapsed)
+        print('Poll %d: %.1f ms, %d records' %
+              (poll, elapsed * 1000, records))
+
+    durations.sort()
+    print('Average: %.1f ms, p50: %.1f ms, max: %.1f ms per poll' % (
+        sum(durations) / len(durations) * 1000,
+        durations[len(durations) // 2] * 1000,
+        durations[-1] * 1000))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for enforcement stats flow stats handling',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=25000,
+                            help='Number of subscribers')
+    arg_parser.add_argument('--rules', type=int, default=2,
+                            help='Number of rules per subscriber, every '
+                                 'rule installs one flow per direction')
+    arg_parser.add_argument('--polls', type=int, default=10,
+                            help='Number of stats polls to replay')
+    arg_parser.add_argument('--active-ratio', type=float, default=0.1,
+                            help='Ratio of flows with traffic per poll')
+    arg_parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of flows per multipart reply')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Restarts EnforcementStatsController and EnforcementController with tables
+of synthetic startup flows, as when pipelined restarts while OVS keeps its
+flows and sessiond sends the SetupPolicyFlows request. The startup flows are
+the flows of the rules of the subscribers in the request, except for a
+fraction of missing flows, and the flows of stale subscribers that aren't in
+the request anymore. The apps run against the fake ryu datapath of
+activate_flows_benchmark.
+
+The time spent reconciling the startup flows with the flows of the request
+(MessageHub.filter_msgs_if_not_in_flow_list) is reported separately from
+the restart time, which also includes building the flow messages.
+
+Usage:
+    python3 -m magma.pipelined.benchmarks.restart_benchmark \
+        --flows 100000 --rules 10
+"""
+
+import argparse
+import random
+import time
+
+from ryu.ofproto.ofproto_v1_4_parser import OFPFlowStats
+
+from magma.pipelined.app.startup_flows import StartupFlows
+from magma.pipelined.benchmarks.activate_flows_benchmark import \
+    create_controllers, create_requests, create_rules
+from magma.pipelined.benchmarks.fake_datapath import FakeDatapath
+
+
+def _get_startup_flows(app, requests, missing_ratio, rng):
+    startup_flows = []
+    for request in requests:
+        imsi = request.sid.id
+        msgs = []
+        for rule_id in request.rule_ids:
+            msgs.extend(app._get_rule_match_flow_msgs(
+                imsi, request.ip_addr, request.apn_ambr,
+                app._policy_dict[rule_id]))
+        default_msg = app._get_default_flow_msg_for_subscriber(imsi)
+        if default_msg:
+            msgs.append(default_msg)
+        for msg in msgs:
+            if rng.random() < missing_ratio:
+                continue
+            startup_flows.append(OFPFlowStats(
+                table_id=app.tbl_num, priority=msg.priority,
+                cookie=msg.cookie, match=msg.match))
+    # The flows of the subscribers are polled in no particular order
+    rng.shuffle(startup_flows)
+    return startup_flows
+
+
+def _timed(func, timings):
+    def _wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.append(time.perf_counter() - start)
+    return _wrapper
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    rules = create_rules(args.rules)
+    flows_per_subscriber = args.rules * len(rules[0].flow_list)
+    num_subscribers = max(args.flows // flows_per_subscriber, 1)
+    num_stale = int(num_subscribers * args.stale_ratio)
+    all_requests = create_requests(num_subscribers + num_stale, rules)
+    requests = all_requests[:num_subscribers]
+
+    datapath = FakeDatapath(args.rtt_ms / 1000, args.flow_mod_us / 1e6)
+    stats, enforcement, version_mapper = create_controllers(datapath, rules)
+    for request in all_requests:
+        for rule_id in request.rule_ids:
+            version_mapper.update_version(request.sid.id, rule_id)
+
+    startup_flow_controller = StartupFlows.__new__(StartupFlows)
+    startup_flow_controller._table_flows = {}
+    startup_flow_controller._flow_indexes = {}
+    startup_flow_controller._flows_received = True
+    for app in (stats, enforcement):
+        startup_flow_controller._table_flows[app.tbl_num] = \
+            _get_startup_flows(app, all_requests, args.missing_ratio, rng)
+
+    print('Restarting with %d subscribers of %d rules, %d stale subscribers, '
+          '%.1f%% of the flows missing' % (
+              num_subscribers, args.rules, num_stale,
+              args.missing_ratio * 100))
+    for app in (stats, enforcement):
+        app._clean_restart = False
+        app._startup_flow_controller = startup_flow_controller
+        app.init_finished = False
+        filter_timings = []
+        app._msg_hub.filter_msgs_if_not_in_flow_list = _timed(
+            app._msg_hub.filter_msgs_if_not_in_flow_list, filter_timings)
+        flow_mods = datapath.flow_mods
+
+        start = time.perf_counter()
+        app.handle_restart(requests)
+        elapsed = time.perf_counter() - start
+        print('%s: %d startup flows, restart %.2f s, reconciliation %.2f s, '
+              '%d flow mods sent' % (
+                  type(app).__name__,
+                  len(startup_flow_controller._table_flows[app.tbl_num]),
+                  elapsed, sum(filter_timings),
+                  datapath.flow_mods - flow_mods))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for the restart of the pipelined policy apps',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--flows', type=int, default=100000,
+                            help='Number of rule flows per table of the '
+                                 'subscribers in the restart request')
+    arg_parser.add_argument('--rules', type=int, default=10,
+                            help='Number of static rules per subscriber')
+    arg_parser.add_argument('--stale-ratio', type=float, default=0.05,
+                            help='Number of subscribers with startup flows '
+                                 'that are not in the request, relative to '
+                                 'the subscribers in the request')
+    arg_parser.add_argument('--missing-ratio', type=float, default=0.01,
+                            help='Ratio of the flows of the request missing '
+                                 'from the startup flows')
+    arg_parser.add_argument('--rtt-ms', type=float, default=0.5,
+                            help='Round trip time of a barrier to OVS')
+    arg_parser.add_argument('--flow-mod-us', type=int, default=20,
+                            help='Time OVS takes to process a flow mod')
+    arg_parser.add_argument('--seed', type=int, default=1,
+                            help='Seed of the missing flows')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+End to end benchmark of the policy RPCs of PipelinedRpcServicer, against
+the GY, enforcement, enforcement stats and startup flows controllers
+connected to a FakeDatapath. No OVS bridge, Redis, sessiond or root access
+is needed, so that it can run in CI.
+
+The RPCs are called from a pool of worker threads, as the gRPC server does,
+and the servicer schedules their handling in an event loop running its
+callbacks one at a time in a green thread, as the aioeventlet loop of
+pipelined does. The phases follow the life of the subscribers:
+
+    setup:      SetupPolicyFlows without subscribers, as on a first start
+    activate:   ActivateFlows for every subscriber
+    poll:       flow stats polls, with traffic on a fraction of the flows,
+                reported to a sessiond stub
+    usage:      GetPolicyUsage
+    restart:    SetupPolicyFlows with every subscriber, after a restart of
+                the controllers while the datapath keeps its flows
+    deactivate: DeactivateFlows for every subscriber
+
+The latency percentiles of the RPCs of every phase are reported. The
+DeactivateFlows RPCs return before their handling, the throughput of the
+phase counts until the loop handled them.
+
+Usage:
+    python3 -m magma.pipelined.benchmarks.rpc_benchmark \
+        --subscribers 1000 --rules 10 --workers 10
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from eventlet.hubs import trampoline
+from lte.protos.pipelined_pb2 import DeactivateFlowsRequest, \
+    RequestOriginType, RuleModResult, SetupPolicyRequest, SetupFlowsResult
+from ryu.lib import hub
+
+from magma.pipelined.app.base import global_epoch
+from magma.pipelined.app.gy import GYController
+from magma.pipelined.app.startup_flows import StartupFlows
+from magma.pipelined.benchmarks.activate_flows_benchmark import \
+    ENFORCEMENT_STATS_TABLE, NEXT_TABLE, RuleMapper, create_controllers, \
+    create_requests, create_rules, create_version_mapper
+from magma.pipelined.benchmarks.fake_datapath import FakeDatapath
+from magma.pipelined.openflow.messages import MessageHub
+from magma.pipelined.redirect import RedirectionManager
+from magma.pipelined.rpc_servicer import PipelinedRpcServicer
+from magma.pipelined.usage_table import RuleUsageTable
+
+GY_TABLE = 4
+REDIRECT_SCRATCH_TABLE = 20
+GY_REDIRECT_SCRATCH_TABLE = 21
+MAC_REWRITE_TABLE = 22
+BRIDGE_IP = '192.168.128.1'
+# Seconds to wait for the datapath to answer
+WAIT_TIMEOUT = 60
+
+
+class _GreenLoop:
+    """
+    Event loop running the callbacks scheduled from any thread one at a time
+    in a green thread, so that a callback waiting for the datapath holds
+    the callbacks after it, as with the aioeventlet loop of pipelined
+    """
+
+    def __init__(self):
+        self._callbacks = deque()
+        self._running = False
+        self._read_fd, self._write_fd = os.pipe()
+        self._thread = hub.spawn(self._run)
+
+    def call_soon_threadsafe(self, callback, *args):
+        self._callbacks.append((callback, args))
+        os.write(self._write_fd, b'\0')
+
+    def is_idle(self):
+        return not self._running and not self._callbacks
+
+    def _run(self):
+        while True:
+            trampoline(self._read_fd, read=True)
+            os.read(self._read_fd, 4096)
+            self._running = True
+            while self._callbacks:
+                callback, args = self._callbacks.popleft()
+                try:
+                    callback(*args)
+                except Exception:  # pylint: disable=broad-except
+                    logging.exception('Error in loop callback')
+            self._running = False
+
+
+class _ReportRuleStats:
+    """ ReportRuleStats of a sessiond stub, answering right away """
+
+    def __init__(self):
+        self.reports = 0
+        self.records = 0
+
+    def future(self, record_table, timeout):
+        self.reports += 1
+        self.records += len(record_table.records)
+        future = Future()
+        future.set_result(None)
+        return future
+
+
+class _SessiondStub:
+    def __init__(self):
+        self.ReportRuleStats = _ReportRuleStats()
+
+
+class _QosManager:
+    """ QosManager without QoS, the rules of the benchmark have none """
+
+    def remove_subscriber_qos(self, imsi, rule_num=-1):
+        pass
+
+
+class _ServiceManager:
+    def __init__(self, version_mapper):
+        self.session_rule_version_mapper = version_mapper
+
+    def is_app_enabled(self, app_name):
+        return True
+
+
+class _Context:
+    """ gRPC context, only records the status code """
+
+    def __init__(self):
+        self.code = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        pass
+
+
+def _create_gy_controller(datapath, rule_mapper, version_mapper, loop):
+    gy = GYController.__new__(GYController)
+    gy.tbl_num = GY_TABLE
+    gy.next_main_table = ENFORCEMENT_STATS_TABLE
+    gy.loop = loop
+    gy.logger = logging.getLogger('rpc_benchmark')
+    gy._msg_hub = MessageHub(gy.logger)
+    gy._datapath = datapath
+    gy._rule_mapper = rule_mapper
+    gy._session_rule_version_mapper = version_mapper
+    gy._policy_dict = {}
+    gy._redirect_scratch = GY_REDIRECT_SCRATCH_TABLE
+    gy._mac_rewr = MAC_REWRITE_TABLE
+    gy._redirect_manager = RedirectionManager(
+        BRIDGE_IP, gy.logger, GY_TABLE, NEXT_TABLE,
+        GY_REDIRECT_SCRATCH_TABLE, version_mapper)
+    return gy
+
+
+def _start_pipelined(datapath, rules, rule_mapper, version_mapper, loop,
+                     sessiond):
+    """
+    Create the controllers as pipelined does when it starts and connects to
+    the datapath, and the servicer calling them
+    """
+    stats, enforcement, _ = create_controllers(datapath, rules, rule_mapper,
+                                               version_mapper)
+    gy = _create_gy_controller(datapath, rule_mapper, version_mapper, loop)
+    datapath.register_app(gy)
+
+    startup_flows = StartupFlows.__new__(StartupFlows)
+    startup_flows.logger = logging.getLogger('rpc_benchmark')
+    startup_flows._datapath = datapath
+    startup_flows._msg_xid = None
+    startup_flows._table_flows = {}
+    startup_flows._flow_indexes = {}
+    startup_flows._flows_received = False
+    datapath.register_app(startup_flows)
+
+    stats.loop = loop
+    stats.sessiond = sessiond
+    stats._usage_table = RuleUsageTable()
+    stats.failed_usage = {}
+    stats._unmatched_bytes = 0
+    stats.unhandled_stats_msgs = []
+    enforcement.loop = loop
+    enforcement._qos_mgr = _QosManager()
+    enforcement._redirect_manager = RedirectionManager(
+        BRIDGE_IP, enforcement.logger, enforcement.tbl_num, NEXT_TABLE,
+        REDIRECT_SCRATCH_TABLE, version_mapper)
+    for app in (gy, enforcement, stats):
+        app.init_finished = False
+        app._clean_restart = False
+        app._startup_flow_controller = startup_flows
+
+    # StartupFlows polls the flows of the datapath once connected
+    startup_flows._poll_all_tables(datapath)
+    _wait_until(lambda: startup_flows._flows_received)
+
+    servicer = PipelinedRpcServicer(
+        loop, gy, enforcement, stats, None, None, None, None, None, None,
+        _ServiceManager(version_mapper))
+    return servicer, (gy, enforcement, stats, startup_flows)
+
+
+def _wait_until(condition):
+    """ Let the green threads run until condition is true """
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError('Timed out waiting for the datapath')
+        hub.sleep(0.001)
+
+
+def _percentile(values, ratio):
+    return values[min(int(len(values) * ratio), len(values) - 1)]
+
+
+def _run_rpcs(args, name, datapath, loop, rpcs):
+    """
+    Call the rpcs from a pool of worker threads and report their latency.
+    Every rpc returns its number of failures.
+    """
+    latencies = []
+    failures = []
+    done = []
+
+    def _call(rpc):
+        start = time.perf_counter()
+        try:
+            failures.append(rpc())
+        except Exception:  # pylint: disable=broad-except
+            logging.exception('Error calling %s', name)
+            failures.append(1)
+        latencies.append(time.perf_counter() - start)
+        done.append(True)
+
+    flow_mods, barriers = datapath.flow_mods, datapath.barriers
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for rpc in rpcs:
+            executor.submit(_call, rpc)
+        # The green threads of the loop and the datapath only run while
+        # this green thread sleeps
+        _wait_until(lambda: len(done) == len(rpcs) and loop.is_idle())
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print('%s: %d calls in %.2f s, %.0f calls/s, latency p50 %.2f ms, '
+          'p90 %.2f ms, p99 %.2f ms, max %.2f ms, %d failures, %d flow mods, '
+          '%d barriers' % (
+              name, len(rpcs), elapsed, len(rpcs) / elapsed,
+              _percentile(latencies, 0.5) * 1000,
+              _percentile(latencies, 0.9) * 1000,
+              _percentile(latencies, 0.99) * 1000, latencies[-1] * 1000,
+              sum(failures), datapath.flow_mods - flow_mods,
+              datapath.barriers - barriers))
+
+
+def _setup_flows_rpc(servicer, requests):
+    def _rpc():
+        context = _Context()
+        result = servicer.SetupPolicyFlows(
+            SetupPolicyRequest(requests=requests, epoch=global_epoch),
+            context)
+        return int(context.code is not None or
+                   result.result != SetupFlowsResult.SUCCESS)
+    return _rpc
+
+
+def _activate_flows_rpc(servicer, request):
+    def _rpc():
+        context = _Context()
+        result = servicer.ActivateFlows(request, context)
+        if context.code is not None:
+            return len(request.rule_ids)
+        return sum(1 for res in result.static_rule_results
+                   if res.result != RuleModResult.SUCCESS)
+    return _rpc
+
+
+def _deactivate_flows_rpc(servicer, request):
+    def _rpc():
+        context = _Context()
+        servicer.DeactivateFlows(request, context)
+        return int(context.code is not None)
+    return _rpc
+
+
+def _get_policy_usage_rpc(servicer):
+    def _rpc():
+        context = _Context()
+        servicer.GetPolicyUsage(None, context)
+        return int(context.code is not None)
+    return _rpc
+
+
+def _poll_stats(args, name, polls, datapath, loop, stats, sessiond):
+    durations = []
+    report_stats = sessiond.ReportRuleStats
+    records = report_stats.records
+    num_flows = len(datapath.get_flows(stats.tbl_num))
+    for _ in range(polls):
+        datapath.add_traffic(args.active_ratio)
+        reports = report_stats.reports
+        start = time.perf_counter()
+        stats._poll_stats(datapath)
+        _wait_until(lambda: report_stats.reports > reports and
+                    loop.is_idle())
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    print('%s: %d polls of %d flows, p50 %.2f ms, max %.2f ms, %d usage '
+          'records reported' % (
+              name, polls, num_flows,
+              _percentile(durations, 0.5) * 1000, durations[-1] * 1000,
+              report_stats.records - records))
+
+
+def run(args):
+    rules = create_rules(args.rules)
+    requests = create_requests(args.subscribers, rules)
+    for request in requests:
+        request.request_origin.type = RequestOriginType.GX
+    print('%d subscribers with %d rules, %d worker threads, %.2f ms round '
+          'trip, %d us per flow mod, %.1f%% of the flow mods failing' % (
+              args.subscribers, args.rules, args.workers, args.rtt_ms,
+              args.flow_mod_us, args.error_rate * 100))
+
+    datapath = FakeDatapath(args.rtt_ms / 1000, args.flow_mod_us / 1e6,
+                            error_rate=args.error_rate)
+    loop = _GreenLoop()
+    sessiond = _SessiondStub()
+    rule_mapper = RuleMapper()
+    version_mapper = create_version_mapper()
+
+    servicer, apps = _start_pipelined(datapath, rules, rule_mapper,
+                                      version_mapper, loop, sessiond)
+    _run_rpcs(args, 'setup', datapath, loop,
+              [_setup_flows_rpc(servicer, [])])
+    _run_rpcs(args, 'activate', datapath, loop,
+              [_activate_flows_rpc(servicer, request)
+               for request in requests])
+    _poll_stats(args, 'poll', args.polls, datapath, loop, apps[2], sessiond)
+    _run_rpcs(args, 'usage', datapath, loop,
+              [_get_policy_usage_rpc(servicer)
+               for _ in range(args.usage_requests)])
+
+    for app in apps:
+        datapath.unregister_app(app)
+    servicer, apps = _start_pipelined(datapath, rules, rule_mapper,
+                                      version_mapper, loop, sessiond)
+    _run_rpcs(args, 'restart', datapath, loop,
+              [_setup_flows_rpc(servicer, requests)])
+
+    _run_rpcs(args, 'deactivate', datapath, loop,
+              [_deactivate_flows_rpc(servicer, DeactivateFlowsRequest(
+                  sid=request.sid, request_origin=request.request_origin))
+               for request in requests])
+    # The stats flows of the deactivated rules are deleted once their last
+    # usage is reported
+    _poll_stats(args, 'cleanup', 1, datapath, loop, apps[2], sessiond)
+    print('%d flows left in the enforcement tables, %d flow mods failed' % (
+        sum(len(datapath.get_flows(app.tbl_num)) for app in apps[1:3]),
+        datapath.errors))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='End to end benchmark of the pipelined policy RPCs',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=1000,
+                            help='Number of subscribers')
+    arg_parser.add_argument('--rules', type=int, default=10,
+                            help='Number of static rules per subscriber')
+    arg_parser.add_argument('--workers', type=int, default=10,
+                            help='Number of RPC worker threads')
+    arg_parser.add_argument('--polls', type=int, default=5,
+                            help='Number of flow stats polls')
+    arg_parser.add_argument('--active-ratio', type=float, default=0.1,
+                            help='Ratio of flows with traffic per poll')
+    arg_parser.add_argument('--usage-requests', type=int, default=100,
+                            help='Number of GetPolicyUsage requests')
+    arg_parser.add_argument('--rtt-ms', type=float, default=0.5,
+                            help='Round trip time of a barrier to OVS')
+    arg_parser.add_argument('--flow-mod-us', type=int, default=20,
+                            help='Time OVS takes to process a flow mod')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Ratio of flow mods failing')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Creates and removes linux tc queues with the linux_tc and linux_tc_batch
+QoS implementations, and reports the queues per second. Half of the queues
+are APN AMBR queues and the other half bearer queues under them, on the
+two ends of a veth pair created for the benchmark. For linux_tc_batch the
+time includes waiting for the queued commands to complete, the time the
+callers of add_qos are blocked is reported separately.
+
+Needs to run as root, or as a user with sudo rights for tc and ip.
+
+Usage:
+    sudo python3 -m magma.pipelined.benchmarks.tc_benchmark --queues 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from lte.protos.policydb_pb2 import FlowMatch
+
+from magma.pipelined.qos.common import QosImplType
+from magma.pipelined.qos.qos_tc_impl import ROOT_QID, TCBatchManager, \
+    TCManager, TrafficClass, run_cmd
+from magma.pipelined.qos.types import QosInfo
+
+IMPLS = [
+    (QosImplType.LINUX_TC, TCManager),
+    (QosImplType.LINUX_TC_BATCH, TCBatchManager),
+]
+
+
+def _init_qdisc(intf):
+    # Same as TrafficClass.init_qdisc, veth interfaces have no speed
+    run_cmd([
+        "tc qdisc add dev {} root handle 1: htb".format(intf),
+        "tc class add dev {} parent 1: classid 1:{} htb rate 1000Mbit "
+        "ceil 1000Mbit".format(intf, hex(ROOT_QID)),
+    ])
+
+
+def _run_impl(args, impl_type, impl_cls):
+    config = {
+        'nat_iface': args.intf,
+        'enodeb_iface': args.intf + 'p',
+        'qos': {
+            'max_rate': 1000000000,
+            'linux_tc': {'min_idx': 2, 'max_idx': 65534},
+        },
+    }
+    for intf in (config['nat_iface'], config['enodeb_iface']):
+        _init_qdisc(intf)
+    tc_mgr = impl_cls(None, asyncio.new_event_loop(), config)
+    flush = getattr(tc_mgr, 'flush', lambda: 0)
+
+    queues = []
+    start = time.perf_counter()
+    for i in range(args.queues // 2):
+        d = FlowMatch.UPLINK if i % 2 == 0 else FlowMatch.DOWNLINK
+        ambr_qid = tc_mgr.add_qos(d, QosInfo(gbr=0, mbr=100000000))
+        qid = tc_mgr.add_qos(d, QosInfo(gbr=1000000, mbr=50000000),
+                             parent=ambr_qid)
+        # children are removed before their parent
+        queues.extend([(d, qid), (d, ambr_qid)])
+    add_blocked = time.perf_counter() - start
+    failed = flush()
+    add_elapsed = time.perf_counter() - start
+
+    num_classes = sum(len(TrafficClass.read_all_classes(intf))
+                      for intf in (config['nat_iface'],
+                                   config['enodeb_iface']))
+
+    start = time.perf_counter()
+    for d, qid in queues:
+        tc_mgr.remove_qos(qid, d)
+    remove_blocked = time.perf_counter() - start
+    failed += flush()
+    remove_elapsed = time.perf_counter() - start
+
+    print('%s: add %.0f queues/s (callers blocked %.2f s), remove %.0f '
+          'queues/s (callers blocked %.2f s), %d classes created, %d failed '
+          'batched commands' % (
+              impl_type.value, len(queues) / add_elapsed, add_blocked,
+              len(queues) / remove_elapsed, remove_blocked, num_classes,
+              failed))
+
+    for intf in (config['nat_iface'], config['enodeb_iface']):
+        run_cmd(["tc qdisc del dev {} root".format(intf)])
+
+
+def run(args):
+    if not args.show_errors:
+        # fq_codel and fw filters may not be available where the benchmark
+        # runs, their errors don't change the cost of the commands
+        logging.getLogger('pipelined.qos.qos_tc_impl').setLevel(
+            logging.CRITICAL)
+    run_cmd(["ip link add {intf} type veth peer name {intf}p".format(
+        intf=args.intf)])
+    try:
+        for impl_type, impl_cls in IMPLS:
+            _run_impl(args, impl_type, impl_cls)
+    finally:
+        run_cmd(["ip link del {}".format(args.intf)])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for the linux tc QoS implementations',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--queues', type=int, default=1000,
+                            help='Number of queues to create and remove')
+    arg_parser.add_argument('--intf', default='tcbench0',
+                            help='Name of the veth interface to create')
+    arg_parser.add_argument('--show-errors', action='store_true',
+                            help='Log the errors of the tc commands')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
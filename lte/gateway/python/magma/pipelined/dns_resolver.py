@@ -0,0 +1,118 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import time
+from collections import namedtuple
+
+import aiodns
+
+from magma.pipelined.metrics import REDIRECT_DNS_LOOKUPS
+
+DnsCacheEntry = namedtuple('DnsCacheEntry', ['ips', 'expiry', 'refresh_time'])
+
+
+class CachingDnsResolver:
+    """
+    CachingDnsResolver
+
+    Resolves the IPv4 addresses of host names with a single aiodns resolver,
+    and caches them for the TTL of the DNS answer.
+
+    Lookups of a host that isn't cached while a query for it is in flight
+    wait for that query instead of sending their own. Cached entries are
+    refreshed in the background once PREFETCH_RATIO of their TTL elapsed, so
+    lookups of hosts in use keep hitting the cache. Expired entries are
+    still returned for up to STALE_SECS while a query refreshes them, and
+    are kept if the query fails.
+    """
+    PREFETCH_RATIO = 0.8
+    STALE_SECS = 300
+
+    def __init__(self, logger, timeout):
+        self.logger = logger
+        self._timeout = timeout
+        self._resolver = None
+        self._cache = {}
+        # Callbacks waiting for the query in flight, by host
+        self._waiters = {}
+
+    def add_entry(self, host, ips, ttl):
+        """
+        Cache the addresses of a host for ttl seconds
+        """
+        now = time.monotonic()
+        self._cache[host] = DnsCacheEntry(
+            ips=ips, expiry=now + ttl,
+            refresh_time=now + ttl * self.PREFETCH_RATIO)
+
+    def resolve(self, loop, host, callback):
+        """
+        Call callback with the list of IPv4 addresses of host, right away if
+        they are cached and otherwise once the DNS query completes. callback
+        isn't called if the query fails and nothing is cached.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(host)
+        if entry is not None and now < entry.expiry + self.STALE_SECS:
+            if now < entry.expiry:
+                REDIRECT_DNS_LOOKUPS.labels(result='hit').inc()
+                self.logger.debug(
+                    "DNS cache hit for %s, entry expires in %d sec", host,
+                    entry.expiry - now)
+            else:
+                REDIRECT_DNS_LOOKUPS.labels(result='stale').inc()
+            if now >= entry.refresh_time:
+                self._query(loop, host)
+            callback(entry.ips)
+            return
+
+        if host in self._waiters:
+            REDIRECT_DNS_LOOKUPS.labels(result='coalesced').inc()
+        else:
+            REDIRECT_DNS_LOOKUPS.labels(result='miss').inc()
+        self._query(loop, host, callback)
+
+    def _query(self, loop, host, callback=None):
+        waiters = self._waiters.get(host)
+        if waiters is not None:
+            if callback is not None:
+                waiters.append(callback)
+            return
+        self._waiters[host] = [callback] if callback is not None else []
+
+        if self._resolver is None:
+            self._resolver = aiodns.DNSResolver(timeout=self._timeout,
+                                                loop=loop)
+        query = self._resolver.query(host, 'A')
+        asyncio.ensure_future(query, loop=loop).add_done_callback(
+            lambda fut: self._query_done(host, fut))
+
+    def _query_done(self, host, dns_resolve_future):
+        waiters = self._waiters.pop(host, [])
+        try:
+            result = dns_resolve_future.result()
+            ips = [entry.host for entry in result]
+            ttl = min(entry.ttl for entry in result)
+        except (aiodns.error.DNSError, ValueError) as err:
+            # A stale entry, if any, is kept for the next lookups
+            self.logger.error("Error: ip lookup for %s: %s", host, err)
+            return
+
+        self.add_entry(host, ips, ttl)
+        for callback in waiters:
+            try:
+                callback(ips)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Error handling the addresses of %s",
+                                      host)
@@ -11,7 +11,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from prometheus_client import Counter, Gauge
+from prometheus_client import Counter, Gauge, Histogram
 
 
 DP_SEND_MSG_ERROR = Counter('dp_send_msg_error',
@@ -48,3 +48,31 @@ NETWORK_IFACE_STATUS = Gauge(
     'Status of a network interface required for data pipeline',
     ['iface_name'],
 )
+
+OVS_BARRIERS_IN_FLIGHT = Gauge(
+    'ovs_barriers_in_flight',
+    'Number of barrier requests sent to OVS and not answered yet, by switch',
+    ['datapath_id'],
+)
+
+OVS_BARRIER_RTT_MS = Histogram(
+    'ovs_barrier_rtt_ms',
+    'Time for OVS to answer a barrier request in milliseconds, by switch',
+    ['datapath_id'],
+    buckets=[1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000],
+)
+
+OVS_BARRIER_TIMEOUTS = Counter(
+    'ovs_barrier_timeouts',
+    'Number of barrier requests to OVS that were not answered before their '
+    'timeout, by switch',
+    ['datapath_id'],
+)
+
+REDIRECT_DNS_LOOKUPS = Counter(
+    'redirect_dns_lookups',
+    'Number of DNS lookups of redirection server hosts, by result: hit, '
+    'stale (expired entry used while it is refreshed), coalesced (waits for '
+    'a query in flight) or miss',
+    ['result'],
+)
@@ -11,7 +11,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import logging
-from typing import Any, List, Optional
+import math
+import time
+from typing import Any, Callable, List, Optional
 
 # there's a cyclic dependency in ryu
 import ryu.base.app_manager  # pylint: disable=unused-import
@@ -20,11 +22,18 @@ from ryu.lib import hub
 from ryu.ofproto.ofproto_parser import MsgBase
 
 from magma.pipelined.openflow.exceptions import MagmaOFError
-from magma.pipelined.metrics import DP_SEND_MSG_ERROR
+from magma.pipelined.metrics import DP_SEND_MSG_ERROR, \
+    OVS_BARRIERS_IN_FLIGHT, OVS_BARRIER_RTT_MS, OVS_BARRIER_TIMEOUTS
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_SEC = 10
+# Resolution of the request timeouts, and number of ticks of the timer wheel
+# that expires them. A turn of the wheel covers the default timeout.
+TIMEOUT_TICK_SEC = 0.1
+TIMEOUT_WHEEL_SLOTS = 128
+# Maximum number of released channels kept for reuse by a MessageHub
+MAX_FREE_CHANNELS = 64
 
 
 def send_msg(datapath, msg, retries=3):
@@ -68,13 +77,15 @@ class MsgReply(object):
     """
 
     def __init__(self, txn_id: Any,
-                 exception: Optional[Exception] = None) -> None:
+                 exception: Optional[Exception] = None,
+                 xid: Optional[int] = None) -> None:
         """
-        Create a reply marked by the transaction id. If an error occurs,
-        include an exception
+        Create a reply marked by the transaction id and the xid of the
+        message. If an error occurs, include an exception
         """
         self._exception = exception
         self.txn_id = txn_id
+        self.xid = xid
 
     def ok(self) -> bool:
         """
@@ -97,6 +108,8 @@ class MsgChannel(object):
 
     def __init__(self) -> None:
         self._queue = hub.Queue()
+        # Requests sent with this channel that aren't answered or expired
+        self.pending_requests = 0
 
     def get(self, timeout: int=DEFAULT_TIMEOUT_SEC) -> MsgReply:
         try:
@@ -107,6 +120,144 @@ class MsgChannel(object):
     def put(self, reply: MsgReply) -> None:
         self._queue.put(reply)
 
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+
+class TimerWheel(object):
+    """
+    Hashed timing wheel expiring keys after a timeout. The keys of a slot
+    are checked together once per tick by a single green thread, which only
+    runs while keys are pending, instead of a timer thread per key. Keys
+    with timeouts longer than a turn of the wheel stay in their slot for the
+    needed number of turns. Timeouts are rounded up to the next tick.
+    """
+
+    def __init__(self, tick_sec: float, num_slots: int,
+                 on_expire: Callable[[Any], None]) -> None:
+        self._tick_sec = tick_sec
+        # Remaining turns of the keys of every slot
+        self._slots = [{} for _ in range(num_slots)]
+        self._slot_by_key = {}
+        self._current = 0
+        self._on_expire = on_expire
+        self._thread = None
+
+    def add(self, key: Any, timeout_sec: float) -> None:
+        ticks = max(int(math.ceil(timeout_sec / self._tick_sec)), 1)
+        if self._thread is not None:
+            # Part of the current tick already elapsed
+            ticks += 1
+        num_slots = len(self._slots)
+        slot = (self._current + ticks) % num_slots
+        self._slots[slot][key] = (ticks - 1) // num_slots
+        self._slot_by_key[key] = slot
+        if self._thread is None:
+            self._thread = hub.spawn(self._run)
+
+    def remove(self, key: Any) -> None:
+        slot = self._slot_by_key.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def __len__(self) -> int:
+        return len(self._slot_by_key)
+
+    def _run(self):
+        while self._slot_by_key:
+            hub.sleep(self._tick_sec)
+            self._current = (self._current + 1) % len(self._slots)
+            slot = self._slots[self._current]
+            expired = []
+            for key, turns in slot.items():
+                if turns:
+                    slot[key] = turns - 1
+                else:
+                    expired.append(key)
+            for key in expired:
+                del slot[key]
+                del self._slot_by_key[key]
+            for key in expired:
+                try:
+                    self._on_expire(key)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('Error expiring %s', key)
+        self._thread = None
+
+
+def _get_flow_key(flow):
+    """
+    Flows and flow messages are compared based on
+     - cookie(Policy number)
+     - metadata(Subscriber IMSI)
+     - reg1(Direction)
+     - reg2(Rule number)
+     - reg4(Policy version number)
+    """
+    match = flow.match
+    return (flow.cookie, match.get('metadata', None), match.get('reg1', None),
+            match.get('reg2', None), match.get('reg4', None))
+
+
+class FlowIndex(object):
+    """
+    Multiset of the flows of a table, such as the startup flows, indexed to
+    find the flow of a flow message in constant time. Flows with the same
+    key are matched in the order of the flow list.
+
+    A FlowIndex is never modified, matching messages returns a new FlowIndex
+    without the matched flows that shares the index with the original one.
+    The index of a table can therefore be built once and used by every
+    controller and call that reconciles the flows of the table.
+    """
+
+    def __init__(self, flow_list) -> None:
+        self._flows = flow_list
+        self._keys = []
+        # Position of every flow among the flows with the same key
+        self._ranks = []
+        self._counts = {}
+        for flow in flow_list:
+            key = _get_flow_key(flow)
+            rank = self._counts.get(key, 0)
+            self._counts[key] = rank + 1
+            self._keys.append(key)
+            self._ranks.append(rank)
+        # Number of flows of every key matched so far, always the first ones
+        self._matched = {}
+        self._len = len(flow_list)
+
+    def match_msgs(self, msg_list: List[MsgBase]):
+        """
+        Returns a list of the messages without a flow in the index, and a
+        FlowIndex of the flows not matched by any message
+        """
+        msgs_to_send = []
+        matched = self._matched.copy()
+        num_matched = 0
+        for msg in msg_list:
+            key = _get_flow_key(msg)
+            count = matched.get(key, 0)
+            if count < self._counts.get(key, 0):
+                matched[key] = count + 1
+                num_matched += 1
+            else:
+                msgs_to_send.append(msg)
+        remaining = FlowIndex.__new__(FlowIndex)
+        remaining.__dict__.update(self.__dict__)
+        remaining._matched = matched
+        remaining._len = self._len - num_matched
+        return msgs_to_send, remaining
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        matched = self._matched
+        for flow, key, rank in zip(self._flows, self._keys, self._ranks):
+            if rank >= matched.get(key, 0):
+                yield flow
+
 
 class MessageHub(object):
     """
@@ -122,6 +273,7 @@ class MessageHub(object):
     """
     def __init__(self, msg_hub_logger):
         self._switches = {}
+        self._free_channels = []
         self.logger = msg_hub_logger
 
     def send(self,
@@ -141,19 +293,23 @@ class MessageHub(object):
                 (does not have to be unique)
             timeout: time before ignoring request
             channel: optional channel to use for the result. If it's not
-                specified, one is created
+                specified, a released one is reused or one is created
         Returns:
-            The channel passed in or the one created if it wasn't passed
+            The channel passed in or the one used if it wasn't passed
         """
         switch = self._switches.get(datapath.id, None)
 
         if switch is None:
             # new switch to track
-            switch = self._SwitchInfo()
+            switch = self._SwitchInfo(datapath.id, self._handle_timeout)
             self._switches[datapath.id] = switch
 
         if channel is None:
-            channel = MsgChannel()
+            if self._free_channels:
+                channel = self._free_channels.pop()
+            else:
+                channel = MsgChannel()
+        channel.pending_requests += 1
 
         # set xids in all msgs
         msg_xids = [datapath.set_xid(msg) for msg in msg_list]
@@ -167,25 +323,34 @@ class MessageHub(object):
             switch.results_by_msg[msg.xid] = None
             datapath.send_msg(msg)
         datapath.send_msg(barrier)
-        req.set_timeout(timeout, switch, barrier.xid, msg_xids)
+        req.sent_time = time.monotonic()
+        switch.timeouts.add(barrier.xid, timeout)
+        switch.barriers_in_flight.inc()
         return channel
 
+    def release_channel(self, channel: MsgChannel) -> None:
+        """
+        Give back a channel returned by send once all the replies were read
+        from it, so that a later send can reuse it. Channels with requests
+        that weren't answered yet or with unread replies are not reused.
+        """
+        if channel.pending_requests or not channel.empty():
+            return
+        if len(self._free_channels) < MAX_FREE_CHANNELS:
+            self._free_channels.append(channel)
+
     def filter_msgs_if_not_in_flow_list(self,
                                         msg_list: List[MsgBase],
                                         flow_list):
         """
         Returns a list of messages not found in the provided flow_list, also
-        returns a list of remaining flows(not found in the msg_list)
+        returns the remaining flows(not found in the msg_list) as a FlowIndex.
+        flow_list can be a list of flows or a FlowIndex, such as the one
+        returned by a previous call.
         """
-        msgs_to_send = []
-        remaining_flows = flow_list.copy()
-        for msg in msg_list:
-            index = self._get_msg_index_in_flow_list(msg, remaining_flows)
-            if index >= 0:
-                remaining_flows.pop(index)
-            else:
-                msgs_to_send.append(msg)
-        return msgs_to_send, remaining_flows
+        if not isinstance(flow_list, FlowIndex):
+            flow_list = FlowIndex(flow_list)
+        return flow_list.match_msgs(msg_list)
 
     @staticmethod
     def _respond(request, reply):
@@ -208,12 +373,17 @@ class MessageHub(object):
         if req is None:
             # could be from a different application
             return
-        req.cancel_timeout()
+        switch.timeouts.remove(msg.xid)
+        switch.barriers_in_flight.dec()
+        switch.barrier_rtt_ms.observe(
+            (time.monotonic() - req.sent_time) * 1000)
+        if req.channel is not None:
+            req.channel.pending_requests -= 1
         for xid in req.msg_xids:
             e = switch.results_by_msg.pop(xid, None)
             MessageHub._respond(
                 req,
-                MsgReply(txn_id=req.txn_id, exception=e),
+                MsgReply(txn_id=req.txn_id, exception=e, xid=xid),
             )
 
     def handle_error(self, ev):
@@ -232,56 +402,38 @@ class MessageHub(object):
         # for now, result is unused. Just return if there's an exception
         switch.results_by_msg[msg.xid] = MagmaOFError(ev.msg)
 
-    def _flow_matches_flowmsg(self, flow, msg):
+    @staticmethod
+    def _handle_timeout(switch, barrier_xid):
         """
-        Compare the flow and flow message based on
-         - cookie(Policy number)
-         - metadata(Subscriber IMSI)
-         - reg4(Policy version number)
+        Clear up any state associated with a request that wasn't answered
         """
-        return flow.cookie == msg.cookie and\
-               flow.match.get('metadata', None) == msg.match.get('metadata', None) and\
-               flow.match.get('reg1', None) == msg.match.get('reg1', None) and\
-               flow.match.get('reg2', None) == msg.match.get('reg2', None) and\
-               flow.match.get('reg4', None) == msg.match.get('reg4', None)
-
-    def _get_msg_index_in_flow_list(self, msg, flow_list):
-        for i in range(len(flow_list)):
-            if self._flow_matches_flowmsg(msg, flow_list[i]):
-                return i
-        return -1
+        req = switch.requests_by_barrier.pop(barrier_xid, None)
+        if req is None:
+            return
+        for xid in req.msg_xids:
+            switch.results_by_msg.pop(xid, None)
+        if req.channel is not None:
+            req.channel.pending_requests -= 1
+        switch.barriers_in_flight.dec()
+        switch.barrier_timeouts.inc()
 
     class _MsgRequest(object):
         def __init__(self, txn_id, msg_xids, channel=None):
             self.txn_id = txn_id
             self.msg_xids = msg_xids
             self.channel = channel
-            self._timeout_thread = None
-
-        def set_timeout(self, timeout_sec, switch, barrier_xid, msg_xids):
-            """
-            Spawn a timeout handler after timeout_sec seconds to clear up any
-            associated state with the request
-            """
-            def _handle_timeout():
-                return self._handle_timeout(switch, barrier_xid, msg_xids)
-            # spawn timeout func to ensure cleanup occurs
-            self._timeout_thread = hub.spawn_after(timeout_sec,
-                                                   _handle_timeout)
-
-        def cancel_timeout(self):
-            """
-            If a request is received, stop the timeout handler from running
-            """
-            if self._timeout_thread is not None:
-                self._timeout_thread.cancel()
-
-        def _handle_timeout(self, switch, barrier_xid, msg_xids):
-            switch.requests_by_barrier.pop(barrier_xid, None)
-            for xid in msg_xids:
-                switch.results_by_msg.pop(xid, None)
+            self.sent_time = None
 
     class _SwitchInfo(object):
-        def __init__(self):
+        def __init__(self, datapath_id, handle_timeout):
             self.requests_by_barrier = {}
             self.results_by_msg = {}
+            self.timeouts = TimerWheel(
+                TIMEOUT_TICK_SEC, TIMEOUT_WHEEL_SLOTS,
+                lambda barrier_xid: handle_timeout(self, barrier_xid))
+            self.barriers_in_flight = \
+                OVS_BARRIERS_IN_FLIGHT.labels(datapath_id=datapath_id)
+            self.barrier_rtt_ms = \
+                OVS_BARRIER_RTT_MS.labels(datapath_id=datapath_id)
+            self.barrier_timeouts = \
+                OVS_BARRIER_TIMEOUTS.labels(datapath_id=datapath_id)
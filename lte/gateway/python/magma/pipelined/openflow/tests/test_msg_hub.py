@@ -17,7 +17,10 @@ from unittest.mock import Mock, MagicMock
 
 from ryu.lib import hub
 
-from magma.pipelined.openflow.messages import MessageHub
+from magma.pipelined.metrics import OVS_BARRIERS_IN_FLIGHT, \
+    OVS_BARRIER_TIMEOUTS
+from magma.pipelined.openflow.messages import FlowIndex, MessageHub, \
+    TimerWheel
 
 
 class MockBarrierRequest(object):
@@ -60,6 +63,14 @@ class MockDatapath(object):
         return xid
 
 
+class MockFlow(object):
+    def __init__(self, cookie, imsi, version=None):
+        self.cookie = cookie
+        self.match = {'metadata': imsi}
+        if version is not None:
+            self.match['reg4'] = version
+
+
 class MessageHubTest(unittest.TestCase):
     """
     Tests tracked message sending through Ryu
@@ -154,6 +165,85 @@ class MessageHubTest(unittest.TestCase):
         # request and results should be removed
         self.assertEqual(len(switch.results_by_msg), 0)
         self.assertEqual(len(switch.requests_by_barrier), 0)
+        self.assertEqual(len(switch.timeouts), 0)
+
+    def test_barrier_metrics(self):
+        """
+        Test that in flight barriers and timeouts are counted per switch
+        """
+        in_flight = OVS_BARRIERS_IN_FLIGHT.labels(
+            datapath_id=self._mock_datapath.id)
+        timeouts = OVS_BARRIER_TIMEOUTS.labels(
+            datapath_id=self._mock_datapath.id)
+        in_flight_before = in_flight._value.get()
+        timeouts_before = timeouts._value.get()
+
+        self._msg_sender.send([MockMessage()], self._mock_datapath, "1")
+        ev = self._get_barrier_event()
+        self._msg_sender.send([MockMessage()], self._mock_datapath, "2",
+                              timeout=0.1)
+        self.assertEqual(in_flight._value.get(), in_flight_before + 2)
+
+        self._msg_sender.handle_barrier(ev)
+        hub.sleep(0.3)
+        self.assertEqual(in_flight._value.get(), in_flight_before)
+        self.assertEqual(timeouts._value.get(), timeouts_before + 1)
+
+    def test_release_channel(self):
+        """
+        Test that released channels are reused once all their replies were
+        read
+        """
+        chan = self._msg_sender.send([MockMessage()], self._mock_datapath)
+        ev = self._get_barrier_event()
+        # The reply wasn't received yet
+        self._msg_sender.release_channel(chan)
+        self.assertIsNot(
+            self._msg_sender.send([MockMessage()], self._mock_datapath),
+            chan)
+
+        self._msg_sender.handle_barrier(ev)
+        self._check_reply(chan, None)
+        self._msg_sender.release_channel(chan)
+        self.assertIs(
+            self._msg_sender.send([MockMessage()], self._mock_datapath),
+            chan)
+
+    def test_filter_msgs_if_not_in_flow_list(self):
+        """
+        Test that every flow matches one message, including duplicates, and
+        the remaining flows keep their order
+        """
+        flows = [MockFlow(1, 1), MockFlow(2, 1), MockFlow(1, 1),
+                 MockFlow(1, 2), MockFlow(1, 1, version=2)]
+        msgs = [MockFlow(1, 1), MockFlow(1, 1), MockFlow(1, 1),
+                MockFlow(1, 2, version=2)]
+        msgs_to_send, remaining = \
+            self._msg_sender.filter_msgs_if_not_in_flow_list(msgs, flows)
+        self.assertEqual([msgs[2], msgs[3]], msgs_to_send)
+        self.assertEqual([flows[1], flows[3], flows[4]], list(remaining))
+        self.assertEqual(3, len(remaining))
+
+        # Filtering the remaining flows again doesn't match the same flows
+        msgs_to_send, remaining = \
+            self._msg_sender.filter_msgs_if_not_in_flow_list(
+                [MockFlow(1, 1), MockFlow(1, 1, version=2)], remaining)
+        self.assertEqual(1, len(msgs_to_send))
+        self.assertEqual([flows[1], flows[3]], list(remaining))
+
+    def test_flow_index_shared(self):
+        """
+        Test that matching messages doesn't change the index it was done on
+        """
+        flows = [MockFlow(1, 1), MockFlow(1, 1)]
+        flow_index = FlowIndex(flows)
+        for _ in range(2):
+            msgs_to_send, remaining = \
+                self._msg_sender.filter_msgs_if_not_in_flow_list(
+                    [MockFlow(1, 1)], flow_index)
+            self.assertEqual([], msgs_to_send)
+            self.assertEqual([flows[1]], list(remaining))
+        self.assertEqual(flows, list(flow_index))
 
     def _get_barrier_event(self):
         barrier_msg = Mock()
@@ -177,5 +267,27 @@ class MessageHubTest(unittest.TestCase):
         self.assertTrue(reply.ok())
 
 
+class TimerWheelTest(unittest.TestCase):
+    def setUp(self):
+        self._expired = []
+        self._wheel = TimerWheel(0.01, 4, self._expired.append)
+
+    def test_expire(self):
+        """
+        Test that keys expire after their timeout, including timeouts longer
+        than a turn of the wheel, and removed keys don't
+        """
+        self._wheel.add('short', 0.02)
+        self._wheel.add('long', 0.1)
+        self._wheel.add('removed', 0.02)
+        self._wheel.remove('removed')
+        hub.sleep(0.05)
+        self.assertEqual(['short'], self._expired)
+        self.assertEqual(1, len(self._wheel))
+        hub.sleep(0.15)
+        self.assertEqual(['short', 'long'], self._expired)
+        self.assertEqual(0, len(self._wheel))
+
+
 if __name__ == "__main__":
     unittest.main()
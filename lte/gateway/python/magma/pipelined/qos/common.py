@@ -17,7 +17,8 @@ import logging
 from enum import Enum
 from lte.protos.policydb_pb2 import FlowMatch
 from magma.pipelined.qos.qos_meter_impl import MeterManager
-from magma.pipelined.qos.qos_tc_impl import TCManager, TrafficClass
+from magma.pipelined.qos.qos_tc_impl import TCBatchManager, TCManager, \
+    TrafficClass
 from magma.pipelined.qos.types import QosInfo, get_json, get_key, get_subscriber_key
 from magma.pipelined.qos.utils import QosStore
 from magma.configuration.service_configs import load_service_config
@@ -33,6 +34,7 @@ def normalize_imsi(imsi: str) -> str:
 
 class QosImplType(Enum):
     LINUX_TC = "linux_tc"
+    LINUX_TC_BATCH = "linux_tc_batch"
     OVS_METER = "ovs_meter"
 
     @staticmethod
@@ -136,6 +138,8 @@ class QosManager(object):
 
         if impl_type == QosImplType.OVS_METER:
             return MeterManager(datapath, loop, config)
+        elif impl_type == QosImplType.LINUX_TC_BATCH:
+            return TCBatchManager(datapath, loop, config)
         else:
             return TCManager(datapath, loop, config)
 
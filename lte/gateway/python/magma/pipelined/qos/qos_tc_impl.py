@@ -11,12 +11,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import List  # noqa
+from typing import List, Tuple  # noqa
 import os
+import re
 import shlex
 import subprocess
 import logging
+from eventlet.green import subprocess as green_subprocess
 from lte.protos.policydb_pb2 import FlowMatch
+from ryu.lib import hub
 from .types import QosInfo
 from .utils import IdManager
 
@@ -55,23 +58,25 @@ class TrafficClass:
     """
 
     @staticmethod
-    def delete_class(intf: str, qid: int, show_error=True) -> None:
+    def get_delete_class_cmds(intf: str, qid: int) -> List[str]:
         qid_hex = hex(qid)
         # delete filter if this is a leaf class
         filter_cmd = "tc filter del dev {intf} protocol ip parent 1: prio 1 "
         filter_cmd += "handle {qid} fw flowid 1:{qid}"
         filter_cmd = filter_cmd.format(intf=intf, qid=qid_hex)
-        run_cmd([filter_cmd], show_error)
 
         # delete class
         tc_cmd = "tc class del dev {intf} classid 1:{qid}".format(intf=intf,
             qid=qid_hex)
-        run_cmd([tc_cmd], show_error)
+        return [filter_cmd, tc_cmd]
 
+    @staticmethod
+    def delete_class(intf: str, qid: int, show_error=True) -> None:
+        run_cmd(TrafficClass.get_delete_class_cmds(intf, qid), show_error)
 
     @staticmethod
-    def create_class(intf: str, qid: int, max_bw: int, rate=None,
-                     parent_qid=None, show_error=True) -> None:
+    def get_create_class_cmds(intf: str, qid: int, max_bw: int, rate=None,
+                              parent_qid=None) -> List[str]:
         if not rate:
             rate = DEFAULT_RATE
 
@@ -85,20 +90,23 @@ class TrafficClass:
         tc_cmd = tc_cmd.format(intf=intf, parent_qid=parent_qid_hex,
             qid=qid_hex, rate=rate, maxbw=max_bw)
 
-        # delete if exists
-        TrafficClass.delete_class(intf, qid, show_error=False)
-
-        run_cmd([tc_cmd], show_error=show_error)
-
         # add fq_codel and filter
         qdisc_cmd = "tc qdisc add dev {intf} parent 1:{qid} fq_codel"
         qdisc_cmd = qdisc_cmd.format(intf=intf, qid=qid_hex)
         filter_cmd = "tc filter add dev {intf} protocol ip parent 1: prio 1 "
         filter_cmd += "handle {qid} fw flowid 1:{qid}"
         filter_cmd = filter_cmd.format(intf=intf, qid=qid_hex)
+        return [tc_cmd, qdisc_cmd, filter_cmd]
+
+    @staticmethod
+    def create_class(intf: str, qid: int, max_bw: int, rate=None,
+                     parent_qid=None, show_error=True) -> None:
+        # delete if exists
+        TrafficClass.delete_class(intf, qid, show_error=False)
 
-        # add fq_codel qdisc and filter
-        run_cmd((qdisc_cmd, filter_cmd), show_error)
+        # add class, fq_codel qdisc and filter
+        run_cmd(TrafficClass.get_create_class_cmds(
+            intf, qid, max_bw, rate=rate, parent_qid=parent_qid), show_error)
 
     @staticmethod
     def init_qdisc(intf: str, show_error=False) -> None:
@@ -204,10 +212,10 @@ class TCManager(object):
                 (qid, pqid) = qid_tuple
                 if qid >= self._start_idx and qid < (self._max_idx - 1):
                     LOG.info("Attemting to delete class idx %d", qid)
-                    TrafficClass.delete_class(intf, qid, show_error=False)
+                    self._delete_class(intf, qid, show_error=False)
                 if pqid >= self._start_idx and pqid < (self._max_idx - 1):
                     LOG.info("Attemting to delete parent class idx %d", pqid)
-                    TrafficClass.delete_class(intf, pqid, show_error=False)
+                    self._delete_class(intf, pqid, show_error=False)
 
     def setup(self,):
         # initialize new qdisc
@@ -227,8 +235,7 @@ class TCManager(object):
         parent=None) -> int:
         qid = self._id_manager.allocate_idx()
         intf = self._uplink if d == FlowMatch.UPLINK else self._downlink
-        TrafficClass.create_class(intf, qid, qos_info.mbr, rate=qos_info.gbr,
-            parent_qid=parent)
+        self._create_class(intf, qid, qos_info, parent)
         return qid
 
     def remove_qos(self, qid: int, d: FlowMatch.Direction,
@@ -242,9 +249,18 @@ class TCManager(object):
 
         LOG.debug("deleting qos_handle %s", qid)
         intf = self._uplink if d == FlowMatch.UPLINK else self._downlink
-        TrafficClass.delete_class(intf, qid)
+        self._delete_class(intf, qid)
         self._id_manager.release_idx(qid)
 
+    @staticmethod
+    def _create_class(intf: str, qid: int, qos_info: QosInfo, parent):
+        TrafficClass.create_class(intf, qid, qos_info.mbr, rate=qos_info.gbr,
+            parent_qid=parent)
+
+    @staticmethod
+    def _delete_class(intf: str, qid: int, **kwargs):
+        TrafficClass.delete_class(intf, qid, **kwargs)
+
     def read_all_state(self, ):
         LOG.debug("read_all_state")
         st = {}
@@ -266,3 +282,125 @@ class TCManager(object):
         LOG.debug("map -> %s", st)
         fut.set_result(st)
         return fut
+
+
+class TCBatch(object):
+    """
+    List of tc commands run by a single `tc -force -batch -` process. With
+    -force tc carries on after a failed command, and reports the line of the
+    failed command on stderr after its error.
+    """
+    _FAILED_CMD_RE = re.compile(r'^Command failed -:(\d+)$')
+
+    def __init__(self) -> None:
+        self._cmds = []  # type: List[Tuple[str, bool]]
+
+    def add(self, cmd_list: List[str], show_error=True) -> None:
+        for cmd in cmd_list:
+            # batch lines are tc arguments without the tc command
+            self._cmds.append((cmd.split(' ', 1)[1], show_error))
+
+    def __len__(self) -> int:
+        return len(self._cmds)
+
+    def run(self) -> int:
+        """
+        Run the commands. The tc process is a green subprocess, so that
+        other green threads run until it completes.
+
+        Returns:
+            The number of failed commands whose errors are shown
+        """
+        if not self._cmds:
+            return 0
+        LOG.debug("running a tc batch of %d commands", len(self._cmds))
+        batch = ''.join(cmd + '\n' for cmd, _ in self._cmds)
+        try:
+            proc = green_subprocess.Popen(
+                argSplit("tc -force -batch -"), stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            _, err = proc.communicate(batch.encode('utf-8'))
+        except OSError as e:
+            LOG.error("%s error running a tc batch of %d commands", str(e),
+                      len(self._cmds))
+            return len(self._cmds)
+
+        failed = 0
+        errors = []
+        for ln in err.decode('utf-8', 'replace').splitlines():
+            match = self._FAILED_CMD_RE.match(ln.strip())
+            if not match:
+                errors.append(ln.strip())
+                continue
+            cmd, show_error = self._cmds[int(match.group(1)) - 1]
+            if show_error:
+                failed += 1
+                LOG.error("%s error running tc %s", ' '.join(errors), cmd)
+            errors = []
+        return failed
+
+
+class TCBatchManager(TCManager):
+    """
+    TCManager running the tc commands of the queues in batches. Queues are
+    allocated right away, but their tc commands are queued and run by a
+    green thread with a single tc process per batch, instead of forking up
+    to five tc processes per queue and blocking the event loop while they
+    run. Commands run in the order they were queued, so a queue id released
+    and allocated again is deleted before being created.
+    """
+    def __init__(self,
+                 datapath,
+                 loop,
+                 config) -> None:
+        super(TCBatchManager, self).__init__(datapath, loop, config)
+        self._pending = TCBatch()
+        self._flush_thread = None
+        self._flush_lock = hub.BoundedSemaphore(1)
+
+    def destroy(self,):
+        super(TCBatchManager, self).destroy()
+        self.flush()
+
+    def read_all_state(self, ):
+        # the state read must include the queued changes
+        self.flush()
+        return super(TCBatchManager, self).read_all_state()
+
+    def flush(self) -> int:
+        """
+        Run the queued tc commands, and return once they completed
+
+        Returns:
+            The number of failed commands whose errors are shown
+        """
+        failed = 0
+        with self._flush_lock:
+            while self._pending:
+                batch, self._pending = self._pending, TCBatch()
+                failed += batch.run()
+        return failed
+
+    def _create_class(self, intf: str, qid: int, qos_info: QosInfo, parent):
+        # delete if exists
+        self._pending.add(TrafficClass.get_delete_class_cmds(intf, qid),
+                          show_error=False)
+        self._pending.add(TrafficClass.get_create_class_cmds(
+            intf, qid, qos_info.mbr, rate=qos_info.gbr, parent_qid=parent))
+        self._schedule_flush()
+
+    def _delete_class(self, intf: str, qid: int, show_error=True):
+        self._pending.add(TrafficClass.get_delete_class_cmds(intf, qid),
+                          show_error=show_error)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        # The commands queued until the green thread runs go in one batch
+        if self._flush_thread is None:
+            self._flush_thread = hub.spawn(self._flush_pending)
+
+    def _flush_pending(self):
+        try:
+            self.flush()
+        finally:
+            self._flush_thread = None
@@ -12,15 +12,13 @@ limitations under the License.
 """
 
 import netifaces
-import aiodns
-import asyncio
 import ipaddress
 from collections import namedtuple
 from redis import RedisError
 from urllib.parse import urlsplit
-from memoize import Memoizer
 
 from magma.configuration.service_configs import get_service_config_value
+from magma.pipelined.dns_resolver import CachingDnsResolver
 from magma.pipelined.imsi import encode_imsi
 from magma.pipelined.openflow import flows
 from magma.pipelined.openflow.magma_match import MagmaMatch
@@ -62,7 +60,7 @@ class RedirectionManager:
         self.next_table = next_table
         self._scratch_tbl_num = scratch_table_num
         self._redirect_dict = RedirectDict()
-        self._dns_cache = Memoizer({})
+        self._dns_resolver = CachingDnsResolver(logger, self.DNS_TIMEOUT_SECS)
         self._redirect_port = get_service_config_value(
             'redirectd', 'http_port', 8080)
         self._session_rule_version_mapper = session_rule_version_mapper
@@ -492,39 +490,19 @@ class RedirectionManager:
         to allow traffic to safely pass through as we want subscribers to have
         full access to the url they are redirected to.
 
-        First check cache for redirect url, if not in cache submit a DNS query
+        The addresses are cached and shared by the subscribers redirected to
+        the same url, see CachingDnsResolver
         """
         redirect_addr_host = urlsplit(rule.redirect.server_address).netloc
-        cached_ips = self._dns_cache.get(redirect_addr_host)
-        if cached_ips is not None:
-            self.logger.debug(
-                "DNS cache hit for {}, entry expires in {} sec".format(
-                    redirect_addr_host, self._dns_cache.ttl(redirect_addr_host)
-                )
-            )
-            self._install_ipv4_bypass_flows(datapath, imsi, rule, rule_num,
-                                            priority, cached_ips)
-            return
-
-        resolver = aiodns.DNSResolver(timeout=self.DNS_TIMEOUT_SECS, loop=loop)
-        query = resolver.query(redirect_addr_host, 'A')
 
-        def add_flows(dns_resolve_future):
+        def add_flows(ips):
             """
             Callback for when DNS query is resolved, adds the bypass flows
             """
-            try:
-                ips = [entry.host for entry in dns_resolve_future.result()]
-                ttl = min(entry.ttl for entry in dns_resolve_future.result())
-            except aiodns.error.DNSError as err:
-                self.logger.error("Error: ip lookup for {}: {}".format(
-                                  redirect_addr_host, err))
-                return
-            self._dns_cache.get(redirect_addr_host, lambda: ips, max_age=ttl)
             self._install_ipv4_bypass_flows(datapath, imsi, rule, rule_num,
                                             priority, ips)
 
-        asyncio.ensure_future(query, loop=loop).add_done_callback(add_flows)
+        self._dns_resolver.resolve(loop, redirect_addr_host, add_flows)
 
     def _install_ipv4_bypass_flows(self, datapath, imsi, rule, rule_num,
                                    priority, ips):
@@ -21,7 +21,10 @@ from lte.protos.pipelined_pb2 import (
     SetupFlowsResult,
     RequestOriginType,
     ActivateFlowsResult,
+    ActivateFlowsBatchRequest,
+    ActivateFlowsBatchResult,
     DeactivateFlowsResult,
+    DeactivateFlowsBatchRequest,
     FlowResponse,
     RuleModResult,
     SetupUEMacRequest,
@@ -31,7 +34,6 @@ from lte.protos.pipelined_pb2 import (
     AllTableAssignments,
     TableAssignment)
 from lte.protos.policydb_pb2 import PolicyRule
-from lte.protos.subscriberdb_pb2 import AggregatedMaximumBitrate
 from magma.pipelined.app.dpi import DPIController
 from magma.pipelined.app.enforcement import EnforcementController
 from magma.pipelined.app.enforcement_stats import EnforcementStatsController
@@ -129,47 +131,49 @@ class PipelinedRpcServicer(pipelined_pb2_grpc.PipelinedServicer):
                                             request, fut)
         return fut.result()
 
-    def _activate_flows_gx(self, request: ActivateFlowsRequest,
-                           fut: 'Future[ActivateFlowsResult]'
-                           ) -> ActivateFlowsResult:
+    def ActivateFlowsBatch(self, request, context):
         """
-        Ensure that the RuleModResult is only successful if the flows are
-        successfully added in both the enforcer app and enforcement_stats.
-        Install enforcement_stats flows first because even if the enforcement
-        flow install fails after, no traffic will be directed to the
-        enforcement_stats flows.
+        Activate flows for many subscribers, the flows of all the subscribers
+        are installed together
         """
-        logging.debug('Activating GX flows for %s', request.sid.id)
-        for rule_id in request.rule_ids:
-            self._service_manager.session_rule_version_mapper.update_version(
-                request.sid.id, rule_id)
-        for rule in request.dynamic_rules:
-            self._service_manager.session_rule_version_mapper.update_version(
-                request.sid.id, rule.id)
-        enforcement_stats_res = self._activate_rules_in_enforcement_stats(
-            request.sid.id, request.ip_addr, request.apn_ambr, request.rule_ids,
-            request.dynamic_rules)
-
-        failed_static_rule_results, failed_dynamic_rule_results = \
-            _retrieve_failed_results(enforcement_stats_res)
-        # Do not install any rules that failed to install in enforcement_stats.
-        static_rule_ids = \
-            _filter_failed_static_rule_ids(request, failed_static_rule_results)
-        dynamic_rules = \
-            _filter_failed_dynamic_rules(request, failed_dynamic_rule_results)
-        enforcement_res = self._activate_rules_in_enforcement(
-            request.sid.id, request.ip_addr, request.apn_ambr, static_rule_ids,
-            dynamic_rules)
+        if not self._service_manager.is_app_enabled(
+                EnforcementController.APP_NAME):
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details('Service not enabled!')
+            return None
 
-        # Include the failed rules from enforcement_stats in the response.
-        enforcement_res.static_rule_results.extend(failed_static_rule_results)
-        enforcement_res.dynamic_rule_results.extend(
-            failed_dynamic_rule_results)
-        fut.set_result(enforcement_res)
+        fut = Future()  # type: Future[ActivateFlowsBatchResult]
+        self._loop.call_soon_threadsafe(self._activate_flows_batch,
+                                        request, fut)
+        return fut.result()
+
+    def _activate_flows_gx(self, request: ActivateFlowsRequest,
+                           fut: 'Future[ActivateFlowsResult]'
+                           ) -> ActivateFlowsResult:
+        fut.set_result(self._activate_gx_requests([request])[0])
 
     def _activate_flows_gy(self, request: ActivateFlowsRequest,
                            fut: 'Future[ActivateFlowsResult]'
                            ) -> ActivateFlowsResult:
+        fut.set_result(self._activate_gy_requests([request])[0])
+
+    def _activate_flows_batch(self, request: ActivateFlowsBatchRequest,
+                              fut: 'Future[ActivateFlowsBatchResult]'
+                              ) -> ActivateFlowsBatchResult:
+        gx_reqs = [req for req in request.requests
+                   if req.request_origin.type == RequestOriginType.GX]
+        gy_reqs = [req for req in request.requests
+                   if req.request_origin.type != RequestOriginType.GX]
+        gx_results = iter(self._activate_gx_requests(gx_reqs))
+        gy_results = iter(self._activate_gy_requests(gy_reqs))
+        # Return the results in the order of the requests
+        fut.set_result(ActivateFlowsBatchResult(results=[
+            next(gx_results)
+            if req.request_origin.type == RequestOriginType.GX
+            else next(gy_results) for req in request.requests]))
+
+    def _activate_gx_requests(self, requests: List[ActivateFlowsRequest]
+                              ) -> List[ActivateFlowsResult]:
         """
         Ensure that the RuleModResult is only successful if the flows are
         successfully added in both the enforcer app and enforcement_stats.
@@ -177,7 +181,56 @@ class PipelinedRpcServicer(pipelined_pb2_grpc.PipelinedServicer):
         flow install fails after, no traffic will be directed to the
         enforcement_stats flows.
         """
-        logging.debug('Activating GY flows for %s', request.sid.id)
+        if not requests:
+            return []
+        for request in requests:
+            logging.debug('Activating GX flows for %s', request.sid.id)
+            self._update_rule_versions(request)
+        enforcement_stats_results = \
+            self._activate_rules_in_enforcement_stats(requests)
+
+        enforcement_reqs = []
+        failed_results = []
+        for request, enforcement_stats_res in zip(requests,
+                                                  enforcement_stats_results):
+            failed_static_rule_results, failed_dynamic_rule_results = \
+                _retrieve_failed_results(enforcement_stats_res)
+            failed_results.append((failed_static_rule_results,
+                                   failed_dynamic_rule_results))
+            # Do not install any rules that failed to install in
+            # enforcement_stats.
+            enforcement_reqs.append(ActivateFlowsRequest(
+                sid=request.sid,
+                ip_addr=request.ip_addr,
+                rule_ids=_filter_failed_static_rule_ids(
+                    request, failed_static_rule_results),
+                dynamic_rules=_filter_failed_dynamic_rules(
+                    request, failed_dynamic_rule_results),
+                request_origin=request.request_origin,
+                apn_ambr=request.apn_ambr))
+        enforcement_results = \
+            self._activate_rules_in_enforcement(enforcement_reqs)
+
+        # Include the failed rules from enforcement_stats in the response.
+        for enforcement_res, (failed_static_rule_results,
+                              failed_dynamic_rule_results) in \
+                zip(enforcement_results, failed_results):
+            enforcement_res.static_rule_results.extend(
+                failed_static_rule_results)
+            enforcement_res.dynamic_rule_results.extend(
+                failed_dynamic_rule_results)
+        return enforcement_results
+
+    def _activate_gy_requests(self, requests: List[ActivateFlowsRequest]
+                              ) -> List[ActivateFlowsResult]:
+        if not requests:
+            return []
+        for request in requests:
+            logging.debug('Activating GY flows for %s', request.sid.id)
+            self._update_rule_versions(request)
+        return self._activate_rules_in_gy(requests)
+
+    def _update_rule_versions(self, request: ActivateFlowsRequest):
         for rule_id in request.rule_ids:
             self._service_manager.session_rule_version_mapper.update_version(
                 request.sid.id, rule_id)
@@ -185,46 +238,36 @@ class PipelinedRpcServicer(pipelined_pb2_grpc.PipelinedServicer):
             self._service_manager.session_rule_version_mapper.update_version(
                 request.sid.id, rule.id)
 
-        res = self._activate_rules_in_gy(request.sid.id, request.ip_addr,
-            request.rule_ids, request.dynamic_rules)
-
-        fut.set_result(res)
-
-    def _activate_rules_in_enforcement_stats(self, imsi: str, ip_addr: str,
-                                             apn_ambr: AggregatedMaximumBitrate,
-                                             static_rule_ids: List[str],
-                                             dynamic_rules: List[PolicyRule]
-                                             ) -> ActivateFlowsResult:
+    def _activate_rules_in_enforcement_stats(
+            self, requests: List[ActivateFlowsRequest]
+    ) -> List[ActivateFlowsResult]:
         if not self._service_manager.is_app_enabled(
                 EnforcementStatsController.APP_NAME):
-            return ActivateFlowsResult()
-
-        enforcement_stats_res = self._enforcement_stats.activate_rules(
-            imsi, ip_addr, apn_ambr, static_rule_ids, dynamic_rules)
-        _report_enforcement_stats_failures(enforcement_stats_res, imsi)
-        return enforcement_stats_res
-
-    def _activate_rules_in_enforcement(self, imsi: str, ip_addr: str,
-                                       apn_ambr: AggregatedMaximumBitrate,
-                                       static_rule_ids: List[str],
-                                       dynamic_rules: List[PolicyRule]
-                                       ) -> ActivateFlowsResult:
-        # TODO: this will crash pipelined if called with both static rules
-        # and dynamic rules at the same time
-        enforcement_res = self._enforcer_app.activate_rules(
-            imsi, ip_addr, apn_ambr, static_rule_ids, dynamic_rules)
+            return [ActivateFlowsResult() for _ in requests]
+
+        enforcement_stats_results = \
+            self._enforcement_stats.activate_rules_batch(requests)
+        for request, enforcement_stats_res in zip(requests,
+                                                  enforcement_stats_results):
+            _report_enforcement_stats_failures(enforcement_stats_res,
+                                               request.sid.id)
+        return enforcement_stats_results
+
+    def _activate_rules_in_enforcement(
+            self, requests: List[ActivateFlowsRequest]
+    ) -> List[ActivateFlowsResult]:
+        enforcement_results = self._enforcer_app.activate_rules_batch(
+            requests)
         # TODO ?? Should the enforcement failure be reported per imsi session
-        _report_enforcement_failures(enforcement_res, imsi)
-        return enforcement_res
-
-    def _activate_rules_in_gy(self, imsi: str, ip_addr: str,
-                              static_rule_ids: List[str],
-                              dynamic_rules: List[PolicyRule]
-                              ) -> ActivateFlowsResult:
-        gy_res = self._gy_app.activate_rules(imsi, ip_addr, static_rule_ids,
-                                             dynamic_rules)
+        for request, enforcement_res in zip(requests, enforcement_results):
+            _report_enforcement_failures(enforcement_res, request.sid.id)
+        return enforcement_results
+
+    def _activate_rules_in_gy(self, requests: List[ActivateFlowsRequest]
+                              ) -> List[ActivateFlowsResult]:
+        gy_results = self._gy_app.activate_rules_batch(requests)
         # TODO: add metrics
-        return gy_res
+        return gy_results
 
     def DeactivateFlows(self, request, context):
         """
@@ -244,6 +287,27 @@ class PipelinedRpcServicer(pipelined_pb2_grpc.PipelinedServicer):
                                             request)
         return DeactivateFlowsResult()
 
+    def DeactivateFlowsBatch(self, request, context):
+        """
+        Deactivate flows for many subscribers
+        """
+        if not self._service_manager.is_app_enabled(
+                EnforcementController.APP_NAME):
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details('Service not enabled!')
+            return None
+
+        self._loop.call_soon_threadsafe(self._deactivate_flows_batch,
+                                        request)
+        return DeactivateFlowsResult()
+
+    def _deactivate_flows_batch(self, request: DeactivateFlowsBatchRequest):
+        for req in request.requests:
+            if req.request_origin.type == RequestOriginType.GX:
+                self._deactivate_flows_gx(req)
+            else:
+                self._deactivate_flows_gy(req)
+
     def _deactivate_flows_gx(self, request):
         logging.debug('Deactivating GX flows for %s', request.sid.id)
         if request.rule_ids:
@@ -12,7 +12,7 @@ limitations under the License.
 """
 import json
 import threading
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 from typing import Optional
 
 from magma.pipelined.imsi import encode_imsi
@@ -74,35 +74,71 @@ class SessionRuleToVersionMapper:
     This class assigns version numbers to rule id & subscriber id combinations
     that can be used in an openflow register. The methods can be called from
     multiple threads.
+
+    Versions are kept in an in-memory table indexed by subscriber, which is
+    written through to Redis so that versions survive restarts. Reads never
+    go to Redis, the table is only loaded from Redis on first use.
     """
 
     VERSION_LIMIT = 0xFFFFFFFF  # 32 bit unsigned int limit (inclusive)
 
     def __init__(self):
         self._version_by_imsi_and_rule = RuleVersionDict()
+        # Encoded imsi -> {rule id -> version}, loaded lazily
+        self._versions_by_imsi = None
         self._lock = threading.Lock()  # write lock
 
+    def _get_versions_by_imsi(self):
+        versions_by_imsi = self._versions_by_imsi
+        if versions_by_imsi is not None:
+            return versions_by_imsi
+        with self._lock:
+            if self._versions_by_imsi is None:
+                self._versions_by_imsi = self._load_versions()
+            return self._versions_by_imsi
+
+    def _load_versions(self):
+        """ NOT thread safe """
+        versions_by_imsi = defaultdict(dict)
+        for k, v in self._version_by_imsi_and_rule.items():
+            _, imsi, rule_id = SubscriberRuleKey(*json.loads(k))
+            versions_by_imsi[imsi][rule_id] = v
+        return versions_by_imsi
+
     def _update_version_unsafe(self, imsi: str, rule_id: str):
-        key = self._get_json_key(encode_imsi(imsi), rule_id)
-        version = self._version_by_imsi_and_rule.get(key)
+        """ NOT thread safe, the versions must already be loaded """
+        encoded_imsi = encode_imsi(imsi)
+        rule_versions = self._versions_by_imsi[encoded_imsi]
+        version = rule_versions.get(rule_id)
         if not version:
             version = 0
-        self._version_by_imsi_and_rule[key] = \
-            (version % self.VERSION_LIMIT) + 1
+        version = (version % self.VERSION_LIMIT) + 1
+        key = self._get_json_key(encoded_imsi, rule_id)
+        self._version_by_imsi_and_rule[key] = version
+        rule_versions[rule_id] = version
 
     def update_version(self, imsi: str, rule_id: Optional[str] = None):
         """
         Increment the version number for a given subscriber and rule. If the
         rule id is not specified, then all rules for the subscriber will be
-        incremented.
+        incremented, with a single write to Redis.
         """
         encoded_imsi = encode_imsi(imsi)
+        versions_by_imsi = self._get_versions_by_imsi()
         with self._lock:
             if rule_id is None:
-                for k, v in self._version_by_imsi_and_rule.items():
-                    _, i, _ = SubscriberRuleKey(*json.loads(k))
-                    if i == encoded_imsi:
-                        self._version_by_imsi_and_rule[k] = v + 1
+                rule_versions = versions_by_imsi.get(encoded_imsi)
+                if not rule_versions:
+                    return
+                updated = {
+                    rule: (version % self.VERSION_LIMIT) + 1
+                    for rule, version in rule_versions.items()
+                }
+                self._version_by_imsi_and_rule.update({
+                    self._get_json_key(encoded_imsi, rule): version
+                    for rule, version in updated.items()
+                })
+                rule_versions.update(updated)
             else:
                 self._update_version_unsafe(imsi, rule_id)
 
@@ -110,12 +146,10 @@ class SessionRuleToVersionMapper:
         """
         Returns the version number given a subscriber and a rule.
         """
-        key = self._get_json_key(encode_imsi(imsi), rule_id)
-        with self._lock:
-            version = self._version_by_imsi_and_rule.get(key)
-            if version is None:
-                version = 0
-        return version
+        rule_versions = self._get_versions_by_imsi().get(encode_imsi(imsi))
+        if not rule_versions:
+            return 0
+        return rule_versions.get(rule_id, 0)
 
     def _get_json_key(self, imsi: str, rule_id: str):
         return json.dumps(SubscriberRuleKey('imsi_rule', imsi, rule_id))
@@ -134,7 +168,8 @@ class RuleIDDict(RedisHashDict):
         super().__init__(
             client,
             self._DICT_HASH,
-            get_json_serializer(), get_json_deserializer())
+            get_json_serializer(), get_json_deserializer(),
+            local_cache=True)
 
     def __missing__(self, key):
         """Instead of throwing a key error, return None when key not found"""
@@ -154,7 +189,8 @@ class RuleNameDict(RedisHashDict):
         super().__init__(
             client,
             self._DICT_HASH,
-            get_json_serializer(), get_json_deserializer())
+            get_json_serializer(), get_json_deserializer(),
+            local_cache=True)
 
     def __missing__(self, key):
         """Instead of throwing a key error, return None when key not found"""
@@ -174,7 +210,8 @@ class RuleVersionDict(RedisHashDict):
         super().__init__(
             client,
             self._DICT_HASH,
-            get_json_serializer(), get_json_deserializer())
+            get_json_serializer(), get_json_deserializer(),
+            local_cache=True)
 
     def __missing__(self, key):
         """Instead of throwing a key error, return None when key not found"""
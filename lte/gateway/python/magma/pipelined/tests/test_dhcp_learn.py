@@ -0,0 +1,104 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from ryu.controller import ofp_event
+from ryu.lib import pcaplib
+from ryu.lib.packet import dhcp, packet, udp
+from ryu.ofproto import ofproto_v1_4_parser
+
+from magma.pipelined.app.ue_mac import UEMacAddressController, \
+    _parse_dhcp_reply, _parse_dhcp_reply_with_ryu
+from magma.pipelined.imsi import encode_imsi
+from magma.pipelined.openflow.registers import IMSI_REG
+
+DHCP_PCAP = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'pcaps', 'dhcp_learn.pcap')
+DHCP_LEARN_TABLE = 201
+IMSI = 'IMSI001010000000013'
+DHCP_SERVER_PORT = 67
+
+
+def _read_dhcp_replies():
+    """ Get the DHCP server packets of the pcap, sent to the controller """
+    with open(DHCP_PCAP, 'rb') as f:
+        return [bytearray(buf) for _, buf in pcaplib.Reader(f)
+                if packet.Packet(buf).get_protocol(udp.udp).src_port ==
+                DHCP_SERVER_PORT]
+
+
+class DhcpParsingTest(unittest.TestCase):
+    def setUp(self):
+        self.replies = _read_dhcp_replies()
+
+    def test_same_as_ryu(self):
+        """
+        The fast path gives the same fields as Ryu for the untagged replies
+        without IPv4 options, and leaves the others to Ryu
+        """
+        parsed = [_parse_dhcp_reply(data) for data in self.replies]
+        # Offer and ack for each client, one with a VLAN tag and one with
+        # IPv4 options
+        self.assertEqual([reply is not None for reply in parsed],
+                         [True, True, False, False, False, False,
+                          True, True])
+        for data, reply in zip(self.replies, parsed):
+            if reply is not None:
+                self.assertEqual(reply, _parse_dhcp_reply_with_ryu(data))
+        self.assertEqual(
+            parsed[1], (dhcp.DHCP_ACK, '192.168.128.11', '5e:cc:cc:b1:49:4b'))
+
+    def test_truncated(self):
+        self.assertIsNone(_parse_dhcp_reply(self.replies[1][:100]))
+
+    def test_no_message_type(self):
+        data = self.replies[1]
+        # Replace the message type option with pads, the options start
+        # after the 4 bytes of the magic cookie
+        options = data.index(b'\x63\x82\x53\x63') + 4
+        data[options:options + 3] = b'\x00\x00\x00'
+        self.assertIsNone(_parse_dhcp_reply(data))
+        self.assertIsNone(_parse_dhcp_reply_with_ryu(data)[0])
+
+
+class DhcpLearnTest(unittest.TestCase):
+    def setUp(self):
+        self.controller = UEMacAddressController.__new__(
+            UEMacAddressController)
+        self.controller.logger = MagicMock()
+        self.controller._dhcp_learn_scratch = DHCP_LEARN_TABLE
+        self.controller.add_arp_response_flow = MagicMock()
+
+    def _packet_in(self, data):
+        match = ofproto_v1_4_parser.OFPMatch(
+            **{IMSI_REG: encode_imsi(IMSI)})
+        msg = ofproto_v1_4_parser.OFPPacketIn(
+            None, table_id=DHCP_LEARN_TABLE, match=match, data=data)
+        self.controller._learn_arp_entry(ofp_event.EventOFPPacketIn(msg))
+
+    def test_learn_from_acks(self):
+        for data in _read_dhcp_replies():
+            self._packet_in(data)
+        self.assertEqual(
+            [call[0] for call in
+             self.controller.add_arp_response_flow.call_args_list],
+            [(IMSI, '192.168.128.11', '5e:cc:cc:b1:49:4b'),
+             (IMSI, '192.168.128.12', '5e:cc:cc:b1:49:4c'),
+             (IMSI, '192.168.128.13', '5e:cc:cc:b1:49:4d')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import unittest
+from collections import namedtuple
+from unittest.mock import Mock, patch
+
+import aiodns
+
+from magma.pipelined.dns_resolver import CachingDnsResolver
+from magma.pipelined.metrics import REDIRECT_DNS_LOOKUPS
+
+ARecord = namedtuple('ARecord', ['host', 'ttl'])
+HOST = 'about.sha.ddih.org'
+
+
+class CachingDnsResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.queries = []
+        aiodns_resolver = Mock()
+        aiodns_resolver.query.side_effect = self._query
+        resolver_patcher = patch('magma.pipelined.dns_resolver.aiodns.'
+                                 'DNSResolver', return_value=aiodns_resolver)
+        resolver_patcher.start()
+        self.addCleanup(resolver_patcher.stop)
+        self.now = 1000
+        time_patcher = patch('magma.pipelined.dns_resolver.time.monotonic',
+                             side_effect=lambda: self.now)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.addCleanup(self.loop.close)
+
+        self.resolver = CachingDnsResolver(logging.getLogger(__name__), 15)
+        self.results = []
+        self.counts = {result: self._get_count(result) for result in
+                       ('hit', 'stale', 'coalesced', 'miss')}
+
+    def _query(self, host, query_type):
+        self.assertEqual(query_type, 'A')
+        future = self.loop.create_future()
+        self.queries.append((host, future))
+        return future
+
+    def _answer(self, index, ips, ttl):
+        _, future = self.queries[index]
+        future.set_result([ARecord(ip, ttl) for ip in ips])
+        self._run_callbacks()
+
+    def _run_callbacks(self):
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+    def _resolve(self):
+        self.resolver.resolve(self.loop, HOST, self.results.append)
+
+    @staticmethod
+    def _get_count(result):
+        return REDIRECT_DNS_LOOKUPS.labels(result=result)._value.get()
+
+    def _assert_counts(self, **expected):
+        for result, count in self.counts.items():
+            self.assertEqual(self._get_count(result) - count,
+                             expected.get(result, 0), result)
+
+    def test_coalesce_lookups(self):
+        """
+        Lookups of a host while its query is in flight wait for that query
+        """
+        for _ in range(3):
+            self._resolve()
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(self.results, [])
+
+        self._answer(0, ['1.2.3.4', '5.6.7.8'], 60)
+        self.assertEqual(self.results, [['1.2.3.4', '5.6.7.8']] * 3)
+
+        self._resolve()
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(len(self.results), 4)
+        self._assert_counts(miss=1, coalesced=2, hit=1)
+
+    def test_prefetch(self):
+        """
+        Hits past PREFETCH_RATIO of the TTL refresh the entry once
+        """
+        self.resolver.add_entry(HOST, ['1.2.3.4'], 100)
+        self.now += 50
+        self._resolve()
+        self.assertEqual(len(self.queries), 0)
+
+        self.now += 40
+        self._resolve()
+        self._resolve()
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(self.results, [['1.2.3.4']] * 3)
+
+        self._answer(0, ['5.6.7.8'], 100)
+        self.assertEqual(len(self.results), 3)
+        self.now += 50
+        self._resolve()
+        self.assertEqual(self.results[-1], ['5.6.7.8'])
+        self.assertEqual(len(self.queries), 1)
+        self._assert_counts(hit=4)
+
+    def test_stale_while_revalidate(self):
+        """
+        Expired entries are used while they are refreshed, and kept if the
+        refresh fails
+        """
+        self.resolver.add_entry(HOST, ['1.2.3.4'], 10)
+        self.now += 20
+        self._resolve()
+        self.assertEqual(self.results, [['1.2.3.4']])
+        self.assertEqual(len(self.queries), 1)
+
+        _, future = self.queries[0]
+        future.set_exception(aiodns.error.DNSError(1, 'timeout'))
+        self._run_callbacks()
+        self._resolve()
+        self.assertEqual(self.results, [['1.2.3.4']] * 2)
+        self.assertEqual(len(self.queries), 2)
+
+        self._answer(1, ['5.6.7.8'], 10)
+        self._resolve()
+        self.assertEqual(self.results[-1], ['5.6.7.8'])
+        self._assert_counts(stale=2, hit=1)
+
+    def test_stale_entry_too_old(self):
+        """
+        Entries expired for more than STALE_SECS are refreshed before use
+        """
+        self.resolver.add_entry(HOST, ['1.2.3.4'], 10)
+        self.now += 10 + CachingDnsResolver.STALE_SECS
+        self._resolve()
+        self.assertEqual(self.results, [])
+
+        self._answer(0, ['5.6.7.8'], 10)
+        self.assertEqual(self.results, [['5.6.7.8']])
+        self._assert_counts(miss=1)
+
+    def test_query_error(self):
+        """
+        Waiters aren't called when the query fails and nothing is cached
+        """
+        self._resolve()
+        self._resolve()
+        _, future = self.queries[0]
+        future.set_exception(aiodns.error.DNSError(4, 'not found'))
+        self._run_callbacks()
+        self.assertEqual(self.results, [])
+
+        self._resolve()
+        self.assertEqual(len(self.queries), 2)
+        self._assert_counts(miss=2, coalesced=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+from ryu.controller import ofp_event
+from ryu.controller.handler import MAIN_DISPATCHER, set_ev_cls
+from ryu.lib import hub
+from ryu.ofproto.ofproto_v1_4 import OFPMPF_REPLY_MORE
+
+from magma.pipelined.benchmarks.fake_datapath import FakeDatapath
+from magma.pipelined.imsi import encode_imsi
+from magma.pipelined.openflow import flows
+from magma.pipelined.openflow.magma_match import MagmaMatch
+from magma.pipelined.openflow.messages import MessageHub
+from magma.pipelined.openflow.registers import Direction
+
+TABLE = 5
+IMSI1 = 'IMSI001010000000013'
+IMSI2 = 'IMSI001010000000014'
+
+
+class _App:
+    """ Ryu app receiving the answers of the datapath """
+
+    def __init__(self):
+        self.msg_hub = MessageHub(None)
+        self.stats_replies = []
+
+    @set_ev_cls(ofp_event.EventOFPBarrierReply, MAIN_DISPATCHER)
+    def _handle_barrier(self, ev):
+        self.msg_hub.handle_barrier(ev)
+
+    @set_ev_cls(ofp_event.EventOFPErrorMsg, MAIN_DISPATCHER)
+    def _handle_error(self, ev):
+        self.msg_hub.handle_error(ev)
+
+    @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
+    def _handle_stats(self, ev):
+        self.stats_replies.append(ev.msg)
+
+
+class FakeDatapathTest(unittest.TestCase):
+    def setUp(self):
+        self.datapath = FakeDatapath(rtt=0, flow_mod_time=0)
+        self.app = _App()
+        self.datapath.register_app(self.app)
+
+    def _add_msg(self, imsi, direction, cookie=1):
+        match = MagmaMatch(imsi=encode_imsi(imsi), direction=direction)
+        return flows.get_add_resubmit_next_service_flow_msg(
+            self.datapath, TABLE, match, priority=10, cookie=cookie,
+            resubmit_table=TABLE + 1)
+
+    def _send(self, msgs):
+        """ Send the msgs with a barrier, return the replies """
+        channel = self.app.msg_hub.send(msgs, self.datapath)
+        return [channel.get(timeout=1) for _ in msgs]
+
+    def test_add_and_delete(self):
+        replies = self._send([
+            self._add_msg(IMSI1, Direction.IN),
+            self._add_msg(IMSI1, Direction.OUT),
+            self._add_msg(IMSI2, Direction.OUT),
+            # Replaces the flow with the same priority and match
+            self._add_msg(IMSI2, Direction.OUT, cookie=2),
+        ])
+        self.assertTrue(all(reply.ok() for reply in replies))
+        self.assertEqual(self.datapath.barriers, 1)
+        self.assertEqual(
+            sorted(flow.cookie for flow in self.datapath.get_flows(TABLE)),
+            [1, 1, 2])
+
+        self._send([flows.get_delete_flow_msg(
+            self.datapath, TABLE, MagmaMatch(imsi=encode_imsi(IMSI1)))])
+        self.assertEqual(
+            [flow.cookie for flow in self.datapath.get_flows(TABLE)], [2])
+
+    def test_flow_stats(self):
+        self.datapath.stats_per_reply = 2
+        self._send([self._add_msg(IMSI1, Direction.IN),
+                    self._add_msg(IMSI1, Direction.OUT),
+                    self._add_msg(IMSI2, Direction.OUT)])
+        self.datapath.add_traffic(active_ratio=1, max_packets=1,
+                                  packet_size=100)
+
+        req = self.datapath.ofproto_parser.OFPFlowStatsRequest(
+            self.datapath, table_id=TABLE)
+        self.datapath.send_msg(req)
+        hub.sleep(0.01)
+        self.assertEqual([reply.flags for reply in self.app.stats_replies],
+                         [OFPMPF_REPLY_MORE, 0])
+        self.assertTrue(all(reply.xid == req.xid
+                            for reply in self.app.stats_replies))
+        stats = [stat for reply in self.app.stats_replies
+                 for stat in reply.body]
+        self.assertEqual(len(stats), 3)
+        self.assertTrue(all(stat.byte_count == 100 for stat in stats))
+
+    def test_errors(self):
+        self.datapath.error_rate = 1
+        replies = self._send([self._add_msg(IMSI1, Direction.IN)])
+        self.assertFalse(replies[0].ok())
+        self.assertEqual(self.datapath.errors, 1)
+        self.assertEqual(self.datapath.get_flows(TABLE), [])
+
+    def test_unregister_app(self):
+        self.datapath.unregister_app(self.app)
+        channel = self.app.msg_hub.send([self._add_msg(IMSI1, Direction.IN)],
+                                        self.datapath)
+        with self.assertRaises(channel.Timeout):
+            channel.get(timeout=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
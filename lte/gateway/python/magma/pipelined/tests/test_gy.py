@@ -123,8 +123,8 @@ class GYTableTest(unittest.TestCase):
         imsi = 'IMSI010000000088888'
         sub_ip = '192.168.128.74'
         redirect_ips = ["185.128.101.5", "185.128.121.4"]
-        self.gy_controller._redirect_manager._dns_cache.get(
-            "about.sha.ddih.org", lambda: redirect_ips, max_age=42
+        self.gy_controller._redirect_manager._dns_resolver.add_entry(
+            "about.sha.ddih.org", redirect_ips, ttl=42
         )
         flow_list = [FlowDescription(match=FlowMatch())]
         policy = PolicyRule(
@@ -0,0 +1,187 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import unittest
+from collections import defaultdict
+from unittest.mock import Mock
+
+from lte.protos.pipelined_pb2 import ActivateFlowsRequest, RuleModResult
+from lte.protos.policydb_pb2 import FlowDescription, PolicyRule
+from lte.protos.subscriberdb_pb2 import SubscriberID
+from ryu.lib import hub
+
+from magma.pipelined.app.policy_mixin import PolicyMixin
+from magma.pipelined.openflow.messages import MessageHub
+from magma.pipelined.policy_converters import FlowMatchError
+
+
+class MockMessage(object):
+    def __init__(self, imsi, rule_id, is_barrier=False):
+        self.imsi = imsi
+        self.rule_id = rule_id
+        self.is_barrier = is_barrier
+        self.xid = None
+
+
+class MockDatapath(object):
+    """
+    Datapath answering barriers asynchronously, with an error for the flow
+    mods of the rules in failed_rules
+    """
+
+    def __init__(self, msg_hub):
+        self.id = 1
+        self._msg_hub = msg_hub
+        self._xid = 0
+        self.failed_rules = set()
+        self.sent = []
+        self.ofproto_parser = Mock()
+        self.ofproto_parser.OFPBarrierRequest = \
+            lambda _: MockMessage(None, None, is_barrier=True)
+
+    def set_xid(self, msg):
+        self._xid += 1
+        msg.xid = self._xid
+        return msg.xid
+
+    def send_msg(self, msg):
+        self.sent.append(msg)
+        if msg.is_barrier:
+            hub.spawn(self._reply, msg)
+        elif (msg.imsi, msg.rule_id) in self.failed_rules:
+            hub.spawn(self._msg_hub.handle_error, self._get_event(msg.xid))
+
+    def _reply(self, barrier):
+        self._msg_hub.handle_barrier(self._get_event(barrier.xid))
+
+    def _get_event(self, xid):
+        ev = Mock()
+        ev.msg.xid = xid
+        ev.msg.datapath = self
+        return ev
+
+
+class MockPolicyApp(PolicyMixin):
+    """ Policy app installing two flow mods per rule """
+
+    def __init__(self):
+        # pylint: disable=super-init-not-called
+        self.logger = logging.getLogger(__name__)
+        self._msg_hub = MessageHub(self.logger)
+        self._datapath = MockDatapath(self._msg_hub)
+        self.failed_installs = []
+        self.default_flows = []
+        self.single_installs = []
+
+    def _get_rule_install_msgs(self, imsi, ip_addr, apn_ambr, rule):
+        if rule.redirect.support == rule.redirect.ENABLED:
+            return None
+        if not rule.flow_list:
+            raise FlowMatchError('no flows')
+        return [MockMessage(imsi, rule.id), MockMessage(imsi, rule.id)]
+
+    def _install_flow_for_rule(self, imsi, ip_addr, apn_ambr, rule):
+        self.single_installs.append((imsi, rule.id))
+        return RuleModResult.SUCCESS
+
+    def _handle_failed_rule_install(self, imsi, rule):
+        self.failed_installs.append((imsi, rule.id))
+
+    def _install_default_flow_for_subscriber(self, imsi):
+        self.default_flows.append(imsi)
+
+    def _install_redirect_flow(self, imsi, ip_addr, rule):
+        pass
+
+    def _install_default_flows_if_not_installed(self, datapath,
+                                                existing_flows):
+        pass
+
+
+def _get_rule(rule_id, redirect=False, flows=1):
+    rule = PolicyRule(id=rule_id,
+                      flow_list=[FlowDescription()] * flows)
+    if redirect:
+        rule.redirect.support = rule.redirect.ENABLED
+    return rule
+
+
+class ActivateRulesBatchTest(unittest.TestCase):
+    def setUp(self):
+        self._app = MockPolicyApp()
+        self._datapath = self._app._datapath
+        # Like PolicyRuleDict, None for unknown rules
+        self._app._policy_dict = defaultdict(lambda: None, {
+            'static1': _get_rule('static1'),
+            'static2': _get_rule('static2'),
+        })
+
+    def _get_results(self, result):
+        return [(res.rule_id, res.result) for res in
+                list(result.static_rule_results) +
+                list(result.dynamic_rule_results)]
+
+    def test_single_barrier(self):
+        """
+        Test that the flow mods of all the subscribers are sent with one
+        barrier, and errors are reported for the rule they belong to
+        """
+        self._datapath.failed_rules.add(('IMSI2', 'static2'))
+        requests = [
+            ActivateFlowsRequest(
+                sid=SubscriberID(id='IMSI1'),
+                rule_ids=['static1', 'static2'],
+                dynamic_rules=[_get_rule('dynamic1')]),
+            ActivateFlowsRequest(
+                sid=SubscriberID(id='IMSI2'),
+                rule_ids=['static1', 'static2', 'missing'],
+                dynamic_rules=[_get_rule('redirect', redirect=True),
+                               _get_rule('empty', flows=0)]),
+        ]
+        results = self._app.activate_rules_batch(requests)
+
+        barriers = [msg for msg in self._datapath.sent if msg.is_barrier]
+        self.assertEqual(1, len(barriers))
+        self.assertEqual(11, len(self._datapath.sent))
+        self.assertEqual(
+            [('static1', RuleModResult.SUCCESS),
+             ('static2', RuleModResult.SUCCESS),
+             ('dynamic1', RuleModResult.SUCCESS)],
+            self._get_results(results[0]))
+        self.assertEqual(
+            [('static1', RuleModResult.SUCCESS),
+             ('static2', RuleModResult.FAILURE),
+             ('missing', RuleModResult.FAILURE),
+             ('redirect', RuleModResult.SUCCESS),
+             ('empty', RuleModResult.FAILURE)],
+            self._get_results(results[1]))
+        self.assertEqual([('IMSI2', 'static2')], self._app.failed_installs)
+        # Rules that aren't installed with flow mods are installed one by one
+        self.assertEqual([('IMSI2', 'redirect')], self._app.single_installs)
+        self.assertEqual(['IMSI1', 'IMSI2'], self._app.default_flows)
+
+    def test_activate_rules(self):
+        """ Test that the rules of a subscriber are sent with one barrier """
+        result = self._app.activate_rules('IMSI1', '192.168.128.1', None,
+                                          ['static1', 'static2'], [])
+        self.assertEqual(
+            [('static1', RuleModResult.SUCCESS),
+             ('static2', RuleModResult.SUCCESS)],
+            self._get_results(result))
+        self.assertEqual(5, len(self._datapath.sent))
+        self.assertTrue(self._datapath.sent[-1].is_barrier)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,9 +17,11 @@ from collections import namedtuple
 from unittest.mock import MagicMock, call, patch
 
 from lte.protos.policydb_pb2 import FlowMatch
+from ryu.lib import hub
 from magma.pipelined.qos.common import QosImplType, QosManager
 from magma.pipelined.qos.qos_meter_impl import MeterManager
-from magma.pipelined.qos.qos_tc_impl import TrafficClass, argSplit, run_cmd
+from magma.pipelined.qos.qos_tc_impl import TCBatch, TCBatchManager, \
+    TrafficClass, argSplit, run_cmd
 from magma.pipelined.qos.types import QosInfo, get_json, get_key, get_subscriber_key
 from magma.pipelined.qos.utils import IdManager
 
@@ -751,4 +753,70 @@ class TestTrafficClass(unittest.TestCase):
         assert(not filter_list and not qdisc_list)
 
         # destroy all qos on eth0
-        run_cmd(['tc qdisc del dev {intf} root'.format(intf=intf)])
\ No newline at end of file
+        run_cmd(['tc qdisc del dev {intf} root'.format(intf=intf)])
+
+
+class TestTCBatch(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "nat_iface": "eth1",
+            "enodeb_iface": "eth0",
+            "qos": {
+                "max_rate": 1000000000,
+                "linux_tc": {"min_idx": 2, "max_idx": 65534},
+            },
+        }
+
+    @patch("magma.pipelined.qos.qos_tc_impl.green_subprocess.Popen")
+    @patch("os.geteuid", return_value=0)
+    def testBatchErrors(self, _, mock_popen):
+        mock_popen.return_value.communicate.return_value = (
+            b"", b"RTNETLINK answers: No such file or directory\n"
+                 b"Command failed -:1\n"
+                 b"Error: Specified qdisc kind is unknown.\n"
+                 b"Command failed -:3\n")
+        batch = TCBatch()
+        batch.add(["tc class del dev eth0 classid 1:0x2"], show_error=False)
+        batch.add(["tc class add dev eth0 parent 1:0xfffe classid 1:0x2 htb "
+                   "rate 12Kbit ceil 100", "tc qdisc add dev eth0 parent "
+                   "1:0x2 fq_codel"])
+
+        with self.assertLogs("pipelined.qos.qos_tc_impl", level="ERROR") as cm:
+            self.assertEqual(batch.run(), 1)
+        # only the error of the command whose errors are shown is logged
+        self.assertEqual(len(cm.output), 1)
+        self.assertTrue("qdisc kind is unknown. error running tc qdisc add"
+                        in cm.output[0])
+        mock_popen.assert_called_once_with(
+            ["tc", "-force", "-batch", "-"], stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        lines = mock_popen.return_value.communicate.call_args[0][0] \
+            .decode().splitlines()
+        self.assertEqual(lines[0], "class del dev eth0 classid 1:0x2")
+        self.assertEqual(len(lines), 3)
+
+    @patch("magma.pipelined.qos.qos_tc_impl.green_subprocess.Popen")
+    def testBatchManager(self, mock_popen):
+        mock_popen.return_value.communicate.return_value = (b"", b"")
+        tc_mgr = TCBatchManager(MagicMock, asyncio.new_event_loop(),
+                                self.config)
+        ambr_qid = tc_mgr.add_qos(FlowMatch.UPLINK, QosInfo(0, 100000))
+        qid = tc_mgr.add_qos(FlowMatch.UPLINK, QosInfo(1000, 50000),
+                             parent=ambr_qid)
+        tc_mgr.remove_qos(qid, FlowMatch.UPLINK)
+        self.assertEqual(len(tc_mgr._pending), 12)
+        mock_popen.assert_not_called()
+
+        # the queued commands run in a single batch once the caller yields
+        hub.sleep(0)
+        self.assertEqual(mock_popen.call_count, 1)
+        lines = mock_popen.return_value.communicate.call_args[0][0] \
+            .decode().splitlines()
+        self.assertEqual(len(lines), 12)
+        self.assertTrue(lines[2].startswith(
+            "class add dev eth1 parent 1:0xfffe classid 1:0x2"))
+        self.assertTrue(lines[7].startswith(
+            "class add dev eth1 parent 1:0x2 classid 1:0x3"))
+        self.assertEqual(lines[-1], "class del dev eth1 classid 1:0x3")
+        self.assertEqual(len(tc_mgr._pending), 0)
+
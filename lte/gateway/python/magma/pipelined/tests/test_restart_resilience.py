@@ -436,8 +436,8 @@ class RestartResilienceTest(unittest.TestCase):
             enf_stats_controller=self.enforcement_stats_controller,
             startup_flow_controller=self.startup_flows_contoller)
         redirect_ips = ["185.128.101.5", "185.128.121.4"]
-        self.enforcement_controller._redirect_manager._dns_cache.get(
-            "about.sha.ddih.org", lambda: redirect_ips, max_age=42
+        self.enforcement_controller._redirect_manager._dns_resolver.add_entry(
+            "about.sha.ddih.org", redirect_ips, ttl=42
         )
         imsi = 'IMSI010000000088888'
         sub_ip = '192.168.128.74'
@@ -13,6 +13,7 @@ limitations under the License.
 
 import unittest
 
+from magma.pipelined.imsi import encode_imsi
 from magma.pipelined.rule_mappers import SessionRuleToVersionMapper
 
 
@@ -49,6 +50,27 @@ class RuleMappersTest(unittest.TestCase):
             self._session_rule_version_mapper.get_version(imsi, rule_ids[1]),
             2)
 
+    def test_versions_loaded_from_backing_dict(self):
+        mapper = SessionRuleToVersionMapper()
+        mapper._version_by_imsi_and_rule = {
+            mapper._get_json_key(encode_imsi('IMSI12345'), 'rule1'): 4,
+            mapper._get_json_key(encode_imsi('IMSI12345'), 'rule2'): 7,
+            mapper._get_json_key(encode_imsi('IMSI67890'), 'rule1'): 1,
+        }
+        self.assertEqual(mapper.get_version('IMSI12345', 'rule1'), 4)
+        self.assertEqual(mapper.get_version('IMSI67890', 'rule1'), 1)
+        self.assertEqual(mapper.get_version('IMSI67890', 'rule2'), 0)
+
+        # Only the rules of the subscriber are bumped and written through
+        mapper.update_version('IMSI12345')
+        self.assertEqual(mapper.get_version('IMSI12345', 'rule1'), 5)
+        self.assertEqual(mapper.get_version('IMSI12345', 'rule2'), 8)
+        self.assertEqual(mapper.get_version('IMSI67890', 'rule1'), 1)
+        self.assertEqual(
+            mapper._version_by_imsi_and_rule[
+                mapper._get_json_key(encode_imsi('IMSI12345'), 'rule2')],
+            8)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+from magma.pipelined.imsi import encode_imsi
+from magma.pipelined.openflow.registers import Direction
+from magma.pipelined.usage_table import FlowUsageKey, RuleUsageTable
+
+
+class RuleUsageTableTest(unittest.TestCase):
+    IMSI1 = 'IMSI001010000000013'
+    IMSI2 = 'IMSI001010000000014'
+
+    def setUp(self):
+        self._table = RuleUsageTable()
+
+    def _add(self, imsi, rule_num, direction, byte_count, version=1):
+        key = FlowUsageKey(encode_imsi(imsi), rule_num, version, direction)
+        self._table.add(key, byte_count, imsi, 'rule%d' % rule_num)
+
+    def test_deltas_only_for_changed_flows(self):
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.IN, 100)
+        self._add(self.IMSI1, 1, Direction.OUT, 50)
+        self._add(self.IMSI2, 2, Direction.OUT, 10)
+        usage = self._table.end_poll()
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_rx, 100)
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_tx, 50)
+        self.assertEqual(usage[self.IMSI2 + '|rule2'].bytes_tx, 10)
+
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.IN, 150)
+        self._add(self.IMSI1, 1, Direction.OUT, 50)
+        self._add(self.IMSI2, 2, Direction.OUT, 10)
+        usage = self._table.end_poll()
+        self.assertEqual(len(usage), 2)
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_rx, 50)
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_tx, 0)
+        # Subscribers with idle flows still get a record
+        self.assertEqual(usage[self.IMSI2 + '|rule2'].bytes_tx, 0)
+
+    def test_removed_flows(self):
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.IN, 100)
+        self._add(self.IMSI2, 2, Direction.IN, 100)
+        self._table.end_poll()
+
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.IN, 100)
+        usage = self._table.end_poll()
+        self.assertEqual(list(usage.keys()), [self.IMSI1 + '|rule1'])
+        self.assertEqual(len(self._table), 1)
+
+        # Slot is reused, and the flow starts from a zero counter
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.IN, 100)
+        self._add(self.IMSI2, 2, Direction.IN, 30)
+        usage = self._table.end_poll()
+        self.assertEqual(usage[self.IMSI2 + '|rule2'].bytes_rx, 30)
+        self.assertEqual(len(self._table), 2)
+
+    def test_reinstalled_flow(self):
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.OUT, 100)
+        self._table.end_poll()
+
+        # Counter went down, the flow was reinstalled
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.OUT, 20)
+        usage = self._table.end_poll()
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_tx, 20)
+
+    def test_versions_aggregated_per_rule(self):
+        self._table.begin_poll()
+        self._add(self.IMSI1, 1, Direction.OUT, 100, version=1)
+        self._add(self.IMSI1, 1, Direction.OUT, 20, version=2)
+        usage = self._table.end_poll()
+        self.assertEqual(usage[self.IMSI1 + '|rule1'].bytes_tx, 120)
+
+        totals = self._table.get_totals()
+        self.assertEqual(totals[self.IMSI1 + '|rule1'].bytes_tx, 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from array import array
+from collections import namedtuple
+from typing import Dict, Iterator, Optional, Tuple
+
+from lte.protos.session_manager_pb2 import RuleRecord
+
+from magma.pipelined.openflow.registers import Direction
+
+
+# Identifies a single stats flow: the IMSI register value, the rule number
+# (flow cookie), the rule version register value and the direction register.
+FlowUsageKey = namedtuple('FlowUsageKey', 'imsi rule_num version direction')
+
+# Max value of the unsigned poll generation counter
+_GENERATION_LIMIT = 0xFFFFFFFF
+
+
+class RuleUsageTable:
+    """
+    Usage counters for the flows of the enforcement stats table.
+
+    Every flow gets a slot in a set of flat arrays holding its byte count as
+    of the current poll and as of the last report. A poll is ingested in place
+    with begin_poll()/add()/end_poll(), which returns usage deltas only for
+    the flows whose counters moved since the last poll. Slots of flows that
+    disappeared from the table are recycled at the end of each poll.
+
+    RuleRecord protos are only built for the (subscriber, rule) pairs that
+    changed, so the cost of a poll no longer depends on allocating a proto for
+    every flow in the table.
+
+    NOT thread safe, the table should only be used from the main event loop.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._slot_by_key)
+
+    def clear(self):
+        """ Drop all counters, used when the stats flows are reinstalled """
+        self._slot_by_key = {}  # type: Dict[FlowUsageKey, int]
+        self._keys = []  # Slot -> FlowUsageKey, None for free slots
+        self._names = []  # Slot -> (sid, rule_id), resolved once per flow
+        self._free_slots = []
+        self._curr_bytes = array('q')
+        self._last_bytes = array('q')
+        self._seen_gen = array('L')
+        self._gen = 0
+
+    def begin_poll(self):
+        """ Start ingesting a new set of flow stats """
+        self._gen = (self._gen % _GENERATION_LIMIT) + 1
+
+    def add(self, key: FlowUsageKey, byte_count: int, sid: str,
+            rule_id: str) -> int:
+        """
+        Add the byte count of a flow stat to the counters of the current poll.
+        The sid and rule_id are only stored when the flow is seen for the
+        first time.
+
+        Returns:
+            The slot the flow is stored in
+        """
+        slot = self._slot_by_key.get(key)
+        if slot is None:
+            slot = self._allocate_slot(key, sid, rule_id)
+        if self._seen_gen[slot] != self._gen:
+            self._seen_gen[slot] = self._gen
+            self._curr_bytes[slot] = byte_count
+        else:
+            # Multiple flows can share the same key, ex. app_name rules
+            self._curr_bytes[slot] += byte_count
+        return slot
+
+    def get_names(self, key: FlowUsageKey) -> Optional[Tuple[str, str]]:
+        """
+        Returns the (sid, rule_id) stored for the flow, or None if the flow
+        is not in the table
+        """
+        slot = self._slot_by_key.get(key)
+        if slot is None:
+            return None
+        return self._names[slot]
+
+    def end_poll(self) -> Dict[str, RuleRecord]:
+        """
+        Finish the current poll and compute the usage delta of every flow.
+
+        Flows that were not part of the poll are removed from the table. A
+        flow with a counter lower than the last reported value must have been
+        reinstalled, so its whole counter is treated as new usage.
+
+        Returns:
+            Map of 'sid|rule_id' to RuleRecord, with an entry for every
+            (subscriber, rule) pair that had usage since the last poll. Every
+            subscriber that still has flows in the table gets at least one
+            record, as sessiond relies on the records to know which
+            subscribers have active flows.
+        """
+        delta_usage = {}
+        idle_records = {}
+        for slot, key in enumerate(self._keys):
+            if key is None:
+                continue
+            if self._seen_gen[slot] != self._gen:
+                self._release_slot(slot)
+                continue
+            curr = self._curr_bytes[slot]
+            delta = curr - self._last_bytes[slot]
+            if delta < 0:
+                delta = curr
+            self._last_bytes[slot] = curr
+            sid, rule_id = self._names[slot]
+            if delta == 0:
+                if sid not in idle_records:
+                    idle_records[sid] = rule_id
+                continue
+            _add_to_usage(delta_usage, sid, rule_id, key.direction, delta)
+
+        active_sids = {record.sid for record in delta_usage.values()}
+        for sid, rule_id in idle_records.items():
+            if sid not in active_sids:
+                _add_to_usage(delta_usage, sid, rule_id, None, 0)
+        return delta_usage
+
+    def get_totals(self) -> Dict[str, RuleRecord]:
+        """
+        Returns:
+            Map of 'sid|rule_id' to RuleRecord with the total usage of every
+            (subscriber, rule) pair as of the last poll
+        """
+        total_usage = {}
+        for slot, key in self._iter_used_slots():
+            sid, rule_id = self._names[slot]
+            _add_to_usage(total_usage, sid, rule_id, key.direction,
+                          self._last_bytes[slot])
+        return total_usage
+
+    def _iter_used_slots(self) -> Iterator[Tuple[int, FlowUsageKey]]:
+        for slot, key in enumerate(self._keys):
+            if key is not None:
+                yield slot, key
+
+    def _allocate_slot(self, key: FlowUsageKey, sid: str, rule_id: str):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot] = key
+            self._names[slot] = (sid, rule_id)
+            self._curr_bytes[slot] = 0
+            self._last_bytes[slot] = 0
+            self._seen_gen[slot] = 0
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._names.append((sid, rule_id))
+            self._curr_bytes.append(0)
+            self._last_bytes.append(0)
+            self._seen_gen.append(0)
+        self._slot_by_key[key] = slot
+        return slot
+
+    def _release_slot(self, slot: int):
+        del self._slot_by_key[self._keys[slot]]
+        self._keys[slot] = None
+        self._names[slot] = None
+        self._free_slots.append(slot)
+
+
+def _add_to_usage(usage, sid, rule_id, direction, byte_count):
+    key = sid + "|" + rule_id
+    record = usage.get(key)
+    if record is None:
+        record = RuleRecord(sid=sid, rule_id=rule_id)
+        usage[key] = record
+    if direction == Direction.IN:
+        record.bytes_rx += byte_count
+    elif direction is not None:
+        record.bytes_tx += byte_count
@@ -0,0 +1,179 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import os
+
+import jinja2
+
+from magma.redirectd.redirect_server import HTTP_NOT_FOUND, HTTP_REDIRECT, \
+    NOT_FOUND_HTML
+from magma.redirectd.redirect_store import RedirectTable
+
+# Requests with larger headers are dropped
+MAX_HEADER_SIZE = 8192
+# Seconds before idle keep-alive connections are closed
+KEEP_ALIVE_TIMEOUT = 15
+
+REASONS = {
+    HTTP_REDIRECT: 'FOUND',
+    HTTP_NOT_FOUND: 'NOT FOUND',
+    400: 'BAD REQUEST',
+}
+
+REDIRECT_HTML = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 3.2 Final//EN">\n'
+    '<title>Redirecting...</title>\n'
+    '<h1>Redirecting...</h1>\n'
+    '<p>You should be redirected automatically to target URL: '
+    '<a href="{0}">{0}</a>.  If not click the link.'
+)
+
+
+def _load_not_found_template():
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(
+            os.path.join(os.path.dirname(__file__), 'templates')),
+        autoescape=True,
+    )
+    return env.get_template(NOT_FOUND_HTML)
+
+
+class RedirectProtocol(asyncio.Protocol):
+    """
+    Minimal HTTP/1.1 server answering every request with the same responses
+    as the flask server: a 302 to the redirect address of the subscriber ip,
+    or a 404 page if the ip isn't found.
+
+    Request bodies aren't read, the connection is closed after answering a
+    request with a body. Keep-alive connections are closed after
+    KEEP_ALIVE_TIMEOUT idle seconds.
+    """
+
+    def __init__(self, loop, get_redirect_address, not_found_template):
+        self._loop = loop
+        self._get_redirect_address = get_redirect_address
+        self._not_found_template = not_found_template
+        self._transport = None
+        self._src_ip = None
+        self._buffer = bytearray()
+        self._idle_timer = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._src_ip = transport.get_extra_info('peername')[0]
+        self._reset_idle_timer()
+
+    def connection_lost(self, exc):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        self._transport = None
+
+    def data_received(self, data):
+        self._buffer += data
+        while self._transport is not None:
+            end = self._buffer.find(b'\r\n\r\n')
+            if end < 0:
+                if len(self._buffer) > MAX_HEADER_SIZE:
+                    self._transport.close()
+                return
+            head = bytes(self._buffer[:end])
+            del self._buffer[:end + 4]
+            self._handle_request(head)
+        self._reset_idle_timer()
+
+    def _handle_request(self, head):
+        lines = head.split(b'\r\n')
+        request_line = lines[0].split()
+        if len(request_line) != 3 or \
+                not request_line[2].startswith(b'HTTP/1.'):
+            self._send(400, b'', [], False)
+            return
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(b':')
+            headers[name.strip().lower()] = value.strip().lower()
+        connection = headers.get(b'connection', b'')
+        if request_line[2] == b'HTTP/1.0':
+            keep_alive = connection == b'keep-alive'
+        else:
+            keep_alive = connection != b'close'
+        if headers.get(b'content-length', b'0') != b'0' or \
+                b'transfer-encoding' in headers:
+            keep_alive = False
+
+        redirect_addr = self._get_redirect_address(self._src_ip)
+        logging.debug("Request from %s: redirected to %s", self._src_ip,
+                      redirect_addr)
+        if redirect_addr is None:
+            body = self._not_found_template.render(
+                subscriber={'ip': self._src_ip})
+            self._send(HTTP_NOT_FOUND, body.encode('utf-8'), [], keep_alive)
+        else:
+            body = REDIRECT_HTML.format(redirect_addr)
+            self._send(HTTP_REDIRECT, body.encode('utf-8'),
+                       [('Location', redirect_addr)], keep_alive)
+
+    def _send(self, http_code, body, headers, keep_alive):
+        head = [
+            'HTTP/1.1 %d %s' % (http_code, REASONS[http_code]),
+            'Content-Type: text/html; charset=utf-8',
+            'Content-Length: %d' % len(body),
+            'Connection: %s' % ('keep-alive' if keep_alive else 'close'),
+        ]
+        head.extend('%s: %s' % header for header in headers)
+        head.append('\r\n')
+        self._transport.write('\r\n'.join(head).encode('utf-8') + body)
+        if not keep_alive:
+            self._transport.close()
+            self._transport = None
+
+    def _reset_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        if self._transport is not None:
+            self._idle_timer = self._loop.call_later(
+                KEEP_ALIVE_TIMEOUT, self._transport.close)
+
+
+def create_async_server(loop, ip, port, get_redirect_address):
+    """
+    Create the server coroutine, get_redirect_address returns the redirect
+    address of a subscriber ip or None
+    """
+    not_found_template = _load_not_found_template()
+    return loop.create_server(
+        lambda: RedirectProtocol(loop, get_redirect_address,
+                                 not_found_template),
+        host=ip, port=port, reuse_address=True)
+
+
+def run_async_server(ip, port, exit_callback):
+    """
+    Runs the asyncio server from the in-memory redirect table, in its own
+    event loop. This is a daemon, so it exits when redirectd exits
+    """
+    loop = asyncio.new_event_loop()
+    redirect_table = RedirectTable()
+    try:
+        redirect_table.start()
+        loop.run_until_complete(
+            create_async_server(loop, ip, port, redirect_table.get))
+        loop.run_forever()
+    finally:
+        redirect_table.stop()
+        # When the server finishes running, do any other cleanup
+        exit_callback()
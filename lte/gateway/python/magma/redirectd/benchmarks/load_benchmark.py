@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Load test of the redirectd servers, reports the requests per second and the
+latency of the requests. Every server runs in its own process, and is hit
+by concurrent HTTP clients sending requests from many subscriber ips, as
+handsets retrying their captive portal probes after a quota exhaustion.
+The subscriber ips are loopback addresses in 127.1.0.0/16, a fraction of
+them don't have a redirect entry and get a 404.
+
+By default the redirect entries are kept in memory, which only measures the
+HTTP servers. With --redis the entries are written to the redirectd hash of
+the local Redis and the servers read them as in redirectd: from Redis for
+every request with flask, from the RedirectTable copy with asyncio.
+
+Usage:
+    python3 -m magma.redirectd.benchmarks.load_benchmark \
+        --requests 20000 --concurrency 100 --redis
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import multiprocessing
+import socket
+import time
+
+import wsgiserver
+from lte.protos.policydb_pb2 import RedirectInformation
+
+from magma.redirectd.async_redirect_server import create_async_server
+from magma.redirectd.redirect_server import HTTP_NOT_FOUND, HTTP_REDIRECT, \
+    setup_flask_server
+from magma.redirectd.redirect_store import RedirectDict, RedirectTable, \
+    get_redirect_address
+
+SERVER_IP = '127.0.0.1'
+FIRST_SUBSCRIBER_IP = ipaddress.IPv4Address('127.1.0.1')
+REDIRECT_INFO = RedirectInformation(
+    support=RedirectInformation.ENABLED,
+    address_type=RedirectInformation.URL,
+    server_address='http://www.example.com/')
+
+
+def _get_subscriber_ip(index):
+    return str(FIRST_SUBSCRIBER_IP + index)
+
+
+def _get_redirect_entries(args):
+    num_known = int(args.subscribers * (1 - args.unknown_ratio))
+    return {_get_subscriber_ip(i): REDIRECT_INFO for i in range(num_known)}
+
+
+def _serve_flask(args):
+    url_dict = None if args.redis else _get_redirect_entries(args)
+    app = setup_flask_server(url_dict)
+    wsgiserver.WSGIServer(app, host=SERVER_IP, port=args.port).start()
+
+
+def _serve_asyncio(args):
+    loop = asyncio.new_event_loop()
+    if args.redis:
+        redirect_table = RedirectTable()
+        redirect_table.start()
+        get_address = redirect_table.get
+    else:
+        addresses = {ip: get_redirect_address(redirect_info) for
+                     ip, redirect_info in _get_redirect_entries(args).items()}
+        get_address = addresses.get
+    loop.run_until_complete(
+        create_async_server(loop, SERVER_IP, args.port, get_address))
+    loop.run_forever()
+
+
+SERVERS = {
+    'flask': _serve_flask,
+    'asyncio': _serve_asyncio,
+}
+
+
+def _wait_for_server(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((SERVER_IP, port), 1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+async def _send_requests(args, loop, next_request, latencies, errors):
+    """ Send requests on successive connections until none are left """
+    while next_request[0] < args.requests:
+        sub = next_request[0] % args.subscribers
+        num_requests = min(args.keep_alive, args.requests - next_request[0])
+        next_request[0] += num_requests
+        expected = HTTP_REDIRECT if sub < args.subscribers * \
+            (1 - args.unknown_ratio) else HTTP_NOT_FOUND
+        try:
+            reader, writer = await asyncio.open_connection(
+                SERVER_IP, args.port, loop=loop,
+                local_addr=(_get_subscriber_ip(sub), 0))
+        except OSError:
+            errors[0] += num_requests
+            continue
+        try:
+            for i in range(num_requests):
+                connection = 'close' if i == num_requests - 1 else \
+                    'keep-alive'
+                start = time.perf_counter()
+                writer.write((
+                    'GET /generate_204 HTTP/1.1\r\nHost: connectivitycheck\r\n'
+                    'Connection: %s\r\n\r\n' % connection).encode('ascii'))
+                head = await reader.readuntil(b'\r\n\r\n')
+                lines = head.split(b'\r\n')
+                length = 0
+                for line in lines[1:]:
+                    name, _, value = line.partition(b':')
+                    if name.lower() == b'content-length':
+                        length = int(value)
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - start)
+                if int(lines[0].split()[1]) != expected:
+                    errors[0] += 1
+        except (OSError, asyncio.IncompleteReadError):
+            errors[0] += 1
+        finally:
+            writer.close()
+
+
+def _run_client(args):
+    loop = asyncio.new_event_loop()
+    latencies = []
+    errors = [0]
+    next_request = [0]
+    loop.run_until_complete(asyncio.gather(
+        *[_send_requests(args, loop, next_request, latencies, errors)
+          for _ in range(args.concurrency)], loop=loop))
+    loop.close()
+    return latencies, errors[0]
+
+
+def run(args):
+    print('%d requests from %d subscribers, %d concurrent connections, '
+          '%d requests per connection, redirect entries in %s' % (
+              args.requests, args.subscribers, args.concurrency,
+              args.keep_alive, 'Redis' if args.redis else 'memory'))
+    if args.redis:
+        redirect_dict = RedirectDict()
+        redirect_dict.update(_get_redirect_entries(args))
+    try:
+        for server_mode in args.servers:
+            server = multiprocessing.Process(
+                target=SERVERS[server_mode], args=(args,), daemon=True)
+            server.start()
+            try:
+                _wait_for_server(args.port)
+                start = time.perf_counter()
+                latencies, errors = _run_client(args)
+                elapsed = time.perf_counter() - start
+            finally:
+                server.terminate()
+                server.join()
+            latencies.sort()
+            print('%s: %.0f requests/s, latency p50 %.2f ms, p99 %.2f ms, '
+                  '%d errors' % (
+                      server_mode, len(latencies) / elapsed,
+                      latencies[len(latencies) // 2] * 1000,
+                      latencies[int(len(latencies) * 0.99)] * 1000, errors))
+    finally:
+        if args.redis:
+            for ip in _get_redirect_entries(args):
+                del redirect_dict[ip]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Load test of the redirectd HTTP servers',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--servers', nargs='+', choices=list(SERVERS),
+                            default=list(SERVERS),
+                            help='Server modes to load')
+    arg_parser.add_argument('--requests', type=int, default=20000,
+                            help='Number of requests per server')
+    arg_parser.add_argument('--subscribers', type=int, default=1000,
+                            help='Number of subscriber ips sending requests')
+    arg_parser.add_argument('--unknown-ratio', type=float, default=0.1,
+                            help='Ratio of the subscribers without a '
+                                 'redirect entry')
+    arg_parser.add_argument('--concurrency', type=int, default=100,
+                            help='Number of concurrent connections')
+    arg_parser.add_argument('--keep-alive', type=int, default=1,
+                            help='Number of requests per connection')
+    arg_parser.add_argument('--port', type=int, default=18080,
+                            help='Port of the servers')
+    arg_parser.add_argument('--redis', action='store_true',
+                            help='Keep the redirect entries in Redis')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
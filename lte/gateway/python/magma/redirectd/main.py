@@ -16,6 +16,7 @@ import threading
 
 from magma.common.service import MagmaService
 from magma.configuration.service_configs import get_service_config_value
+from magma.redirectd.async_redirect_server import run_async_server
 from magma.redirectd.redirect_server import run_flask
 from lte.protos.mconfig import mconfigs_pb2
 
@@ -36,8 +37,17 @@ def main():
         return
 
     http_port = service.config['http_port']
+    server_mode = service.config.get('server_mode', 'flask')
+    if server_mode == 'asyncio':
+        run_server = run_async_server
+    elif server_mode == 'flask':
+        run_server = run_flask
+    else:
+        logging.error("ERROR unknown server_mode %s", server_mode)
+        service.close()
+        return
     exit_callback = get_exit_server_thread_callback(service)
-    run_server_thread(run_flask, redirect_ip, http_port, exit_callback)
+    run_server_thread(run_server, redirect_ip, http_port, exit_callback)
 
     # Run the service loop
     service.run()
@@ -14,7 +14,8 @@ limitations under the License.
 import logging
 from collections import namedtuple
 
-from magma.redirectd.redirect_store import RedirectDict
+from magma.redirectd.redirect_store import RedirectDict, \
+    get_redirect_address
 
 import wsgiserver
 from flask import Flask, redirect, request, render_template
@@ -52,25 +53,21 @@ def flask_redirect(**kwargs):
     return redirect(response.redirect_address, code=response.http_code)
 
 
-def setup_flask_server():
+def setup_flask_server(url_dict=None):
+    """
+    Create the flask app, url_dict maps the subscriber ips to their
+    RedirectInformation and defaults to the Redis RedirectDict
+    """
     app = Flask(__name__)
-    url_dict = RedirectDict()
+    if url_dict is None:
+        url_dict = RedirectDict()
 
     def get_redirect_response(src_ip):
-        """
-        If addr type is IPv4/IPv6 prepend http, if url don't change
-        TODO: not sure what to do with SIP_URI
-        """
-        if src_ip not in url_dict:
+        redirect_info = url_dict.get(src_ip)
+        if redirect_info is None:
             return ServerResponse(NOT_FOUND_HTML, HTTP_NOT_FOUND)
-
-        redirect_addr = url_dict[src_ip].server_address
-        if url_dict[src_ip].address_type == url_dict[src_ip].IPv4:
-            redirect_addr = 'http://' + redirect_addr + '/'
-        elif url_dict[src_ip].address_type == url_dict[src_ip].IPv6:
-            redirect_addr = 'http://[' + redirect_addr + ']/'
-
-        return ServerResponse(redirect_addr, HTTP_REDIRECT)
+        return ServerResponse(get_redirect_address(redirect_info),
+                              HTTP_REDIRECT)
 
     app.add_url_rule(
         '/',
@@ -11,21 +11,43 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import logging
+import threading
+import time
+
 from lte.protos.policydb_pb2 import RedirectInformation
+from redis.exceptions import RedisError
 
 from magma.common.redis.client import get_default_client
 from magma.common.redis.containers import RedisHashDict
 from magma.common.redis.serializers import get_proto_deserializer, \
     get_proto_serializer
 
+# Seconds to wait for a change notification, and before reconnecting
+LISTEN_TIMEOUT = 1.0
+
+
+def get_redirect_address(redirect_info):
+    """
+    If addr type is IPv4/IPv6 prepend http, if url don't change
+    TODO: not sure what to do with SIP_URI
+    """
+    redirect_addr = redirect_info.server_address
+    if redirect_info.address_type == redirect_info.IPv4:
+        redirect_addr = 'http://' + redirect_addr + '/'
+    elif redirect_info.address_type == redirect_info.IPv6:
+        redirect_addr = 'http://[' + redirect_addr + ']/'
+    return redirect_addr
+
 
 class RedirectDict(RedisHashDict):
     """
     RedirectDict uses the RedisHashDict collection to store a mapping of ips
     to RedirectInformation. Setting and deleting items in the dictionary syncs
-    with Redis automatically
+    with Redis automatically, and publishes the ip on CHANGES_CHANNEL
     """
     _DICT_HASH = "redirectd:rules"
+    CHANGES_CHANNEL = "redirectd:rules:changes"
 
     def __init__(self):
         client = get_default_client()
@@ -38,3 +60,102 @@ class RedirectDict(RedisHashDict):
     def __missing__(self, key):
         """Instead of throwing a key error, return None when key not found"""
         return None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.redis.publish(self.CHANGES_CHANNEL, key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.redis.publish(self.CHANGES_CHANNEL, key)
+
+
+class RedirectTable:
+    """
+    RedirectTable keeps an in-memory copy of the redirect addresses of the
+    RedirectDict subscribers, so that lookups don't go to Redis.
+
+    The table is loaded when it starts, and the ips published on
+    RedirectDict.CHANGES_CHANNEL are then read again from Redis by a
+    background thread. Redis doesn't keep the messages of disconnected
+    subscribers, so the whole table is loaded again after a connection loss.
+    """
+
+    def __init__(self):
+        self._redirect_dict = RedirectDict()
+        self._pubsub = self._redirect_dict.redis.pubsub(
+            ignore_subscribe_messages=True)
+        # {ip: redirect address}
+        self._addresses = {}
+        self._synced = False
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """
+        Load the table and start following its changes. If Redis can't be
+        reached, the table is loaded once it can.
+        """
+        try:
+            self._sync()
+        except RedisError as err:
+            logging.warning("Can't load the redirect table: %s", err)
+        self._running = True
+        self._thread = threading.Thread(target=self._listen,
+                                        name='redirect_table', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop following the changes of the table """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._pubsub.close()
+
+    def get(self, ip):
+        """ Return the redirect address of ip, or None if not found """
+        return self._addresses.get(ip)
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def _sync(self):
+        # Subscribe first, changes made while the hash is read are then
+        # applied again from their message
+        self._pubsub.subscribe(RedirectDict.CHANGES_CHANNEL)
+        self._addresses = {
+            ip: get_redirect_address(redirect_info)
+            for ip, redirect_info in self._redirect_dict.items()
+        }
+        self._synced = True
+        logging.info("Loaded %d redirect entries", len(self._addresses))
+
+    def _listen(self):
+        while self._running:
+            try:
+                if not self._synced:
+                    self._sync()
+                message = self._pubsub.get_message(timeout=LISTEN_TIMEOUT)
+                if message is not None and message['type'] == 'message':
+                    self._update(_decode(message['data']))
+            except RedisError as err:
+                if self._synced:
+                    logging.warning("Lost the redirect table changes: %s",
+                                    err)
+                    self._synced = False
+                time.sleep(LISTEN_TIMEOUT)
+
+    def _update(self, ip):
+        redirect_info = self._redirect_dict[ip]
+        if redirect_info is None:
+            self._addresses.pop(ip, None)
+        else:
+            self._addresses[ip] = get_redirect_address(redirect_info)
+
+
+def _decode(value):
+    try:
+        return value.decode('utf-8')
+    except AttributeError:
+        return value
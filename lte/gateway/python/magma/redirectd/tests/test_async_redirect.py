@@ -0,0 +1,104 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import unittest
+
+from magma.redirectd.async_redirect_server import create_async_server
+from magma.redirectd.redirect_server import HTTP_NOT_FOUND, HTTP_REDIRECT
+
+
+class AsyncRedirectdTest(unittest.TestCase):
+    def setUp(self):
+        """
+        Starts the asyncio server on a free port with an in-memory table
+        """
+        self.loop = asyncio.new_event_loop()
+        self.table = {'127.0.0.1': 'http://www.example.com/'}
+        self.server = self.loop.run_until_complete(create_async_server(
+            self.loop, '127.0.0.1', 0, self.table.get))
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def _request(self, requests, num_responses=1):
+        """
+        Send the requests on one connection, return the responses as
+        (status code, headers, body) and whether the connection was closed
+        """
+        async def _send_requests():
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', self.port, loop=self.loop)
+            writer.write(requests)
+            responses = []
+            for _ in range(num_responses):
+                head = await reader.readuntil(b'\r\n\r\n')
+                lines = head.decode('utf-8').split('\r\n')
+                headers = dict(line.split(': ', 1) for line in lines[1:]
+                               if line)
+                body = await reader.readexactly(
+                    int(headers['Content-Length']))
+                responses.append((int(lines[0].split()[1]), headers, body))
+            closed = (await reader.read()) == b''
+            writer.close()
+            return responses, closed
+
+        return self.loop.run_until_complete(
+            asyncio.wait_for(_send_requests(), 5, loop=self.loop))
+
+    def test_302(self):
+        """
+        Assert 302 http response, proper reponse headers with new dest url
+        """
+        responses, closed = self._request(
+            b'GET /generate_204 HTTP/1.1\r\nHost: a\r\n'
+            b'Connection: close\r\n\r\n')
+        code, headers, _ = responses[0]
+        self.assertEqual(code, HTTP_REDIRECT)
+        self.assertEqual(headers['Location'], 'http://www.example.com/')
+        self.assertTrue(closed)
+
+    def test_404(self):
+        """
+        Assert 404 http response with the not found page
+        """
+        self.table.clear()
+        responses, _ = self._request(b'GET / HTTP/1.0\r\n\r\n')
+        code, _, body = responses[0]
+        self.assertEqual(code, HTTP_NOT_FOUND)
+        self.assertIn(b'Error: 404', body)
+
+    def test_keep_alive(self):
+        """
+        Assert pipelined requests are answered in order on one connection
+        """
+        responses, closed = self._request(
+            b'GET / HTTP/1.1\r\nHost: a\r\n\r\n' * 2 +
+            b'GET / HTTP/1.0\r\n\r\n', num_responses=3)
+        self.assertEqual([code for code, _, _ in responses],
+                         [HTTP_REDIRECT] * 3)
+        self.assertEqual(responses[0][1]['Connection'], 'keep-alive')
+        self.assertEqual(responses[2][1]['Connection'], 'close')
+        self.assertTrue(closed)
+
+    def test_bad_request(self):
+        responses, closed = self._request(b'hello\r\n\r\n')
+        self.assertEqual(responses[0][0], 400)
+        self.assertTrue(closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
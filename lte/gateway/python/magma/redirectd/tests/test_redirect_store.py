@@ -0,0 +1,105 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from lte.protos.policydb_pb2 import RedirectInformation
+from redis.exceptions import ConnectionError
+
+from magma.common.redis.serializers import get_proto_serializer
+from magma.redirectd.redirect_store import RedirectDict, RedirectTable
+
+
+def _serialize(redirect_info):
+    return get_proto_serializer()(redirect_info, 1)
+
+
+class RedirectTableTest(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.hash = {
+            b'192.168.128.2': _serialize(RedirectInformation(
+                address_type=RedirectInformation.URL,
+                server_address='http://www.example.com/')),
+            b'192.168.128.3': _serialize(RedirectInformation(
+                address_type=RedirectInformation.IPv4,
+                server_address='10.0.0.1')),
+        }
+        self.client.hgetall.side_effect = lambda key: dict(self.hash)
+        self.client.hget.side_effect = \
+            lambda key, field: self.hash.get(field.encode('utf-8'))
+        self.pubsub = self.client.pubsub.return_value
+        patcher = patch('magma.redirectd.redirect_store.get_default_client',
+                        return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.table = RedirectTable()
+
+    def _receive(self, message):
+        """ Run the listener thread loop once, receiving message """
+        def _get_message(timeout):
+            self.table._running = False
+            if isinstance(message, Exception):
+                raise message
+            return message
+
+        self.pubsub.get_message.side_effect = _get_message
+        self.table._running = True
+        with patch('magma.redirectd.redirect_store.time.sleep'):
+            self.table._listen()
+
+    def test_load(self):
+        self.table._sync()
+        self.pubsub.subscribe.assert_called_once_with(
+            RedirectDict.CHANGES_CHANNEL)
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.get('192.168.128.2'),
+                         'http://www.example.com/')
+        self.assertEqual(self.table.get('192.168.128.3'), 'http://10.0.0.1/')
+        self.assertIsNone(self.table.get('192.168.128.4'))
+
+    def test_changes(self):
+        """
+        Published ips are read again from Redis
+        """
+        self.table._sync()
+        self.hash[b'192.168.128.4'] = self.hash.pop(b'192.168.128.2')
+        for ip in (b'192.168.128.2', b'192.168.128.4'):
+            self._receive({'type': 'message', 'data': ip})
+        self.assertIsNone(self.table.get('192.168.128.2'))
+        self.assertEqual(self.table.get('192.168.128.4'),
+                         'http://www.example.com/')
+        self.assertEqual(self.client.hgetall.call_count, 1)
+
+    def test_reload_after_connection_loss(self):
+        self.table._sync()
+        self._receive(ConnectionError())
+        self.assertFalse(self.table._synced)
+
+        self.hash.pop(b'192.168.128.2')
+        self._receive(None)
+        self.assertTrue(self.table._synced)
+        self.assertEqual(self.client.hgetall.call_count, 2)
+        self.assertIsNone(self.table.get('192.168.128.2'))
+
+    def test_publish_changes(self):
+        redirect_dict = RedirectDict()
+        redirect_dict['192.168.128.5'] = RedirectInformation(
+            server_address='http://www.example.com/')
+        self.client.publish.assert_called_once_with(
+            RedirectDict.CHANGES_CHANNEL, '192.168.128.5')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Generates E-UTRAN auth vectors through the Processor, as the S6a handlers
+would, for subscribers in a SqliteStore in a temporary db file, and reports
+the number of vectors generated per second on a single core. Subscribers are
+provisioned either with an OPc or with only a key, in which case the OPc is
+derived from the network OP.
+
+Usage:
+    python3 -m magma.subscriberdb.benchmarks.auth_vector_benchmark \
+        --subscribers 1000 --requests 20000 --vectors-per-request 1 5
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from lte.protos.subscriberdb_pb2 import (
+    LTESubscription,
+    SubscriberData,
+    SubscriberState,
+)
+from lte.protos.mconfig.mconfigs_pb2 import SubscriberDB
+
+from magma.subscriberdb.processor import Processor
+from magma.subscriberdb.sid import SIDUtils
+from magma.subscriberdb.store.sqlite import SqliteStore
+
+PLMN = b'\x02\xf8\x59'
+
+
+def _get_imsi(sub):
+    return '00101%010d' % sub
+
+
+def _create_store(db_file, num_subscribers, with_opc):
+    store = SqliteStore(db_file)
+    subscribers = []
+    for sub in range(num_subscribers):
+        lte = LTESubscription(state=LTESubscription.ACTIVE,
+                              auth_key=os.urandom(16))
+        if with_opc:
+            lte.auth_opc = os.urandom(16)
+        subscribers.append(SubscriberData(
+            sid=SIDUtils.to_pb('IMSI' + _get_imsi(sub)), lte=lte,
+            state=SubscriberState(lte_auth_next_seq=1)))
+    store.resync(subscribers)
+    return store
+
+
+def _generate(processor, imsis, num_vectors):
+    if num_vectors == 1:
+        for imsi in imsis:
+            processor.generate_lte_auth_vector(imsi, PLMN)
+    else:
+        for imsi in imsis:
+            processor.generate_lte_auth_vectors(imsi, PLMN, num_vectors)
+
+
+def run(args):
+    sub_profile = SubscriberDB.SubscriptionProfile(
+        max_ul_bit_rate=10000, max_dl_bit_rate=5000)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for with_opc in (True, False):
+            db_file = os.path.join(tmp_dir, 'subscriber_%d.db' % with_opc)
+            store = _create_store(db_file, args.subscribers, with_opc)
+            processor = Processor(store, sub_profile, {}, os.urandom(16),
+                                  b'\x80\x00')
+            for num_vectors in args.vectors_per_request:
+                imsis = [_get_imsi(random.randrange(args.subscribers))
+                         for _ in range(args.requests // num_vectors)]
+                start = time.perf_counter()
+                _generate(processor, imsis, num_vectors)
+                elapsed = time.perf_counter() - start
+                print('%s, %d vectors per request: %d requests in %.1f ms, '
+                      '%.0f vectors/s' % (
+                          'With OPc' if with_opc else 'Without OPc',
+                          num_vectors, len(imsis), elapsed * 1000,
+                          len(imsis) * num_vectors / elapsed))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for subscriberdb auth vector generation',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=1000,
+                            help='Number of subscribers in the store')
+    arg_parser.add_argument('--requests', type=int, default=20000,
+                            help='Number of vectors generated per run')
+    arg_parser.add_argument('--vectors-per-request', type=int, nargs='+',
+                            default=[1, 5],
+                            help='Number of vectors per auth request')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Micro-benchmarks of the Diameter codec on typical S6a messages: decoding
+AIRs and ULRs and reading the AVPs the S6a application reads, and building
+and encoding the AIAs and ULAs answering them. The answers are generated by
+S6AApplication with a processor returning fixed vectors and profiles, so
+no store or crypto is involved.
+
+Usage:
+    python3 -m magma.subscriberdb.benchmarks.diameter_codec_benchmark \
+        --iterations 20000
+"""
+
+import argparse
+import time
+
+from lte.protos.mconfig.mconfigs_pb2 import SubscriberDB
+
+from magma.subscriberdb.protocols.diameter import avp, message
+from magma.subscriberdb.protocols.diameter.application import s6a
+
+REALM = 'magma.com'
+HOST = 'hss.magma.com'
+STATE_ID = 1
+IMSI = '001010000000001'
+PLMN = b'\x02\xf8\x59'
+EUTRAN_VECTOR = (16 * b'\x01', 8 * b'\x02', 16 * b'\x03', 32 * b'\x04')
+
+
+class _FixedProcessor:
+    """ Processor answering every subscriber with the same data """
+
+    # pylint:disable=unused-argument
+    def generate_lte_auth_vectors(self, imsi, plmn, num_vectors):
+        return num_vectors * [EUTRAN_VECTOR]
+
+    def get_sub_profile(self, imsi):
+        return SubscriberDB.SubscriptionProfile(max_ul_bit_rate=100000000,
+                                                max_dl_bit_rate=200000000)
+
+
+def _encode(msg):
+    buf = bytearray(msg.length)
+    msg.encode(buf, 0)
+    return bytes(buf)
+
+
+def _create_request(command_code, avps):
+    msg = message.Message()
+    msg.header.application_id = s6a.S6AApplication.APP_ID
+    msg.header.command_code = command_code
+    msg.header.request = True
+    msg.append_avp(avp.AVP('Session-Id', 'mme.magma.com;1;1;%s' % IMSI))
+    msg.append_avp(avp.AVP('Auth-Session-State', 1))
+    msg.append_avp(avp.AVP('Origin-Host', 'mme.magma.com'))
+    msg.append_avp(avp.AVP('Origin-Realm', REALM))
+    msg.append_avp(avp.AVP('Destination-Realm', REALM))
+    msg.append_avp(avp.AVP('User-Name', IMSI))
+    msg.append_avp(avp.AVP('Visited-PLMN-Id', PLMN))
+    for request_avp in avps:
+        msg.append_avp(request_avp)
+    return _encode(msg)
+
+
+def _create_air(num_vectors):
+    return _create_request(
+        s6a.S6AApplicationCommands.AUTHENTICATION_INFORMATION,
+        [avp.AVP('Requested-EUTRAN-Authentication-Info', [
+            avp.AVP('Number-Of-Requested-Vectors', num_vectors),
+            avp.AVP('Immediate-Response-Preferred', 0),
+        ])])
+
+
+def _create_ulr():
+    return _create_request(s6a.S6AApplicationCommands.UPDATE_LOCATION, [
+        avp.AVP('RAT-Type', 1004),
+        avp.AVP('ULR-Flags', 34),
+    ])
+
+
+def _read_air(payload):
+    msg = message.decode(memoryview(payload))
+    msg.has_fields(s6a.S6AApplication.REQUIRED_FIELDS[
+        s6a.S6AApplicationCommands.AUTHENTICATION_INFORMATION])
+    msg.find_avp(*avp.resolve('User-Name')).value
+    msg.find_avp(*avp.resolve('Visited-PLMN-Id')).value
+    eutran_info = msg.find_avp(
+        *avp.resolve('Requested-EUTRAN-Authentication-Info'))
+    eutran_info.find_avp(*avp.resolve('Re-Synchronization-Info'))
+    eutran_info.find_avp(*avp.resolve('Number-Of-Requested-Vectors')).value
+
+
+def _read_ulr(payload):
+    msg = message.decode(memoryview(payload))
+    msg.has_fields(s6a.S6AApplication.REQUIRED_FIELDS[
+        s6a.S6AApplicationCommands.UPDATE_LOCATION])
+    msg.find_avp(*avp.resolve('User-Name')).value
+
+
+def _time(name, func, payload, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(payload)
+    elapsed = time.perf_counter() - start
+    print('%s: %.1f us, %.0f/s' % (
+        name, elapsed / iterations * 1e6, iterations / elapsed))
+
+
+def run(args):
+    application = s6a.S6AApplication(_FixedProcessor(), REALM, HOST,
+                                     '127.0.0.1')
+    air = _create_air(1)
+    air5 = _create_air(5)
+    ulr = _create_ulr()
+
+    def answer(payload):
+        return _encode(application.answer_msg(
+            STATE_ID, message.decode(memoryview(payload))))
+
+    _time('AIR decode', _read_air, air, args.iterations)
+    _time('ULR decode', _read_ulr, ulr, args.iterations)
+    _time('AIR to encoded AIA, 1 vector', answer, air, args.iterations)
+    _time('AIR to encoded AIA, 5 vectors', answer, air5, args.iterations)
+    _time('ULR to encoded ULA', answer, ulr, args.iterations)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Micro-benchmarks of the Diameter codec',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--iterations', type=int, default=20000,
+                            help='Number of messages per benchmark')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
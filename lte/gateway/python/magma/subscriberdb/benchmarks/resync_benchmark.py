@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Replays cloud resyncs of a large subscriber list against a SqliteStore in a
+temporary db file, as SubscriberDBStreamerCallback would, and reports the
+time taken by each resync.
+
+Usage:
+    python3 -m magma.subscriberdb.benchmarks.resync_benchmark \
+        --subscribers 100000 --change-ratio 0.01
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from lte.protos.subscriberdb_pb2 import LTESubscription, SubscriberData
+
+from magma.subscriberdb.sid import SIDUtils
+from magma.subscriberdb.store.sqlite import SqliteStore
+
+
+def _create_subscriber(imsi):
+    sub = SubscriberData(sid=SIDUtils.to_pb('IMSI%015d' % imsi))
+    sub.lte.state = LTESubscription.ACTIVE
+    sub.lte.auth_key = os.urandom(16)
+    sub.lte.auth_opc = os.urandom(16)
+    sub.sub_profile = 'default'
+    return sub
+
+
+def _serialize(subscribers):
+    """ The store gets freshly parsed subscribers from every stream """
+    return [sub.SerializeToString() for sub in subscribers]
+
+
+def _parse(blobs):
+    subscribers = []
+    for blob in blobs:
+        sub = SubscriberData()
+        sub.ParseFromString(blob)
+        subscribers.append(sub)
+    return subscribers
+
+
+def _resync(store, name, blobs):
+    subscribers = _parse(blobs)
+    start = time.perf_counter()
+    store.resync(subscribers)
+    elapsed = time.perf_counter() - start
+    print('%s: %d subscribers in %.1f ms' % (
+        name, len(subscribers), elapsed * 1000))
+
+
+def run(args):
+    subscribers = [_create_subscriber(imsi)
+                   for imsi in range(args.subscribers)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SqliteStore(os.path.join(tmp_dir, 'subscriber.db'))
+        _resync(store, 'Initial resync', _serialize(subscribers))
+
+        # Attaches update the state of the subscribers between resyncs
+        for sub in random.sample(subscribers, len(subscribers) // 10):
+            with store.edit_subscriber(SIDUtils.to_str(sub.sid)) as data:
+                data.state.lte_auth_next_seq += 1
+
+        _resync(store, 'Unchanged resync', _serialize(subscribers))
+
+        num_changes = int(len(subscribers) * args.change_ratio)
+        for sub in random.sample(subscribers, num_changes):
+            sub.lte.auth_opc = os.urandom(16)
+        _resync(store, 'Resync with %d updates' % num_changes,
+                _serialize(subscribers))
+
+        del subscribers[:num_changes]
+        subscribers.extend(_create_subscriber(imsi) for imsi in range(
+            args.subscribers, args.subscribers + num_changes))
+        _resync(store, 'Resync with %d deletes and inserts' % num_changes,
+                _serialize(subscribers))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for subscriberdb resyncs',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=100000,
+                            help='Number of subscribers streamed')
+    arg_parser.add_argument('--change-ratio', type=float, default=0.01,
+                            help='Ratio of subscribers updated, and '
+                                 'replaced, between resyncs')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Load generator for the S6a server. Starts an S6aServer in a child process,
+backed by a SqliteStore in a temporary db file, then keeps a number of
+Authentication-Information-Requests in flight on several MME connections
+and reports the throughput and latency of the answers. The server is run
+once for each of the given numbers of workers, 0 answering the requests on
+the event loop.
+
+Usage:
+    python3 -m magma.subscriberdb.benchmarks.s6a_load_benchmark \
+        --subscribers 1000 --connections 4 --concurrency 1000 \
+        --requests 20000 --workers 0 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import struct
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lte.protos.mconfig.mconfigs_pb2 import SubscriberDB
+from lte.protos.subscriberdb_pb2 import (
+    LTESubscription,
+    SubscriberData,
+    SubscriberState,
+)
+
+from magma.subscriberdb.processor import Processor
+from magma.subscriberdb.protocols.diameter import avp, message
+from magma.subscriberdb.protocols.diameter.application import base, s6a
+from magma.subscriberdb.protocols.diameter.server import S6aServer
+from magma.subscriberdb.sid import SIDUtils
+from magma.subscriberdb.store.sqlite import SqliteStore
+
+REALM = 'magma.com'
+HOST = 'hss.magma.com'
+HOST_ADDRESS = '127.0.0.1'
+PLMN = b'\x02\xf8\x59'
+# Offset of the Hop-by-Hop Identifier in the Diameter header
+HOP_BY_HOP_OFFSET = 12
+
+
+def _get_imsi(sub):
+    return '00101%010d' % sub
+
+
+def _create_store(db_file, num_subscribers):
+    store = SqliteStore(db_file)
+    store.resync([
+        SubscriberData(
+            sid=SIDUtils.to_pb('IMSI' + _get_imsi(sub)),
+            lte=LTESubscription(state=LTESubscription.ACTIVE,
+                                auth_key=os.urandom(16),
+                                auth_opc=os.urandom(16)),
+            state=SubscriberState(lte_auth_next_seq=1))
+        for sub in range(num_subscribers)])
+    return store
+
+
+def _serve(db_file, port, num_workers, ready):
+    """ Runs the S6a server, in the child process """
+    store = SqliteStore(db_file)
+    sub_profile = SubscriberDB.SubscriptionProfile(
+        max_ul_bit_rate=10000, max_dl_bit_rate=5000)
+    processor = Processor(store, sub_profile, {}, os.urandom(16),
+                          b'\x80\x00')
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    base_manager = base.BaseApplication(REALM, HOST, HOST_ADDRESS)
+    s6a_manager = s6a.S6AApplication(processor, REALM, HOST, HOST_ADDRESS,
+                                     loop)
+    base_manager.register(s6a_manager)
+    executor = ThreadPoolExecutor(max_workers=num_workers) \
+        if num_workers else None
+    loop.run_until_complete(loop.create_server(
+        lambda: S6aServer(base_manager, s6a_manager, REALM, HOST,
+                          loop=loop, executor=executor),
+        HOST_ADDRESS, port))
+    ready.set()
+    loop.run_forever()
+
+
+def _encode_air(imsi):
+    msg = message.Message()
+    msg.header.application_id = s6a.S6AApplication.APP_ID
+    msg.header.command_code = \
+        s6a.S6AApplicationCommands.AUTHENTICATION_INFORMATION
+    msg.header.request = True
+    msg.append_avp(avp.AVP('Session-Id', 'mme.magma.com;%s' % imsi))
+    msg.append_avp(avp.AVP('Auth-Session-State', 1))
+    msg.append_avp(avp.AVP('User-Name', imsi))
+    msg.append_avp(avp.AVP('Visited-PLMN-Id', PLMN))
+    msg.append_avp(avp.AVP('Requested-EUTRAN-Authentication-Info', [
+        avp.AVP('Number-Of-Requested-Vectors', 1),
+        avp.AVP('Immediate-Response-Preferred', 0),
+    ]))
+    buf = bytearray(msg.length)
+    msg.encode(buf, 0)
+    return buf
+
+
+class _MMEClient(asyncio.Protocol):
+    """
+    MME connection keeping a number of AIRs in flight. The requests are
+    pre-encoded, only their Hop-by-Hop Identifier is set before sending.
+    """
+
+    def __init__(self, requests, concurrency, num_requests, latencies, done):
+        self._requests = requests
+        self._concurrency = concurrency
+        self._remaining = num_requests
+        self._latencies = latencies
+        self._done = done
+        self._sent = {}  # {hop by hop id: send time}
+        self._next_id = 0
+        self._readbuf = bytearray()
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+        for _ in range(min(self._concurrency, self._remaining)):
+            self._send()
+
+    def data_received(self, data):
+        self._readbuf.extend(data)
+        begin = 0
+        while len(self._readbuf) - begin >= message.HEADER_LEN:
+            length = int.from_bytes(self._readbuf[begin + 1:begin + 4], 'big')
+            if len(self._readbuf) - begin < length:
+                break
+            hop_by_hop_id, = struct.unpack_from(
+                '!I', self._readbuf, begin + HOP_BY_HOP_OFFSET)
+            if not self._latencies:
+                # Check the first answer only, decoding costs as much as
+                # the rest of the client
+                answer = message.decode(
+                    bytes(self._readbuf[begin:begin + length]))
+                result = answer.find_avp(*avp.resolve('Result-Code'))
+                assert result.value == avp.ResultCode.DIAMETER_SUCCESS
+            self._latencies.append(
+                time.perf_counter() - self._sent.pop(hop_by_hop_id))
+            begin += length
+            if self._remaining:
+                self._send()
+            elif not self._sent:
+                self._done.set_result(None)
+        del self._readbuf[:begin]
+
+    def connection_lost(self, exc):
+        if not self._done.done():
+            self._done.set_exception(
+                exc or ConnectionError('S6a server closed the connection'))
+
+    def _send(self):
+        req = random.choice(self._requests)
+        struct.pack_into('!I', req, HOP_BY_HOP_OFFSET, self._next_id)
+        self._sent[self._next_id] = time.perf_counter()
+        self._next_id += 1
+        self._remaining -= 1
+        self._transport.write(bytes(req))
+
+
+def _load(port, requests, args):
+    loop = asyncio.new_event_loop()
+    latencies = []
+    done = []
+    requests_per_connection = args.requests // args.connections
+    concurrency = max(1, args.concurrency // args.connections)
+    for _ in range(args.connections):
+        future = loop.create_future()
+        done.append(future)
+        loop.run_until_complete(loop.create_connection(
+            lambda future=future: _MMEClient(
+                requests, concurrency, requests_per_connection, latencies,
+                future),
+            HOST_ADDRESS, port))
+    start = time.perf_counter()
+    loop.run_until_complete(asyncio.gather(*done))
+    elapsed = time.perf_counter() - start
+    loop.close()
+    return elapsed, latencies
+
+
+def _percentile(sorted_values, ratio):
+    return sorted_values[min(len(sorted_values) - 1,
+                             int(len(sorted_values) * ratio))]
+
+
+def run(args):
+    requests = [_encode_air(_get_imsi(sub))
+                for sub in range(args.subscribers)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, 'subscriber.db')
+        _create_store(db_file, args.subscribers)
+        for num_workers in args.workers:
+            ready = multiprocessing.Event()
+            port = args.port + num_workers
+            server = multiprocessing.Process(
+                target=_serve, args=(db_file, port, num_workers, ready))
+            server.start()
+            try:
+                ready.wait()
+                elapsed, latencies = _load(port, requests, args)
+            finally:
+                server.terminate()
+                server.join()
+            latencies.sort()
+            print('%d workers: %d AIRs with %d in flight in %.1f s, '
+                  '%.0f AIR/s, latency p50 %.1f ms, p99 %.1f ms, '
+                  'max %.1f ms' % (
+                      num_workers, len(latencies), args.concurrency,
+                      elapsed, len(latencies) / elapsed,
+                      _percentile(latencies, 0.5) * 1000,
+                      _percentile(latencies, 0.99) * 1000,
+                      latencies[-1] * 1000))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Load generator for the subscriberdb S6a server',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--subscribers', type=int, default=1000,
+                            help='Number of subscribers in the store')
+    arg_parser.add_argument('--connections', type=int, default=4,
+                            help='Number of MME connections')
+    arg_parser.add_argument('--concurrency', type=int, default=1000,
+                            help='Number of AIRs in flight, spread over '
+                                 'the connections')
+    arg_parser.add_argument('--requests', type=int, default=20000,
+                            help='Total number of AIRs sent')
+    arg_parser.add_argument('--workers', type=int, nargs='+',
+                            default=[0, 4],
+                            help='Numbers of S6a workers to run the '
+                                 'server with')
+    arg_parser.add_argument('--port', type=int, default=38680,
+                            help='Port of the server with 0 workers, the '
+                                 'number of workers is added to it')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -49,3 +49,17 @@ class BaseLTEAuthAlgo(metaclass=abc.ABCMeta):
             kasme (bytes): 256 bit base network authentication code
         """
         pass
+
+    def generate_eutran_vectors(self, keys, sqns, plmn):
+        """
+        Generate an E-EUTRAN key vector for each of the sequence numbers.
+        Algos that can reuse the keys between vectors should override this.
+        Args:
+            keys: subscriber keys with a key and an opc attribute
+            sqns (list of int): 48 bit sequence numbers
+            plmn (bytes): 24 bit network identifer
+        Returns:
+            list of (rand, xres, autn, kasme) vectors, one per SQN
+        """
+        return [self.generate_eutran_vector(keys.key, keys.opc, sqn, plmn)
+                for sqn in sqns]
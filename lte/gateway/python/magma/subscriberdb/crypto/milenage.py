@@ -18,6 +18,31 @@ from Crypto.Random import random
 from .lte import BaseLTEAuthAlgo
 
 
+class MilenageKeys:
+    """
+    Keys of a subscriber for Milenage: the subscriber key, the OPc and the
+    AES key schedule of the subscriber key, so that they can be kept from
+    one vector to the next.
+    """
+
+    def __init__(self, key, opc):
+        """
+        Args:
+            key (bytes): 128 bit subscriber key
+            opc (bytes): 128 bit operator variant algorithm configuration field
+        """
+        self.key = key
+        self.opc = opc
+        # A single block CBC with a zero IV, as in Milenage.encrypt, is ECB
+        self._cipher = AES.new(bytes(key), AES.MODE_ECB)
+
+    def encrypt(self, buf):
+        """
+        Encrypt a 128 bit buffer with the subscriber key
+        """
+        return self._cipher.encrypt(bytes(buf))
+
+
 class Milenage(BaseLTEAuthAlgo):
     """
     Milenage Algorithm (3GPP TS 35.205, .206, .207, .208)
@@ -41,13 +66,47 @@ class Milenage(BaseLTEAuthAlgo):
             autn (bytes): 128 bit authentication token
             kasme (bytes): 256 bit base network authentication code
         """
+        return self._generate_eutran_vector(MilenageKeys(key, opc), sqn, plmn)
+
+    def generate_eutran_vectors(self, keys, sqns, plmn):
+        """
+        Generate an E-EUTRAN key vector for each of the sequence numbers,
+        reusing the key schedule of the subscriber key.
+        Args:
+            keys (MilenageKeys): keys of the subscriber
+            sqns (list of int): 48 bit sequence numbers
+            plmn (bytes): 24 bit network identifer
+        Returns:
+            list of (rand, xres, autn, kasme) vectors, one per SQN
+        """
+        return [self._generate_eutran_vector(keys, sqn, plmn)
+                for sqn in sqns]
+
+    def _generate_eutran_vector(self, keys, sqn, plmn):
+        """
+        Compute f1 to f5 from a single TEMP = E_K(RAND XOR OP_C), see the
+        classmethods for each function
+        """
         sqn_bytes = bytearray.fromhex('{:012x}'.format(sqn))
         rand = Milenage.generate_rand()
+        opc = keys.opc
+
+        temp = keys.encrypt(xor(rand, opc))
+        temp_x_opc = xor(temp, opc)
+
+        in1 = (sqn_bytes[0:6] + self.amf[0:2]) * 2
+        out1 = xor(opc, keys.encrypt(xor(temp, rotate(xor(in1, opc), 8))))
+        mac_a = out1[:8]
+
+        c2 = 15 * b'\x00' + b'\x01'
+        out2 = xor(keys.encrypt(xor(rotate(temp_x_opc, 0), c2)), opc)
+        xres, ak = out2[8:16], out2[0:6]
+
+        c3 = 15 * b'\x00' + b'\x02'
+        ck = xor(keys.encrypt(xor(rotate(temp_x_opc, 4), c3)), opc)
 
-        mac_a, _ = Milenage.f1(key, sqn_bytes, rand, opc, self.amf)
-        xres, ak = Milenage.f2_f5(key, rand, opc)
-        ck = Milenage.f3(key, rand, opc)
-        ik = Milenage.f4(key, rand, opc)
+        c4 = 15 * b'\x00' + b'\x04'
+        ik = xor(keys.encrypt(xor(rotate(temp_x_opc, 8), c4)), opc)
 
         autn = Milenage.generate_autn(sqn_bytes, ak, mac_a, self.amf)
         kasme = Milenage.generate_kasme(ck, ik, plmn, sqn_bytes, ak)
@@ -331,7 +390,8 @@ def xor(s1, s2):
     """
     if len(s1) != len(s2):
         raise ValueError('Input not equal length: %d %d' % (len(s1), len(s2)))
-    return bytes(a ^ b for a, b in zip(s1, s2))
+    result = int.from_bytes(s1, 'big') ^ int.from_bytes(s2, 'big')
+    return result.to_bytes(len(s1), 'big')
 
 
 def rotate(input_s, bytes_):
@@ -344,5 +404,5 @@ def rotate(input_s, bytes_):
     Returns:
         (bytes) s1 rotated by n bytes
     """
-    return bytes(input_s[(i + bytes_) % len(input_s)] for i in range(len(
-        input_s)))
+    bytes_ %= len(input_s)
+    return bytes(input_s[bytes_:]) + bytes(input_s[:bytes_])
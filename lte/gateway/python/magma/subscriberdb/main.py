@@ -12,15 +12,18 @@ limitations under the License.
 """
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from magma.common.service import MagmaService
 from magma.common.streamer import StreamerClient
 from .processor import Processor
 from .protocols.diameter.application import base, s6a
-from .protocols.diameter.server import S6aServer
+from .protocols.diameter.server import DEFAULT_MAX_IN_FLIGHT, \
+    DEFAULT_S6A_WORKERS, S6aServer
 from .rpc_servicer import SubscriberDBRpcServicer
 from .subscription_profile import get_default_sub_profile
 from .streamer_callback import SubscriberDBStreamerCallback
+from .store.cached_store import CachedStore
 from .store.sqlite import SqliteStore
 from .protocols.s6a_proxy_servicer import S6aProxyRpcServicer
 from lte.protos.mconfig import mconfigs_pb2
@@ -32,6 +35,9 @@ def main():
 
     # Initialize a store to keep all subscriber data.
     store = SqliteStore(service.config['db_path'], loop=service.loop)
+    cache_capacity = service.config.get('cache_capacity', 0)
+    if cache_capacity:
+        store = CachedStore(store, cache_capacity, loop=service.loop)
 
     # Initialize the processor
     processor = Processor(store,
@@ -71,13 +77,26 @@ def main():
             s6a_manager = _get_s6a_manager(service, processor)
             base_manager.register(s6a_manager)
 
+            s6a_workers = service.config.get('s6a_workers',
+                                             DEFAULT_S6A_WORKERS)
+            executor = None
+            if s6a_workers and not s6a_manager.ANSWERS_SYNCHRONOUSLY:
+                logging.info('S6a requests are relayed, s6a_workers is '
+                             'ignored')
+            elif s6a_workers:
+                executor = ThreadPoolExecutor(max_workers=s6a_workers)
+            max_in_flight = service.config.get('s6a_max_in_flight',
+                                               DEFAULT_MAX_IN_FLIGHT)
+
             # Setup the Diameter/s6a MME
             s6a_server = service.loop.create_server(
                 lambda: S6aServer(base_manager,
-                              s6a_manager,
-                              service.config['mme_realm'],
-                              service.config['mme_host_name'],
-                              loop=service.loop),
+                                  s6a_manager,
+                                  service.config['mme_realm'],
+                                  service.config['mme_host_name'],
+                                  loop=service.loop,
+                                  executor=executor,
+                                  max_in_flight=max_in_flight),
                 service.config['host_address'], service.config['mme_port'])
             asyncio.ensure_future(s6a_server, loop=service.loop)
     asyncio.ensure_future(serve(), loop=service.loop)
@@ -11,7 +11,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
 
 
 # Counters for Diameter/S6a application
@@ -21,6 +21,12 @@ S6A_AUTH_FAILURE_TOTAL = Counter('s6a_auth_failure',
                                   'Total failed S6a auth requests with reason', ['code'])
 S6A_LUR_TOTAL = Counter('s6a_location_update',
                          'Total S6a location update requests')
+S6A_REQUEST_LATENCY_MS = Histogram('s6a_request_latency_ms',
+                                   'Time to answer S6a requests in '
+                                   'milliseconds, by command code',
+                                   ['command'],
+                                   buckets=[1, 2, 5, 10, 20, 50, 100, 200,
+                                            500, 1000])
 
 DIAMETER_AUTHENTICATION_REJECTED = 4001
 DIAMETER_ERROR_USER_UNKNOWN = 5001
@@ -32,3 +38,13 @@ DIAMETER_WATCHDOG_TOTAL = Counter('diameter_watchdog',
                                   'Total Diameter watchdog requests')
 DIAMETER_DISCONECT_TOTAL = Counter('diameter_disconnect',
                                    'Total Diameter disconnect requests')
+
+# Counters for the subscriber cache, type is subscriber for cached
+# subscribers and unknown for cached lookups of unknown subscribers
+SUBSCRIBER_CACHE_HITS = Counter('subscriberdb_cache_hits',
+                                'Total subscriber cache hits', ['type'])
+SUBSCRIBER_CACHE_MISSES = Counter('subscriberdb_cache_misses',
+                                  'Total subscriber cache misses')
+SUBSCRIBER_CACHE_EVICTIONS = Counter('subscriberdb_cache_evictions',
+                                     'Total subscriber cache evictions',
+                                     ['type'])
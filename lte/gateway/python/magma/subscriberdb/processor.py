@@ -13,6 +13,9 @@ limitations under the License.
 """
 
 import abc
+import threading
+from collections import OrderedDict
+
 from lte.protos.subscriberdb_pb2 import (
     GSMSubscription,
     LTESubscription,
@@ -21,9 +24,14 @@ from lte.protos.subscriberdb_pb2 import (
 
 from magma.subscriberdb.sid import SIDUtils
 from .crypto.gsm import UnsafePreComputedA3A8
-from .crypto.milenage import Milenage
+from .crypto.milenage import Milenage, MilenageKeys
 from .crypto.utils import CryptoError
 
+# Number of subscribers whose derived keys are kept by the Processor
+MILENAGE_KEYS_CACHE_CAPACITY = 4096
+# Most E-UTRAN vectors returned for a single auth request
+MAX_EUTRAN_VECTORS = 5
+
 
 class GSMProcessor(metaclass=abc.ABCMeta):
     """
@@ -100,6 +108,24 @@ class LTEProcessor(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def generate_lte_auth_vectors(self, imsi, plmn, num_vectors):
+        """
+        Returns num_vectors E-UTRAN key vectors for the subscriber, with
+        consecutive sequence numbers.
+
+        Args:
+            imsi: the subscriber identifier
+            plmn (bytes): 24 bit network identifer
+            num_vectors (int): number of vectors to generate
+        Returns:
+            list of (rand, xres, autn, kasme) vectors
+        Raises:
+            SubscriberNotFoundError if the subscriber is not present
+            CryptoError if the auth tuple couldn't be generated
+        """
+        return [self.generate_lte_auth_vector(imsi, plmn)
+                for _ in range(num_vectors)]
+
 
 class Processor(GSMProcessor, LTEProcessor):
     """
@@ -121,6 +147,9 @@ class Processor(GSMProcessor, LTEProcessor):
         self._amf = amf
         self._default_sub_profile = default_sub_profile
         self._sub_profiles = sub_profiles
+        # LRU of {sid: (auth_key, auth_opc, MilenageKeys)}
+        self._milenage_keys = OrderedDict()
+        self._milenage_keys_lock = threading.Lock()
         if len(op) != 16:
             raise ValueError("OP is invalid len=%d value=%s" % (len(op), op))
         if len(amf) != 2:
@@ -171,30 +200,27 @@ class Processor(GSMProcessor, LTEProcessor):
         Returns the lte auth vector for the subscriber by querying the store
         for the crypto algo and secret keys.
         """
-        sid = SIDUtils.to_str(SubscriberID(id=imsi, type=SubscriberID.IMSI))
-        subs = self._store.get_subscriber_data(sid)
-
-        if subs.lte.state != LTESubscription.ACTIVE:
-            raise CryptoError("LTE service not active for %s" % sid)
-
-        if subs.lte.auth_algo != LTESubscription.MILENAGE:
-            raise CryptoError("Unknown crypto (%s) for %s" %
-                              (subs.lte.auth_algo, sid))
+        return self.generate_lte_auth_vectors(imsi, plmn, 1)[0]
 
-        if len(subs.lte.auth_key) != 16:
-            raise CryptoError("Subscriber key not valid for %s" % sid)
+    def generate_lte_auth_vectors(self, imsi, plmn, num_vectors):
+        """
+        Returns lte auth vectors for the subscriber. The sequence numbers of
+        all the vectors are reserved with a single edit of the subscriber.
+        """
+        sid = SIDUtils.to_str(SubscriberID(id=imsi, type=SubscriberID.IMSI))
 
-        if len(subs.lte.auth_opc) == 0:
-            opc = Milenage.generate_opc(subs.lte.auth_key, self._op)
-        elif len(subs.lte.auth_opc) != 16:
-            raise CryptoError("Subscriber OPc is invalid length for %s" % sid)
-        else:
-            opc = subs.lte.auth_opc
+        # Increment the sequence number.
+        # The 3GPP TS 33.102 spec allows wrapping around the maximum value.
+        # The re-synchronization mechanism would be used to sync the counter
+        # between USIM and HSS when it happens.
+        with self._store.edit_subscriber(sid) as subs:
+            keys = self._get_milenage_keys(sid, subs)
+            seq = subs.state.lte_auth_next_seq
+            subs.state.lte_auth_next_seq += num_vectors
 
-        sqn = self.seq_to_sqn(self.get_next_lte_auth_seq(imsi))
+        sqns = [self.seq_to_sqn(seq + i) for i in range(num_vectors)]
         milenage = Milenage(self._amf)
-        return milenage.generate_eutran_vector(subs.lte.auth_key,
-                                               opc, sqn, plmn)
+        return milenage.generate_eutran_vectors(keys, sqns, plmn)
 
     def resync_lte_auth_seq(self, imsi, rand, auts):
         """
@@ -203,23 +229,8 @@ class Processor(GSMProcessor, LTEProcessor):
         """
         sid = SIDUtils.to_str(SubscriberID(id=imsi, type=SubscriberID.IMSI))
         subs = self._store.get_subscriber_data(sid)
-
-        if subs.lte.state != LTESubscription.ACTIVE:
-            raise CryptoError("LTE service not active for %s" % sid)
-
-        if subs.lte.auth_algo != LTESubscription.MILENAGE:
-            raise CryptoError("Unknown crypto (%s) for %s" %
-                              (subs.lte.auth_algo, sid))
-
-        if len(subs.lte.auth_key) != 16:
-            raise CryptoError("Subscriber key not valid for %s" % sid)
-
-        if len(subs.lte.auth_opc) == 0:
-            opc = Milenage.generate_opc(subs.lte.auth_key, self._op)
-        elif len(subs.lte.auth_opc) != 16:
-            raise CryptoError("Subscriber OPc is invalid length for %s" % sid)
-        else:
-            opc = subs.lte.auth_opc
+        keys = self._get_milenage_keys(sid, subs)
+        opc = keys.opc
 
         dummy_amf = b'\x00\x00'  # Use dummy AMF for re-synchronization
         milenage = Milenage(dummy_amf)
@@ -269,6 +280,48 @@ class Processor(GSMProcessor, LTEProcessor):
         with self._store.edit_subscriber(sid) as subs:
             subs.state.lte_auth_next_seq = seq
 
+    def _get_milenage_keys(self, sid, subs):
+        """
+        Returns the MilenageKeys of the subscriber, from the cache if the
+        key and OPc of the subscriber didn't change since they were derived.
+
+        Raises:
+            CryptoError if the subscriber can't use Milenage
+        """
+        if subs.lte.state != LTESubscription.ACTIVE:
+            raise CryptoError("LTE service not active for %s" % sid)
+
+        if subs.lte.auth_algo != LTESubscription.MILENAGE:
+            raise CryptoError("Unknown crypto (%s) for %s" %
+                              (subs.lte.auth_algo, sid))
+
+        auth_key = subs.lte.auth_key
+        auth_opc = subs.lte.auth_opc
+        with self._milenage_keys_lock:
+            cached = self._milenage_keys.get(sid)
+            if cached is not None and cached[0] == auth_key and \
+                    cached[1] == auth_opc:
+                self._milenage_keys.move_to_end(sid)
+                return cached[2]
+
+        if len(auth_key) != 16:
+            raise CryptoError("Subscriber key not valid for %s" % sid)
+
+        if len(auth_opc) == 0:
+            opc = Milenage.generate_opc(auth_key, self._op)
+        elif len(auth_opc) != 16:
+            raise CryptoError("Subscriber OPc is invalid length for %s" % sid)
+        else:
+            opc = auth_opc
+
+        keys = MilenageKeys(auth_key, opc)
+        with self._milenage_keys_lock:
+            self._milenage_keys[sid] = (auth_key, auth_opc, keys)
+            self._milenage_keys.move_to_end(sid)
+            if len(self._milenage_keys) > MILENAGE_KEYS_CACHE_CAPACITY:
+                self._milenage_keys.popitem(last=False)
+        return keys
+
     def get_sub_data(self, imsi):
         """
         Returns the complete subscriber profile for subscriber.
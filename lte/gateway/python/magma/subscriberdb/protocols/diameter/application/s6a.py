@@ -17,11 +17,17 @@ import logging
 from . import abc
 from magma.subscriberdb.protocols.diameter import avp, message
 from magma.subscriberdb.crypto.utils import CryptoError
+from magma.subscriberdb.processor import MAX_EUTRAN_VECTORS
 from magma.subscriberdb.store.base import SubscriberNotFoundError
 from magma.subscriberdb.metrics import (S6A_AUTH_SUCCESS_TOTAL,
                                         S6A_AUTH_FAILURE_TOTAL,
                                         S6A_LUR_TOTAL)
 
+# Most pre-encoded AVP sets kept for answers, the cache is cleared when full
+MAX_PRE_ENCODED_AVPS = 64
+ULA_FLAGS = avp.PreEncodedAVP(avp.AVP('ULA-Flags', 1))
+
+
 @unique
 class S6AApplicationCommands(IntEnum):
     # Command codes defined in this application used in msg header
@@ -39,6 +45,9 @@ class S6AApplication(abc.Application):
     """
     # The ID this application uses for messages
     APP_ID = 16777251
+    # Whether answer_msg answers the requests, so that they can be answered
+    # by worker threads
+    ANSWERS_SYNCHRONOUSLY = True
     # The Vendor-Specific-Application-Id and VendorId AVPs that
     # the S6a application should advertise
     CAPABILITIES_EXCHANGE_AVPS = [
@@ -76,6 +85,10 @@ class S6AApplication(abc.Application):
         """
         super(S6AApplication, self).__init__(realm, host, host_ip, loop)
         self.lte_processor = lte_processor
+        # The AVPs ending the answers, by (state_id, result_code)
+        self._answer_avps = {}
+        # The ULA Subscription-Data, by (max_ul_bit_rate, max_dl_bit_rate)
+        self._subscription_data = {}
 
     def handle_msg(self, state_id, msg):
         """
@@ -99,6 +112,30 @@ class S6AApplication(abc.Application):
         else:
             logging.error('Unsupported command: %d', msg.command_code)
 
+    def answer_msg(self, state_id, msg):
+        """
+        Generate the answer to an incoming S6a/S6d request without sending
+        it. Nothing is written to the application writer, so this can be
+        called from worker threads.
+
+        Args:
+            state_id: the server state identifier
+            msg: the message to handle
+        Returns:
+            the answer message, or None if there is nothing to answer
+        """
+        if not msg.header.request:
+            logging.warning("Received unsolicited answer")
+            return None
+
+        if msg.header.command_code == \
+            S6AApplicationCommands.AUTHENTICATION_INFORMATION:
+            return self._gen_auth_answer(state_id, msg)
+        elif msg.header.command_code == S6AApplicationCommands.UPDATE_LOCATION:
+            return self._gen_location_answer(state_id, msg)
+        logging.error('Unsupported command: %d', msg.header.command_code)
+        return None
+
     def validate_message(self, state_id, msg):
         """
         Validate a message and send the appropriate error response
@@ -110,16 +147,30 @@ class S6AApplication(abc.Application):
         Returns:
             True if the message validated
         """
+        resp = self._gen_validation_error(state_id, msg)
+        if resp is not None:
+            self.writer.send_msg(resp)
+            return False
+        return True
+
+    def _gen_validation_error(self, state_id, msg):
+        """
+        Generate the error answer to a message missing required fields
+
+        Args:
+            state_id: the server state_id
+            msg: the message to validate
+        Returns:
+            the error answer, or None if the message validated
+        """
         # Validate we have all required fields
         required_fields = self.REQUIRED_FIELDS[msg.header.command_code]
         if not msg.has_fields(required_fields):
             logging.error("Missing AVP for s6a command %d",
                           msg.header.command_code)
-            resp = self._gen_response(state_id, msg,
+            return self._gen_response(state_id, msg,
                                       avp.ResultCode.DIAMETER_MISSING_AVP)
-            self.writer.send_msg(resp)
-            return False
-        return True
+        return None
 
     def _gen_response(self, state_id, msg, result_code, body_avps=None):
         """
@@ -145,18 +196,33 @@ class S6AApplication(abc.Application):
         for body_avp in body_avps:
             resp_msg.append_avp(body_avp)
 
-        # Auth-Session-State is NO_STATE_MAINTAINED (1)
-        resp_msg.append_avp(avp.AVP('Auth-Session-State', 1))
-
-        # Host identifiers
-        resp_msg.append_avp(avp.AVP('Origin-Host', self.host))
-        resp_msg.append_avp(avp.AVP('Origin-Realm', self.realm))
-        resp_msg.append_avp(avp.AVP('Origin-State-Id', state_id))
-
-        # Response result
-        resp_msg.append_avp(avp.AVP('Result-Code', result_code))
+        for answer_avp in self._get_answer_avps(state_id, result_code):
+            resp_msg.append_avp(answer_avp)
         return resp_msg
 
+    def _get_answer_avps(self, state_id, result_code):
+        """
+        Returns the AVPs ending every answer, which only depend on the server
+        state id and the result code, encoded once.
+        """
+        key = (state_id, result_code)
+        answer_avps = self._answer_avps.get(key)
+        if answer_avps is None:
+            answer_avps = [avp.PreEncodedAVP(answer_avp) for answer_avp in [
+                # Auth-Session-State is NO_STATE_MAINTAINED (1)
+                avp.AVP('Auth-Session-State', 1),
+                # Host identifiers
+                avp.AVP('Origin-Host', self.host),
+                avp.AVP('Origin-Realm', self.realm),
+                avp.AVP('Origin-State-Id', state_id),
+                # Response result
+                avp.AVP('Result-Code', result_code),
+            ]]
+            if len(self._answer_avps) >= MAX_PRE_ENCODED_AVPS:
+                self._answer_avps.clear()
+            self._answer_avps[key] = answer_avps
+        return answer_avps
+
     def _send_auth(self, state_id, msg):
         """
         Handles an incoming 3GPP-Authentication-Information-Request
@@ -168,9 +234,23 @@ class S6AApplication(abc.Application):
         Returns:
             None
         """
+        self.writer.send_msg(self._gen_auth_answer(state_id, msg))
+
+    def _gen_auth_answer(self, state_id, msg):
+        """
+        Generates the 3GPP-Authentication-Information-Answer to an incoming
+        3GPP-Authentication-Information-Request
+
+        Args:
+            state_id: the server state id
+            msg: an auth request message
+        Returns:
+            the answer message
+        """
         # Validate the message
-        if not self.validate_message(state_id, msg):
-            return
+        resp = self._gen_validation_error(state_id, msg)
+        if resp is not None:
+            return resp
         imsi = ""
         try:
             imsi = msg.find_avp(*avp.resolve('User-Name')).value
@@ -187,15 +267,20 @@ class S6AApplication(abc.Application):
                 auts = re_sync_info.value[16:]
                 self.lte_processor.resync_lte_auth_seq(imsi, rand, auts)
 
-            rand, xres, autn, kasme = \
-                self.lte_processor.generate_lte_auth_vector(imsi, plmn)
+            num_vectors_avp = request_eutran_info.find_avp(
+                *avp.resolve('Number-Of-Requested-Vectors'))
+            num_vectors = num_vectors_avp.value if num_vectors_avp else 1
+            num_vectors = max(1, min(num_vectors, MAX_EUTRAN_VECTORS))
+            vectors = self.lte_processor.generate_lte_auth_vectors(
+                imsi, plmn, num_vectors)
 
             auth_info = avp.AVP('Authentication-Info', [
                 avp.AVP('E-UTRAN-Vector', [
                     avp.AVP('RAND', rand),
                     avp.AVP('XRES', xres),
                     avp.AVP('AUTN', autn),
-                    avp.AVP('KASME', kasme)])])
+                    avp.AVP('KASME', kasme)])
+                for rand, xres, autn, kasme in vectors])
 
             S6A_AUTH_SUCCESS_TOTAL.inc()
             resp = self._gen_response(state_id, msg,
@@ -214,8 +299,7 @@ class S6AApplication(abc.Application):
             resp = self._gen_response(
                 state_id, msg, avp.ResultCode.DIAMETER_ERROR_USER_UNKNOWN)
             logging.warning("Subscriber not found: %s", e)
-
-        self.writer.send_msg(resp)
+        return resp
 
     def _send_location_request(self, state_id, msg):
         """
@@ -228,11 +312,25 @@ class S6AApplication(abc.Application):
         Returns:
             None
         """
-        # Validate the message
-        if not self.validate_message(state_id, msg):
-            return
+        resp = self._gen_location_answer(state_id, msg)
+        if resp is not None:
+            self.writer.send_msg(resp)
 
-        ula_flags = avp.AVP('ULA-Flags', 1)
+    def _gen_location_answer(self, state_id, msg):
+        """
+        Generates the 3GPP-Update-Location-Answer to an incoming
+        3GPP-Update-Location-Request
+
+        Args:
+            state_id: the server state id
+            msg: an update location request message
+        Returns:
+            the answer message, or None if the subscriber is unknown
+        """
+        # Validate the message
+        resp = self._gen_validation_error(state_id, msg)
+        if resp is not None:
+            return resp
 
         try:
             imsi = msg.find_avp(*avp.resolve('User-Name')).value
@@ -241,7 +339,23 @@ class S6AApplication(abc.Application):
             resp = self._gen_response(
                 state_id, msg, avp.ResultCode.DIAMETER_ERROR_USER_UNKNOWN)
             logging.warning('Subscriber not found for ULR: %s', e)
-            return
+            return None
+
+        S6A_LUR_TOTAL.inc()
+        return self._gen_response(state_id, msg,
+                                  avp.ResultCode.DIAMETER_SUCCESS,
+                                  [ULA_FLAGS,
+                                   self._get_subscription_data(profile)])
+
+    def _get_subscription_data(self, profile):
+        """
+        Returns the Subscription-Data AVP of a subscription profile, encoded
+        once per profile.
+        """
+        key = (profile.max_ul_bit_rate, profile.max_dl_bit_rate)
+        subscription_data = self._subscription_data.get(key)
+        if subscription_data is not None:
+            return subscription_data
 
         # Stubbed out Subscription Data from OAI
         subscription_data = avp.AVP('Subscription-Data', [
@@ -277,9 +391,8 @@ class S6AApplication(abc.Application):
                 ])
             ]),
         ])
-
-        S6A_LUR_TOTAL.inc()
-        resp = self._gen_response(state_id, msg,
-                                  avp.ResultCode.DIAMETER_SUCCESS,
-                                  [ula_flags, subscription_data])
-        self.writer.send_msg(resp)
+        subscription_data = avp.PreEncodedAVP(subscription_data)
+        if len(self._subscription_data) >= MAX_PRE_ENCODED_AVPS:
+            self._subscription_data.clear()
+        self._subscription_data[key] = subscription_data
+        return subscription_data
@@ -33,6 +33,8 @@ class S6ARelayApplication(S6AApplication):
     (HSS) on the S6d interface.
     """
     grpc_timeout = 60
+    # Relayed requests are answered from the gRPC callbacks, on the loop
+    ANSWERS_SYNCHRONOUSLY = False
 
     def __init__(self, lte_processor, realm, host, host_ip,
                  loop=None, proxy_client=None, retry_count=0):
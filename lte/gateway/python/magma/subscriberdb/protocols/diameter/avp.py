@@ -312,6 +312,11 @@ class Unsigned32AVP(BaseAVP):
 class GroupedAVP(BaseAVP):
     """Implements a Grouped AVP"""
 
+    def __init__(self, *args, **kwargs):
+        # AVPList of the payload, for lookups without decoding the group
+        self._avp_list = None
+        super().__init__(*args, **kwargs)
+
     @staticmethod
     def decode_payload(payload):
         """Returns a list of AVPs from the decoded payload"""
@@ -343,8 +348,7 @@ class GroupedAVP(BaseAVP):
         Return:
             an iterator on all AVPs that match
         """
-        return filter(lambda element: element.vendor == vendor \
-                                      and element.code == code, self.value)
+        return self._get_avp_list().filter(vendor, code)
 
     def find_avp(self, vendor, code):
         """
@@ -356,9 +360,18 @@ class GroupedAVP(BaseAVP):
         Return:
             the first AVP that matches or None if no match exists
         """
-        result = list(self.filter_avps(vendor, code))
-        if len(result):
-            return result[0]
+        return self._get_avp_list().find(vendor, code)
+
+    def _get_avp_list(self):
+        """
+        Returns the AVPList indexing the current payload. The payload can be
+        replaced through value or directly, so the list is rebuilt when it
+        doesn't index the current payload anymore.
+        """
+        if self._avp_list is None or \
+                self._avp_list.payload is not self.payload:
+            self._avp_list = AVPList(self.payload)
+        return self._avp_list
 
 
 class AddressAVP(BaseAVP):
@@ -454,6 +467,150 @@ class UnknownAVP(BaseAVP):
         return bytearray(value)
 
 
+class PreEncodedAVP(object):
+    """
+    An AVP encoded once and then copied as is into every message it is
+    appended to, for AVPs that are the same in many messages, like the host
+    identifiers of the answers. The AVP must not be modified afterwards.
+    """
+
+    def __init__(self, avp):
+        self.avp = avp
+        self.code = avp.code
+        self.vendor = avp.vendor
+        self.name = avp.name
+        self.flags = avp.flags
+        buf = bytearray(avp.length)
+        avp.encode(buf, 0)
+        self._encoded = bytes(buf)
+
+    @property
+    def value(self):
+        return self.avp.value
+
+    @property
+    def payload(self):
+        return self.avp.payload
+
+    @property
+    def length(self):
+        return len(self._encoded)
+
+    def encode(self, buf, begin):
+        """
+        Copy the encoded AVP into a buffer at an offset
+
+            Returns: The number of bytes written
+        """
+        buf[begin:begin + len(self._encoded)] = self._encoded
+        return len(self._encoded)
+
+    def __repr__(self):
+        return repr(self.avp)
+
+    def __eq__(self, other):
+        return repr(self) == repr(other)
+
+
+class AVPList(object):
+    """
+    The AVPs of a message or grouped AVP. When created from an encoded
+    payload only the AVP headers are read, AVP instances are created on first
+    access with their payload referencing the original buffer, and AVPs are
+    looked up by vendor and code through an index instead of a scan.
+    """
+
+    def __init__(self, payload=None):
+        self.payload = payload
+        self._avps = []
+        # (vendor, code, flags, payload begin, payload end) of every AVP
+        # that wasn't created yet, None once it is in self._avps
+        self._headers = []
+        # {(vendor, code): [positions of the matching AVPs]}
+        self._index = {}
+        if payload is not None:
+            self._scan(payload)
+
+    def _scan(self, payload):
+        """
+        Reads the AVP headers of the payload, with the same bounds and
+        errors as decode
+        """
+        offset = 0
+        end = len(payload)
+        while offset < end:
+            remain = end - offset
+            if remain < HEADER_LEN:
+                raise exception.CodecException(
+                    'AVP shorter than header length')
+            code, flags_and_length = struct.unpack_from('!II', payload,
+                                                        offset)
+            length = flags_and_length & 0x00FFFFFF
+            flags = flags_and_length >> 24
+            header_length = HEADER_LEN
+            if flags & FLAG_VENDOR != 0:
+                if remain - HEADER_LEN < 4:
+                    raise exception.CodecException(
+                        'AVP too short to decode vendor')
+                vendor = struct.unpack_from('!I', payload,
+                                            offset + HEADER_LEN)[0]
+                header_length += 4
+            else:
+                vendor = VendorId.DEFAULT
+            encoded_length = min(max(length, header_length), remain)
+            self._index.setdefault((vendor, code), []).append(
+                len(self._avps))
+            self._avps.append(None)
+            self._headers.append((vendor, code, flags,
+                                  offset + header_length,
+                                  offset + encoded_length))
+            offset += (encoded_length + 3) & ~3
+
+    def __len__(self):
+        return len(self._avps)
+
+    def __getitem__(self, position):
+        avp = self._avps[position]
+        if avp is None:
+            vendor, code, flags, begin, end = self._headers[position]
+            avp = AVP((vendor, code), None, flags=flags)
+            avp.payload = self.payload[begin:end]
+            self._avps[position] = avp
+            self._headers[position] = None
+        return avp
+
+    def __iter__(self):
+        for position in range(len(self._avps)):
+            yield self[position]
+
+    def __eq__(self, other):
+        """ Two lists are equal if they hold the same AVPs """
+        return list(self) == list(other)
+
+    def append(self, avp):
+        """ Append an AVP instance to the list """
+        self._index.setdefault((avp.vendor, avp.code), []).append(
+            len(self._avps))
+        self._avps.append(avp)
+        self._headers.append(None)
+
+    def filter(self, vendor, code):
+        """
+        Return an iterator of the AVPs that match the vendor and code
+        """
+        return (self[position]
+                for position in self._index.get((vendor, code), ()))
+
+    def find(self, vendor, code):
+        """
+        Return the first AVP that matches the vendor and code, or None
+        """
+        positions = self._index.get((vendor, code))
+        if positions:
+            return self[positions[0]]
+        return None
+
+
 def AVP(ident, value=None, **kwargs):
     """
     Convenience method for constructing an AVP using an identifier. It will
@@ -503,11 +660,10 @@ def resolve(name):
     Raises:
         ValueError if not found
     """
-    for vendor in AVPDict.keys():
-        for code in AVPDict[vendor].keys():
-            if AVPDict[vendor][code][0] == name:
-                return vendor, code
-    raise ValueError('AVP not found')
+    try:
+        return _AVP_IDS[name]
+    except KeyError:
+        raise ValueError('AVP not found')
 
 
 def decode(payload):
@@ -648,3 +804,15 @@ AVPDict = {
                FLAG_MANDATORY | FLAG_VENDOR),
     }
 }
+
+
+def _get_avp_ids():
+    """ Map the name of every AVP in the AVPDict to its (vendor, code) """
+    avp_ids = {}
+    for vendor, avp_defs in AVPDict.items():
+        for code, avp_def in avp_defs.items():
+            avp_ids.setdefault(avp_def[0], (vendor, code))
+    return avp_ids
+
+
+_AVP_IDS = _get_avp_ids()
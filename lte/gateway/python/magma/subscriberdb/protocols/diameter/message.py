@@ -210,7 +210,7 @@ class Message(object):
 
     def __init__(self, header=None):
         self.header = header if header else MessageHeader()
-        self._avps = []
+        self._avps = avp.AVPList()
 
     @classmethod
     def create_response_msg(cls, msg):
@@ -275,8 +275,7 @@ class Message(object):
         Return:
             an iterator on all AVPs that match
         """
-        return filter(lambda element: element.vendor == vendor and
-                                      element.code == code, self._avps)
+        return self._avps.filter(vendor, code)
 
     def find_avp(self, vendor, code):
         """
@@ -288,9 +287,7 @@ class Message(object):
         Return:
             the first AVP that matches or None if no match exists
         """
-        result = list(self.filter_avps(vendor, code))
-        if len(result):
-            return result[0]
+        return self._avps.find(vendor, code)
 
     def has_fields(self, fields):
         """
@@ -309,7 +306,9 @@ class Message(object):
 
 def decode(payload):
     """
-    Decodes a diameter message from the wire
+    Decodes a diameter message from the wire. Only the AVP headers are read,
+    the AVPs are decoded when they are accessed, and keep referencing the
+    payload.
 
     Args:
         payload: the byte stream from the wire
@@ -332,11 +331,5 @@ def decode(payload):
         raise TooShortException()
 
     msg = Message(MessageHeader.decode(payload))
-
-    offset = msg.header.length
-    while offset < length:
-        avp_entry = avp.decode(payload[offset:])
-        offset += avp_entry.length
-        msg.append_avp(avp_entry)
-
+    msg._avps = avp.AVPList(payload[HEADER_LEN:length])
     return msg
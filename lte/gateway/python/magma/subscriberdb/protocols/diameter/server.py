@@ -13,22 +13,38 @@ limitations under the License.
 
 import asyncio
 import logging
+import time
+from collections import deque
 
 import random
+from magma.subscriberdb.metrics import S6A_REQUEST_LATENCY_MS
 from magma.subscriberdb.protocols.diameter.application import s6a, base
 
 from . import exception
 from . import message
 
+# Most S6a requests of a connection handed to the workers at once. Reading
+# from the connection is paused above that, and resumed once half of them
+# have been answered.
+DEFAULT_MAX_IN_FLIGHT = 128
+# Number of workers answering the S6a requests, as in subscriberdb.yml
+DEFAULT_S6A_WORKERS = 4
+
 
 class S6aServer(asyncio.Protocol):
     """
     This is a Diameter 3GPP S6A Server. It sits between the MME and
     subscriberdb to exchange auth information. This class handles TCP
     connection initialization and handling incoming data from the network
+
+    S6a requests are handled on the event loop, unless an executor is given
+    and the S6a application answers synchronously, in which case the answers
+    are generated by the executor workers and written back in the order of
+    the requests.
     """
 
-    def __init__(self, base_manager, s6a_manager, realm, host, loop=None):
+    def __init__(self, base_manager, s6a_manager, realm, host, loop=None,
+                 executor=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
         self.realm = realm
         self.host = host
         self.state_id = random.randint(0, 100000000)
@@ -37,6 +53,16 @@ class S6aServer(asyncio.Protocol):
         self._base_manager = base_manager
         self.writer = None
         self.loop = loop
+        # The relay application answers from its own callbacks
+        self._executor = executor \
+            if s6a_manager.ANSWERS_SYNCHRONOUSLY else None
+        self._max_in_flight = max_in_flight
+        # (future, command code, start time) of the requests handed to the
+        # executor, in the order they were received
+        self._in_flight = deque()
+        self._transport = None
+        self._reading_paused = False
+        self._writing_paused = False
 
     def connection_made(self, transport):
         """
@@ -50,6 +76,7 @@ class S6aServer(asyncio.Protocol):
         logging.info("Connection received, state id: %d", self.state_id)
         # bytesarray is more efficient to append fragments of reads
         self._readbuf = bytearray()
+        self._transport = transport
         self.writer = Writer(self.realm, self.host,
                              self.state_id, transport)
         self._base_manager.set_writer(self.writer)
@@ -78,6 +105,14 @@ class S6aServer(asyncio.Protocol):
         while remain >= message.HEADER_LEN:
             try:
                 msg = message.decode(memview[begin:])
+                if self._executor is not None and \
+                        msg.header.application_id == \
+                        s6a.S6AApplication.APP_ID:
+                    # The workers keep the message after this read, while
+                    # the receive buffer is resized by the next ones, so
+                    # they are given a copy
+                    msg = message.decode(
+                        bytes(memview[begin:begin + msg.length]))
                 logging.debug("Handling diameter message:\n%s", msg)
                 self._handle_msg(msg.header.application_id, msg)
                 # Get ready for the next message
@@ -85,7 +120,7 @@ class S6aServer(asyncio.Protocol):
                 remain -= msg.length
             except exception.TooShortException:
                 logging.error("Diameter message too short to decode")
-                return
+                break
             except Exception as exc:  # pylint: disable=broad-except
                 # Handle any exceptions with message handling, without
                 # affecting other messages/users
@@ -109,6 +144,25 @@ class S6aServer(asyncio.Protocol):
             None
         """
         logging.warning("Connection lost!")
+        for future, _, _ in self._in_flight:
+            future.cancel()
+        self._in_flight.clear()
+        self._transport = None
+
+    def pause_writing(self):
+        """
+        The transport write buffer is above the high watermark, stop reading
+        requests until the MME reads the answers.
+        """
+        self._writing_paused = True
+        self._update_reading()
+
+    def resume_writing(self):
+        """
+        The transport write buffer drained below the low watermark.
+        """
+        self._writing_paused = False
+        self._update_reading()
 
     def _handle_msg(self, application_id, msg):
         """
@@ -122,13 +176,84 @@ class S6aServer(asyncio.Protocol):
         """
         # TOOD(oramadan) move this distpatch loging out of server
         if application_id == base.BaseApplication.APP_ID:
+            # The applications are shared by all the connections, answer
+            # on the connection the request came from
+            self._base_manager.set_writer(self.writer)
             self._base_manager.handle_msg(self.state_id, msg)
         elif application_id == s6a.S6AApplication.APP_ID:
-            self._s6a_manager.handle_msg(self.state_id, msg)
+            self._handle_s6a_msg(msg)
         else:
             logging.error("Unknown application: %d",
                           msg.header.application_id)
 
+    def _handle_s6a_msg(self, msg):
+        """
+        Handles a message bound for the S6a application, on the event loop
+        or by the executor.
+
+        Args:
+            msg: the actual message
+        Returns:
+            None
+        """
+        start_time = time.perf_counter()
+        command_code = msg.header.command_code
+        if self._executor is None:
+            self._s6a_manager.set_writer(self.writer)
+            self._s6a_manager.handle_msg(self.state_id, msg)
+            _observe_latency(command_code, start_time)
+            return
+
+        loop = self.loop or asyncio.get_event_loop()
+        future = loop.run_in_executor(self._executor,
+                                      self._s6a_manager.answer_msg,
+                                      self.state_id, msg)
+        self._in_flight.append((future, command_code, start_time))
+        future.add_done_callback(self._send_answers)
+        self._update_reading()
+
+    def _send_answers(self, _future):
+        """
+        Writes the answers generated by the executor. Answers are written in
+        the order of the requests, so an answer waits for the answers to all
+        the earlier requests of the connection.
+        """
+        while self._in_flight and self._in_flight[0][0].done():
+            future, command_code, start_time = self._in_flight.popleft()
+            try:
+                resp = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                # Answer the other requests even if one of them failed
+                logging.exception(exc)
+                continue
+            if resp is not None:
+                self.writer.send_msg(resp)
+            _observe_latency(command_code, start_time)
+        self._update_reading()
+
+    def _update_reading(self):
+        """
+        Pauses reading from the transport while too many requests are in
+        flight, or while the answers can't be written, and resumes it once
+        half of the in flight requests have been answered.
+        """
+        if self._transport is None:
+            return
+        if self._reading_paused:
+            if not self._writing_paused and \
+                    len(self._in_flight) <= self._max_in_flight // 2:
+                self._reading_paused = False
+                self._transport.resume_reading()
+        elif self._writing_paused or \
+                len(self._in_flight) >= self._max_in_flight:
+            self._reading_paused = True
+            self._transport.pause_reading()
+
+
+def _observe_latency(command_code, start_time):
+    S6A_REQUEST_LATENCY_MS.labels(command=command_code).observe(
+        (time.perf_counter() - start_time) * 1000)
+
 
 class Writer:
     """The writer abstracts away a client connection for an
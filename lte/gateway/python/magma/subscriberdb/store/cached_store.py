@@ -15,26 +15,48 @@ import copy
 import threading
 
 from collections import OrderedDict
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 
+from magma.subscriberdb.metrics import SUBSCRIBER_CACHE_EVICTIONS, \
+    SUBSCRIBER_CACHE_HITS, SUBSCRIBER_CACHE_MISSES
 from magma.subscriberdb.sid import SIDUtils
 
 from .onready import OnDataReady
 from .base import BaseStore
-from .base import DuplicateSubscriberError
+from .base import DuplicateSubscriberError, SubscriberNotFoundError
+
+# Shards are only added for caches large enough to keep a useful LRU in
+# every shard
+MAX_NUM_SHARDS = 16
+MIN_SHARD_CAPACITY = 64
 
 
 class CachedStore(BaseStore):
     """
     A thread-safe cached persistent store of the subscriber database.
     Prerequisite: persistent_store need to be thread safe
+
+    The cache is split in shards by subscriber id, each with its own LRU and
+    locks. Lookups only lock their shard for the time of the cache access.
+    Edits are serialized per shard, and the writes to the persistent store
+    by a store-wide lock, as sqlite doesn't allow concurrent writers on a
+    shared cache. Lookups of unknown subscribers are cached as well, in a
+    separate LRU per shard.
     """
 
-    def __init__(self, persistent_store, cache_capacity=512, loop=None):
-        self._lock = threading.Lock()
-        self._cache = OrderedDict()
-        self._cache_capacity = cache_capacity
+    def __init__(self, persistent_store, cache_capacity=512, loop=None,
+                 negative_cache_capacity=512, num_shards=None):
+        if num_shards is None:
+            num_shards = max(1, min(MAX_NUM_SHARDS,
+                                    cache_capacity // MIN_SHARD_CAPACITY))
+        self._shards = [
+            _CacheShard(_split_capacity(cache_capacity, num_shards, i),
+                        _split_capacity(negative_cache_capacity, num_shards,
+                                        i))
+            for i in range(num_shards)
+        ]
         self._persistent_store = persistent_store
+        self._write_lock = threading.Lock()
         self._on_ready = OnDataReady(loop=loop)
 
     def add_subscriber(self, subscriber_data):
@@ -42,12 +64,17 @@ class CachedStore(BaseStore):
         Method that adds the subscriber.
         """
         sid = SIDUtils.to_str(subscriber_data.sid)
-        with self._lock:
-            if sid in self._cache:
-                raise DuplicateSubscriberError(sid)
+        shard = self._get_shard(sid)
+        with shard.write_lock:
+            with shard.lock:
+                if sid in shard.entries:
+                    raise DuplicateSubscriberError(sid)
 
-            self._persistent_store.add_subscriber(subscriber_data)
-            self._cache_put(sid, subscriber_data)
+            with self._write_lock:
+                self._persistent_store.add_subscriber(subscriber_data)
+            with shard.lock:
+                shard.invalidate(sid)
+                shard.put(sid, subscriber_data)
         self._on_ready.add_subscriber(subscriber_data)
 
     @contextmanager
@@ -55,34 +82,40 @@ class CachedStore(BaseStore):
         """
         Context manager to modify the subscriber data.
         """
-        with self._lock:
-            if subscriber_id in self._cache:
-                data = self._cache_get(subscriber_id)
+        shard = self._get_shard(subscriber_id)
+        with shard.write_lock:
+            with shard.lock:
+                data = shard.entries.get(subscriber_id)
+            if data is not None:
                 subscriber_data = copy.deepcopy(data)
             else:
                 subscriber_data = \
                     self._persistent_store.get_subscriber_data(subscriber_id)
             yield subscriber_data
-            self._persistent_store.update_subscriber(subscriber_data)
-            self._cache_put(subscriber_id, subscriber_data)
+            with self._write_lock:
+                self._persistent_store.update_subscriber(subscriber_data)
+            with shard.lock:
+                shard.invalidate(subscriber_id)
+                shard.put(subscriber_id, subscriber_data)
 
     def delete_subscriber(self, subscriber_id):
         """
         Method that deletes a subscriber, if present.
         """
-        with self._lock:
-            if subscriber_id in self._cache:
-                del self._cache[subscriber_id]
-
-            self._persistent_store.delete_subscriber(subscriber_id)
+        shard = self._get_shard(subscriber_id)
+        with shard.write_lock:
+            with self._write_lock:
+                self._persistent_store.delete_subscriber(subscriber_id)
+            with shard.lock:
+                shard.invalidate(subscriber_id)
 
     def delete_all_subscribers(self):
         """
         Method that removes all the subscribers from the store
         """
-        with self._lock:
-            self._cache_clear()
+        with self._lock_all_shards(), self._write_lock:
             self._persistent_store.delete_all_subscribers()
+            self._cache_clear()
 
     def resync(self, subscribers):
         """
@@ -90,26 +123,47 @@ class CachedStore(BaseStore):
         subscribers. The resync leaves the current state of subscribers
         intact.
 
+        Only the cached subscribers that were removed or whose data changed
+        are evicted, along with the unknown subscribers that were added.
+
         Args:
             subscribers - list of subscribers to be in the store.
         """
-        with self._lock:
-            self._cache_clear()
+        new_subscribers = {SIDUtils.to_str(sub.sid): sub
+                           for sub in subscribers}
+        with self._lock_all_shards(), self._write_lock:
             self._persistent_store.resync(subscribers)
+            for shard in self._shards:
+                with shard.lock:
+                    shard.invalidate_changed(new_subscribers)
         self._on_ready.resync(subscribers)
 
     def get_subscriber_data(self, subscriber_id):
         """
         Method that returns the subscriber data for the subscriber.
         """
-        with self._lock:
-            if subscriber_id in self._cache:
-                return self._cache_get(subscriber_id)
-            else:
-                subscriber_data = \
-                    self._persistent_store.get_subscriber_data(subscriber_id)
-                self._cache_put(subscriber_id, subscriber_data)
-                return subscriber_data
+        shard = self._get_shard(subscriber_id)
+        with shard.lock:
+            data = shard.get(subscriber_id)
+            generation = shard.generation
+        if data is _UNKNOWN_SUBSCRIBER:
+            SUBSCRIBER_CACHE_HITS.labels('unknown').inc()
+            raise SubscriberNotFoundError(subscriber_id)
+        if data is not None:
+            SUBSCRIBER_CACHE_HITS.labels('subscriber').inc()
+            return data
+
+        # Read without locking, the result is only cached if no write to
+        # the shard happened in the meantime
+        SUBSCRIBER_CACHE_MISSES.inc()
+        try:
+            data = self._persistent_store.get_subscriber_data(subscriber_id)
+        except SubscriberNotFoundError:
+            self._cache_lookup(shard, generation, subscriber_id,
+                               _UNKNOWN_SUBSCRIBER)
+            raise
+        self._cache_lookup(shard, generation, subscriber_id, data)
+        return data
 
     def list_subscribers(self):
         """
@@ -122,23 +176,131 @@ class CachedStore(BaseStore):
     def on_ready(self):
         return self._on_ready.event.wait()
 
-    def _cache_get(self, k):
-        """
-        Get from the LRU cache. Move the last hit entry to the end.
-        """
-        self._cache.move_to_end(k)
-        return self._cache[k]
+    def _get_shard(self, subscriber_id):
+        return self._shards[hash(subscriber_id) % len(self._shards)]
+
+    @staticmethod
+    def _cache_lookup(shard, generation, k, v):
+        with shard.lock:
+            if shard.generation == generation:
+                shard.put(k, v)
 
-    def _cache_put(self, k, v):
+    @contextmanager
+    def _lock_all_shards(self):
         """
-        Put to the LRU cache. Evict the first item if full.
+        Serialize with the writes to all shards. Locks are always taken in
+        the same order.
         """
-        if self._cache_capacity == len(self._cache):
-            self._cache.popitem(last=False)
-        self._cache[k] = v
+        with ExitStack() as stack:
+            for shard in self._shards:
+                stack.enter_context(shard.write_lock)
+            yield
 
     def _cache_list(self):
-        return list(self._cache.keys())
+        keys = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.entries.keys())
+        return keys
 
     def _cache_clear(self):
-        self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+
+
+class _UnknownSubscriber:
+    """ Cached result of the lookup of an unknown subscriber """
+    pass
+
+
+_UNKNOWN_SUBSCRIBER = _UnknownSubscriber()
+
+
+class _CacheShard:
+    """
+    LRU caches of the subscribers and the unknown subscribers of a shard.
+
+    lock protects the caches and is only held while accessing them.
+    write_lock serializes the writes to the subscribers of the shard, and is
+    taken before the store-wide write lock. generation is bumped by
+    every invalidation, so that a lookup that went to the persistent store
+    doesn't cache data that a concurrent write made stale.
+    """
+
+    def __init__(self, capacity, unknown_capacity):
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.unknown = OrderedDict()
+        self.capacity = capacity
+        self.unknown_capacity = unknown_capacity
+        self.generation = 0
+
+    def get(self, k):
+        """
+        Get from the LRU caches. Move the last hit entry to the end.
+        Returns None if not cached, _UNKNOWN_SUBSCRIBER for a cached miss.
+        """
+        if k in self.entries:
+            self.entries.move_to_end(k)
+            return self.entries[k]
+        if k in self.unknown:
+            self.unknown.move_to_end(k)
+            return _UNKNOWN_SUBSCRIBER
+        return None
+
+    def put(self, k, v):
+        """
+        Put to the LRU cache of v. Evict the first item if full.
+        """
+        if v is _UNKNOWN_SUBSCRIBER:
+            _lru_put(self.unknown, self.unknown_capacity, k, None, 'unknown')
+        else:
+            _lru_put(self.entries, self.capacity, k, v, 'subscriber')
+
+    def invalidate(self, k):
+        self.entries.pop(k, None)
+        self.unknown.pop(k, None)
+        self.generation += 1
+
+    def invalidate_changed(self, new_subscribers):
+        """
+        Drop the subscribers removed or changed by a resync, and the
+        unknown subscribers that were added.
+        """
+        for k, data in list(self.entries.items()):
+            new_data = new_subscribers.get(k)
+            if new_data is None or not _same_subscription(data, new_data):
+                del self.entries[k]
+        for k in list(self.unknown):
+            if k in new_subscribers:
+                del self.unknown[k]
+        self.generation += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.unknown.clear()
+        self.generation += 1
+
+
+def _lru_put(cache, capacity, k, v, cache_type):
+    if k not in cache and len(cache) >= capacity:
+        if not capacity:
+            return
+        cache.popitem(last=False)
+        SUBSCRIBER_CACHE_EVICTIONS.labels(cache_type).inc()
+    cache[k] = v
+
+
+def _split_capacity(capacity, num_shards, shard):
+    """ Capacity of a shard, the shards add up to capacity """
+    return capacity // num_shards + (shard < capacity % num_shards)
+
+
+def _same_subscription(data, new_data):
+    """ Whether two SubscriberData are the same, except for their state """
+    return [(field.name, value) for field, value in data.ListFields()
+            if field.name != 'state'] == \
+        [(field.name, value) for field, value in new_data.ListFields()
+         if field.name != 'state']
@@ -11,6 +11,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import hashlib
 import sqlite3
 import threading
 from contextlib import contextmanager
@@ -32,6 +33,11 @@ class SqliteStore(BaseStore):
 
     Processes using this store shouldn't be forked since the sqlite connections
     can't be shared by multiple processes.
+
+    The subscriber state is stored in its own column, apart from the rest of
+    the subscriber data which is streamed from the cloud. The digest of the
+    data column lets resync find the subscribers that changed without
+    parsing them.
     """
 
     def __init__(self, db_location, loop=None):
@@ -51,26 +57,52 @@ class SqliteStore(BaseStore):
 
     def _create_store(self):
         """
-        Create the sqlite table if it doesn't exist already.
+        Create the sqlite table if it doesn't exist already, and migrate
+        tables created without the digest and state columns.
         """
+        # WAL lets readers go on while a resync writes, and is persisted in
+        # the db file. In-memory databases ignore it.
+        self.conn.execute("PRAGMA journal_mode=WAL")
         with self.conn:
             self.conn.execute("CREATE TABLE IF NOT EXISTS subscriberdb"
-                              "(subscriber_id text PRIMARY KEY, data text)")
+                              "(subscriber_id text PRIMARY KEY, data text, "
+                              "digest blob, state blob)")
+            columns = [row[1] for row in
+                       self.conn.execute("PRAGMA table_info(subscriberdb)")]
+            if 'state' not in columns:
+                self._migrate_state_column()
+
+    def _migrate_state_column(self):
+        """
+        Move the state out of the data of the subscribers stored before the
+        digest and state columns were added.
+        """
+        self.conn.execute("ALTER TABLE subscriberdb ADD COLUMN digest blob")
+        self.conn.execute("ALTER TABLE subscriberdb ADD COLUMN state blob")
+        res = self.conn.execute("SELECT subscriber_id, data FROM subscriberdb")
+        rows = []
+        for sid, data in res.fetchall():
+            subscriber_data = SubscriberData()
+            subscriber_data.ParseFromString(data)
+            rows.append(_split_state(subscriber_data) + (sid, ))
+        self.conn.executemany("UPDATE subscriberdb SET data = ?, digest = ?, "
+                              "state = ? WHERE subscriber_id = ?", rows)
 
     def add_subscriber(self, subscriber_data):
         """
         Method that adds the subscriber.
         """
         sid = SIDUtils.to_str(subscriber_data.sid)
-        data_str = subscriber_data.SerializeToString()
+        data_str, digest, state_str = _split_state(subscriber_data)
         with self.conn:
             res = self.conn.execute("SELECT data FROM subscriberdb WHERE "
                                     "subscriber_id = ?", (sid, ))
             if res.fetchone():
                 raise DuplicateSubscriberError(sid)
 
-            self.conn.execute("INSERT INTO subscriberdb(subscriber_id, data) "
-                              "VALUES (?, ?)", (sid, data_str))
+            self.conn.execute("INSERT INTO subscriberdb(subscriber_id, data, "
+                              "digest, state) VALUES (?, ?, ?, ?)",
+                              (sid, data_str, digest, state_str))
         self._on_ready.add_subscriber(subscriber_data)
 
     @contextmanager
@@ -79,20 +111,24 @@ class SqliteStore(BaseStore):
         Context manager to modify the subscriber data.
         """
         with self.conn:
+            # Take the write lock before reading, so that concurrent edits
+            # from other threads can't read the same data and lose updates
+            self.conn.execute("BEGIN IMMEDIATE")
             res = self.conn.execute(
-                "SELECT data FROM subscriberdb WHERE " "subscriber_id = ?",
+                "SELECT data, state FROM subscriberdb WHERE "
+                "subscriber_id = ?",
                 (subscriber_id,),
             )
             row = res.fetchone()
             if not row:
                 raise SubscriberNotFoundError(subscriber_id)
-            subscriber_data = SubscriberData()
-            subscriber_data.ParseFromString(row[0])
+            subscriber_data = _merge_state(*row)
             yield subscriber_data
-            data_str = subscriber_data.SerializeToString()
+            data_str, digest, state_str = _split_state(subscriber_data)
             self.conn.execute(
-                "UPDATE subscriberdb SET data = ? " "WHERE subscriber_id = ?",
-                (data_str, subscriber_id),
+                "UPDATE subscriberdb SET data = ?, digest = ?, state = ? "
+                "WHERE subscriber_id = ?",
+                (data_str, digest, state_str, subscriber_id),
             )
 
     def delete_subscriber(self, subscriber_id):
@@ -117,14 +153,13 @@ class SqliteStore(BaseStore):
         Method that returns the auth key for the subscriber.
         """
         with self.conn:
-            res = self.conn.execute("SELECT data FROM subscriberdb WHERE "
-                                    "subscriber_id = ?", (subscriber_id, ))
+            res = self.conn.execute("SELECT data, state FROM subscriberdb "
+                                    "WHERE subscriber_id = ?",
+                                    (subscriber_id, ))
             row = res.fetchone()
             if not row:
                 raise SubscriberNotFoundError(subscriber_id)
-        subscriber_data = SubscriberData()
-        subscriber_data.ParseFromString(row[0])
-        return subscriber_data
+        return _merge_state(*row)
 
     def list_subscribers(self):
         """
@@ -148,10 +183,12 @@ class SqliteStore(BaseStore):
 
         """
         sid = SIDUtils.to_str(subscriber_data.sid)
-        data_str = subscriber_data.SerializeToString()
+        data_str, digest, state_str = _split_state(subscriber_data)
         with self.conn:
-            res = self.conn.execute("UPDATE subscriberdb SET data = ? "
-                                    "WHERE subscriber_id = ?", (data_str, sid))
+            res = self.conn.execute("UPDATE subscriberdb SET data = ?, "
+                                    "digest = ?, state = ? "
+                                    "WHERE subscriber_id = ?",
+                                    (data_str, digest, state_str, sid))
             if not res.rowcount:
                 raise SubscriberNotFoundError(sid)
 
@@ -161,29 +198,40 @@ class SqliteStore(BaseStore):
         subscribers. The resync leaves the current state of subscribers
         intact.
 
+        Only the subscribers that were added, removed or whose data digest
+        changed are written, in a single transaction.
+
         Args:
             subscribers - list of subscribers to be in the store.
         """
+        new_rows = {}
+        for sub in subscribers:
+            new_rows[SIDUtils.to_str(sub.sid)] = _split_state(sub)
+
         with self.conn:
-            # Capture the current state of the subscribers
-            res = self.conn.execute("SELECT subscriber_id, data FROM subscriberdb")
-            current_state = {}
-            for row in res:
-                sub = SubscriberData()
-                sub.ParseFromString(row[1])
-                current_state[row[0]] = sub.state
-
-            # Clear all subscribers
-            self.conn.execute("DELETE FROM subscriberdb")
+            res = self.conn.execute(
+                "SELECT subscriber_id, digest FROM subscriberdb")
+            current_digests = dict(res.fetchall())
+
+            inserts = []
+            updates = []
+            for sid, (data_str, digest, state_str) in new_rows.items():
+                if sid not in current_digests:
+                    inserts.append((sid, data_str, digest, state_str))
+                elif current_digests[sid] != digest:
+                    # Keep the current state of the subscriber
+                    updates.append((data_str, digest, sid))
+            deletes = [(sid, ) for sid in current_digests
+                       if sid not in new_rows]
 
-            # Add the subscribers with the current state
-            for sub in subscribers:
-                sid = SIDUtils.to_str(sub.sid)
-                if sid in current_state:
-                    sub.state.CopyFrom(current_state[sid])
-                data_str = sub.SerializeToString()
-                self.conn.execute("INSERT INTO subscriberdb(subscriber_id, data) "
-                                  "VALUES (?, ?)", (sid, data_str))
+            self.conn.executemany(
+                "DELETE FROM subscriberdb WHERE subscriber_id = ?", deletes)
+            self.conn.executemany(
+                "UPDATE subscriberdb SET data = ?, digest = ? "
+                "WHERE subscriber_id = ?", updates)
+            self.conn.executemany(
+                "INSERT INTO subscriberdb(subscriber_id, data, digest, state) "
+                "VALUES (?, ?, ?, ?)", inserts)
         self._on_ready.resync(subscribers)
 
     def on_ready(self):
@@ -206,3 +254,30 @@ class SqliteStore(BaseStore):
         )
         apn_config.ambr.max_bandwidth_ul = apn_data.ambr.max_bandwidth_ul
         apn_config.ambr.max_bandwidth_dl = apn_data.ambr.max_bandwidth_dl
+
+
+def _split_state(subscriber_data):
+    """
+    Serialize the subscriber data without its state, the digest of that
+    serialization, and the state, or None if it isn't set.
+    """
+    state_str = None
+    if subscriber_data.HasField('state'):
+        state_str = subscriber_data.state.SerializeToString()
+        data = SubscriberData()
+        data.CopyFrom(subscriber_data)
+        data.ClearField('state')
+        subscriber_data = data
+    data_str = subscriber_data.SerializeToString(deterministic=True)
+    return data_str, hashlib.sha256(data_str).digest(), state_str
+
+
+def _merge_state(data_str, state_str):
+    """
+    Parse the subscriber data stored by _split_state.
+    """
+    subscriber_data = SubscriberData()
+    subscriber_data.ParseFromString(data_str)
+    if state_str is not None:
+        subscriber_data.state.ParseFromString(state_str)
+    return subscriber_data
@@ -13,7 +13,7 @@ limitations under the License.
 
 import unittest
 
-from magma.subscriberdb.crypto.milenage import Milenage
+from magma.subscriberdb.crypto.milenage import Milenage, MilenageKeys
 
 
 class MilenageRandomTests(unittest.TestCase):
@@ -172,6 +172,10 @@ class MilenageTests(unittest.TestCase):
         self.assertEqual(autn, autn_)
         self.assertEqual(kasme, kasme_)
 
+        keys = MilenageKeys(key, op_c)
+        vectors = crypto.generate_eutran_vectors(keys, [sqn, sqn], plmn)
+        self.assertEqual(vectors, 2 * [(self.rand, xres, autn, kasme)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -184,6 +184,30 @@ class ProcessorTests(unittest.TestCase):
                          3*b'\x00'),
                          eutran_vector)
 
+    def test_lte_auth_multiple_vectors(self):
+        """
+        Test if the vectors get consecutive SQNs from a single reservation
+        """
+        vectors = self._processor.generate_lte_auth_vectors('11111',
+                                                            3*b'\x00', 3)
+        self.assertEqual(vectors, 3 * [_dummy_eutran_vector()])
+        self.assertEqual(self._processor.get_next_lte_auth_seq('11111'), 4)
+
+    def test_lte_auth_keys_updated(self):
+        """
+        Test if the derived keys are dropped when the subscriber key changes
+        """
+        self._processor.generate_lte_auth_vector('44444', 3*b'\x00')
+        keys = self._processor._milenage_keys['IMSI44444'][2]
+        self._processor.generate_lte_auth_vector('44444', 3*b'\x00')
+        self.assertIs(self._processor._milenage_keys['IMSI44444'][2], keys)
+
+        with self._processor._store.edit_subscriber('IMSI44444') as subs:
+            subs.lte.auth_opc = 16*b'\x22'
+        self._processor.generate_lte_auth_vector('44444', 3*b'\x00')
+        keys = self._processor._milenage_keys['IMSI44444'][2]
+        self.assertEqual(keys.opc, 16*b'\x22')
+
     def test_lte_auth_fail_opc_short(self):
         """
         Test if we get the a crypto error if the OPc is too short
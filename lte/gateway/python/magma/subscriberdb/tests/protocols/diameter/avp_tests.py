@@ -436,3 +436,86 @@ class AVPConstructorTests(unittest.TestCase):
         # Lists are not supported and should cause an error
         with self.assertRaises(TypeError):
             avp.AVP([0, 3])
+
+
+class AVPListTests(unittest.TestCase):
+    """
+    Tests for the lazily decoded AVP lists
+    """
+
+    def _encode(self, avps):
+        return bytes(avp.GroupedAVP.encode_value(avps))
+
+    def test_lazy_decode(self):
+        """
+        Tests AVPs are only decoded when accessed, and looked up by vendor
+        and code
+        """
+        payload = memoryview(self._encode([
+            avp.AVP('User-Name', 'hello'),
+            avp.AVP('Visited-PLMN-Id', b'\x02\xf8\x59'),
+            avp.AVP('User-Name', 'world'),
+        ]))
+        avp_list = avp.AVPList(payload)
+        self.assertEqual(len(avp_list), 3)
+        self.assertEqual(avp_list._avps, [None, None, None])
+
+        plmn = avp_list.find(*avp.resolve('Visited-PLMN-Id'))
+        self.assertEqual(plmn.value, b'\x02\xf8\x59')
+        self.assertEqual(plmn.name, 'Visited-PLMN-Id')
+        # The payload references the original buffer
+        self.assertEqual(plmn.payload.obj, payload.obj)
+        self.assertEqual(avp_list._avps[0], None)
+
+        self.assertEqual([x.value for x in avp_list.filter(0, 1)],
+                         ['hello', 'world'])
+        self.assertEqual(avp_list.find(0, 2), None)
+        self.assertEqual(list(avp_list), [avp.decode(payload),
+                                          plmn,
+                                          avp.AVP('User-Name', 'world')])
+
+    def test_append(self):
+        """
+        Tests appended AVPs are indexed
+        """
+        avp_list = avp.AVPList(self._encode([avp.AVP('User-Name', 'hello')]))
+        avp_list.append(avp.AVP('Session-Id', 'session'))
+        self.assertEqual(avp_list.find(*avp.resolve('Session-Id')).value,
+                         'session')
+        self.assertEqual(len(avp_list), 2)
+
+    def test_garbage(self):
+        """
+        Tests AVP headers are validated when the list is created
+        """
+        with self.assertRaises(CodecException):
+            avp.AVPList(b'\x00' * 4)
+        with self.assertRaises(CodecException):
+            avp.AVPList(b'\x00\x00\x00\x01\x80\x00\x00\x0c\x00')
+
+    def test_grouped_payload_replaced(self):
+        """
+        Tests grouped AVP lookups follow the current payload
+        """
+        grouped_avp = avp.AVP('Requested-EUTRAN-Authentication-Info', [
+            avp.AVP('Number-Of-Requested-Vectors', 1)])
+        self.assertEqual(grouped_avp.find_avp(
+            *avp.resolve('Number-Of-Requested-Vectors')).value, 1)
+        grouped_avp.value = [avp.AVP('Number-Of-Requested-Vectors', 3)]
+        self.assertEqual(grouped_avp.find_avp(
+            *avp.resolve('Number-Of-Requested-Vectors')).value, 3)
+
+    def test_pre_encoded(self):
+        """
+        Tests pre-encoded AVPs encode as the original AVP
+        """
+        origin_host = avp.AVP('Origin-Host', 'hss.magma.com')
+        pre_encoded = avp.PreEncodedAVP(origin_host)
+        self.assertEqual(pre_encoded.length, origin_host.length)
+        self.assertEqual(pre_encoded.value, 'hss.magma.com')
+        self.assertEqual(pre_encoded, origin_host)
+
+        buf = bytearray(origin_host.length * 2)
+        self.assertEqual(pre_encoded.encode(buf, origin_host.length),
+                         origin_host.length)
+        self.assertEqual(avp.decode(buf[origin_host.length:]), origin_host)
@@ -15,10 +15,12 @@ limitations under the License.
 
 import asyncio
 import unittest
+from concurrent.futures import Future
 
 from unittest.mock import Mock
 
-from magma.subscriberdb.protocols.diameter import server, message
+from magma.subscriberdb.protocols.diameter import avp, message, server
+from magma.subscriberdb.protocols.diameter.application import s6a
 
 
 class ServerTests(unittest.TestCase):
@@ -100,6 +102,145 @@ class ServerTests(unittest.TestCase):
         self.assertEqual(len(self._server._readbuf), 0)
 
 
+class FakeExecutor:
+    """
+    Executor running the submitted calls only when the tests complete them
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.calls.append((future, fn, args))
+        return future
+
+    def complete(self, index):
+        future, fn, args = self.calls[index]
+        future.set_result(fn(*args))
+
+
+class WorkerServerTests(unittest.TestCase):
+    """
+    Test the dispatch of S6a requests to the executor workers
+    """
+
+    def setUp(self):
+        self._loop = asyncio.new_event_loop()
+        self._executor = FakeExecutor()
+        s6a_manager = Mock()
+        # Answer each request with the request itself
+        s6a_manager.answer_msg = Mock(side_effect=lambda _, msg: msg)
+        self._server = server.S6aServer(Mock(),
+                                        s6a_manager,
+                                        "mai.facebook.com",
+                                        "hss.mai.facebook.com",
+                                        loop=self._loop,
+                                        executor=self._executor,
+                                        max_in_flight=2)
+
+        self._writes = Mock()
+
+        def convert_memview_to_bytes(memview):
+            """ Deep copy the memoryview for checking later  """
+            return self._writes(memview.tobytes())
+
+        self._transport = Mock()
+        self._transport.write = Mock(side_effect=convert_memview_to_bytes)
+        self._server.connection_made(self._transport)
+
+    def tearDown(self):
+        self._loop.close()
+
+    def _encode_request(self, hop_by_hop_id):
+        msg = message.Message()
+        msg.header.application_id = s6a.S6AApplication.APP_ID
+        msg.header.command_code = \
+            s6a.S6AApplicationCommands.AUTHENTICATION_INFORMATION
+        msg.header.request = True
+        msg.header.hop_by_hop_id = hop_by_hop_id
+        msg.append_avp(avp.AVP('User-Name', '1'))
+        req_buf = bytearray(msg.length)
+        msg.encode(req_buf, 0)
+        return bytes(req_buf)
+
+    def _send_request(self, hop_by_hop_id):
+        req_buf = self._encode_request(hop_by_hop_id)
+        self._server.data_received(req_buf)
+        return req_buf
+
+    def _complete(self, index):
+        self._executor.complete(index)
+        # Run the done callbacks of the wrapped futures
+        self._loop.run_until_complete(asyncio.sleep(0))
+
+    def test_answer_order(self):
+        """Check that answers are written in the order of the requests"""
+        requests = [self._send_request(i) for i in range(3)]
+        self._complete(2)
+        self._complete(1)
+        self.assertFalse(self._writes.called)
+
+        self._complete(0)
+        self.assertEqual([c[0][0] for c in self._writes.call_args_list],
+                         requests)
+
+    def test_backpressure(self):
+        """Check that reads are paused while too many requests are in
+        flight, and while the transport can't be written to"""
+        self._send_request(0)
+        self.assertFalse(self._transport.pause_reading.called)
+        self._send_request(1)
+        self._transport.pause_reading.assert_called_once_with()
+
+        self._complete(0)
+        self._transport.resume_reading.assert_called_once_with()
+
+        self._server.pause_writing()
+        self.assertEqual(self._transport.pause_reading.call_count, 2)
+        self._complete(1)
+        self.assertEqual(self._transport.resume_reading.call_count, 1)
+        self._server.resume_writing()
+        self.assertEqual(self._transport.resume_reading.call_count, 2)
+
+    def test_partial_read_in_flight(self):
+        """Check that a request followed by part of the next one can be
+        read while the first one is in flight"""
+        requests = [self._encode_request(i) for i in range(2)]
+        split = message.HEADER_LEN + 4
+        self._server.data_received(requests[0] + requests[1][:split])
+        self._server.data_received(requests[1][split:])
+        self.assertEqual(len(self._server._readbuf), 0)
+
+        self._complete(0)
+        self._complete(1)
+        self.assertEqual([c[0][0] for c in self._writes.call_args_list],
+                         requests)
+
+    def test_asynchronous_application(self):
+        """Check that the requests to an application answering them
+        asynchronously, like the relay, are handled on the loop"""
+        s6a_manager = Mock(ANSWERS_SYNCHRONOUSLY=False)
+        self._server = server.S6aServer(Mock(),
+                                        s6a_manager,
+                                        "mai.facebook.com",
+                                        "hss.mai.facebook.com",
+                                        loop=self._loop,
+                                        executor=self._executor)
+        self._server.connection_made(self._transport)
+        self._send_request(0)
+        self.assertEqual(self._executor.calls, [])
+        self.assertFalse(s6a_manager.answer_msg.called)
+        self.assertEqual(s6a_manager.handle_msg.call_count, 1)
+
+    def test_connection_lost(self):
+        """Check that answers are dropped once the connection is lost"""
+        self._send_request(0)
+        self._server.connection_lost(None)
+        self.assertEqual(len(self._server._in_flight), 0)
+        self.assertFalse(self._writes.called)
+
+
 class WriterTests(unittest.TestCase):
     """
     Test the Writer class for the diameter server
@@ -183,3 +183,65 @@ class StoreTests(unittest.TestCase):
         self._store.delete_all_subscribers()
         self.assertEqual(self._store.list_subscribers(), [])
         self.assertEqual(self._store._cache_list(), [])
+
+    def test_unknown_subscriber_cache(self):
+        """
+        Test if lookups of unknown subscribers are cached until they are
+        added
+        """
+        sqlite = self._store._persistent_store
+        with self.assertRaises(SubscriberNotFoundError):
+            self._store.get_subscriber_data('IMSI11111')
+        # Add behind the cache, the miss is still cached
+        sqlite.add_subscriber(SubscriberData(sid=SIDUtils.to_pb('IMSI11111')))
+        with self.assertRaises(SubscriberNotFoundError):
+            self._store.get_subscriber_data('IMSI11111')
+        sqlite.delete_all_subscribers()
+
+        (sid1, sub1) = self._add_subscriber('IMSI11111')
+        self.assertEqual(self._store.get_subscriber_data(sid1), sub1)
+
+        with self.assertRaises(SubscriberNotFoundError):
+            self._store.get_subscriber_data('IMSI22222')
+        sub2 = SubscriberData(sid=SIDUtils.to_pb('IMSI22222'))
+        self._store.resync([sub1, sub2])
+        self.assertEqual(self._store.get_subscriber_data('IMSI22222'), sub2)
+
+    def test_resync_invalidation(self):
+        """
+        Test if resync only evicts the subscribers that changed
+        """
+        (sid1, sub1) = self._add_subscriber('IMSI11111')
+        (sid2, _) = self._add_subscriber('IMSI22222')
+        (sid3, _) = self._add_subscriber('IMSI33333')
+        with self._store.edit_subscriber(sid1) as subs:
+            subs.state.lte_auth_next_seq = 1000
+
+        sub2 = SubscriberData(sid=SIDUtils.to_pb(sid2))
+        sub2.lte.auth_key = b'5678'
+        self._store.resync([sub1, sub2])
+        self.assertEqual(self._store._cache_list(), [sid1])
+        self.assertEqual(
+            self._store.get_subscriber_data(sid1).state.lte_auth_next_seq,
+            1000)
+        self.assertEqual(self._store.get_subscriber_data(sid2).lte.auth_key,
+                         b'5678')
+        with self.assertRaises(SubscriberNotFoundError):
+            self._store.get_subscriber_data(sid3)
+
+    def test_sharded_cache(self):
+        """
+        Test if the capacity is split across shards
+        """
+        store = CachedStore(SqliteStore("file::memory:"), 8, num_shards=4)
+        sids = ['IMSI%05d' % i for i in range(32)]
+        for sid in sids:
+            store.add_subscriber(SubscriberData(sid=SIDUtils.to_pb(sid)))
+        self.assertEqual(len(store._shards), 4)
+        self.assertTrue(all(len(shard.entries) <= 2
+                            for shard in store._shards))
+
+        for sid in sids:
+            self.assertEqual(SIDUtils.to_str(
+                store.get_subscriber_data(sid).sid), sid)
+            self.assertIn(sid, store._cache_list())
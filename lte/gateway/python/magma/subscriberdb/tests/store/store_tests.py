@@ -11,6 +11,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import os
+import sqlite3
+import tempfile
+import threading
 import unittest
 
 from lte.protos.subscriberdb_pb2 import SubscriberData
@@ -109,6 +113,81 @@ class StoreTests(unittest.TestCase):
             with self._store.edit_subscriber('IMSI3000') as subs:
                 pass
 
+    def test_subscriber_resync(self):
+        """
+        Test if resync applies the changes and keeps the subscriber state
+        """
+        (sid1, sub1) = self._add_subscriber('IMSI11111')
+        (sid2, _) = self._add_subscriber('IMSI22222')
+        with self._store.edit_subscriber(sid1) as subs:
+            subs.state.lte_auth_next_seq = 42
+
+        sub1.lte.auth_key = b'1234'
+        sub3 = SubscriberData(sid=SIDUtils.to_pb('IMSI33333'))
+        sub3.state.lte_auth_next_seq = 7
+        self._store.resync([sub1, sub3])
+        self.assertEqual(self._store.list_subscribers(), [sid1, 'IMSI33333'])
+
+        sub = self._store.get_subscriber_data(sid1)
+        self.assertEqual(sub.lte.auth_key, b'1234')
+        self.assertEqual(sub.state.lte_auth_next_seq, 42)
+        self.assertEqual(
+            self._store.get_subscriber_data('IMSI33333').state
+            .lte_auth_next_seq, 7)
+        with self.assertRaises(SubscriberNotFoundError):
+            self._store.get_subscriber_data(sid2)
+
+        # Unchanged subscribers are left as they are
+        with self._store.edit_subscriber(sid1) as subs:
+            subs.state.lte_auth_next_seq = 43
+        self._store.resync([sub1, sub3])
+        self.assertEqual(
+            self._store.get_subscriber_data(sid1).state.lte_auth_next_seq, 43)
+
+    def test_state_column_migration(self):
+        """
+        Test if subscribers stored with the state in their data are migrated
+        """
+        db_location = "file:migration?mode=memory&cache=shared"
+        conn = sqlite3.connect(db_location, uri=True)
+        sub = SubscriberData(sid=SIDUtils.to_pb('IMSI11111'))
+        sub.state.lte_auth_next_seq = 42
+        with conn:
+            conn.execute("CREATE TABLE subscriberdb"
+                         "(subscriber_id text PRIMARY KEY, data text)")
+            conn.execute("INSERT INTO subscriberdb(subscriber_id, data) "
+                         "VALUES (?, ?)",
+                         ('IMSI11111', sub.SerializeToString()))
+
+        store = SqliteStore(db_location)
+        self.assertEqual(store.get_subscriber_data('IMSI11111'), sub)
+        store.resync([SubscriberData(sid=SIDUtils.to_pb('IMSI11111'))])
+        self.assertEqual(store.get_subscriber_data('IMSI11111'), sub)
+        conn.close()
+
+    def test_concurrent_edits(self):
+        """
+        Test if edits from several threads don't lose updates
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SqliteStore(os.path.join(tmp_dir, 'subscriber.db'))
+            store.add_subscriber(SubscriberData(
+                sid=SIDUtils.to_pb('IMSI11111')))
+
+            def edit():
+                for _ in range(50):
+                    with store.edit_subscriber('IMSI11111') as subs:
+                        subs.state.lte_auth_next_seq += 1
+
+            threads = [threading.Thread(target=edit) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(
+                store.get_subscriber_data('IMSI11111')
+                .state.lte_auth_next_seq, 200)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -30,6 +30,8 @@ import (
 	"github.com/golang/glog"
 	"github.com/prometheus/client_model/go"
 	"google.golang.org/grpc"
+	// Registers the gzip compressor, gateways can compress their metrics
+	_ "google.golang.org/grpc/encoding/gzip"
 )
 
 const (
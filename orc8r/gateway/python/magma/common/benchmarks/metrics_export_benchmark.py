@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Measures the latency of the GetMetrics handler of the services, which
+encodes the prometheus registry of the process to a MetricsContainer. The
+registry holds counters and gauges with enum and non-enum names and label
+names, and histograms, for a total of the given number of series.
+
+Usage:
+    python3 -m magma.common.benchmarks.metrics_export_benchmark \
+        --series 10000 --scrapes 50
+"""
+
+import argparse
+import time
+
+from orc8r.protos import metricsd_pb2
+from orc8r.protos.metricsd_pb2 import MetricsContainer
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+from magma.common.metrics_export import get_metrics
+
+SERIES_PER_FAMILY = 100
+
+
+def _build_registry(num_series, histogram_ratio):
+    registry = CollectorRegistry()
+    enum_names = [name for name in metricsd_pb2.MetricName.keys()
+                  if not name.startswith('process_')]
+    num_families = max(num_series // SERIES_PER_FAMILY, 1)
+    num_histograms = int(num_families * histogram_ratio)
+    for i in range(num_families):
+        # Half of the families have names defined in MetricName
+        if i % 2 == 0 and i // 2 < len(enum_names):
+            name = enum_names[i // 2]
+        else:
+            name = 'bench_metric_%d' % i
+        labels = ['result', 'bench_label']
+        if i < num_histograms:
+            metric = Histogram(name, 'A histogram', labels,
+                               registry=registry)
+        elif i % 2 == 0:
+            metric = Counter(name, 'A counter', labels, registry=registry)
+        else:
+            metric = Gauge(name, 'A gauge', labels, registry=registry)
+        for j in range(SERIES_PER_FAMILY):
+            child = metric.labels('success', 'value_%d' % j)
+            if i < num_histograms:
+                child.observe(j / 10)
+            else:
+                child.inc(j)
+    return registry
+
+
+def _get_metrics(registry):
+    # Same as MagmaService.GetMetrics, with the registry of the benchmark
+    metrics = MetricsContainer()
+    metrics.family.extend(get_metrics(registry))
+    return metrics
+
+
+def run(args):
+    registry = _build_registry(args.series, args.histogram_ratio)
+    container = _get_metrics(registry)
+    print('Registry: %d families, %d series, %d bytes encoded' % (
+        len(container.family),
+        sum(len(family.metric) for family in container.family),
+        container.ByteSize()))
+
+    # The collection of the samples by prometheus_client is part of the
+    # latency, but not of the encoding
+    _print_latencies('Registry collect', args.scrapes,
+                     lambda: list(registry.collect()))
+    _print_latencies('GetMetrics', args.scrapes,
+                     lambda: _get_metrics(registry))
+
+
+def _print_latencies(name, count, func):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print('%s latency: mean %.1f ms, p50 %.1f ms, p99 %.1f ms' % (
+        name, sum(latencies) / len(latencies) * 1000,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[min(len(latencies) * 99 // 100, len(latencies) - 1)]
+        * 1000))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for the GetMetrics encoding of the services',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--series', type=int, default=10000,
+                            help='Number of series in the registry')
+    arg_parser.add_argument('--histogram-ratio', type=float, default=0.1,
+                            help='Ratio of the families that are histograms')
+    arg_parser.add_argument('--scrapes', type=int, default=50,
+                            help='Number of GetMetrics calls')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,3 +17,8 @@ STREAMER_RESPONSES = Counter('streamer_responses',
 
 SERVICE_ERRORS = Counter('service_errors',
                          'The number of errors logged')
+
+REDIS_ROUND_TRIPS = Counter('redis_round_trips',
+                            'The number of round trips to Redis made by the '
+                            'Redis containers, by hash and operation',
+                            ['hash', 'operation'])
@@ -18,6 +18,12 @@ import metrics_pb2
 from orc8r.protos import metricsd_pb2
 from prometheus_client import REGISTRY
 
+# Enum values of the metric and label names, as sent in place of the names
+_METRIC_NAMES = {name: str(value)
+                 for name, value in metricsd_pb2.MetricName.items()}
+_LABEL_NAMES = {name: str(value)
+                for name, value in metricsd_pb2.MetricLabelName.items()}
+
 
 def get_metrics(registry=REGISTRY, verbose=False):
     """
@@ -39,17 +45,18 @@ def get_metrics(registry=REGISTRY, verbose=False):
             family_proto = encode_summary(metric_family, timestamp_ms)
         elif metric_family.type == 'histogram':
             family_proto = encode_histogram(metric_family, timestamp_ms)
+        else:
+            logging.debug('Skipping %s metric %s', metric_family.type,
+                          metric_family.name)
+            continue
 
         if verbose:
             family_proto.help = metric_family.documentation
             family_proto.name = metric_family.name
         else:
-            try:
-                family_proto.name = \
-                    str(metricsd_pb2.MetricName.Value(metric_family.name))
-            except ValueError as e:
-                logging.debug(e)  # If enum is not defined
-                family_proto.name = metric_family.name
+            # Use the enum value if the name is defined in MetricNames
+            family_proto.name = _METRIC_NAMES.get(metric_family.name,
+                                                  metric_family.name)
         yield family_proto
 
 
@@ -73,17 +80,15 @@ def encode_counter_gauge(family, timestamp_ms):
     family_proto = metrics_pb2.MetricFamily()
     family_proto.type = \
         metrics_pb2.MetricType.Value(family.type.upper())
-    for sample in family.samples:
-        metric_proto = metrics_pb2.Metric()
-        if family_proto.type == metrics_pb2.COUNTER:
-            metric_proto.counter.value = sample[2]
-        elif family_proto.type == metrics_pb2.GAUGE:
-            metric_proto.gauge.value = sample[2]
-        # Add meta-data to the timeseries
-        metric_proto.timestamp_ms = timestamp_ms
-        metric_proto.label.extend(_convert_labels_to_enums(sample[1].items()))
-        # Append metric sample to family
-        family_proto.metric.extend([metric_proto])
+    add_metric = family_proto.metric.add
+    is_counter = family_proto.type == metrics_pb2.COUNTER
+    for _, labels, value in family.samples:
+        metric_proto = add_metric(timestamp_ms=timestamp_ms)
+        if is_counter:
+            metric_proto.counter.value = value
+        else:
+            metric_proto.gauge.value = value
+        _add_labels(metric_proto, labels.items())
     return family_proto
 
 
@@ -109,27 +114,18 @@ def encode_summary(family, timestamp_ms):
     family_proto = metrics_pb2.MetricFamily()
     family_proto.type = metrics_pb2.SUMMARY
     metric_protos = {}
-    # Build a map of each of the summary timeseries from the samples
-    for sample in family.samples:
-        quantile = sample[1].pop('quantile', None) # Remove from label set
-        # Each time series identified by label set excluding the quantile
-        metric_proto = \
-            metric_protos.setdefault(frozenset(sample[1].items()),
-                                     metrics_pb2.Metric())
-        if sample[0].endswith('_count'):
-            metric_proto.summary.sample_count = int(sample[2])
-        elif sample[0].endswith('_sum'):
-            metric_proto.summary.sample_sum = sample[2]
+    # Build each of the summary timeseries from the samples, in one pass
+    for name, labels, value in family.samples:
+        quantile = labels.get('quantile')
+        metric_proto = _get_metric_proto(family_proto, metric_protos, labels,
+                                         'quantile', timestamp_ms)
+        if name.endswith('_count'):
+            metric_proto.summary.sample_count = int(value)
+        elif name.endswith('_sum'):
+            metric_proto.summary.sample_sum = value
         elif quantile:
-            quantile = metric_proto.summary.quantile.add()
-            quantile.value = sample[2]
-            quantile.quantile = _goStringToFloat(quantile)
-    # Go back and add meta-data to the timeseries
-    for labels, metric_proto in metric_protos.items():
-        metric_proto.timestamp_ms = timestamp_ms
-        metric_proto.label.extend(_convert_labels_to_enums(labels))
-        # Add it to the family
-        family_proto.metric.extend([metric_proto])
+            metric_proto.summary.quantile.add(
+                quantile=_goStringToFloat(quantile), value=value)
     return family_proto
 
 
@@ -156,28 +152,39 @@ def encode_histogram(family, timestamp_ms):
     family_proto = metrics_pb2.MetricFamily()
     family_proto.type = metrics_pb2.HISTOGRAM
     metric_protos = {}
-    for sample in family.samples:
-        upper_bound = sample[1].pop('le', None) # Remove from label set
-        metric_proto = \
-            metric_protos.setdefault(frozenset(sample[1].items()),
-                                     metrics_pb2.Metric())
-        if sample[0].endswith('_count'):
-            metric_proto.histogram.sample_count = int(sample[2])
-        elif sample[0].endswith('_sum'):
-            metric_proto.histogram.sample_sum = sample[2]
-        elif sample[0].endswith('_bucket'):
-            quantile = metric_proto.histogram.bucket.add()
-            quantile.cumulative_count = int(sample[2])
-            quantile.upper_bound = _goStringToFloat(upper_bound)
-    # Go back and add meta-data to the timeseries
-    for labels, metric_proto in metric_protos.items():
-        metric_proto.timestamp_ms = timestamp_ms
-        metric_proto.label.extend(_convert_labels_to_enums(labels))
-        # Add it to the family
-        family_proto.metric.extend([metric_proto])
+    for name, labels, value in family.samples:
+        metric_proto = _get_metric_proto(family_proto, metric_protos, labels,
+                                         'le', timestamp_ms)
+        if name.endswith('_bucket'):
+            metric_proto.histogram.bucket.add(
+                cumulative_count=int(value),
+                upper_bound=_goStringToFloat(labels['le']))
+        elif name.endswith('_count'):
+            metric_proto.histogram.sample_count = int(value)
+        elif name.endswith('_sum'):
+            metric_proto.histogram.sample_sum = value
     return family_proto
 
 
+def _get_metric_proto(family_proto, metric_protos, labels, extra_label,
+                      timestamp_ms):
+    """
+    Returns the timeseries of a summary or histogram sample, adding it to the
+    family if it is the first sample of the series. A timeseries is identified
+    by the labels of its samples, excluding the quantile or bucket label.
+    """
+    if extra_label in labels:
+        labels = labels.copy()
+        del labels[extra_label]
+    key = frozenset(labels.items())
+    metric_proto = metric_protos.get(key)
+    if metric_proto is None:
+        metric_proto = family_proto.metric.add(timestamp_ms=timestamp_ms)
+        _add_labels(metric_proto, labels.items())
+        metric_protos[key] = metric_proto
+    return metric_proto
+
+
 def _goStringToFloat(s):
     if s == '+Inf':
         return float("inf")
@@ -189,20 +196,15 @@ def _goStringToFloat(s):
         return float(s)
 
 
-def _convert_labels_to_enums(labels):
+def _add_labels(metric_proto, labels):
     """
-    Try to convert both the label names and label values to enum values.
-    Defaults to the given name and value if it fails to convert.
+    Add the label pairs to the timeseries, converting the label names to enum
+    values. Defaults to the given name if it is not defined in
+    MetricLabelName.
     Arguments:
-        labels: an array of label pairs that may contain enum names
-    Returns:
-        an array of label pairs with enum names converted to enum values
+        metric_proto: the timeseries to add the labels to
+        labels: an iterable of label pairs that may contain enum names
     """
-    new_labels = []
+    add_label = metric_proto.label.add
     for name, value in labels:
-        try:
-            name = str(metricsd_pb2.MetricLabelName.Value(name))
-        except ValueError as e:
-            logging.debug(e)
-        new_labels.append(metrics_pb2.LabelPair(name=name, value=value))
-    return new_labels
+        add_label(name=_LABEL_NAMES.get(name, name), value=value)
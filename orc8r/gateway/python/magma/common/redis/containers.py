@@ -14,8 +14,10 @@ from copy import deepcopy
 import redis
 from redis.lock import Lock
 import redis_collections
-from typing import Any, Iterator, List, MutableMapping, Optional, TypeVar
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, \
+    Tuple, TypeVar
 
+from magma.common.metrics import REDIS_ROUND_TRIPS
 from magma.common.redis.serializers import RedisSerde
 from orc8r.protos.redis_pb2 import RedisState
 
@@ -26,6 +28,9 @@ from orc8r.protos.redis_pb2 import RedisState
 
 T = TypeVar('T')
 
+# Number of keys fetched per round trip when walking a RedisFlatDict
+DEFAULT_SCAN_BATCH_SIZE = 500
+
 class RedisList(redis_collections.List):
     """
     List-like interface serializing elements to a Redis datastore.
@@ -112,6 +117,7 @@ class RedisHashDict(redis_collections.DefaultDict):
         - Mutable elements handled correctly
         - Not expected to be thread safe, but could be extended
         - Keys are serialized in plaintext
+        - Round trips to Redis are counted in the redis_round_trips metric
     """
 
     @staticmethod
@@ -128,6 +134,7 @@ class RedisHashDict(redis_collections.DefaultDict):
         self, client, key, serialize, deserialize,
         default_factory=None,
         writeback=False,
+        local_cache=False,
     ):
         """
         Initialize instance.
@@ -143,6 +150,12 @@ class RedisHashDict(redis_collections.DefaultDict):
                 local cache of values and the `sync` method can be called to
                 store these values. NOTE: only use this option if syncing
                 between services is not important.
+            local_cache (bool): if local_cache is set to true, dict maintains
+                a read-through cache of values and versions, and writes go
+                straight to Redis. Writes then don't need to read the current
+                version first, and reads of cached keys don't go to Redis.
+                NOTE: only use this option if this dict is the only writer of
+                the hash, and cached values are not mutated in place.
 
         Returns:
             redis_dict (redis_collections.Dict): persistent dict-like interface
@@ -153,9 +166,32 @@ class RedisHashDict(redis_collections.DefaultDict):
         # Value serialization
         self._pickle_value = serialize
         self._unpickle = deserialize
+        self._local_cache = local_cache
+        self._versions = {}  # Versions of cached keys, if local_cache is set
         super().__init__(
             default_factory, redis=client, key=key, writeback=writeback)
 
+    def __getitem__(self, key):
+        """Return the item of dictionary with key *key*.
+
+        Override in order to populate the local cache
+        """
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+        self._count_round_trip('get')
+        pickled_value = self.redis.hget(self.key, self._pickle_key(key))
+        if pickled_value is None:
+            return self.__missing__(key)
+
+        value = self._unpickle(pickled_value)
+        if self.writeback or self._local_cache:
+            self.cache[key] = value
+        if self._local_cache:
+            self._versions[key] = _get_version(pickled_value)
+        return value
+
     def __setitem__(self, key, value):
         """Set ``d[key]`` to *value*.
 
@@ -164,10 +200,90 @@ class RedisHashDict(redis_collections.DefaultDict):
         version = self.get_version(key)
         pickled_key = self._pickle_key(key)
         pickled_value = self._pickle_value(value, version + 1)
+        self._count_round_trip('set')
         self.redis.hset(self.key, pickled_key, pickled_value)
 
-        if self.writeback:
+        if self.writeback or self._local_cache:
             self.cache[key] = value
+        if self._local_cache:
+            self._versions[key] = version + 1
+
+    def __delitem__(self, key):
+        """Remove ``d[key]`` from dictionary.
+
+        Override in order to drop the cached version
+        """
+        self._count_round_trip('delete')
+        super().__delitem__(key)
+        self._versions.pop(key, None)
+
+    def __contains__(self, key):
+        """Return ``True`` if *key* is present, else ``False``."""
+        if self._local_cache and key in self.cache:
+            return True
+        self._count_round_trip('contains')
+        return super().__contains__(key)
+
+    def pop(self, key, *args):
+        """Remove *key* and return its value, or the default if given.
+
+        Override in order to drop the cached version
+        """
+        self._count_round_trip('pop')
+        self._versions.pop(key, None)
+        return super().pop(key, *args)
+
+    def clear(self, pipe=None):
+        """Remove all keys from the dictionary"""
+        self._count_round_trip('clear')
+        super().clear(pipe)
+        # The parent only clears the cache of writeback dicts
+        if self._local_cache:
+            self.cache.clear()
+        self._versions.clear()
+
+    def update(self, other=None, **kwargs):
+        """Update the dictionary with the key/value pairs from *other* and
+        *kwargs*, overwriting existing keys. See set_many.
+        """
+        data = dict(other or {}, **kwargs)
+        self.set_many(data)
+
+    def set_many(self, data: Mapping[str, Any]):
+        """Set all key/value pairs of *data*, incrementing their versions.
+
+        The current versions of the keys are read with a single HMGET, skipped
+        entirely if the versions are cached, and all values are written with a
+        single pipelined request.
+        """
+        if not data:
+            return
+        versions = {}
+        missing_keys = []
+        for key in data:
+            if self._local_cache and key in self._versions:
+                versions[key] = self._versions[key]
+            else:
+                missing_keys.append(key)
+        if missing_keys:
+            self._count_round_trip('set_many')
+            old_values = self.redis.hmget(
+                self.key, [self._pickle_key(key) for key in missing_keys])
+            for key, old_value in zip(missing_keys, old_values):
+                versions[key] = _get_version(old_value)
+
+        pipe = self.redis.pipeline()
+        for key, value in data.items():
+            pickled_value = self._pickle_value(value, versions[key] + 1)
+            pipe.hset(self.key, self._pickle_key(key), pickled_value)
+        self._count_round_trip('set_many')
+        pipe.execute()
+
+        if self.writeback or self._local_cache:
+            self.cache.update(data)
+        if self._local_cache:
+            for key in data:
+                self._versions[key] = versions[key] + 1
 
     def __copy__(self):
         return {key: self[key] for key in self}
@@ -180,51 +296,65 @@ class RedisHashDict(redis_collections.DefaultDict):
         key is not in the map
         """
         try:
-            value = self.cache[key]
+            return self._versions[key]
         except KeyError:
-            pickled_key = self._pickle_key(key)
-            value = self.redis.hget(self.key, pickled_key)
-            if value is None:
-                return 0
+            pass
+        self._count_round_trip('get_version')
+        pickled_key = self._pickle_key(key)
+        version = _get_version(self.redis.hget(self.key, pickled_key))
+        if self._local_cache and version:
+            self._versions[key] = version
+        return version
 
-        proto_wrapper = RedisState()
-        proto_wrapper.ParseFromString(value)
-        return proto_wrapper.version
+    def _count_round_trip(self, operation):
+        REDIS_ROUND_TRIPS.labels(hash=self.key, operation=operation).inc()
 
 
 class RedisFlatDict(MutableMapping[str, T]):
     """
     Dict-like interface serializing elements to a Redis datastore. This
     dict stores key directly (i.e. without a hashmap).
+
+    Keys are walked with SCAN and values fetched with MGET in batches, so
+    iterating the dict never blocks Redis with a KEYS call or issues a GET
+    per key.
+
+    If the dict is indexed, the keys of the type and the keys marked as
+    garbage are also kept in two Redis sets, updated in the same
+    transaction as the values. len() and garbage_keys() then don't need to
+    walk the keyspace. Only use the index if every writer of the type goes
+    through an indexed RedisFlatDict.
     """
 
-    def __init__(self, client: redis.Redis, serde: RedisSerde[T]):
+    def __init__(self, client: redis.Redis, serde: RedisSerde[T],
+                 indexed: bool = False):
         """
         Args:
             client (redis.Redis): Redis client object
             serde (): RedisSerde for de/serializing the object stored
+            indexed (bool): maintain a per-type index of the keys
         """
         super().__init__()
         self.redis = client
         self.serde = serde
         self.redis_type = serde.redis_type
+        self.indexed = indexed
+        self._index_key = self.redis_type + ":index"
+        self._garbage_index_key = self.redis_type + ":garbage"
+        if indexed and not self.redis.exists(self._index_key):
+            self._rebuild_index()
 
     def __len__(self) -> int:
         """Return the number of items in the dictionary."""
-        return len(self.keys())
+        if self.indexed:
+            return self.redis.scard(self._index_key) - \
+                self.redis.scard(self._garbage_index_key)
+        return sum(1 for _ in self.__iter__())
 
     def __iter__(self) -> Iterator[str]:
         """Return an iterator over the keys of the dictionary."""
-        type_pattern = "*:" + self.redis_type
-        for k in self.redis.keys(pattern=type_pattern):
-            try:
-                deserialized_key = k.decode('utf-8')
-                split_key = deserialized_key.split(":", 1)
-            except AttributeError:
-                split_key = k.split(":", 1)
-            if self.is_garbage(split_key[0]):
-                continue
-            yield split_key[0]
+        for key, _ in self.scan_versions():
+            yield key
 
     def __contains__(self, key: str) -> bool:
         """Return ``True`` if *key* is present and not garbage,
@@ -260,7 +390,14 @@ class RedisFlatDict(MutableMapping[str, T]):
         version = self.get_version(key)
         serialized_value = self.serde.serialize(value, version + 1)
         composite_key = self._make_composite_key(key)
-        return self.redis.set(composite_key, serialized_value)
+        if not self.indexed:
+            return self.redis.set(composite_key, serialized_value)
+
+        pipe = self.redis.pipeline()
+        pipe.set(composite_key, serialized_value)
+        pipe.sadd(self._index_key, key)
+        pipe.srem(self._garbage_index_key, key)
+        return pipe.execute()[0]
 
     def __delitem__(self, key: str) -> int:
         """Remove ``d[key:type]`` from dictionary.
@@ -269,7 +406,14 @@ class RedisFlatDict(MutableMapping[str, T]):
         if ':' in key:
             raise ValueError("Key %s cannot contain ':' char" % key)
         composite_key = self._make_composite_key(key)
-        deleted_count = self.redis.delete(composite_key)
+        if self.indexed:
+            pipe = self.redis.pipeline()
+            pipe.delete(composite_key)
+            pipe.srem(self._index_key, key)
+            pipe.srem(self._garbage_index_key, key)
+            deleted_count = pipe.execute()[0]
+        else:
+            deleted_count = self.redis.delete(composite_key)
         if not deleted_count:
             raise KeyError(composite_key)
         return deleted_count
@@ -288,9 +432,16 @@ class RedisFlatDict(MutableMapping[str, T]):
         Clear all keys in the dictionary. Objects are immediately deleted
         (i.e. not garbage collected)
         """
-        for key in self.keys():
-            composite_key = self._make_composite_key(key)
-            self.redis.delete(composite_key)
+        # Collect the keys first, deleting them would move the scan cursor
+        all_keys = self.keys()
+        for i in range(0, len(all_keys), DEFAULT_SCAN_BATCH_SIZE):
+            keys = all_keys[i:i + DEFAULT_SCAN_BATCH_SIZE]
+            pipe = self.redis.pipeline()
+            for key in keys:
+                pipe.delete(self._make_composite_key(key))
+            if self.indexed:
+                pipe.srem(self._index_key, *keys)
+            pipe.execute()
 
     def get_version(self, key: str) -> int:
         """Return the version of the value for key *key:type*. Returns 0 if
@@ -311,6 +462,52 @@ class RedisFlatDict(MutableMapping[str, T]):
         """
         return list(self.__iter__())
 
+    def scan_versions(
+        self, batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> Iterator[Tuple[str, int]]:
+        """Return an iterator over the (key, version) pairs of the
+        dictionary, skipping garbage. Values are fetched *batch_size* keys
+        per round trip and are not deserialized.
+        """
+        for batch in self._scan_batches(batch_size):
+            for key, state, _ in batch:
+                if not state.is_garbage:
+                    yield key, state.version
+
+    def scan_items(
+        self, batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> Iterator[Tuple[str, T]]:
+        """Return an iterator over the (key, value) pairs of the
+        dictionary, skipping garbage. Values are fetched *batch_size* keys
+        per round trip.
+        """
+        for batch in self._scan_batches(batch_size):
+            for key, state, serialized_value in batch:
+                if not state.is_garbage:
+                    yield key, self.serde.deserialize(serialized_value)
+
+    def fetch_versions(
+        self, keys: List[str], batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
+    ) -> Iterator[Tuple[str, int, Optional[bytes]]]:
+        """Return an iterator over the (key, version, serialized value)
+        tuples of *keys*, fetched *batch_size* keys per round trip. Keys that
+        are not in the map or are garbage have version 0 and no value.
+        """
+        for i in range(0, len(keys), batch_size):
+            batch_keys = keys[i:i + batch_size]
+            values = self.redis.mget(
+                [self._make_composite_key(key) for key in batch_keys])
+            for key, value in zip(batch_keys, values):
+                if value is None:
+                    yield key, 0, None
+                    continue
+                proto_wrapper = RedisState()
+                proto_wrapper.ParseFromString(value)
+                if proto_wrapper.is_garbage:
+                    yield key, 0, None
+                else:
+                    yield key, proto_wrapper.version, value
+
     def mark_as_garbage(self, key: str) -> Any:
         """Mark ``d[key:type]`` for garbage collection
         Raises a KeyError if *key:type* is not in the map.
@@ -324,7 +521,13 @@ class RedisFlatDict(MutableMapping[str, T]):
         proto_wrapper.ParseFromString(value)
         proto_wrapper.is_garbage = True
         garbage_serialized = proto_wrapper.SerializeToString()
-        return self.redis.set(composite_key, garbage_serialized)
+        if not self.indexed:
+            return self.redis.set(composite_key, garbage_serialized)
+
+        pipe = self.redis.pipeline()
+        pipe.set(composite_key, garbage_serialized)
+        pipe.sadd(self._garbage_index_key, key)
+        return pipe.execute()[0]
 
     def is_garbage(self, key: str) -> bool:
         """Return if d[key:type] has been marked for garbage collection.
@@ -343,17 +546,13 @@ class RedisFlatDict(MutableMapping[str, T]):
         """Return a copy of the dictionary's list of keys that are garbage
         Note: for redis *key:type* key is returned
         """
+        if self.indexed:
+            return [_decode(key)
+                    for key in self.redis.smembers(self._garbage_index_key)]
         garbage_keys = []
-        type_pattern = "*:" + self.redis_type
-        for k in self.redis.keys(pattern=type_pattern):
-            try:
-                deserialized_key = k.decode('utf-8')
-                split_key = deserialized_key.split(":", 1)
-            except AttributeError:
-                split_key = k.split(":", 1)
-            if not self.is_garbage(split_key[0]):
-                continue
-            garbage_keys.append(split_key[0])
+        for batch in self._scan_batches(DEFAULT_SCAN_BATCH_SIZE):
+            garbage_keys.extend(
+                key for key, state, _ in batch if state.is_garbage)
         return garbage_keys
 
     def delete_garbage(self, key) -> bool:
@@ -372,3 +571,80 @@ class RedisFlatDict(MutableMapping[str, T]):
 
     def _make_composite_key(self, key):
         return key + ":" + self.redis_type
+
+    def _scan_batches(
+        self, batch_size: int,
+    ) -> Iterator[List[Tuple[str, RedisState, bytes]]]:
+        """
+        Walk the keys of the type, including garbage, and yield batches of
+        (key, RedisState, serialized value) tuples fetched with one MGET per
+        batch. Keys of an indexed dict are walked with SSCAN on the index,
+        otherwise with SCAN on the keyspace. Index entries of keys that no
+        longer exist are dropped along the way.
+        """
+        seen = set()  # SCAN can return a key more than once
+        for keys in self._scan_keys(batch_size):
+            keys = [key for key in keys if key not in seen]
+            if not keys:
+                continue
+            seen.update(keys)
+            values = self.redis.mget(
+                [self._make_composite_key(key) for key in keys])
+            batch = []
+            stale_keys = []
+            for key, value in zip(keys, values):
+                if value is None:
+                    stale_keys.append(key)
+                    continue
+                proto_wrapper = RedisState()
+                proto_wrapper.ParseFromString(value)
+                batch.append((key, proto_wrapper, value))
+            if stale_keys and self.indexed:
+                self.redis.srem(self._index_key, *stale_keys)
+            yield batch
+
+    def _scan_keys(self, batch_size: int) -> Iterator[List[str]]:
+        cursor = 0
+        while True:
+            if self.indexed:
+                cursor, keys = self.redis.sscan(
+                    self._index_key, cursor, count=batch_size)
+                keys = [_decode(key) for key in keys]
+            else:
+                cursor, keys = self.redis.scan(
+                    cursor, match="*:" + self.redis_type, count=batch_size)
+                keys = [_decode(key).split(":", 1)[0] for key in keys]
+            yield keys
+            if not cursor:
+                return
+
+    def _rebuild_index(self):
+        """ Populate the index from the keyspace, ex. after an upgrade """
+        indexed, self.indexed = self.indexed, False
+        try:
+            pipe = self.redis.pipeline()
+            for batch in self._scan_batches(DEFAULT_SCAN_BATCH_SIZE):
+                for key, state, _ in batch:
+                    pipe.sadd(self._index_key, key)
+                    if state.is_garbage:
+                        pipe.sadd(self._garbage_index_key, key)
+            pipe.execute()
+        finally:
+            self.indexed = indexed
+
+
+def _decode(key) -> str:
+    """Return *key* as str, Redis returns bytes unless decoding is set"""
+    try:
+        return key.decode('utf-8')
+    except AttributeError:
+        return key
+
+
+def _get_version(serialized_value) -> int:
+    """Return the version of a serialized RedisState, 0 if there is none"""
+    if serialized_value is None:
+        return 0
+    proto_wrapper = RedisState()
+    proto_wrapper.ParseFromString(serialized_value)
+    return proto_wrapper.version
@@ -41,6 +41,10 @@ class MockRedis(object):
         if skey in self.redis:
             del self.redis[skey]
             return 1
+        # The hashes are stored under their unserialized key
+        if key in self.redis:
+            del self.redis[key]
+            return 1
         return 0
 
     def exists(self, key):
@@ -57,6 +61,22 @@ class MockRedis(object):
         """Mock set."""
         skey = self.serialize_key(key)
         self.redis[skey] = value
+        return True
+
+    def setbit(self, key, offset, value):
+        """Mock setbit."""
+        skey = self.serialize_key(key)
+        bitmap = bytearray(self.redis.get(skey, b''))
+        if len(bitmap) <= offset >> 3:
+            bitmap.extend(bytes((offset >> 3) + 1 - len(bitmap)))
+        mask = 0x80 >> (offset & 7)
+        old_value = int(bool(bitmap[offset >> 3] & mask))
+        if value:
+            bitmap[offset >> 3] |= mask
+        else:
+            bitmap[offset >> 3] &= 0xFF ^ mask
+        self.redis[skey] = bytes(bitmap)
+        return old_value
 
     def keys(self, pattern=".*"):
         """ Mock keys with regex pattern matching."""
@@ -79,6 +99,45 @@ class MockRedis(object):
                 ret.append(key)
         return ret
 
+    # pylint: disable=unused-argument
+    def scan(self, cursor=0, match=None, count=None):
+        """ Mock scan, returns all matching keys in one batch."""
+        return 0, self.keys(match or "*")
+
+    def mget(self, keys, *args):
+        """Mock mget."""
+        return [self.get(key) for key in keys]
+
+    def sadd(self, name, *values):
+        """Mock sadd."""
+        members = self.redis.setdefault(self.serialize_key(name), set())
+        added = [value for value in values
+                 if self.serialize_key(value) not in members]
+        members.update(self.serialize_key(value) for value in added)
+        return len(added)
+
+    def srem(self, name, *values):
+        """Mock srem."""
+        members = self.redis.get(self.serialize_key(name), set())
+        removed = [value for value in values
+                   if self.serialize_key(value) in members]
+        members.difference_update(
+            self.serialize_key(value) for value in removed)
+        return len(removed)
+
+    def scard(self, name):
+        """Mock scard."""
+        return len(self.redis.get(self.serialize_key(name), set()))
+
+    def smembers(self, name):
+        """Mock smembers."""
+        return set(self.redis.get(self.serialize_key(name), set()))
+
+    # pylint: disable=unused-argument
+    def sscan(self, name, cursor=0, match=None, count=None):
+        """ Mock sscan, returns all members in one batch."""
+        return 0, list(self.smembers(name))
+
     def hget(self, hashkey, key):
         """Mock hget."""
 
@@ -88,6 +147,11 @@ class MockRedis(object):
         return self.redis[hashkey][skey] if skey in self.redis[hashkey] \
             else None
 
+    def hmget(self, hashkey, keys):
+        """Mock hmget."""
+
+        return [self.hget(hashkey, key) for key in keys]
+
     def hgetall(self, hashkey):
         """Mock hgetall."""
 
@@ -112,8 +176,10 @@ class MockRedis(object):
         """ Mock hdel"""
         skey = self.serialize_key(key)
         if hashkey not in self.redis:
-            return
-        self.redis[hashkey].pop(skey)
+            return 0
+        if self.redis[hashkey].pop(skey, None) is None:
+            return 0
+        return 1
 
     def pipeline(self):
         """ Mock pipline"""
@@ -168,10 +234,26 @@ class MockUnavailableRedis(object):
         """ Mock keys with regex pattern matching."""
         raise RedisError("mock redis error")
 
+    def scan(self, cursor=0, match=None, count=None):
+        """ Mock scan."""
+        raise RedisError("mock redis error")
+
+    def mget(self, keys, *args):
+        """Mock mget."""
+        raise RedisError("mock redis error")
+
+    def sscan(self, name, cursor=0, match=None, count=None):
+        """ Mock sscan."""
+        raise RedisError("mock redis error")
+
     def hget(self, hashkey, key):
         """Mock hget."""
         raise RedisError("mock redis error")
 
+    def hmget(self, hashkey, keys):
+        """Mock hmget."""
+        raise RedisError("mock redis error")
+
     def hgetall(self, hashkey):
         """Mock hgetall."""
         raise RedisError("mock redis error")
@@ -215,12 +297,36 @@ class MockRedisPipeline(object):
         self.pipe_res.append(del_res)
         return del_res
 
+    def set(self, key, value):
+        """ Mock set."""
+        set_res = self.redis.set(key, value)
+        self.pipe_res.append(set_res)
+        return set_res
+
+    def sadd(self, name, *values):
+        """ Mock sadd."""
+        sadd_res = self.redis.sadd(name, *values)
+        self.pipe_res.append(sadd_res)
+        return sadd_res
+
+    def srem(self, name, *values):
+        """ Mock srem."""
+        srem_res = self.redis.srem(name, *values)
+        self.pipe_res.append(srem_res)
+        return srem_res
+
     def hget(self, hashkey, key):
         """Mock hget."""
         hget_res = self.redis.hget(hashkey, key)
         self.pipe_res.append(hget_res)
         return hget_res
 
+    def hset(self, hashkey, key, value):
+        """Mock hset."""
+        hset_res = self.redis.hset(hashkey, key, value)
+        self.pipe_res.append(hset_res)
+        return hset_res
+
     def hdel(self, hashkey, key):
         """ Mock hdel"""
         hdel_res = self.redis.hdel(hashkey, key)
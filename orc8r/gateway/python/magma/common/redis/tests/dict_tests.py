@@ -11,6 +11,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from magma.common.metrics import REDIS_ROUND_TRIPS
 from magma.common.redis.client import get_default_client
 from magma.common.redis.containers import RedisHashDict, RedisFlatDict
 from magma.common.redis.mocks.mock_redis import MockRedis
@@ -39,6 +40,11 @@ class RedisDictTests(TestCase):
                            get_proto_deserializer(LogVerbosity))
         self._flat_dict = RedisFlatDict(client, serde)
 
+    def tearDown(self):
+        # The mock store is shared with the tests of the other modules, which
+        # scan all its keys
+        MockRedis.redis.clear()
+
     @mock.patch("redis.Redis", MockRedis)
     def test_hash_insert(self):
         expected = LogVerbosity(verbosity=0)
@@ -58,6 +64,61 @@ class RedisDictTests(TestCase):
         self.assertEqual(2, version2)
         self.assertEqual(expected2, actual2)
 
+    @mock.patch("redis.Redis", MockRedis)
+    def test_hash_update(self):
+        self._hash_dict['update1'] = LogVerbosity(verbosity=0)
+
+        self._hash_dict.update({
+            'update1': LogVerbosity(verbosity=1),
+            'update2': LogVerbosity(verbosity=2),
+        })
+        self.assertEqual(2, self._hash_dict.get_version('update1'))
+        self.assertEqual(1, self._hash_dict.get_version('update2'))
+        self.assertEqual(LogVerbosity(verbosity=1), self._hash_dict['update1'])
+        self.assertEqual(LogVerbosity(verbosity=2), self._hash_dict['update2'])
+
+    @mock.patch("redis.Redis", MockRedis)
+    def test_hash_local_cache(self):
+        cached_dict = RedisHashDict(
+            get_default_client(),
+            "unittest_local_cache",
+            get_proto_serializer(),
+            get_proto_deserializer(LogVerbosity),
+            local_cache=True)
+        cached_dict['cached1'] = LogVerbosity(verbosity=0)
+        cached_dict['cached1'] = LogVerbosity(verbosity=1)
+        cached_dict.set_many({
+            'cached1': LogVerbosity(verbosity=2),
+            'cached2': LogVerbosity(verbosity=3),
+        })
+
+        # Cached values and versions don't go to Redis
+        round_trips = REDIS_ROUND_TRIPS.labels(
+            hash="unittest_local_cache", operation='get')
+        before = round_trips._value.get()
+        self.assertEqual(LogVerbosity(verbosity=2), cached_dict['cached1'])
+        self.assertEqual(3, cached_dict.get_version('cached1'))
+        self.assertEqual(1, cached_dict.get_version('cached2'))
+        self.assertEqual(before, round_trips._value.get())
+
+        # Other instances see the same versions in Redis
+        self.assertEqual(
+            3, RedisHashDict(
+                get_default_client(),
+                "unittest_local_cache",
+                get_proto_serializer(),
+                get_proto_deserializer(LogVerbosity),
+            ).get_version('cached1'))
+
+        del cached_dict['cached1']
+        self.assertEqual(0, cached_dict.get_version('cached1'))
+        self.assertRaises(KeyError, cached_dict.__getitem__, 'cached1')
+
+        cached_dict.clear()
+        self.assertIsNone(cached_dict.get('cached2'))
+        self.assertRaises(KeyError, cached_dict.__getitem__, 'cached2')
+        self.assertEqual(0, cached_dict.get_version('cached2'))
+
     @mock.patch("redis.Redis", MockRedis)
     def test_missing_version(self):
         missing_version = self._hash_dict.get_version("key2")
@@ -170,6 +231,60 @@ class RedisDictTests(TestCase):
         with self.assertRaises(KeyError):
             self._flat_dict.mark_as_garbage(bad_key)
 
+    @mock.patch("redis.Redis", MockRedis)
+    def test_flat_scan(self):
+        self._flat_dict.clear()
+        self._flat_dict['scan1'] = LogVerbosity(verbosity=1)
+        self._flat_dict['scan2'] = LogVerbosity(verbosity=2)
+        self._flat_dict['scan2'] = LogVerbosity(verbosity=3)
+        self._flat_dict['scan3'] = LogVerbosity(verbosity=4)
+        self._flat_dict.mark_as_garbage('scan3')
+
+        self.assertEqual({'scan1': 1, 'scan2': 2},
+                         dict(self._flat_dict.scan_versions(batch_size=1)))
+        self.assertEqual({'scan1': LogVerbosity(verbosity=1),
+                          'scan2': LogVerbosity(verbosity=3)},
+                         dict(self._flat_dict.scan_items()))
+        self.assertEqual(2, len(self._flat_dict))
+        self.assertEqual(['scan3'], self._flat_dict.garbage_keys())
+
+        fetched = list(self._flat_dict.fetch_versions(
+            ['scan2', 'scan3', 'scan4'], batch_size=2))
+        self.assertEqual([('scan2', 2), ('scan3', 0), ('scan4', 0)],
+                         [(key, version) for key, version, _ in fetched])
+        self.assertEqual(LogVerbosity(verbosity=3),
+                         self._flat_dict.serde.deserialize(fetched[0][2]))
+        self.assertIsNone(fetched[1][2])
+        self.assertIsNone(fetched[2][2])
+
+    @mock.patch("redis.Redis", MockRedis)
+    def test_flat_index(self):
+        client = get_default_client()
+        serde = RedisSerde('indexed_log_verbosity',
+                           get_proto_serializer(),
+                           get_proto_deserializer(LogVerbosity))
+        # Existing keys are added to the index when it doesn't exist yet
+        RedisFlatDict(client, serde)['idx1'] = LogVerbosity(verbosity=1)
+        indexed_dict = RedisFlatDict(client, serde, indexed=True)
+        self.assertEqual(1, len(indexed_dict))
+
+        indexed_dict['idx2'] = LogVerbosity(verbosity=2)
+        indexed_dict['idx3'] = LogVerbosity(verbosity=3)
+        indexed_dict.mark_as_garbage('idx3')
+        self.assertEqual(2, len(indexed_dict))
+        self.assertEqual(['idx3'], indexed_dict.garbage_keys())
+        self.assertEqual({'idx1', 'idx2'}, set(indexed_dict.keys()))
+
+        self.assertTrue(indexed_dict.delete_garbage('idx3'))
+        del indexed_dict['idx1']
+        self.assertEqual(1, len(indexed_dict))
+        self.assertEqual([], indexed_dict.garbage_keys())
+        self.assertEqual(['idx2'], indexed_dict.keys())
+
+        indexed_dict.clear()
+        self.assertEqual(0, len(indexed_dict))
+        self.assertEqual([], indexed_dict.keys())
+
 
 if __name__ == "__main__":
     main()
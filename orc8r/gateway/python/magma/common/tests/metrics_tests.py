@@ -18,6 +18,7 @@ import metrics_pb2
 from orc8r.protos import metricsd_pb2
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, \
     Summary
+from prometheus_client.core import Metric
 
 from magma.common import metrics_export
 
@@ -182,5 +183,43 @@ class Service303MetricTests(unittest.TestCase):
         self.assertEqual(metric_labels[0].name, str(metricsd_pb2.result))
         self.assertEqual(metric_labels[0].value, 'success')
 
+    def test_encode_quantiles(self):
+        """ Test that quantile and bucket samples are grouped by series """
+        summary = Metric('summary', 'A summary', 'summary')
+        summary.samples = [
+            ('summary', {'result': 'ok', 'quantile': '0.5'}, 1.0),
+            ('summary', {'result': 'ok', 'quantile': '0.9'}, 2.0),
+            ('summary_count', {'result': 'ok'}, 3),
+            ('summary_sum', {'result': 'ok'}, 4.0),
+        ]
+        metric = metrics_pb2.Metric(timestamp_ms=1000)
+        metric.summary.sample_count = 3
+        metric.summary.sample_sum = 4.0
+        metric.summary.quantile.add(quantile=0.5, value=1.0)
+        metric.summary.quantile.add(quantile=0.9, value=2.0)
+        metric.label.add(name=str(metricsd_pb2.result), value='ok')
+        self.assertEqual([metric], list(
+            metrics_export.encode_summary(summary, 1000).metric))
+
+        histogram = Metric('histogram', 'A histogram', 'histogram')
+        histogram.samples = [
+            ('histogram_bucket', {'result': 'ok', 'le': '1.0'}, 1),
+            ('histogram_bucket', {'result': 'ok', 'le': '+Inf'}, 2),
+            ('histogram_count', {'result': 'ok'}, 2),
+            ('histogram_sum', {'result': 'ok'}, 5.0),
+        ]
+        metric = metrics_pb2.Metric(timestamp_ms=1000)
+        metric.histogram.sample_count = 2
+        metric.histogram.sample_sum = 5.0
+        metric.histogram.bucket.add(upper_bound=1.0, cumulative_count=1)
+        metric.histogram.bucket.add(upper_bound=float('inf'),
+                                    cumulative_count=2)
+        metric.label.add(name=str(metricsd_pb2.result), value='ok')
+        self.assertEqual([metric], list(
+            metrics_export.encode_histogram(histogram, 1000).metric))
+        # The samples are left as they are
+        self.assertEqual({'result': 'ok', 'le': '1.0'},
+                         histogram.samples[0][1])
+
 if __name__ == "__main__":
     unittest.main()
@@ -50,7 +50,8 @@ class GatewayDirectoryServiceRpcServicer(GatewayDirectoryServiceServicer):
         serde = RedisSerde(DIRECTORYD_REDIS_TYPE,
                            get_json_serializer(),
                            get_json_deserializer())
-        self._redis_dict = RedisFlatDict(get_default_client(), serde)
+        self._redis_dict = RedisFlatDict(get_default_client(), serde,
+                                         indexed=True)
 
     def add_to_server(self, server):
         """ Add the servicer to a gRPC server """
@@ -169,33 +170,19 @@ class GatewayDirectoryServiceRpcServicer(GatewayDirectoryServiceServicer):
         """
         response = AllDirectoryRecords()
         try:
-            redis_keys = self._redis_dict.keys()
+            # Records are fetched in batches. A record is written with a
+            # single SET, so it doesn't need to be locked to be read.
+            for key, stored_record in self._redis_dict.scan_items():
+                directory_record = response.records.add()
+                directory_record.id = key
+                directory_record.location_history[:] = \
+                    stored_record.location_history
+                for identifier_key in stored_record.identifiers:
+                    directory_record.fields[identifier_key] = \
+                        stored_record.identifiers[identifier_key]
         except RedisError as e:
             logging.error(e)
             context.set_code(grpc.StatusCode.UNAVAILABLE)
             context.set_details("Could not connect to redis: %s" % e)
-            return response
-
-        for key in redis_keys:
-            try:
-                with self._redis_dict.lock(key):
-                    # Lookup may produce an exception if the key has been
-                    # deleted between the call to __iter__ and lock
-                    stored_record = self._redis_dict[key]
-            except RedisError as e:
-                logging.error(e)
-                context.set_code(grpc.StatusCode.UNAVAILABLE)
-                context.set_details("Could not connect to redis: %s" % e)
-                return response
-            except KeyError:
-                continue
-
-            directory_record = response.records.add()
-            directory_record.id = key
-            directory_record.location_history[:] = \
-                stored_record.location_history
-            for identifier_key in stored_record.identifiers:
-                directory_record.fields[identifier_key] = \
-                    stored_record.identifiers[identifier_key]
 
         return response
@@ -159,7 +159,8 @@ class DirectorydRpcServiceTests(TestCase):
     @mock.patch("redis.Redis", MockUnavailableRedis)
     @mock.patch('snowflake.snowflake', get_mock_snowflake)
     def test_redis_unavailable(self):
-        self._servicer._redis_dict = MockUnavailableRedis("localhost", 6380)
+        self._servicer._redis_dict.redis = \
+            MockUnavailableRedis("localhost", 6380)
         req = UpdateRecordRequest()
         req.id = "IMSI557"
         req.fields["mac_addr"] = "aa:bb:aa:bb:aa:bb"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Feeds synthetic GetMetrics responses of a multi-service gateway through
+MetricsCollector.collect_done and sync, and reports the bytes uploaded per
+sync. Every service exposes process metrics and counters, gauges and
+histograms with a few label values, of which only a fraction changes
+between collects, and sessiond a gauge per subscriber. Uploads are recorded
+instead of being sent to the cloud, and always succeed. The collected bytes
+are what the collector uploaded before samples were aggregated.
+
+Usage:
+    python3 -m magma.magmad.benchmarks.metrics_sync_benchmark \
+        --services 8 --families 40 --subscribers 200 \
+        --collects-per-sync 6 --syncs 20
+"""
+
+import argparse
+import asyncio
+import gzip
+import random
+import time
+from unittest import mock
+
+import metrics_pb2
+from orc8r.protos.metricsd_pb2 import MetricsContainer
+
+from magma.magmad.metrics_collector import MetricsCollector
+
+SERVICES = ['magmad', 'subscriberdb', 'mobilityd', 'mme', 'enodebd',
+            'pipelined', 'state', 'sessiond', 'policydb', 'health']
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000]
+LABEL_VALUES = ['success', 'failure', 'timeout', 'rejected']
+
+
+class _DoneFuture(object):
+    def __init__(self, result=None):
+        self._result = result
+
+    def exception(self):
+        return None
+
+    def result(self):
+        return self._result
+
+
+class _RecordingCollector(MetricsCollector):
+    """ MetricsCollector recording its uploads instead of sending them """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.uploaded_bytes = 0
+        self.uploaded_gzip_bytes = 0
+        self.uploaded_series = 0
+
+    def _send_chunk(self, samples):
+        data = MetricsContainer(gatewayId='gw', family=samples) \
+            .SerializeToString()
+        self.uploaded_bytes += len(data)
+        self.uploaded_gzip_bytes += len(gzip.compress(data))
+        self.uploaded_series += sum(len(family.metric) for family in samples)
+        self._inflight_chunks += 1
+        self.sync_done(samples, _DoneFuture())
+
+
+class _ServiceMetrics(object):
+    """ Metric values of a service, a fraction changes at every collect """
+
+    def __init__(self, service, num_families, num_subscribers, rng):
+        self._rng = rng
+        self._values = {}  # {(family, label): value}
+        self._families = [
+            ('process_cpu_seconds_total', metrics_pb2.COUNTER, [''], 1.0),
+            ('process_resident_memory_bytes', metrics_pb2.GAUGE, [''], 1.0),
+            ('process_open_fds', metrics_pb2.GAUGE, [''], 0.1),
+            ('process_start_time_seconds', metrics_pb2.GAUGE, [''], 0.0),
+            ('python_gc_collections_total', metrics_pb2.COUNTER,
+             ['0', '1', '2'], 0.3),
+        ]
+        for i in range(num_families):
+            name = '%s_metric_%d' % (service, i)
+            if i % 10 == 0:
+                self._families.append(
+                    (name, metrics_pb2.HISTOGRAM, LABEL_VALUES[:2], 0.3))
+            elif i % 3 == 0:
+                self._families.append(
+                    (name, metrics_pb2.GAUGE, LABEL_VALUES[:1], 0.1))
+            else:
+                self._families.append(
+                    (name, metrics_pb2.COUNTER, LABEL_VALUES, 0.2))
+        if num_subscribers:
+            self._families.append((
+                '%s_subscriber_bytes' % service, metrics_pb2.GAUGE,
+                ['IMSI%015d' % sub for sub in range(num_subscribers)], 0.3))
+
+    def collect(self):
+        container = MetricsContainer()
+        for name, family_type, labels, change_ratio in self._families:
+            family = container.family.add(name=name, type=family_type)
+            for label in labels:
+                value = self._values.get((name, label), 0)
+                if value == 0 or self._rng.random() < change_ratio:
+                    value += self._rng.randint(1, 100)
+                    self._values[(name, label)] = value
+                metric = family.metric.add()
+                if label:
+                    metric.label.add(name='label', value=label)
+                _set_value(metric, family_type, value)
+        return container
+
+
+def _set_value(metric, family_type, value):
+    if family_type == metrics_pb2.COUNTER:
+        metric.counter.value = value
+    elif family_type == metrics_pb2.GAUGE:
+        metric.gauge.value = value
+    else:
+        metric.histogram.sample_count = value
+        metric.histogram.sample_sum = value * 7
+        for upper_bound in HISTOGRAM_BUCKETS:
+            metric.histogram.bucket.add(
+                cumulative_count=value * upper_bound // 2000,
+                upper_bound=upper_bound)
+
+
+def _run_mode(args, suppress_unchanged):
+    rng = random.Random(args.seed)
+    services = SERVICES[:args.services]
+    metrics = {
+        service: _ServiceMetrics(
+            service, args.families,
+            args.subscribers if service == 'sessiond' else 0, rng)
+        for service in services}
+    collector = _RecordingCollector(
+        services,
+        collect_interval=args.sync_interval // args.collects_per_sync,
+        sync_interval=args.sync_interval, grpc_timeout=30,
+        grpc_max_msg_size_mb=4, queue_length=1000,
+        loop=asyncio.new_event_loop(),
+        suppress_unchanged=suppress_unchanged,
+        full_refresh_interval=args.full_refresh_interval)
+
+    collected_bytes = 0
+    elapsed = 0.0
+    now = [1e9]
+    with mock.patch('time.time', lambda: now[0]):
+        for _ in range(args.syncs):
+            for _ in range(args.collects_per_sync):
+                containers = [(service, metrics[service].collect())
+                              for service in services]
+                collected_bytes += sum(container.ByteSize()
+                                       for _, container in containers)
+                start = time.perf_counter()
+                for service, container in containers:
+                    collector.collect_done(service, _DoneFuture(container))
+                elapsed += time.perf_counter() - start
+                now[0] += args.sync_interval / args.collects_per_sync
+            start = time.perf_counter()
+            collector.sync()
+            elapsed += time.perf_counter() - start
+    collector._loop.close()
+
+    print('%s: collected %.0f KB/sync, uploaded %d series, %.0f KB, '
+          '%.0f KB gzipped per sync, %.1f ms CPU per sync' % (
+              'Aggregated and unchanged suppressed' if suppress_unchanged
+              else 'Aggregated',
+              collected_bytes / args.syncs / 1024,
+              collector.uploaded_series / args.syncs,
+              collector.uploaded_bytes / args.syncs / 1024,
+              collector.uploaded_gzip_bytes / args.syncs / 1024,
+              elapsed / args.syncs * 1000))
+
+
+def run(args):
+    _run_mode(args, False)
+    _run_mode(args, True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark for the magmad metrics upload',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    arg_parser.add_argument('--services', type=int, default=8,
+                            help='Number of services polled, at most %d'
+                                 % len(SERVICES))
+    arg_parser.add_argument('--families', type=int, default=40,
+                            help='Number of service specific metric families '
+                                 'per service')
+    arg_parser.add_argument('--subscribers', type=int, default=200,
+                            help='Number of per-subscriber series of '
+                                 'sessiond')
+    arg_parser.add_argument('--sync-interval', type=int, default=60,
+                            help='Sync interval in seconds')
+    arg_parser.add_argument('--collects-per-sync', type=int, default=6,
+                            help='Number of collects per sync interval')
+    arg_parser.add_argument('--syncs', type=int, default=20,
+                            help='Number of syncs')
+    arg_parser.add_argument('--full-refresh-interval', type=int, default=300,
+                            help='Seconds between uploads of all series when '
+                                 'unchanged series are suppressed')
+    arg_parser.add_argument('--seed', type=int, default=1,
+                            help='Seed of the metric values')
+    args = arg_parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,9 @@ from .bootstrap_manager import BootstrapManager
 from .config_manager import CONFIG_STREAM_NAME, ConfigManager
 from .gateway_status import GatewayStatusFactory, KernelVersionsPoller
 from .metrics import metrics_collection_loop, monitor_unattended_upgrade_status
-from .metrics_collector import MetricsCollector
+from .metrics_collector import DEFAULT_CHUNK_SIZE_KB, \
+    DEFAULT_FULL_REFRESH_INTERVAL, DEFAULT_MAX_INFLIGHT_CHUNKS, \
+    MetricsCollector
 from .rpc_servicer import MagmadRpcServicer
 from .service_manager import ServiceManager
 from .service_poller import ServicePoller
@@ -74,6 +76,10 @@ def main():
     grpc_msg_size = metrics_config.get('grpc_max_msg_size_mb', 4)
     queue_length = metrics_config['queue_length']
     metrics_post_processor_fn = metrics_config.get('post_processing_fn')
+    chunk_size_kb = metrics_config.get('chunk_size_kb',
+                                       DEFAULT_CHUNK_SIZE_KB)
+    max_inflight_chunks = metrics_config.get('max_inflight_chunks',
+                                             DEFAULT_MAX_INFLIGHT_CHUNKS)
 
     # Create local metrics collector
     metrics_collector = MetricsCollector(
@@ -86,6 +92,14 @@ def main():
         loop=service.loop,
         post_processing_fn=
         get_metrics_postprocessor_fn(metrics_post_processor_fn),
+        chunk_size_kb=chunk_size_kb,
+        max_inflight_chunks=max_inflight_chunks,
+        spool_dir=metrics_config.get('spool_dir'),
+        spool_max_size_mb=metrics_config.get('spool_max_size_mb', 0),
+        compression=metrics_config.get('compression'),
+        suppress_unchanged=metrics_config.get('suppress_unchanged', False),
+        full_refresh_interval=metrics_config.get(
+            'full_refresh_interval', DEFAULT_FULL_REFRESH_INTERVAL),
     )
 
     # Poll and sync the metrics collector loops
@@ -14,7 +14,8 @@ import asyncio
 import calendar
 import logging
 import time
-from typing import Callable, List, Optional
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import snowflake
 import metrics_pb2
@@ -25,11 +26,33 @@ from orc8r.protos.metricsd_pb2_grpc import MetricsControllerStub
 from orc8r.protos.service303_pb2_grpc import Service303Stub
 
 from magma.common.service_registry import ServiceRegistry
+from magma.magmad.metrics_spool import MetricsSpool
+
+DEFAULT_CHUNK_SIZE_KB = 1024
+DEFAULT_MAX_INFLIGHT_CHUNKS = 2
+# Room left in a gRPC message for the gateway ID and field headers
+CONTAINER_OVERHEAD_BYTES = 1024
+# gRPC compression algorithms, as in grpc_compression_algorithm
+COMPRESSION_ALGORITHMS = {'none': 0, 'gzip': 2}
+# Seconds between uploads of all series when unchanged ones are suppressed,
+# the Prometheus staleness period
+DEFAULT_FULL_REFRESH_INTERVAL = 300
 
 
 class MetricsCollector(object):
     """
     Polls magma services periodicaly for metrics and posts them to cloud
+
+    Samples are uploaded in chunks of at most chunk_size_kb, with up to
+    max_inflight_chunks Collect calls in flight. Chunks that fail to upload
+    are queued for the next sync, keeping the last queue_length families, or
+    written to a MetricsSpool of spool_max_size_mb if a spool_dir is given.
+    Spooled chunks are uploaded once an upload succeeds again.
+
+    The samples collected between two syncs are aggregated, keeping the last
+    sample of every series. If suppress_unchanged is set, series whose value
+    is the same as in the last successful upload are not sent, except every
+    full_refresh_interval seconds.
     """
     _services = []
 
@@ -40,7 +63,14 @@ class MetricsCollector(object):
                  grpc_max_msg_size_mb: int,
                  queue_length: int,
                  loop: Optional[asyncio.AbstractEventLoop] = None,
-                 post_processing_fn: Optional[Callable] = None):
+                 post_processing_fn: Optional[Callable] = None,
+                 chunk_size_kb: int = DEFAULT_CHUNK_SIZE_KB,
+                 max_inflight_chunks: int = DEFAULT_MAX_INFLIGHT_CHUNKS,
+                 spool_dir: Optional[str] = None,
+                 spool_max_size_mb: int = 0,
+                 compression: Optional[str] = None,
+                 suppress_unchanged: bool = False,
+                 full_refresh_interval: int = DEFAULT_FULL_REFRESH_INTERVAL):
         self.sync_interval = sync_interval
         self.collect_interval = collect_interval
         self.grpc_timeout = grpc_timeout
@@ -49,9 +79,29 @@ class MetricsCollector(object):
         self._loop = loop if loop else asyncio.get_event_loop()
         self._retry_queue = []
         self._samples = []
-        self._grpc_options = _get_metrics_chan_grpc_options(grpc_max_msg_size_mb)
+        self._grpc_options = _get_metrics_chan_grpc_options(
+            grpc_max_msg_size_mb, compression)
         # @see example_metrics_postprocessor_fn
         self.post_processing_fn = post_processing_fn
+        self._max_chunk_bytes = min(
+            chunk_size_kb * 1024,
+            grpc_max_msg_size_mb * 1024 * 1024 - CONTAINER_OVERHEAD_BYTES)
+        self._max_inflight_chunks = max_inflight_chunks
+        self._spool = None
+        if spool_dir:
+            self._spool = MetricsSpool(spool_dir,
+                                       spool_max_size_mb * 1024 * 1024)
+        # Chunks waiting for a Collect call slot
+        self._pending_chunks = deque()
+        self._inflight_chunks = 0
+        # Spooled chunks are only sent after an upload succeeded
+        self._last_upload_ok = False
+        self.suppress_unchanged = suppress_unchanged
+        self.full_refresh_interval = full_refresh_interval
+        # {(family name, label pairs): value} of the series uploaded since
+        # the last full refresh, if suppress_unchanged is set
+        self._uploaded_values = {}
+        self._last_full_refresh = 0.0
 
     def run(self):
         """
@@ -67,40 +117,106 @@ class MetricsCollector(object):
         Synchronizes sample queue to cloud and reschedules sync loop
         """
         if self._samples:
-            chan = ServiceRegistry.get_rpc_channel('metricsd',
-                                                   ServiceRegistry.CLOUD,
-                                                   grpc_options=self._grpc_options)
-            client = MetricsControllerStub(chan)
             if self.post_processing_fn:
                 # If services wants to, let it run a postprocessing function
                 # If we throw an exception here, we'll have no idea whether
                 # something was postprocessed or not, so I guess try and make it
                 # idempotent?  #m sevchicken
                 self.post_processing_fn(self._samples)
-            samples = self._retry_queue + self._samples
-            metrics_container = MetricsContainer(
-                gatewayId=snowflake.snowflake(),
-                family=samples
-            )
-            future = client.Collect.future(metrics_container, self.grpc_timeout)
-            future.add_done_callback(lambda future:
-                                     self._loop.call_soon_threadsafe(
-                                         self.sync_done, samples, future))
+            samples = _aggregate_samples(self._samples)
+            if self.suppress_unchanged:
+                samples = self._drop_unchanged_series(samples)
+            samples = self._retry_queue + samples
+            self._pending_chunks.extend(
+                _split_samples(samples, self._max_chunk_bytes))
             self._retry_queue.clear()
             self._samples.clear()
+        self._send_pending_chunks()
         self._loop.call_later(self.sync_interval, self.sync)
 
     def sync_done(self, samples, collect_future):
         """
         Sync callback to handle exceptions
         """
+        self._inflight_chunks = max(0, self._inflight_chunks - 1)
         err = collect_future.exception()
         if err:
-            self._retry_queue = samples[-self.queue_length:]
             logging.error("Metrics upload error! [%s] %s",
                           err.code(), err.details())
+            self._last_upload_ok = False
+            # The cloud is likely unreachable, keep the pending chunks for
+            # the next sync as well
+            self._retry_chunk(samples)
+            while self._pending_chunks:
+                self._retry_chunk(self._pending_chunks.popleft())
         else:
             logging.debug("Metrics upload success")
+            self._last_upload_ok = True
+            if self.suppress_unchanged:
+                self._record_uploaded_values(samples)
+            self._send_pending_chunks()
+
+    def _drop_unchanged_series(self, samples):
+        now = time.time()
+        if now - self._last_full_refresh >= self.full_refresh_interval:
+            self._last_full_refresh = now
+            # Also forgets the series that are gone
+            self._uploaded_values.clear()
+            return samples
+        changed_samples = []
+        for family in samples:
+            changed = [
+                metric for metric in family.metric
+                if self._uploaded_values.get(
+                    (family.name, _get_label_pairs(metric)))
+                != _get_value(family.type, metric)]
+            if len(changed) == len(family.metric):
+                changed_samples.append(family)
+            elif changed:
+                changed_family = _get_empty_family(family)
+                changed_family.metric.extend(changed)
+                changed_samples.append(changed_family)
+        return changed_samples
+
+    def _record_uploaded_values(self, samples):
+        for family in samples:
+            for metric in family.metric:
+                self._uploaded_values[
+                    (family.name, _get_label_pairs(metric))] = \
+                    _get_value(family.type, metric)
+
+    def _send_pending_chunks(self):
+        while self._inflight_chunks < self._max_inflight_chunks:
+            if not self._pending_chunks and self._spool and \
+                    self._last_upload_ok:
+                chunk = self._spool.pop()
+                if chunk:
+                    self._pending_chunks.append(chunk)
+            if not self._pending_chunks:
+                return
+            self._send_chunk(self._pending_chunks.popleft())
+
+    def _send_chunk(self, samples):
+        chan = ServiceRegistry.get_rpc_channel('metricsd',
+                                               ServiceRegistry.CLOUD,
+                                               grpc_options=self._grpc_options)
+        client = MetricsControllerStub(chan)
+        metrics_container = MetricsContainer(
+            gatewayId=snowflake.snowflake(),
+            family=samples
+        )
+        future = client.Collect.future(metrics_container, self.grpc_timeout)
+        self._inflight_chunks += 1
+        future.add_done_callback(lambda future:
+                                 self._loop.call_soon_threadsafe(
+                                     self.sync_done, samples, future))
+
+    def _retry_chunk(self, samples):
+        if self._spool is not None:
+            self._spool.push(samples)
+        else:
+            self._retry_queue = \
+                (self._retry_queue + samples)[-self.queue_length:]
 
     def collect(self, service_name):
         """
@@ -191,16 +307,140 @@ def _get_uptime_metric(service_name, start_time):
     return family_proto
 
 
-def _get_metrics_chan_grpc_options(msg_size_mb: int):
+def _aggregate_samples(
+        samples: List[metrics_pb2.MetricFamily],
+) -> List[metrics_pb2.MetricFamily]:
+    """
+    Merge the families of the same name and type, keeping the last sample of
+    every series, i.e. label set. Families that don't need merging are
+    returned as is.
+    """
+    # {(name, type): [families]}
+    families = OrderedDict()
+    for family in samples:
+        families.setdefault((family.name, family.type), []).append(family)
+    aggregated = []
+    for same_families in families.values():
+        series = OrderedDict()
+        for family in same_families:
+            for metric in family.metric:
+                series[_get_label_pairs(metric)] = metric
+        first = same_families[0]
+        if len(same_families) == 1 and len(series) == len(first.metric):
+            aggregated.append(first)
+            continue
+        family = _get_empty_family(first)
+        family.metric.extend(series.values())
+        aggregated.append(family)
+    return aggregated
+
+
+def _get_empty_family(
+        family: metrics_pb2.MetricFamily) -> metrics_pb2.MetricFamily:
+    """ Copy of family without its metrics """
+    empty = metrics_pb2.MetricFamily()
+    for field in ('name', 'help', 'type'):
+        if family.HasField(field):
+            setattr(empty, field, getattr(family, field))
+    return empty
+
+
+def _get_label_pairs(metric: metrics_pb2.Metric) -> Tuple:
+    return tuple(sorted((label.name, label.value) for label in metric.label))
+
+
+def _get_value(family_type: int, metric: metrics_pb2.Metric):
+    """ Value of a sample, to compare with the value of an older sample """
+    if family_type == metrics_pb2.COUNTER:
+        return metric.counter.value
+    if family_type == metrics_pb2.GAUGE:
+        return metric.gauge.value
+    if family_type == metrics_pb2.SUMMARY:
+        return metric.summary.SerializeToString()
+    if family_type == metrics_pb2.HISTOGRAM:
+        return metric.histogram.SerializeToString()
+    return metric.untyped.value
+
+
+def _split_samples(
+        samples: List[metrics_pb2.MetricFamily],
+        max_bytes: int) -> Iterator[List[metrics_pb2.MetricFamily]]:
+    """
+    Split samples in chunks whose MetricsContainer takes at most max_bytes.
+    Families larger than max_bytes are split in families of the same name
+    with part of the metrics.
+    """
+    chunk = []
+    chunk_bytes = 0
+    for family in samples:
+        family_bytes = _get_field_size(family.ByteSize())
+        if family_bytes > max_bytes and len(family.metric) > 1:
+            parts = _split_family(family, max_bytes)
+        else:
+            parts = [(family, family_bytes)]
+        for part, part_bytes in parts:
+            if chunk and chunk_bytes + part_bytes > max_bytes:
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(part)
+            chunk_bytes += part_bytes
+    if chunk:
+        yield chunk
+
+
+def _split_family(family: metrics_pb2.MetricFamily, max_bytes: int):
+    """ Return (family, size) parts of family of at most max_bytes """
+    header = _get_empty_family(family)
+    header_bytes = header.ByteSize()
+    parts = []
+    part = None
+    part_bytes = 0
+    for metric in family.metric:
+        metric_bytes = _get_field_size(metric.ByteSize())
+        if part is None or \
+                _get_field_size(part_bytes + metric_bytes) > max_bytes:
+            if part is not None:
+                parts.append((part, _get_field_size(part_bytes)))
+            part = metrics_pb2.MetricFamily()
+            part.CopyFrom(header)
+            part_bytes = header_bytes
+        part.metric.add().CopyFrom(metric)
+        part_bytes += metric_bytes
+    if part is not None:
+        parts.append((part, _get_field_size(part_bytes)))
+    return parts
+
+
+def _get_field_size(message_bytes: int) -> int:
+    """ Size of an embedded message field, with its tag and length """
+    length_bytes = 1
+    while message_bytes >= 1 << (7 * length_bytes):
+        length_bytes += 1
+    return 1 + length_bytes + message_bytes
+
+
+def _get_metrics_chan_grpc_options(msg_size_mb: int,
+                                   compression: Optional[str] = None):
     """
     Returns a list of gRPC options for metricsd cloud grpc channel
     :param msg_size_mb: msg size in MBs
+    :param compression: compression algorithm of the messages, in
+        COMPRESSION_ALGORITHMS
     :return: list of tuples containing grpc options for channel
     """
     grpc_max_msg_size_bytes = msg_size_mb * 1024 * 1024
     logging.debug('Setting metricsd gRPC chan Max Message Size to: %s bytes',
                   grpc_max_msg_size_bytes)
-    return [('grpc.max_send_message_length', grpc_max_msg_size_bytes)]
+    options = [('grpc.max_send_message_length', grpc_max_msg_size_bytes)]
+    if compression and compression not in COMPRESSION_ALGORITHMS:
+        logging.error('Unknown metrics compression %s, expected one of %s. '
+                      'Sending the samples uncompressed', compression,
+                      ', '.join(COMPRESSION_ALGORITHMS))
+    elif compression:
+        options.append(('grpc.default_compression_algorithm',
+                        COMPRESSION_ALGORITHMS[compression]))
+    return options
 
 
 def example_metrics_postprocessor_fn(
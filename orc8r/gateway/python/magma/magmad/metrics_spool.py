@@ -0,0 +1,118 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import os
+from collections import deque
+from typing import List, Optional
+
+import metrics_pb2
+from google.protobuf.message import DecodeError
+from orc8r.protos.metricsd_pb2 import MetricsContainer
+
+CHUNK_SUFFIX = '.chunk'
+TMP_SUFFIX = '.tmp'
+
+
+class MetricsSpool(object):
+    """
+    Ring buffer of metrics chunks that failed to upload, kept on disk so they
+    survive restarts. Every chunk is a serialized MetricsContainer in its own
+    file, named after its sequence number. When the total size of the chunks
+    goes over max_bytes, the oldest chunks are dropped.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._chunks = deque()  # (sequence number, size), oldest first
+        self._bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._next_seq = self._chunks[-1][0] + 1 if self._chunks else 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def size_bytes(self) -> int:
+        """ Total size of the chunks in the spool """
+        return self._bytes
+
+    def push(self, families: List[metrics_pb2.MetricFamily]) -> None:
+        """ Add a chunk, dropping the oldest chunks if the spool is full """
+        data = MetricsContainer(family=families).SerializeToString()
+        path = self._get_path(self._next_seq)
+        try:
+            with open(path + TMP_SUFFIX, 'wb') as chunk_file:
+                chunk_file.write(data)
+            os.replace(path + TMP_SUFFIX, path)
+        except OSError as err:
+            logging.error("Failed to spool %d metric families: %s",
+                          len(families), err)
+            return
+        self._chunks.append((self._next_seq, len(data)))
+        self._bytes += len(data)
+        self._next_seq += 1
+
+        dropped = 0
+        while self._bytes > self._max_bytes:
+            seq, size = self._chunks.popleft()
+            self._remove(seq, size)
+            dropped += 1
+        if dropped:
+            logging.warning("Metrics spool full, dropped %d chunks", dropped)
+
+    def pop(self) -> Optional[List[metrics_pb2.MetricFamily]]:
+        """ Remove and return the oldest chunk, None if the spool is empty """
+        while self._chunks:
+            seq, size = self._chunks.popleft()
+            container = MetricsContainer()
+            try:
+                with open(self._get_path(seq), 'rb') as chunk_file:
+                    container.ParseFromString(chunk_file.read())
+            except (OSError, DecodeError) as err:
+                logging.error("Dropping unreadable metrics chunk %d: %s",
+                              seq, err)
+                continue
+            finally:
+                self._remove(seq, size)
+            return list(container.family)
+        return None
+
+    def _get_path(self, seq: int) -> str:
+        return os.path.join(self._directory, '%d%s' % (seq, CHUNK_SUFFIX))
+
+    def _remove(self, seq: int, size: int):
+        self._bytes -= size
+        try:
+            os.remove(self._get_path(seq))
+        except OSError as err:
+            logging.error("Failed to remove metrics chunk %d: %s", seq, err)
+
+    def _load(self):
+        chunks = []
+        for name in os.listdir(self._directory):
+            path = os.path.join(self._directory, name)
+            if name.endswith(TMP_SUFFIX):
+                # Interrupted write
+                os.remove(path)
+            elif name.endswith(CHUNK_SUFFIX) and \
+                    name[:-len(CHUNK_SUFFIX)].isdigit():
+                chunks.append((int(name[:-len(CHUNK_SUFFIX)]),
+                               os.path.getsize(path)))
+        for seq, size in sorted(chunks):
+            self._chunks.append((seq, size))
+            self._bytes += size
+        if chunks:
+            logging.info("Loaded %d spooled metrics chunks, %d bytes",
+                         len(self._chunks), self._bytes)
@@ -12,13 +12,15 @@ limitations under the License.
 """
 import asyncio
 import calendar
+import tempfile
 import time
 import unittest
 import unittest.mock
 
 from magma.common.service_registry import ServiceRegistry
-from magma.magmad.metrics_collector import MetricsCollector
-from metrics_pb2 import Metric, MetricFamily
+from magma.magmad.metrics_collector import MetricsCollector, \
+    _aggregate_samples, _get_metrics_chan_grpc_options, _split_samples
+from metrics_pb2 import COUNTER, GAUGE, LabelPair, Metric, MetricFamily
 from orc8r.protos import metricsd_pb2
 from orc8r.protos.metricsd_pb2 import MetricsContainer
 
@@ -71,7 +73,8 @@ class MetricsCollectorTests(unittest.TestCase):
                                            queue_length=self.queue_length,
                                            loop=asyncio.new_event_loop())
 
-    @unittest.mock.patch('magma.magmad.metrics_collector.MetricsControllerStub')
+    @unittest.mock.patch(
+        'magma.magmad.metrics_collector.MetricsControllerStub')
     def test_sync(self, controller_mock):
         """
         Test if the collector syncs our sample.
@@ -174,6 +177,168 @@ class MetricsCollectorTests(unittest.TestCase):
         except Exception:   # pylint: disable=broad-except
             self.fail("Collection with empty metric should not have failed")
 
+    @unittest.mock.patch('snowflake.snowflake',
+                         unittest.mock.Mock(return_value='gw'))
+    @unittest.mock.patch(
+        'magma.magmad.metrics_collector.MetricsControllerStub')
+    def test_sync_chunks(self, controller_mock):
+        """
+        Test if samples are sent in chunks, with a limited number in flight
+        """
+        mock = unittest.mock.Mock()
+        controller_mock.return_value = mock
+        metrics = [Metric(label=[LabelPair(name='id', value=str(i))])
+                   for i in range(100)]
+        samples = [MetricFamily(name=str(i), metric=metrics)
+                   for i in range(5)]
+        self._collector._max_chunk_bytes = 2 * samples[0].ByteSize() + 10
+        self._collector._samples.extend(samples)
+        self._collector.sync()
+        self._collector._loop.stop()
+
+        sent = [list(call[0][0].family)
+                for call in mock.Collect.future.call_args_list]
+        self.assertEqual([samples[0:2], samples[2:4]], sent)
+        self.assertEqual(2, self._collector._inflight_chunks)
+
+        # The last chunk is sent when a call completes
+        self._collector.sync_done(samples[0:2], MockFuture(is_error=False))
+        sent = list(mock.Collect.future.call_args_list[-1][0][0].family)
+        self.assertEqual(samples[4:], sent)
+        self.assertEqual(2, self._collector._inflight_chunks)
+
+        # Chunks are queued for retry on failure
+        self._collector.sync_done(samples[2:4], MockFuture(is_error=True))
+        self.assertEqual(samples[2:4], self._collector._retry_queue)
+        self.assertEqual(1, self._collector._inflight_chunks)
+
+    def test_compression_options(self):
+        """
+        Test if unknown compression algorithms fall back to no compression
+        """
+        self.assertIn(('grpc.default_compression_algorithm', 2),
+                      _get_metrics_chan_grpc_options(4, 'gzip'))
+        self.assertEqual(_get_metrics_chan_grpc_options(4),
+                         _get_metrics_chan_grpc_options(4, 'gzp'))
+
+    def test_split_large_family(self):
+        """
+        Test if families larger than a chunk are split
+        """
+        metrics = [Metric(timestamp_ms=i) for i in range(100)]
+        samples = [MetricFamily(name="small", metric=metrics[:1]),
+                   MetricFamily(name="large", help="help", metric=metrics)]
+        max_bytes = samples[1].ByteSize() // 3
+        chunks = list(_split_samples(samples, max_bytes))
+        self.assertGreater(len(chunks), 3)
+        for chunk in chunks:
+            self.assertLessEqual(MetricsContainer(family=chunk).ByteSize(),
+                                 max_bytes)
+        families = [family for chunk in chunks for family in chunk]
+        self.assertEqual(samples[0], families[0])
+        self.assertEqual({'large'}, {family.name for family in families[1:]})
+        self.assertEqual(metrics, [metric for family in families[1:]
+                                   for metric in family.metric])
+
+    @unittest.mock.patch('snowflake.snowflake',
+                         unittest.mock.Mock(return_value='gw'))
+    @unittest.mock.patch(
+        'magma.magmad.metrics_collector.MetricsControllerStub')
+    def test_sync_spool(self, controller_mock):
+        """
+        Test if failed chunks are spooled, and sent after an upload succeeds
+        """
+        mock = unittest.mock.Mock()
+        controller_mock.return_value = mock
+        with tempfile.TemporaryDirectory() as spool_dir:
+            collector = MetricsCollector(self._services, 5, 10, self.timeout,
+                                         grpc_max_msg_size_mb=4,
+                                         queue_length=self.queue_length,
+                                         loop=self._collector._loop,
+                                         max_inflight_chunks=1,
+                                         spool_dir=spool_dir,
+                                         spool_max_size_mb=1)
+            samples = [MetricFamily(name=str(i)) for i in range(3)]
+            collector._max_chunk_bytes = samples[0].ByteSize() + 2
+            collector._samples.extend(samples)
+            collector.sync()
+            collector._loop.stop()
+            self.assertEqual(1, mock.Collect.future.call_count)
+
+            collector.sync_done(samples[:1], MockFuture(is_error=True))
+            self.assertEqual(3, len(collector._spool))
+            self.assertEqual([], collector._retry_queue)
+
+            # Spooled chunks wait for a successful upload
+            collector._samples.append(MetricFamily(name="new"))
+            collector.sync()
+            self.assertEqual(2, mock.Collect.future.call_count)
+            self.assertEqual(3, len(collector._spool))
+            collector.sync_done(samples, MockFuture(is_error=False))
+            sent = list(
+                mock.Collect.future.call_args_list[-1][0][0].family)
+            self.assertEqual(samples[:1], sent)
+            self.assertEqual(2, len(collector._spool))
+
+    def test_aggregate_samples(self):
+        """
+        Test if only the last sample of every series is kept
+        """
+        def family(name, *values):
+            metrics = []
+            for label, value in values:
+                metric = Metric()
+                metric.gauge.value = value
+                metric.label.add(name='service', value='test')
+                metric.label.add(name='id', value=label)
+                metrics.append(metric)
+            return MetricFamily(name=name, type=GAUGE,
+                                metric=metrics)
+
+        samples = [family('a', ('1', 1), ('2', 2)), family('b', ('1', 1)),
+                   family('a', ('2', 3), ('3', 4))]
+        aggregated = _aggregate_samples(samples)
+        self.assertEqual([family('a', ('1', 1), ('2', 3), ('3', 4)),
+                          family('b', ('1', 1))], aggregated)
+        # Families that are not merged are not copied
+        self.assertIs(samples[1], aggregated[1])
+
+    @unittest.mock.patch('snowflake.snowflake',
+                         unittest.mock.Mock(return_value='gw'))
+    @unittest.mock.patch(
+        'magma.magmad.metrics_collector.MetricsControllerStub')
+    def test_suppress_unchanged(self, controller_mock):
+        """
+        Test if unchanged series are only sent on full refreshes
+        """
+        mock = unittest.mock.Mock()
+        controller_mock.return_value = mock
+        self._collector.suppress_unchanged = True
+        self._collector._max_inflight_chunks = 1
+
+        def sync(*values):
+            family = MetricFamily(name='a', type=COUNTER)
+            for label, value in values:
+                metric = family.metric.add()
+                metric.counter.value = value
+                metric.label.add(name='id', value=label)
+            self._collector._samples.append(family)
+            self._collector.sync()
+            sent = mock.Collect.future.call_args_list[-1][0][0].family
+            self._collector.sync_done(sent, MockFuture(is_error=False))
+            return [(metric.label[0].value, metric.counter.value)
+                    for family in sent for metric in family.metric]
+
+        with unittest.mock.patch('time.time') as time_mock:
+            time_mock.return_value = 1000
+            self.assertEqual([('1', 1), ('2', 1)], sync(('1', 1), ('2', 1)))
+            time_mock.return_value = 1060
+            self.assertEqual([('2', 2)], sync(('1', 1), ('2', 2)))
+            time_mock.return_value = \
+                1000 + self._collector.full_refresh_interval
+            self.assertEqual([('1', 1), ('2', 2)], sync(('1', 1), ('2', 2)))
+        self._collector._loop.stop()
+
 
 if __name__ == "__main__":
     unittest.main()
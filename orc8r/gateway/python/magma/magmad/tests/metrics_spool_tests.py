@@ -0,0 +1,81 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import tempfile
+import unittest
+
+from magma.magmad.metrics_spool import MetricsSpool
+from metrics_pb2 import MetricFamily
+
+
+class MetricsSpoolTests(unittest.TestCase):
+    """
+    Tests for the MetricsSpool ring buffer
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dir = self._tmp_dir.name
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_push_pop(self):
+        spool = MetricsSpool(self._dir, 1024 * 1024)
+        self.assertIsNone(spool.pop())
+        chunks = [[MetricFamily(name=str(i)), MetricFamily(name='x')]
+                  for i in range(3)]
+        for chunk in chunks:
+            spool.push(chunk)
+        self.assertEqual(3, len(spool))
+
+        self.assertEqual(chunks[0], spool.pop())
+        self.assertEqual(chunks[1], spool.pop())
+        spool.push(chunks[0])
+        self.assertEqual(chunks[2], spool.pop())
+        self.assertEqual(chunks[0], spool.pop())
+        self.assertIsNone(spool.pop())
+        self.assertEqual(0, spool.size_bytes)
+        self.assertEqual([], os.listdir(self._dir))
+
+    def test_ring(self):
+        chunk = [MetricFamily(name='a' * 100)]
+        spool = MetricsSpool(self._dir, 250)
+        for i in range(3):
+            spool.push([MetricFamily(name=str(i) * 100)])
+        # The oldest chunk is dropped
+        self.assertEqual(2, len(spool))
+        self.assertEqual([MetricFamily(name='1' * 100)], spool.pop())
+        spool.push(chunk)
+        self.assertEqual(2, len(spool))
+        self.assertLessEqual(spool.size_bytes, 250)
+
+    def test_restart(self):
+        spool = MetricsSpool(self._dir, 1024 * 1024)
+        spool.push([MetricFamily(name='a')])
+        spool.push([MetricFamily(name='b')])
+        spool.pop()
+        # Interrupted writes are dropped
+        with open(os.path.join(self._dir, '5.chunk.tmp'), 'wb') as tmp_file:
+            tmp_file.write(b'\x00')
+
+        spool = MetricsSpool(self._dir, 1024 * 1024)
+        self.assertEqual(1, len(spool))
+        spool.push([MetricFamily(name='c')])
+        self.assertEqual([MetricFamily(name='b')], spool.pop())
+        self.assertEqual([MetricFamily(name='c')], spool.pop())
+        self.assertEqual([], os.listdir(self._dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+
+import redis
+from redis.exceptions import RedisError
+
+NOTIFY_CONFIG = 'notify-keyspace-events'
+# Keyspace notifications, for the event classes of the commands changing
+# RedisFlatDict values: generic (DEL, RENAME...), string (SET...), expired
+# and evicted. 'A' is an alias for all classes.
+KEYSPACE_EVENTS = 'K'
+STATE_EVENT_CLASSES = 'g$xe'
+ALL_EVENT_CLASSES = 'A'
+# Seconds to wait for a notification, and before reconnecting
+LISTEN_TIMEOUT = 1.0
+
+
+class KeyspaceTracker:
+    """
+    KeyspaceTracker records the keys of the given state types that changed,
+    from the Redis keyspace notifications of the <key>:<type> keys of
+    RedisFlatDict. Notifications are received in a background thread.
+
+    Redis doesn't keep notifications for disconnected subscribers, so the
+    changes are only complete from the time the subscriptions are confirmed
+    until the connection is lost. pop_dirty_keys returns None when changes
+    may have been missed, and the caller has to check every key instead.
+    """
+
+    def __init__(self, client: redis.Redis, redis_types: Iterable[str]):
+        self._client = client
+        db = client.connection_pool.connection_kwargs.get('db', 0)
+        self._prefix = '__keyspace@%d__:' % db
+        # {pattern: state type}
+        self._patterns = {self._prefix + '*:' + redis_type: redis_type
+                          for redis_type in redis_types}
+        self._lock = threading.Lock()
+        self._dirty_keys = defaultdict(set)
+        self._subscriptions = 0
+        self._missed_changes = True
+        self._pubsub = None
+        self._thread = None
+        self._running = False
+
+    def start(self) -> bool:
+        """
+        Enable keyspace notifications if needed and start listening to them.
+        Returns False if Redis can't send them.
+        """
+        try:
+            self._enable_notifications()
+            self._pubsub = self._client.pubsub()
+            self._pubsub.psubscribe(*self._patterns)
+        except RedisError as err:
+            logging.warning("Can't track state changes with keyspace "
+                            "notifications: %s", err)
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._listen,
+                                        name='keyspace_tracker', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """ Stop listening to the notifications """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def pop_dirty_keys(self) -> Optional[Dict[str, Set[str]]]:
+        """
+        Return the keys that changed since the last call, by state type, or
+        None if changes may have been missed.
+        """
+        with self._lock:
+            dirty_keys, self._dirty_keys = self._dirty_keys, defaultdict(set)
+            if not self._missed_changes:
+                return dirty_keys
+            # The caller checks every key after this call, changes are
+            # complete from now on if all subscriptions are up
+            self._missed_changes = \
+                self._subscriptions < len(self._patterns)
+            return None
+
+    def _enable_notifications(self):
+        events = self._client.config_get(NOTIFY_CONFIG).get(NOTIFY_CONFIG, '')
+        missing = [flag for flag in KEYSPACE_EVENTS + STATE_EVENT_CLASSES
+                   if flag not in events and not (
+                       flag in STATE_EVENT_CLASSES
+                       and ALL_EVENT_CLASSES in events)]
+        if missing:
+            logging.info("Enabling Redis keyspace notifications")
+            self._client.config_set(NOTIFY_CONFIG, events + ''.join(missing))
+
+    def _listen(self):
+        connected = True
+        while self._running:
+            try:
+                if not connected:
+                    # Redis may have restarted without the notifications
+                    self._enable_notifications()
+                    connected = True
+                # Reconnects and subscribes again after a connection loss
+                message = self._pubsub.get_message(timeout=LISTEN_TIMEOUT)
+            except RedisError as err:
+                if connected:
+                    logging.warning("Lost Redis keyspace notifications: %s",
+                                    err)
+                    connected = False
+                with self._lock:
+                    self._subscriptions = 0
+                    self._missed_changes = True
+                time.sleep(LISTEN_TIMEOUT)
+                continue
+            if message is not None:
+                self._handle_message(message)
+
+    def _handle_message(self, message: Dict[str, Any]):
+        if message['type'] == 'psubscribe':
+            with self._lock:
+                self._subscriptions = message['data']
+            return
+        if message['type'] != 'pmessage':
+            return
+        redis_type = self._patterns.get(_decode(message['pattern']))
+        if redis_type is None:
+            return
+        channel = _decode(message['channel'])
+        key = channel[len(self._prefix):-len(redis_type) - 1]
+        # Keys of the type don't contain ':', other keys can match
+        if ':' in key:
+            return
+        with self._lock:
+            self._dirty_keys[redis_type].add(key)
+
+
+def _decode(value) -> str:
+    try:
+        return value.decode('utf-8')
+    except AttributeError:
+        return value
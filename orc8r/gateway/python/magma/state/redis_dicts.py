@@ -29,8 +29,9 @@ class StateDict(RedisFlatDict):
     StateDict is a RedisFlatDict that holds state metadata and reads/writes
     state to Redis.
     """
-    def __init__(self, serde: RedisSerde, state_scope: str, state_format: int):
-        super().__init__(get_default_client(), serde)
+    def __init__(self, serde: RedisSerde, state_scope: str, state_format: int,
+                 indexed: bool = False):
+        super().__init__(get_default_client(), serde, indexed)
         # Scope determines the deviceID to report the state with
         self.state_scope = state_scope
         self.state_format = state_format
@@ -59,7 +60,8 @@ def get_proto_redis_dicts(config):
                                get_proto_deserializer(msg))
             redis_dict = StateDict(serde,
                                proto_cfg['state_scope'],
-                               PROTO_FORMAT)
+                               PROTO_FORMAT,
+                               proto_cfg.get('indexed', False))
             redis_dicts.append(redis_dict)
 
         except (ImportError, AttributeError) as err:
@@ -87,7 +89,8 @@ def get_json_redis_dicts(config):
                            get_json_deserializer())
         redis_dict = StateDict(serde,
                            json_cfg['state_scope'],
-                           JSON_FORMAT)
+                           JSON_FORMAT,
+                           json_cfg.get('indexed', False))
         redis_dicts.append(redis_dict)
 
     return redis_dicts
@@ -14,16 +14,21 @@ limitations under the License.
 
 import logging
 import json
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
 import jsonpickle
 import grpc
 
 from magma.common.grpc_client_manager import GRPCClientManager
+from magma.common.redis.client import get_default_client
 from magma.common.service import MagmaService
 from magma.common.sdwatchdog import SDWatchdogTask
 from magma.state.garbage_collector import GarbageCollector
 from magma.state.keys import make_mem_key, make_scoped_device_id
+from magma.state.keyspace_tracker import KeyspaceTracker
 from magma.state.redis_dicts import get_json_redis_dicts, \
-    get_proto_redis_dicts, PROTO_FORMAT
+    get_proto_redis_dicts, PROTO_FORMAT, StateDict
 from orc8r.protos.state_pb2 import ReportStatesRequest, SyncStatesRequest, \
     IDAndVersion, StateID
 from orc8r.protos.service303_pb2 import State
@@ -32,13 +37,25 @@ from google.protobuf.json_format import MessageToDict
 
 # TODO: Make DEFAULT_SYNC_INTERVAL an mconfig parameter
 DEFAULT_SYNC_INTERVAL = 60
+# Sync interval when the changed keys are tracked with keyspace
+# notifications, a sync then only reads the changed keys
+KEYSPACE_SYNC_INTERVAL = 5
 DEFAULT_GRPC_TIMEOUT = 10
+# Max total size of the states reported per ReportStatesRequest
+DEFAULT_MAX_REPORT_BYTES = 1024 * 1024
+# Number of DEFAULT_SYNC_INTERVAL between garbage collections
 GARBAGE_COLLECTION_ITERATION_INTERVAL = 2
 
 class StateReplicator(SDWatchdogTask):
     """
-    StateReplicator periodically fetches all configured state from Redis,
+    StateReplicator periodically fetches the configured state from Redis,
     reporting any updates to the Orchestrator State service.
+
+    If keyspace_notifications is set in the service config, the keys that
+    changed are tracked with Redis keyspace notifications and only those are
+    read. Every key is still checked after a resync, and whenever changes
+    may have been missed. Updates are reported in requests of at most
+    max_report_bytes of states.
     """
     def __init__(self,
                  service: MagmaService,
@@ -60,6 +77,22 @@ class StateReplicator(SDWatchdogTask):
         # _grpc_client_manager to manage grpc client recyclings
         self._grpc_client_manager = grpc_client_manager
 
+        self._max_report_bytes = service.config.get(
+            'max_report_bytes', DEFAULT_MAX_REPORT_BYTES)
+        # Tracker of the changed keys, None to check every key at each sync
+        self._keyspace_tracker = None
+        if service.config.get('keyspace_notifications', False):
+            tracker = KeyspaceTracker(
+                get_default_client(),
+                [redis_dict.redis_type for redis_dict in self._redis_dicts])
+            if tracker.start():
+                self._keyspace_tracker = tracker
+                self.set_interval(KEYSPACE_SYNC_INTERVAL)
+        # Keys of the states reported in the last sync, by type. They are
+        # read again at the next sync of the changed keys, in case they
+        # failed to replicate.
+        self._reported_keys = defaultdict(set)
+
         # Flag to indicate if resync has completed successfully.
         # Replication cannot proceed until this flag is True
         self._has_resync_completed = False
@@ -67,6 +100,14 @@ class StateReplicator(SDWatchdogTask):
         # Track replication iteration to track when to trigger garbage
         # collection
         self._replication_iteration = 0
+        self._garbage_collection_interval = max(
+            1, GARBAGE_COLLECTION_ITERATION_INTERVAL * DEFAULT_SYNC_INTERVAL
+            // self._interval)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._keyspace_tracker is not None:
+            self._keyspace_tracker.stop()
 
     async def _run(self):
         if not self._has_resync_completed:
@@ -76,22 +117,28 @@ class StateReplicator(SDWatchdogTask):
                 logging.error("GRPC call failed for initial state re-sync: %s",
                               err)
                 return
-        request = await self._collect_states_to_replicate()
+        dirty_keys = None
+        if self._keyspace_tracker is not None:
+            dirty_keys = self._keyspace_tracker.pop_dirty_keys()
+        if dirty_keys is None:
+            request = await self._collect_states_to_replicate()
+        else:
+            request = await self._collect_changed_states(dirty_keys)
         if request is not None:
-            await self._send_to_state_service(request)
-        await self._cleanup_deleted_keys()
+            for chunk in self._split_request(request):
+                await self._send_to_state_service(chunk)
+        if dirty_keys is None:
+            await self._cleanup_deleted_keys()
 
         self._replication_iteration += 1
-        if self._replication_iteration >= \
-                GARBAGE_COLLECTION_ITERATION_INTERVAL:
+        if self._replication_iteration >= self._garbage_collection_interval:
             await self._garbage_collector.run_garbage_collection()
             self._replication_iteration = 0
 
     async def _resync(self):
         states_to_sync = []
         for redis_dict in self._redis_dicts:
-            for key in redis_dict:
-                version = redis_dict.get_version(key)
+            for key, version in redis_dict.scan_versions():
                 device_id = make_scoped_device_id(key, redis_dict.state_scope)
                 state_id = StateID(type=redis_dict.redis_type,
                                    deviceID=device_id)
@@ -123,35 +170,90 @@ class StateReplicator(SDWatchdogTask):
         logging.info("Successfully resynced state with Orchestrator!")
 
     async def _collect_states_to_replicate(self):
-        states_to_report = []
+        """ Check every key, Redis is read from the default executor """
+        return await self._loop.run_in_executor(
+            None, self._scan_states_to_replicate)
+
+    async def _collect_changed_states(self, dirty_keys: Dict[str, Set[str]]):
+        """ Check the changed keys and the keys reported in the last sync """
+        for redis_type, keys in self._reported_keys.items():
+            dirty_keys.setdefault(redis_type, set()).update(keys)
+        return await self._loop.run_in_executor(
+            None, self._read_states_to_replicate, dirty_keys)
+
+    def _scan_states_to_replicate(self) -> Optional[ReportStatesRequest]:
+        keys_to_read = {}
         for redis_dict in self._redis_dicts:
-            for key in redis_dict:
+            keys = keys_to_read[redis_dict.redis_type] = []
+            for key, redis_version in redis_dict.scan_versions():
                 device_id = make_scoped_device_id(key, redis_dict.state_scope)
                 in_mem_key = make_mem_key(device_id, redis_dict.redis_type)
-                redis_version = redis_dict.get_version(key)
                 self._state_keys_from_current_iteration.add(in_mem_key)
                 if in_mem_key in self._state_versions and \
                         self._state_versions[in_mem_key] == redis_version:
                     continue
+                keys.append(key)
+        return self._read_states_to_replicate(keys_to_read)
 
-                redis_state = redis_dict.get(key)
-                if redis_dict.state_format == PROTO_FORMAT:
-                    state_to_serialize = MessageToDict(redis_state)
-                    serialized_json_state = json.dumps(state_to_serialize)
-                else:
-                    serialized_json_state = jsonpickle.encode(redis_state)
-                state_proto = State(type=redis_dict.redis_type,
-                      deviceID=device_id,
-                      value=serialized_json_state.encode("utf-8"),
-                      version=redis_version)
-
-                states_to_report.append(state_proto)
+    def _read_states_to_replicate(
+        self, keys_to_read: Dict[str, Iterable[str]],
+    ) -> Optional[ReportStatesRequest]:
+        states_to_report = []
+        self._reported_keys = defaultdict(set)
+        for redis_dict in self._redis_dicts:
+            keys = list(keys_to_read.get(redis_dict.redis_type, ()))
+            for key, redis_version, value in redis_dict.fetch_versions(keys):
+                device_id = make_scoped_device_id(key, redis_dict.state_scope)
+                in_mem_key = make_mem_key(device_id, redis_dict.redis_type)
+                if value is None:
+                    # Deleted or marked as garbage
+                    self._state_versions.pop(in_mem_key, None)
+                    continue
+                if self._state_versions.get(in_mem_key) == redis_version:
+                    continue
+                states_to_report.append(self._make_state(
+                    redis_dict, device_id, redis_version, value))
+                self._reported_keys[redis_dict.redis_type].add(key)
 
         if len(states_to_report) == 0:
             logging.debug("Not replicating state. No state has changed!")
             return None
         return ReportStatesRequest(states=states_to_report)
 
+    @staticmethod
+    def _make_state(redis_dict: StateDict, device_id: str, version: int,
+                    serialized_value: bytes) -> State:
+        redis_state = redis_dict.serde.deserialize(serialized_value)
+        if redis_dict.state_format == PROTO_FORMAT:
+            state_to_serialize = MessageToDict(redis_state)
+            serialized_json_state = json.dumps(state_to_serialize)
+        else:
+            serialized_json_state = jsonpickle.encode(redis_state)
+        return State(type=redis_dict.redis_type,
+                     deviceID=device_id,
+                     value=serialized_json_state.encode("utf-8"),
+                     version=version)
+
+    def _split_request(
+        self, request: ReportStatesRequest,
+    ) -> List[ReportStatesRequest]:
+        """ Split the states in requests of at most max_report_bytes """
+        if request.ByteSize() <= self._max_report_bytes:
+            return [request]
+        requests = []
+        chunk = []
+        chunk_bytes = 0
+        for state in request.states:
+            state_bytes = state.ByteSize()
+            if chunk and chunk_bytes + state_bytes > self._max_report_bytes:
+                requests.append(ReportStatesRequest(states=chunk))
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(state)
+            chunk_bytes += state_bytes
+        requests.append(ReportStatesRequest(states=chunk))
+        return requests
+
     async def _send_to_state_service(self, request: ReportStatesRequest):
         state_client = self._grpc_client_manager.get_client()
         try:
@@ -184,8 +286,9 @@ class StateReplicator(SDWatchdogTask):
                               "version: %d",
                               state.deviceID, state.type, state.version)
         finally:
-            # reset timeout to config-specified + some buffer
-            self.set_timeout(self._interval * 2)
+            # reset timeout to config-specified + some buffer, full scans
+            # can take longer than the interval of keyspace tracking
+            self.set_timeout(max(self._interval, DEFAULT_SYNC_INTERVAL) * 2)
 
     async def _cleanup_deleted_keys(self):
         deleted_keys = set(self._state_versions) - \
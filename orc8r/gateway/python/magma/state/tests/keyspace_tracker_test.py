@@ -0,0 +1,94 @@
+"""
+Copyright 2020 The Magma Authors.
+
+This source code is licensed under the BSD-style license found in the
+LICENSE file in the root directory of this source tree.
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from unittest import TestCase, mock
+from unittest.mock import MagicMock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from magma.state.keyspace_tracker import KeyspaceTracker, NOTIFY_CONFIG
+
+# Allow access to protected variables for unit testing
+# pylint: disable=protected-access
+
+
+class KeyspaceTrackerTests(TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.connection_pool.connection_kwargs = {'db': 0}
+        self.tracker = KeyspaceTracker(self.client, ['foo', 'bar'])
+
+    def _notify(self, key, redis_type, event='set'):
+        self.tracker._handle_message({
+            'type': 'pmessage',
+            'pattern': ('__keyspace@0__:*:%s' % redis_type).encode(),
+            'channel': ('__keyspace@0__:%s:%s' % (key, redis_type)).encode(),
+            'data': event.encode(),
+        })
+
+    def _subscribe(self, count):
+        self.tracker._handle_message({
+            'type': 'psubscribe', 'pattern': None,
+            'channel': b'__keyspace@0__:*:foo', 'data': count,
+        })
+
+    def test_enable_notifications(self):
+        self.client.config_get.return_value = {NOTIFY_CONFIG: 'Ex'}
+        self.tracker._enable_notifications()
+        self.client.config_set.assert_called_once_with(NOTIFY_CONFIG,
+                                                       'ExKg$e')
+
+        self.client.config_set.reset_mock()
+        self.client.config_get.return_value = {NOTIFY_CONFIG: 'AK'}
+        self.tracker._enable_notifications()
+        self.client.config_set.assert_not_called()
+
+    def test_dirty_keys(self):
+        # Changes may be missed until all subscriptions are confirmed
+        self._subscribe(1)
+        self._notify('id1', 'foo')
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+        self._subscribe(2)
+        self._notify('id1', 'foo')
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+
+        self._notify('id1', 'foo')
+        self._notify('id1', 'foo', 'del')
+        self._notify('id2', 'bar')
+        # Index and lock keys of the types are skipped
+        self._notify('id2:foo', 'bar')
+        self.assertEqual({'foo': {'id1'}, 'bar': {'id2'}},
+                         self.tracker.pop_dirty_keys())
+        self.assertEqual({}, self.tracker.pop_dirty_keys())
+
+    @mock.patch('magma.state.keyspace_tracker.time.sleep')
+    def test_connection_lost(self, _sleep_mock):
+        self._subscribe(2)
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+        self._notify('id1', 'foo')
+
+        # Notifications are lost until the patterns are subscribed again
+        self.client.pubsub.return_value.get_message.side_effect = \
+            self._stop_on_error
+        self.tracker._pubsub = self.client.pubsub()
+        self.tracker._running = True
+        self.tracker._listen()
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+        self._subscribe(2)
+        self.assertIsNone(self.tracker.pop_dirty_keys())
+        self.assertEqual({}, self.tracker.pop_dirty_keys())
+
+    def _stop_on_error(self, timeout):
+        # pylint: disable=unused-argument
+        self.tracker._running = False
+        raise RedisConnectionError('connection lost')
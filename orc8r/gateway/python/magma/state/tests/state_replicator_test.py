@@ -17,10 +17,10 @@ import json
 import jsonpickle
 from concurrent import futures
 import orc8r.protos.state_pb2_grpc as state_pb2_grpc
-from orc8r.protos.state_pb2 import ReportStatesResponse, \
-    SyncStatesResponse, IDAndVersion, IDAndError
+from orc8r.protos.state_pb2 import ReportStatesRequest, \
+    ReportStatesResponse, SyncStatesResponse, IDAndVersion, IDAndError
 from unittest.mock import MagicMock
-from orc8r.protos.service303_pb2 import LogVerbosity
+from orc8r.protos.service303_pb2 import LogVerbosity, State
 from magma.common.redis.client import get_default_client
 from magma.common.redis.containers import RedisFlatDict
 from magma.common.redis.serializers import get_proto_deserializer, \
@@ -419,3 +419,60 @@ class StateReplicatorTests(TestCase):
         # Cancel the replicator's loop so there are no other activities
         self.state_replicator._periodic_task.cancel()
         self.loop.run_until_complete(test())
+
+    @mock.patch("redis.Redis", MockRedis)
+    @mock.patch('snowflake.snowflake', get_mock_snowflake)
+    @mock.patch('magma.magmad.state_reporter.ServiceRegistry.get_rpc_channel')
+    def test_replicate_changed_states(self, get_grpc_mock):
+        async def test():
+            get_grpc_mock.return_value = self.channel
+            self.nid_client.clear()
+            self.idlist_client.clear()
+            self.log_client.clear()
+            self.foo_client.clear()
+
+            self.nid_client['id1'] = NetworkID(id='foo')
+            self.nid_client['id2'] = NetworkID(id='bar')
+            self.log_client['id1'] = LogVerbosity(verbosity=5)
+            req = await self.state_replicator._collect_states_to_replicate()
+            self.assertEqual(3, len(req.states))
+            await self.state_replicator._send_to_state_service(req)
+            self.assertEqual(2, len(self.state_replicator._state_versions))
+
+            # Only the changed keys are read, with the keys reported in the
+            # last sync
+            self.nid_client['id2'] = NetworkID(id='baz')
+            del self.nid_client['id1']
+            req = await self.state_replicator._collect_changed_states(
+                {NID_TYPE: {'id1', 'id2', 'id3'}})
+            self.assertEqual([(NID_TYPE, 'id2', 2),
+                              (LOG_TYPE, 'aaa-bbb:id1', 1)],
+                             [(state.type, state.deviceID, state.version)
+                              for state in req.states])
+            self.assertEqual(
+                {make_mem_key('id2', NID_TYPE): 1},
+                self.state_replicator._state_versions)
+
+            await self.state_replicator._send_to_state_service(req)
+            req = await self.state_replicator._collect_changed_states({})
+            self.assertEqual([(LOG_TYPE, 'aaa-bbb:id1', 1)],
+                             [(state.type, state.deviceID, state.version)
+                              for state in req.states])
+
+        # Cancel the replicator's loop so there are no other activities
+        self.state_replicator._periodic_task.cancel()
+        self.loop.run_until_complete(test())
+
+    @mock.patch("redis.Redis", MockRedis)
+    def test_split_request(self):
+        states = [State(type=NID_TYPE, deviceID='id%d' % i, value=b'x' * 100)
+                  for i in range(5)]
+        request = ReportStatesRequest(states=states)
+        self.assertEqual([request],
+                         self.state_replicator._split_request(request))
+
+        self.state_replicator._max_report_bytes = 2 * states[0].ByteSize()
+        requests = self.state_replicator._split_request(request)
+        self.assertEqual([2, 2, 1], [len(req.states) for req in requests])
+        self.assertEqual(states,
+                         [state for req in requests for state in req.states])
@@ -43,6 +43,10 @@ const (
 	MetricName_diameter_capabilities_exchange MetricName = 9
 	MetricName_diameter_watchdog              MetricName = 10
 	MetricName_diameter_disconnect            MetricName = 11
+	MetricName_subscriberdb_cache_hits        MetricName = 12
+	MetricName_subscriberdb_cache_misses      MetricName = 13
+	MetricName_subscriberdb_cache_evictions   MetricName = 14
+	MetricName_s6a_request_latency_ms         MetricName = 15
 	// More prometheus metrics
 	MetricName_python_info MetricName = 50
 	// Metricsd metrics
@@ -171,7 +175,8 @@ const (
 	MetricName_tracking_area_update MetricName = 507
 	MetricName_s1_setup             MetricName = 508
 	// Generic service metrics
-	MetricName_service_errors MetricName = 550
+	MetricName_service_errors    MetricName = 550
+	MetricName_redis_round_trips MetricName = 551
 )
 
 var MetricName_name = map[int32]string{
@@ -187,6 +192,10 @@ var MetricName_name = map[int32]string{
 	9:   "diameter_capabilities_exchange",
 	10:  "diameter_watchdog",
 	11:  "diameter_disconnect",
+	12:  "subscriberdb_cache_hits",
+	13:  "subscriberdb_cache_misses",
+	14:  "subscriberdb_cache_evictions",
+	15:  "s6a_request_latency_ms",
 	50:  "python_info",
 	60:  "service_metrics_collected",
 	61:  "process_uptime_seconds",
@@ -294,6 +303,7 @@ var MetricName_name = map[int32]string{
 	507: "tracking_area_update",
 	508: "s1_setup",
 	550: "service_errors",
+	551: "redis_round_trips",
 }
 
 var MetricName_value = map[string]int32{
@@ -309,6 +319,10 @@ var MetricName_value = map[string]int32{
 	"diameter_capabilities_exchange":                      9,
 	"diameter_watchdog":                                   10,
 	"diameter_disconnect":                                 11,
+	"subscriberdb_cache_hits":                             12,
+	"subscriberdb_cache_misses":                           13,
+	"subscriberdb_cache_evictions":                        14,
+	"s6a_request_latency_ms":                              15,
 	"python_info":                                         50,
 	"service_metrics_collected":                           60,
 	"process_uptime_seconds":                              61,
@@ -416,6 +430,7 @@ var MetricName_value = map[string]int32{
 	"tracking_area_update":                                507,
 	"s1_setup":                                            508,
 	"service_errors":                                      550,
+	"redis_round_trips":                                   551,
 }
 
 func (x MetricName) String() string {
@@ -721,137 +736,142 @@ func init() {
 func init() { proto.RegisterFile("orc8r/protos/metricsd.proto", fileDescriptor_65dcd99ac93a06b7) }
 
 var fileDescriptor_65dcd99ac93a06b7 = []byte{
-	// 2065 bytes of a gzipped FileDescriptorProto
-	0x1f, 0x8b, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0xff, 0x84, 0x58, 0x59, 0x8f, 0x25, 0x37,
-	0x15, 0x4e, 0x55, 0xf5, 0xf4, 0x4c, 0xbb, 0x67, 0xa6, 0xdd, 0x9e, 0xad, 0xbb, 0x67, 0x49, 0xa7,
-	0xb3, 0xd0, 0x4c, 0xa0, 0x87, 0x99, 0x11, 0x28, 0x42, 0x44, 0x42, 0x44, 0x42, 0x42, 0x62, 0x50,
-	0xd4, 0x48, 0x3c, 0xf0, 0x62, 0xf9, 0x96, 0xcf, 0xbd, 0xd7, 0xe9, 0x2a, 0xdb, 0xb1, 0x5d, 0x7d,
-	0xfb, 0xfe, 0x08, 0x24, 0x40, 0x88, 0x07, 0x78, 0x05, 0x9e, 0x20, 0xfb, 0xca, 0x4e, 0x12, 0x24,
-	0xf6, 0x7d, 0x5f, 0x92, 0xd9, 0xe0, 0x17, 0xb0, 0xc3, 0x03, 0x3a, 0xae, 0xaa, 0xbb, 0x71, 0x33,
-	0xbc, 0xcc, 0x74, 0x9d, 0xef, 0xf3, 0xb1, 0xfd, 0xf9, 0x2c, 0xf6, 0x25, 0x67, 0x8d, 0xcb, 0x1f,
-	0x72, 0x97, 0xac, 0x33, 0xc1, 0xf8, 0x4b, 0x25, 0x04, 0xa7, 0x72, 0x2f, 0x77, 0xe2, 0x37, 0x5b,
-	0x2e, 0x45, 0xaf, 0x14, 0x3b, 0x91, 0xb2, 0x71, 0xac, 0x01, 0x6b, 0x6c, 0x63, 0x7d, 0x6a, 0x60,
-	0x6e, 0xca, 0xd2, 0xe8, 0x1a, 0xda, 0x2a, 0x08, 0xbd, 0x56, 0x73, 0x1f, 0x31, 0x3a, 0x08, 0xa5,
-	0xc1, 0xb1, 0x73, 0x64, 0xa9, 0x27, 0x02, 0x0c, 0xc4, 0xf0, 0x03, 0x72, 0x2d, 0xd9, 0x4c, 0xb6,
-	0x97, 0x76, 0xc7, 0x06, 0xf6, 0x6e, 0xb2, 0xd8, 0x15, 0xa5, 0x2a, 0x86, 0x6b, 0xe9, 0x66, 0xb6,
-	0xbd, 0x7c, 0x65, 0x6b, 0x47, 0x19, 0x74, 0x56, 0x42, 0xe8, 0x43, 0xe5, 0x77, 0xf2, 0x42, 0x81,
-	0x0e, 0x3b, 0xb5, 0xd7, 0xf7, 0x47, 0xe6, 0x6e, 0x33, 0x62, 0xeb, 0xd3, 0x09, 0x39, 0xfa, 0x68,
-	0xe5, 0xfb, 0x20, 0x6b, 0x98, 0x5d, 0x20, 0xa4, 0x5e, 0xea, 0x87, 0x44, 0x09, 0xcd, 0x5c, 0x13,
-	0x16, 0x76, 0x92, 0x1c, 0xda, 0x17, 0x45, 0x05, 0x6b, 0xe9, 0x66, 0xb2, 0x9d, 0xec, 0xd6, 0x1f,
-	0x6c, 0x93, 0x2c, 0x07, 0x55, 0x82, 0x0f, 0xa2, 0xb4, 0xd7, 0x3e, 0xbc, 0x96, 0x6d, 0x26, 0xdb,
-	0xd9, 0xee, 0xa4, 0x89, 0xed, 0x90, 0xc5, 0x42, 0x74, 0xa0, 0xf0, 0x6b, 0x0b, 0x71, 0x91, 0xa7,
-	0x77, 0x26, 0xe4, 0xd9, 0xf9, 0x20, 0x42, 0x8f, 0x0a, 0xe5, 0x76, 0x1b, 0xd6, 0xd6, 0x3b, 0xc9,
-	0xd2, 0xc8, 0xc8, 0x18, 0x59, 0xd0, 0xe3, 0xe5, 0xc4, 0xbf, 0xa7, 0x17, 0xb2, 0xd4, 0x2c, 0x64,
-	0x6b, 0x8f, 0x9c, 0x9e, 0xdc, 0xce, 0xb4, 0x86, 0x1a, 0xc2, 0xc0, 0xb8, 0xbd, 0xb1, 0x86, 0x23,
-	0x03, 0xbb, 0x4a, 0x0e, 0x37, 0x27, 0xd4, 0x88, 0xb8, 0x3e, 0xb5, 0xbe, 0x49, 0x9f, 0xbb, 0x2d,
-	0xf3, 0xe2, 0xc7, 0xce, 0x12, 0x72, 0x6d, 0x2c, 0xcd, 0x05, 0xb2, 0x61, 0x9d, 0xc9, 0xc1, 0x7b,
-	0xee, 0x83, 0x70, 0x81, 0xe3, 0xfe, 0xb9, 0x87, 0xdc, 0x68, 0xe9, 0xe9, 0x5d, 0x6c, 0x93, 0x9c,
-	0x6b, 0xf1, 0x7d, 0xe5, 0x42, 0x25, 0x0a, 0x5e, 0x42, 0x69, 0xdc, 0x90, 0x77, 0x86, 0x01, 0x3c,
-	0x4d, 0xd8, 0x3d, 0xe4, 0x7c, 0xcb, 0x70, 0xe0, 0x95, 0x04, 0x1d, 0xa6, 0x29, 0x29, 0x3b, 0x4f,
-	0xd6, 0x5b, 0x4a, 0x6e, 0xab, 0xd6, 0x3b, 0x0f, 0x26, 0x88, 0x82, 0x66, 0xec, 0x24, 0xa1, 0x2d,
-	0x6c, 0x2c, 0x68, 0xde, 0x95, 0x9e, 0x2e, 0xb0, 0x13, 0x64, 0xa5, 0xb5, 0x96, 0xe2, 0x20, 0x1a,
-	0x0f, 0x21, 0xd5, 0xbf, 0x4b, 0x70, 0x51, 0x85, 0x3e, 0xf7, 0x55, 0x8e, 0x28, 0x5d, 0x9c, 0xb2,
-	0x76, 0x85, 0x2a, 0x2a, 0x07, 0xf4, 0x30, 0x3b, 0x43, 0x4e, 0xa0, 0xb5, 0x30, 0xb9, 0x08, 0xca,
-	0x68, 0x5e, 0x59, 0x29, 0x02, 0xd0, 0x23, 0x6c, 0x8b, 0x5c, 0x90, 0x4a, 0x94, 0x10, 0xc0, 0xf1,
-	0x5c, 0x58, 0xd1, 0x51, 0x85, 0x0a, 0x0a, 0x3c, 0x87, 0x83, 0xbc, 0x2f, 0x74, 0x0f, 0xe8, 0x12,
-	0x3b, 0x45, 0x56, 0x47, 0x9c, 0x81, 0x08, 0x79, 0x5f, 0x9a, 0x1e, 0x25, 0xe8, 0x73, 0x64, 0x96,
-	0xca, 0xe7, 0x46, 0x6b, 0xc8, 0x03, 0x5d, 0x66, 0x2b, 0x64, 0xd9, 0x0e, 0x43, 0xdf, 0x68, 0xae,
-	0x74, 0xd7, 0xd0, 0x2b, 0xb8, 0x67, 0x0f, 0x6e, 0x5f, 0xe5, 0xc0, 0x1b, 0xe9, 0x79, 0x6e, 0x8a,
-	0x02, 0xf2, 0x00, 0x92, 0xbe, 0x87, 0x6d, 0x90, 0xd3, 0xed, 0xee, 0x2a, 0x3b, 0xa5, 0xf9, 0xc3,
-	0x6c, 0x8d, 0x9c, 0x54, 0x96, 0x0b, 0x29, 0x1d, 0xc2, 0xa2, 0x88, 0x3b, 0x00, 0x49, 0x25, 0x4e,
-	0x3f, 0x81, 0x38, 0x28, 0x40, 0x78, 0x90, 0x14, 0xda, 0x21, 0x85, 0x03, 0x21, 0x87, 0x13, 0x43,
-	0xba, 0x6c, 0x9d, 0x9c, 0x8a, 0xc8, 0x48, 0x86, 0x56, 0xa0, 0x1e, 0xdb, 0x20, 0xa7, 0x40, 0x1b,
-	0x09, 0x1d, 0x5e, 0xf6, 0xca, 0xc0, 0x9b, 0xcd, 0x80, 0xa4, 0xdf, 0x49, 0xd8, 0x59, 0x72, 0xba,
-	0xc1, 0x8c, 0xf5, 0x41, 0x04, 0xe0, 0xa0, 0x45, 0xa7, 0x00, 0x49, 0xbf, 0x9b, 0xb0, 0x75, 0x72,
-	0xb2, 0x01, 0x5d, 0x97, 0x87, 0x83, 0x11, 0xf4, 0xbd, 0x49, 0xa8, 0x67, 0xfd, 0x84, 0xcb, 0xef,
-	0x4f, 0x42, 0x36, 0xd8, 0x09, 0xe8, 0x07, 0x93, 0x50, 0x59, 0xc2, 0x04, 0xf4, 0xc3, 0x84, 0x9d,
-	0x21, 0xcc, 0xb9, 0x9c, 0x63, 0x4e, 0x76, 0xb8, 0x08, 0x01, 0x4a, 0x1b, 0x3c, 0xfd, 0x51, 0xc2,
-	0xd6, 0xc8, 0x89, 0x31, 0xd0, 0xc4, 0x02, 0x78, 0xfa, 0xe3, 0x84, 0x9d, 0x27, 0x6b, 0x56, 0xe6,
-	0x96, 0x57, 0x1e, 0x1c, 0xb7, 0x85, 0xd0, 0x50, 0x47, 0x22, 0xaf, 0x0a, 0xfa, 0x93, 0x3b, 0xc0,
-	0xb2, 0xa0, 0x3f, 0x8d, 0x6b, 0x41, 0xbf, 0x0e, 0x66, 0xa6, 0xfc, 0x59, 0xc2, 0xee, 0x27, 0x9b,
-	0xf3, 0x20, 0xee, 0xf0, 0xe8, 0xba, 0x51, 0x59, 0xfa, 0x73, 0xcc, 0x88, 0x73, 0x73, 0x69, 0x7d,
-	0x53, 0x53, 0x7e, 0x91, 0xb0, 0xbb, 0xc9, 0xc6, 0x5c, 0x8a, 0x09, 0x7d, 0x70, 0xf4, 0x97, 0x09,
-	0x9e, 0xcd, 0x24, 0x61, 0xbc, 0xbf, 0x5f, 0xc5, 0x9d, 0x83, 0x13, 0x9d, 0x59, 0x4d, 0x7e, 0x5d,
-	0xeb, 0x38, 0x46, 0xc6, 0x83, 0x7e, 0x33, 0x3b, 0xa8, 0x09, 0x02, 0x4f, 0x7f, 0x1b, 0xa7, 0x8a,
-	0x48, 0x13, 0x4e, 0xdc, 0xc1, 0xe3, 0x15, 0xf8, 0xe0, 0xe9, 0xef, 0x12, 0x76, 0x91, 0xdc, 0x3f,
-	0x17, 0xab, 0xc5, 0x53, 0x5a, 0xe4, 0x41, 0xed, 0xab, 0x30, 0xa4, 0xbf, 0x8f, 0xdb, 0x9e, 0xcf,
-	0xd5, 0xc6, 0x95, 0xa2, 0xa0, 0x7f, 0x48, 0xd8, 0x43, 0xe4, 0xea, 0x7c, 0x8a, 0x13, 0x52, 0x19,
-	0xac, 0x1f, 0xa6, 0x72, 0x39, 0xe0, 0x90, 0xc0, 0xc5, 0xbe, 0x50, 0x05, 0x06, 0x16, 0xfd, 0x63,
-	0xc2, 0x1e, 0x20, 0xf7, 0xbc, 0xc9, 0x48, 0x90, 0x55, 0x0e, 0xbc, 0x30, 0x42, 0xd2, 0xd7, 0x13,
-	0xf6, 0x76, 0xb2, 0x3d, 0x9f, 0x87, 0x3b, 0xe6, 0x4a, 0x37, 0x33, 0x61, 0xee, 0xd1, 0x37, 0xee,
-	0xe0, 0x16, 0xaa, 0xe0, 0x84, 0xe6, 0x0e, 0x84, 0xa7, 0xd7, 0x13, 0xf6, 0x0e, 0xf2, 0xe0, 0x1d,
-	0x17, 0x1e, 0xff, 0xc5, 0xb8, 0xe5, 0x85, 0xf1, 0x81, 0xde, 0x48, 0xd8, 0x83, 0xe4, 0x81, 0xf9,
-	0x23, 0x8c, 0x28, 0xb9, 0xd2, 0x01, 0xdc, 0x3e, 0x68, 0x4c, 0x48, 0x7a, 0x73, 0x32, 0xdb, 0xda,
-	0x4c, 0xec, 0xaa, 0x5e, 0xe5, 0x40, 0xd2, 0x5b, 0x31, 0x56, 0xda, 0x6c, 0x83, 0x8e, 0x31, 0x75,
-	0x89, 0x76, 0x3c, 0x4a, 0x0f, 0xf4, 0x76, 0xc2, 0x4e, 0x90, 0xe3, 0x53, 0x04, 0x4f, 0xff, 0xf4,
-	0xbf, 0x39, 0x2a, 0xc1, 0x2b, 0x74, 0xf8, 0xe7, 0x98, 0x52, 0xb1, 0x4f, 0x48, 0x6e, 0x95, 0xee,
-	0x71, 0x17, 0x02, 0x2f, 0x3d, 0xfd, 0x62, 0xca, 0x28, 0x59, 0xc6, 0xfa, 0x6c, 0xc1, 0xe5, 0xa0,
-	0x03, 0xfd, 0x52, 0x8a, 0x51, 0xe3, 0x07, 0xc2, 0xb6, 0x05, 0xbd, 0x45, 0x9e, 0x48, 0x71, 0xc9,
-	0x33, 0x0d, 0xa1, 0x05, 0x9f, 0x4c, 0xd9, 0x2a, 0x39, 0x2a, 0x95, 0xdf, 0x1b, 0x99, 0x9e, 0x4a,
-	0xd9, 0x0a, 0x21, 0x75, 0x96, 0x79, 0x34, 0x3c, 0x9d, 0xe2, 0xaa, 0x6b, 0x83, 0x83, 0x1c, 0xd4,
-	0x3e, 0x48, 0xfa, 0x4c, 0x5c, 0x01, 0x46, 0x33, 0x38, 0x11, 0xb0, 0x46, 0x3d, 0x1b, 0x69, 0x79,
-	0x1f, 0xf2, 0x3d, 0xa5, 0xb1, 0x41, 0x85, 0xca, 0xd3, 0xe7, 0x52, 0xdc, 0x81, 0x0f, 0x0e, 0x04,
-	0xea, 0xe0, 0xc0, 0x5b, 0xa3, 0x31, 0xca, 0x9f, 0x4f, 0xd9, 0x71, 0xb2, 0x54, 0x42, 0xd9, 0x74,
-	0x96, 0x17, 0x52, 0xc6, 0xc8, 0x31, 0xfc, 0x1e, 0x87, 0xd2, 0x8b, 0x29, 0x3b, 0x46, 0x8e, 0xa0,
-	0xad, 0xc2, 0xca, 0xf9, 0xd2, 0xe8, 0xb3, 0xeb, 0x00, 0xe8, 0xcb, 0x71, 0xc7, 0x51, 0xc3, 0xe0,
-	0x84, 0xc5, 0x86, 0x00, 0x36, 0x1e, 0xd2, 0x97, 0x53, 0x54, 0xb4, 0xb2, 0x3d, 0x27, 0x24, 0xb8,
-	0x2b, 0x75, 0x9b, 0x0c, 0x62, 0x0f, 0x34, 0xfd, 0x4a, 0xca, 0x4e, 0x92, 0x95, 0x31, 0x04, 0xce,
-	0x19, 0x47, 0xbf, 0x1a, 0x57, 0x39, 0xb6, 0x5a, 0x07, 0x56, 0xe0, 0x01, 0x7c, 0x6d, 0xc6, 0x93,
-	0x34, 0x03, 0x8d, 0xd1, 0x0b, 0x92, 0x7e, 0x3d, 0x65, 0xa7, 0x08, 0x1d, 0x43, 0xb9, 0xd0, 0xc2,
-	0x0d, 0xe9, 0x37, 0x66, 0xcc, 0x98, 0xc1, 0x05, 0xd0, 0x6f, 0x46, 0x71, 0xc6, 0x66, 0x25, 0x0b,
-	0xa0, 0xdf, 0x4a, 0xd9, 0x26, 0x39, 0x5b, 0x69, 0x38, 0xb0, 0xb1, 0x84, 0xf2, 0xb6, 0x09, 0x39,
-	0x88, 0xfd, 0xdd, 0xd3, 0x57, 0x52, 0x76, 0x81, 0xac, 0x57, 0x1a, 0xeb, 0x86, 0x96, 0x20, 0x79,
-	0xe3, 0xa1, 0x95, 0xf7, 0xd5, 0x78, 0xb6, 0x33, 0xc3, 0x5a, 0xf0, 0xb5, 0x94, 0x9d, 0x26, 0xab,
-	0xd2, 0xe2, 0x29, 0x4a, 0x5e, 0xfa, 0x5e, 0xb3, 0xdb, 0xd7, 0xb1, 0xc9, 0xaf, 0x09, 0x67, 0xb9,
-	0x84, 0xae, 0xa8, 0x8a, 0xc0, 0x7b, 0x03, 0x5e, 0x8a, 0xbc, 0x81, 0xdf, 0x88, 0x62, 0x60, 0x73,
-	0xef, 0x16, 0x66, 0x50, 0x1b, 0x71, 0x34, 0xbd, 0x9e, 0x62, 0xf9, 0xa9, 0xf4, 0x9e, 0x36, 0x03,
-	0xcd, 0xed, 0x5e, 0xe0, 0x52, 0x39, 0xc8, 0xa3, 0xe4, 0x37, 0xa2, 0x50, 0xcd, 0x75, 0x87, 0xab,
-	0xae, 0xc8, 0x47, 0x6b, 0xbc, 0x99, 0xb2, 0x2d, 0x72, 0x1e, 0x74, 0xd7, 0xb8, 0x1c, 0x4a, 0xbc,
-	0x71, 0xb8, 0xaa, 0x00, 0xae, 0xb4, 0x0f, 0xa2, 0x28, 0xea, 0x2a, 0x7b, 0x2b, 0x65, 0xdb, 0xe4,
-	0xde, 0x49, 0x0e, 0x0e, 0xf6, 0x73, 0x98, 0xb7, 0xeb, 0x38, 0x29, 0x47, 0xbb, 0x05, 0x49, 0x3f,
-	0x9e, 0xe1, 0x46, 0xfd, 0x65, 0x34, 0x41, 0xe0, 0x5d, 0x67, 0x4a, 0x0e, 0xba, 0x43, 0x3f, 0x91,
-	0x61, 0x24, 0xfb, 0x3c, 0xd8, 0x1a, 0xa1, 0x9f, 0xc9, 0x70, 0x70, 0x34, 0xf8, 0x7e, 0x15, 0xf0,
-	0x34, 0xe9, 0x67, 0x33, 0x9c, 0x1a, 0x2f, 0x1f, 0xbe, 0xea, 0xf8, 0xdc, 0xa9, 0x0e, 0x38, 0xd9,
-	0x69, 0xfb, 0xda, 0x64, 0x13, 0xfe, 0x5c, 0xc6, 0xde, 0x4a, 0xee, 0x1b, 0x5d, 0x5e, 0xf0, 0xee,
-	0x30, 0x0a, 0xe8, 0x26, 0xcf, 0xe1, 0xc0, 0xc6, 0xc4, 0xfd, 0x7c, 0x86, 0x12, 0xcb, 0xca, 0x16,
-	0x0a, 0x7b, 0x3b, 0xd6, 0x7d, 0x91, 0xf7, 0xdb, 0xba, 0x42, 0x9f, 0xc8, 0xb0, 0xe4, 0x28, 0xad,
-	0x82, 0x12, 0x05, 0x4e, 0x15, 0xe0, 0x20, 0x70, 0x0f, 0xa1, 0xb2, 0xed, 0x6c, 0xe3, 0x4c, 0x7b,
-	0x32, 0xc3, 0x8a, 0x36, 0x9f, 0xdc, 0x38, 0x9c, 0x99, 0xfd, 0xa9, 0x8c, 0xdd, 0x47, 0xee, 0xd6,
-	0xc2, 0xb7, 0xf3, 0x8a, 0x1c, 0x53, 0x63, 0x86, 0xf5, 0x74, 0x86, 0xd5, 0x2a, 0xb2, 0x70, 0x3b,
-	0xce, 0xdb, 0x19, 0xc2, 0x33, 0x19, 0x7b, 0x1b, 0x79, 0x0b, 0x12, 0x3c, 0xe4, 0x95, 0x53, 0x61,
-	0xc8, 0x4b, 0x23, 0xb1, 0xe5, 0x97, 0xa5, 0xd0, 0x72, 0x86, 0xfd, 0x6c, 0x86, 0xc7, 0x3c, 0xcd,
-	0x74, 0xf0, 0x18, 0xe4, 0x61, 0xbc, 0x95, 0xe7, 0x32, 0x0c, 0x57, 0x9c, 0x0e, 0xcb, 0xe9, 0xcc,
-	0x1d, 0xe7, 0xf9, 0x0c, 0xb3, 0x01, 0x4f, 0xd6, 0xdb, 0xde, 0x80, 0xe7, 0x0e, 0x50, 0x39, 0x0f,
-	0xde, 0x23, 0xcb, 0xc1, 0xe3, 0xf4, 0x85, 0x3b, 0x33, 0xbc, 0xa5, 0x2f, 0x4e, 0x33, 0x24, 0x14,
-	0x30, 0xe3, 0xe3, 0xa5, 0x3b, 0x33, 0xbc, 0xa5, 0x2f, 0x47, 0x5d, 0x2a, 0x18, 0x49, 0x3d, 0xd3,
-	0x15, 0xe8, 0x2b, 0x19, 0x76, 0xae, 0x39, 0x84, 0xf9, 0xc2, 0xbc, 0x1a, 0x85, 0x51, 0x25, 0xc6,
-	0x82, 0x0a, 0x5c, 0x42, 0x3c, 0x92, 0x69, 0xce, 0x6b, 0xf1, 0x8c, 0x41, 0x77, 0xf8, 0x54, 0x70,
-	0x72, 0x9c, 0xa4, 0x00, 0x81, 0xf7, 0xe1, 0x99, 0x11, 0xdf, 0xce, 0xd8, 0x39, 0x72, 0xc6, 0x5f,
-	0xc6, 0xc2, 0x17, 0x33, 0x54, 0x69, 0x39, 0x16, 0xfa, 0x7a, 0x44, 0x7b, 0xc1, 0x56, 0xf3, 0xd0,
-	0x1b, 0x31, 0x90, 0xf1, 0x60, 0xb5, 0xd1, 0x28, 0x81, 0xda, 0x07, 0x37, 0x44, 0x4e, 0x7b, 0x26,
-	0x23, 0xea, 0xcd, 0x2c, 0x5e, 0x46, 0xca, 0xb2, 0xc9, 0xe6, 0x31, 0x72, 0x0b, 0xdf, 0x02, 0x2b,
-	0x13, 0x48, 0xec, 0x15, 0xb7, 0x23, 0x1f, 0xe5, 0xd5, 0x30, 0xe0, 0xc2, 0x7b, 0x93, 0xab, 0xe8,
-	0x92, 0xfe, 0x25, 0xc3, 0x82, 0x5f, 0xb5, 0xb9, 0x40, 0xff, 0x1a, 0xc7, 0x8f, 0x4b, 0x57, 0xad,
-	0xed, 0xdf, 0x5a, 0x56, 0x2d, 0x13, 0xfd, 0x7b, 0xf4, 0x37, 0xe7, 0xb8, 0xe9, 0x3f, 0xc6, 0xc8,
-	0xf4, 0x21, 0xd2, 0x7f, 0xc6, 0x72, 0x50, 0x01, 0xb7, 0x52, 0x4f, 0xe4, 0x31, 0xfd, 0x57, 0x86,
-	0x35, 0x2a, 0x38, 0x81, 0x0d, 0xaa, 0xc7, 0x85, 0x03, 0xd1, 0xbe, 0x33, 0xfe, 0x9d, 0x61, 0x6b,
-	0xf1, 0x97, 0xeb, 0xb4, 0xa2, 0xff, 0xc9, 0xb0, 0x5a, 0xb7, 0x6b, 0x8b, 0x0a, 0x7a, 0xfa, 0x85,
-	0x85, 0x8b, 0x9f, 0x4c, 0xc9, 0x4a, 0xfd, 0x1e, 0x8b, 0x4f, 0xc7, 0xf8, 0x28, 0x23, 0x64, 0xd1,
-	0x81, 0xaf, 0x8a, 0x40, 0xef, 0x62, 0x4b, 0xe4, 0x50, 0x2e, 0x2a, 0x0f, 0x34, 0x61, 0x47, 0xc9,
-	0x91, 0x20, 0x2a, 0x1e, 0x86, 0x16, 0x68, 0x8a, 0x5f, 0xb8, 0x98, 0xf8, 0x95, 0xe1, 0x10, 0x51,
-	0x2f, 0x69, 0x81, 0x1d, 0x21, 0x0b, 0x7d, 0xbc, 0x85, 0x1c, 0x42, 0x6b, 0xfd, 0xf8, 0xa0, 0x8b,
-	0xec, 0x38, 0x21, 0x16, 0x1f, 0x32, 0x05, 0xec, 0x43, 0x41, 0x0f, 0xa3, 0xe3, 0x52, 0x69, 0xe3,
-	0xe8, 0x91, 0xf8, 0xa7, 0x78, 0xcc, 0x38, 0xba, 0xc4, 0x96, 0xc9, 0xe1, 0x7d, 0x70, 0x71, 0xcf,
-	0x84, 0x31, 0x72, 0x1c, 0x63, 0x2c, 0x56, 0xcf, 0x5a, 0xf1, 0x65, 0x74, 0xe9, 0x41, 0x7b, 0xe3,
-	0xe8, 0x51, 0x74, 0x59, 0x87, 0x42, 0x6e, 0x24, 0xd0, 0x63, 0xe3, 0xef, 0xb8, 0xa8, 0xe3, 0xf8,
-	0x5d, 0x97, 0x6d, 0x7c, 0xfc, 0xd2, 0x15, 0x46, 0xc9, 0xd1, 0x56, 0x80, 0x68, 0xa1, 0x38, 0x5d,
-	0x5d, 0x8f, 0x25, 0x5d, 0xc5, 0x75, 0xab, 0xd2, 0x2b, 0xca, 0xae, 0x7c, 0x2a, 0x21, 0xab, 0x13,
-	0x8f, 0x61, 0x87, 0x0f, 0x27, 0xc7, 0x1e, 0x26, 0x87, 0x1f, 0xa9, 0x9f, 0x50, 0xec, 0xfc, 0xd4,
-	0x4b, 0x77, 0xf6, 0xdd, 0xbc, 0xb1, 0x3a, 0x05, 0x7f, 0xc4, 0x28, 0xb9, 0x75, 0x17, 0x7b, 0x2f,
-	0x59, 0xc0, 0x27, 0x31, 0xbb, 0xf7, 0x4d, 0x5f, 0xc9, 0xff, 0xc7, 0xc3, 0xfb, 0xce, 0x7e, 0x74,
-	0x3d, 0x5a, 0x2f, 0xd5, 0xbf, 0x84, 0x14, 0xaa, 0x73, 0xa9, 0x67, 0x9a, 0x1f, 0x44, 0x3a, 0x8b,
-	0xf1, 0xff, 0xab, 0xff, 0x0d, 0x00, 0x00, 0xff, 0xff, 0x3a, 0xa9, 0x89, 0x1b, 0x60, 0x11, 0x00,
-	0x00,
+	// 2146 bytes of a gzipped FileDescriptorProto
+	0x1f, 0x8b, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0xff, 0x85, 0x58, 0x59, 0x6f, 0x24, 0x49,
+	0x11, 0xde, 0xaa, 0xf2, 0x1c, 0x4e, 0x7b, 0xec, 0x74, 0xce, 0x8c, 0xc7, 0xf6, 0x1c, 0x3b, 0xeb,
+	0x3d, 0x30, 0xb3, 0xe0, 0x61, 0x67, 0x04, 0x5a, 0x21, 0x56, 0x42, 0xac, 0x84, 0x84, 0xc4, 0xa0,
+	0x95, 0x91, 0x78, 0xe0, 0x25, 0x95, 0x5d, 0x95, 0xdd, 0x9d, 0xeb, 0x3a, 0x92, 0xcc, 0x2c, 0xdb,
+	0xfd, 0x2f, 0x00, 0x21, 0x1e, 0xe0, 0x81, 0x17, 0x8e, 0x17, 0xd8, 0xfb, 0xe4, 0x66, 0x77, 0x91,
+	0xd8, 0xe5, 0xbe, 0xef, 0xdd, 0xb9, 0xe0, 0x17, 0x70, 0xc3, 0x03, 0x11, 0x59, 0x55, 0x5d, 0xd5,
+	0x4d, 0xaf, 0x79, 0x99, 0xe9, 0x8a, 0x88, 0x8c, 0x8c, 0xf8, 0xe2, 0xca, 0x30, 0x39, 0x5b, 0x98,
+	0xf8, 0x41, 0x73, 0x59, 0x9b, 0xc2, 0x15, 0xf6, 0x72, 0x26, 0x9d, 0x51, 0xb1, 0x4d, 0xb6, 0xfd,
+	0x37, 0x5b, 0xc8, 0xc4, 0x20, 0x13, 0xdb, 0x5e, 0x64, 0xe3, 0x44, 0xcd, 0xac, 0x78, 0x1b, 0xeb,
+	0x13, 0x07, 0xe3, 0x22, 0xcb, 0x8a, 0xbc, 0x62, 0x6d, 0xa6, 0x84, 0x5e, 0xab, 0x64, 0x1f, 0x2e,
+	0x72, 0x27, 0x54, 0x2e, 0x0d, 0x3b, 0x47, 0xe6, 0x07, 0xc2, 0xc9, 0x7d, 0x31, 0xfa, 0x40, 0xb2,
+	0x16, 0x5c, 0x0c, 0xb6, 0xe6, 0x77, 0x5a, 0x02, 0x7b, 0x37, 0x39, 0xda, 0x17, 0x99, 0x4a, 0x47,
+	0x6b, 0xe1, 0xc5, 0x68, 0x6b, 0xe1, 0xca, 0xe6, 0xb6, 0x2a, 0x50, 0x19, 0x5c, 0x39, 0x94, 0xa5,
+	0xdd, 0x8e, 0x53, 0x25, 0x73, 0xb7, 0x5d, 0x69, 0x7d, 0xbf, 0x97, 0xdc, 0xa9, 0x4f, 0x6c, 0x7e,
+	0x3a, 0x20, 0x8b, 0x8f, 0x94, 0x76, 0x28, 0x93, 0x8a, 0xcd, 0x2e, 0x10, 0x52, 0x99, 0xfa, 0x21,
+	0x91, 0xc9, 0xfa, 0xae, 0x0e, 0x85, 0x9d, 0x22, 0x47, 0xf6, 0x44, 0x5a, 0x4a, 0xb8, 0x2b, 0xd8,
+	0x0a, 0x76, 0xaa, 0x0f, 0x76, 0x91, 0x2c, 0x38, 0x95, 0x49, 0xeb, 0x44, 0xa6, 0xaf, 0x7d, 0x78,
+	0x2d, 0x02, 0x5e, 0xb4, 0xd3, 0x25, 0xb1, 0x6d, 0x72, 0x34, 0x15, 0x3d, 0x99, 0xda, 0xb5, 0x39,
+	0x6f, 0xe4, 0xea, 0x76, 0x07, 0x9e, 0xed, 0x0f, 0x22, 0xeb, 0x11, 0xa1, 0xcc, 0x4e, 0x2d, 0xb5,
+	0xf9, 0x4e, 0x32, 0x3f, 0x26, 0x32, 0x46, 0xe6, 0xf2, 0xd6, 0x1c, 0xff, 0x7b, 0xd2, 0x90, 0xf9,
+	0xda, 0x90, 0xcd, 0x5d, 0xb2, 0xda, 0x75, 0x67, 0x12, 0xc3, 0x5c, 0xba, 0xfd, 0xc2, 0xec, 0xb6,
+	0x18, 0x8e, 0x09, 0xec, 0x2a, 0x39, 0x56, 0x47, 0xa8, 0x06, 0x71, 0x7d, 0xc2, 0xbe, 0xae, 0xce,
+	0x9d, 0x46, 0xf2, 0xd2, 0xe7, 0xce, 0x11, 0x72, 0xad, 0x85, 0xe6, 0x02, 0xd9, 0x00, 0xd4, 0x63,
+	0x69, 0x2d, 0x07, 0xaf, 0x8d, 0xe3, 0xe8, 0x3f, 0xb7, 0x32, 0x2e, 0xf2, 0xc4, 0xd2, 0x3b, 0x00,
+	0xa4, 0x73, 0x0d, 0x7f, 0x4f, 0x19, 0x57, 0x8a, 0x94, 0x67, 0x32, 0x2b, 0xcc, 0x88, 0xf7, 0x46,
+	0x4e, 0x5a, 0x1a, 0xb0, 0xbb, 0xc8, 0xf9, 0x46, 0xc2, 0x48, 0xab, 0x12, 0x08, 0xdb, 0xa4, 0x48,
+	0xc8, 0xce, 0x93, 0xf5, 0x46, 0x24, 0xd6, 0x65, 0xa3, 0x9d, 0xbb, 0xc2, 0x89, 0x94, 0x46, 0x80,
+	0x0a, 0x6d, 0xd8, 0x85, 0x96, 0x39, 0xef, 0xc3, 0xcd, 0x73, 0xec, 0x24, 0x59, 0x6e, 0xa8, 0x99,
+	0x38, 0xf0, 0xc4, 0x23, 0x28, 0x6a, 0xdf, 0x25, 0xb8, 0x28, 0xdd, 0x90, 0xdb, 0x32, 0x46, 0x2e,
+	0x3d, 0x3a, 0x41, 0xed, 0x0b, 0x95, 0x96, 0x46, 0xd2, 0x63, 0xec, 0x0c, 0x39, 0x89, 0xd4, 0xb4,
+	0x88, 0x85, 0x53, 0x45, 0xce, 0x4b, 0x9d, 0x40, 0xfa, 0xd1, 0xe3, 0x6c, 0x93, 0x5c, 0x48, 0x14,
+	0x38, 0xef, 0xa4, 0xe1, 0xb1, 0xd0, 0xa2, 0xa7, 0x52, 0xe5, 0x94, 0xb4, 0x5c, 0x1e, 0xc4, 0x43,
+	0x91, 0x0f, 0x24, 0x9d, 0x67, 0xa7, 0xc9, 0xca, 0x58, 0x66, 0x5f, 0xb8, 0x78, 0x98, 0x14, 0x03,
+	0x4a, 0x50, 0xe7, 0x98, 0x9c, 0x28, 0x0b, 0x7e, 0xe4, 0x32, 0x76, 0x74, 0x81, 0x9d, 0x25, 0x67,
+	0x6c, 0xd9, 0xb3, 0xb1, 0x51, 0x3d, 0x69, 0x92, 0x1e, 0xe8, 0x8d, 0x87, 0x92, 0x0f, 0x95, 0xb3,
+	0x74, 0x11, 0xfd, 0x9f, 0xc1, 0xcc, 0x94, 0xb5, 0x00, 0xcf, 0x09, 0xc4, 0x78, 0x06, 0x5b, 0xee,
+	0xa9, 0x18, 0xed, 0xb6, 0x74, 0x89, 0x6d, 0x90, 0x55, 0x74, 0xc5, 0xc8, 0x8f, 0x95, 0x90, 0x9c,
+	0x3c, 0x05, 0x3f, 0xf2, 0x78, 0xc4, 0x33, 0x4b, 0x97, 0xd9, 0x32, 0x59, 0xd0, 0x23, 0x37, 0x04,
+	0x07, 0x55, 0xde, 0x2f, 0xe8, 0x15, 0x7f, 0x9b, 0x34, 0x70, 0x1a, 0xae, 0xa8, 0x82, 0xce, 0xe3,
+	0x22, 0x4d, 0xc1, 0x4e, 0x99, 0xd0, 0xf7, 0xa0, 0xae, 0x06, 0xd7, 0x52, 0x4f, 0x44, 0xfb, 0x21,
+	0xb6, 0x46, 0x4e, 0x29, 0xcd, 0x45, 0x92, 0x18, 0x64, 0x8b, 0xd4, 0x63, 0x07, 0xa7, 0x12, 0x74,
+	0xbc, 0xc3, 0x31, 0x32, 0x95, 0xc2, 0x02, 0x43, 0x36, 0x47, 0x52, 0x23, 0x45, 0x32, 0xea, 0x1c,
+	0xe9, 0xb3, 0x75, 0x72, 0xda, 0x73, 0xc6, 0x01, 0x68, 0x42, 0x33, 0x00, 0x1b, 0x4e, 0xcb, 0xbc,
+	0x48, 0x64, 0x8f, 0x67, 0x83, 0xcc, 0xf1, 0x1a, 0x46, 0x38, 0xf5, 0xbd, 0x00, 0x90, 0x5c, 0xad,
+	0x79, 0x85, 0x86, 0x94, 0x74, 0x80, 0x44, 0x2e, 0x7a, 0x29, 0x30, 0x5f, 0x0d, 0x40, 0xe7, 0xa9,
+	0x9a, 0x69, 0xfa, 0xdc, 0x1d, 0x8c, 0x59, 0xaf, 0x75, 0x59, 0x03, 0x6d, 0x3b, 0x2a, 0xbf, 0xdf,
+	0x65, 0x69, 0xa7, 0x3b, 0xac, 0x1f, 0x74, 0x59, 0x19, 0x20, 0xd1, 0xb2, 0x7e, 0x18, 0x80, 0xcb,
+	0xcc, 0x98, 0x98, 0x63, 0x37, 0xe8, 0x71, 0xe1, 0x9c, 0xcc, 0x34, 0x44, 0xf3, 0x47, 0x01, 0xb8,
+	0x7c, 0xb2, 0x65, 0xd4, 0x59, 0x08, 0x81, 0xfc, 0x71, 0x00, 0xd0, 0xaf, 0xe9, 0x24, 0xd6, 0xbc,
+	0x84, 0x00, 0x70, 0x9d, 0x8a, 0x5c, 0x56, 0x35, 0xc0, 0xcb, 0x94, 0xfe, 0xe4, 0x10, 0x76, 0x92,
+	0xd2, 0x9f, 0x7a, 0x5b, 0x50, 0xaf, 0x91, 0x53, 0x57, 0xfe, 0x2c, 0x60, 0xf7, 0x92, 0x8b, 0xb3,
+	0x58, 0x40, 0x00, 0x93, 0xfb, 0x1e, 0x59, 0xfa, 0x73, 0xac, 0xc5, 0x73, 0x33, 0xc5, 0x86, 0x45,
+	0x25, 0xf2, 0x8b, 0x80, 0xdd, 0x49, 0x36, 0x66, 0x8a, 0x14, 0xd0, 0x77, 0x0d, 0xfd, 0x65, 0x80,
+	0xb1, 0xe9, 0x0a, 0xb4, 0xfe, 0xfd, 0xca, 0x7b, 0x2e, 0x0d, 0x10, 0xa7, 0x0c, 0xfc, 0x75, 0x85,
+	0x63, 0xcb, 0x69, 0x0f, 0xfd, 0x66, 0xfa, 0x50, 0x9d, 0x04, 0x96, 0xfe, 0xd6, 0x5f, 0xe5, 0x39,
+	0x75, 0x3a, 0x35, 0xf9, 0x6d, 0xe9, 0xef, 0x02, 0x76, 0x89, 0xdc, 0x3b, 0x93, 0x57, 0x81, 0xa7,
+	0x72, 0x01, 0xc5, 0xb1, 0xa7, 0xdc, 0x88, 0xfe, 0xde, 0xbb, 0x3d, 0x5b, 0x36, 0x2f, 0x4c, 0x06,
+	0x2d, 0xe6, 0x0f, 0x01, 0x7b, 0x90, 0x5c, 0x9d, 0x2d, 0x62, 0x44, 0xa2, 0x0a, 0xec, 0x5c, 0x45,
+	0x69, 0xc0, 0x66, 0x38, 0xe2, 0xb8, 0xd8, 0x03, 0x23, 0x31, 0xb1, 0xe8, 0x1f, 0x03, 0x76, 0x1f,
+	0xb9, 0xeb, 0x4d, 0x4e, 0xca, 0xa4, 0x84, 0x1a, 0x4b, 0x0b, 0x91, 0xd0, 0xd7, 0x03, 0xf6, 0x76,
+	0xb2, 0x35, 0x5b, 0x0e, 0x3d, 0x06, 0x83, 0xeb, 0x9b, 0xb0, 0xf6, 0xe8, 0x1b, 0x87, 0xa8, 0x95,
+	0xa5, 0x33, 0x02, 0xa4, 0x81, 0x4a, 0xaf, 0x07, 0xec, 0x1d, 0xe4, 0xfe, 0x43, 0x0d, 0xf7, 0xff,
+	0x62, 0xde, 0x82, 0x21, 0xd6, 0xd1, 0x1b, 0x01, 0xbb, 0x9f, 0xdc, 0x37, 0xfb, 0x44, 0x21, 0x32,
+	0xb0, 0x03, 0x5a, 0xd7, 0x1e, 0xf4, 0x68, 0x28, 0x48, 0x7a, 0xb3, 0x5b, 0x6d, 0x4d, 0x25, 0xf6,
+	0xd5, 0x00, 0xe2, 0x93, 0xd0, 0x5b, 0x3e, 0x57, 0x9a, 0x6a, 0x93, 0xbd, 0xa2, 0xa8, 0x86, 0x83,
+	0xe1, 0x1e, 0x7a, 0x49, 0x6f, 0x07, 0xd0, 0xa3, 0x97, 0x26, 0x04, 0x2c, 0xfd, 0xd3, 0xff, 0xd6,
+	0x68, 0x02, 0x53, 0x01, 0x15, 0xfe, 0xd9, 0x97, 0x94, 0x9f, 0x50, 0x09, 0xd7, 0x2a, 0x1f, 0x70,
+	0xe3, 0x1c, 0xf6, 0xb0, 0x2f, 0x87, 0x8c, 0x92, 0x05, 0x9c, 0x0c, 0x5a, 0x42, 0x0c, 0x72, 0x47,
+	0xbf, 0x12, 0x62, 0xd6, 0xd8, 0x7d, 0xa1, 0x9b, 0x51, 0xd2, 0x70, 0x1e, 0x0b, 0xd1, 0xe4, 0xa9,
+	0x51, 0xd4, 0x30, 0x1f, 0x0f, 0xd9, 0x0a, 0x59, 0x84, 0xbe, 0xbc, 0x3b, 0x26, 0x3d, 0x11, 0x42,
+	0x83, 0x24, 0x55, 0x95, 0x59, 0x24, 0x3c, 0x19, 0xa2, 0xd5, 0x15, 0x01, 0xaa, 0x47, 0x82, 0x27,
+	0x09, 0x7d, 0xca, 0x5b, 0x80, 0xd9, 0x0c, 0xc8, 0x39, 0xec, 0x51, 0x4f, 0x7b, 0x31, 0xe8, 0xc3,
+	0xf1, 0x2e, 0x84, 0x0e, 0xfb, 0x50, 0x69, 0xe9, 0x33, 0x21, 0x7a, 0x60, 0x1d, 0xc4, 0x06, 0x71,
+	0x80, 0xa4, 0xd1, 0xd0, 0x9f, 0x21, 0x97, 0x9f, 0x0d, 0xd9, 0x12, 0x99, 0x07, 0x6b, 0xea, 0x99,
+	0xf6, 0x5c, 0x08, 0xe3, 0xff, 0x04, 0x7e, 0xb7, 0xa9, 0xf4, 0x7c, 0xc8, 0x4e, 0x90, 0xe3, 0x48,
+	0x2b, 0xb1, 0x73, 0xbe, 0x30, 0xfe, 0xec, 0x43, 0xa9, 0xd1, 0x17, 0xbd, 0xc7, 0x1e, 0x43, 0x08,
+	0xbf, 0xc6, 0x51, 0x24, 0xb5, 0x0f, 0xd2, 0x57, 0x43, 0x44, 0xb4, 0xd4, 0x03, 0x08, 0xb5, 0x34,
+	0x57, 0xaa, 0x01, 0xed, 0xc4, 0xae, 0xcc, 0xe9, 0xd7, 0x42, 0x18, 0x7d, 0xcb, 0x2d, 0x4b, 0x1a,
+	0x53, 0x18, 0xfa, 0x75, 0x6f, 0x65, 0x4b, 0xd5, 0x46, 0x6a, 0x81, 0x01, 0xf8, 0xc6, 0x94, 0xa6,
+	0xa4, 0xd8, 0xcf, 0x31, 0x7b, 0x81, 0xf5, 0xcd, 0x10, 0x26, 0x1e, 0x6d, 0x59, 0xb1, 0xc8, 0x85,
+	0x19, 0xd1, 0x6f, 0x4d, 0x91, 0xb1, 0x82, 0xc1, 0x95, 0x6f, 0x7b, 0x70, 0x5a, 0xb2, 0x4a, 0x80,
+	0xf8, 0x9d, 0x10, 0x06, 0xd9, 0xd9, 0x32, 0x97, 0x07, 0xda, 0xb7, 0x50, 0xde, 0x0c, 0x21, 0x23,
+	0xfd, 0xcb, 0xc2, 0xd2, 0x97, 0x42, 0x78, 0x6e, 0xac, 0x97, 0x39, 0xf6, 0x8d, 0x1c, 0x6e, 0xe5,
+	0xb5, 0x86, 0x06, 0xde, 0x97, 0x7d, 0x6c, 0xa7, 0x8e, 0x35, 0xcc, 0x57, 0x42, 0xb6, 0x0a, 0x33,
+	0x59, 0x63, 0x14, 0x13, 0xc8, 0x9a, 0x41, 0xed, 0xed, 0xeb, 0xf8, 0xbc, 0x58, 0x13, 0x46, 0x43,
+	0x9e, 0xf5, 0x45, 0x99, 0x3a, 0x3e, 0xd8, 0x87, 0x07, 0x43, 0x5c, 0xb3, 0xdf, 0xf0, 0x60, 0xe0,
+	0xb3, 0xa2, 0x9f, 0x16, 0xfb, 0x15, 0x11, 0x4f, 0xd3, 0xeb, 0x21, 0xb6, 0x9f, 0x32, 0xdf, 0xcd,
+	0x01, 0x05, 0xae, 0x77, 0x1d, 0xcc, 0x73, 0xc8, 0x07, 0x0f, 0xf9, 0x0d, 0x0f, 0x54, 0xfd, 0xd0,
+	0xe2, 0xaa, 0x2f, 0xe2, 0xb1, 0x8d, 0x37, 0x43, 0x78, 0x3e, 0x9c, 0x07, 0x6d, 0xf0, 0xc6, 0x92,
+	0x19, 0xbe, 0x75, 0x4c, 0x99, 0x4a, 0x28, 0x2b, 0xe0, 0xa7, 0x69, 0xd5, 0x65, 0x6f, 0x85, 0x6c,
+	0x8b, 0xdc, 0xdd, 0x95, 0xc1, 0xc3, 0x76, 0x86, 0xe4, 0xed, 0x2a, 0x4f, 0xb2, 0xb1, 0xb7, 0x10,
+	0x8a, 0x8f, 0x47, 0xe8, 0xa8, 0x7d, 0x00, 0x49, 0xd2, 0x41, 0x76, 0x14, 0x19, 0x8c, 0xb9, 0x1e,
+	0xfd, 0x44, 0x84, 0x99, 0x6c, 0x63, 0x98, 0x60, 0x9e, 0x43, 0x3f, 0x13, 0xe1, 0x61, 0x4f, 0xb0,
+	0xc3, 0xd2, 0x61, 0x34, 0xe9, 0x67, 0x23, 0xbc, 0x1a, 0xdf, 0x0a, 0x93, 0x2f, 0x8a, 0x6a, 0xae,
+	0x75, 0x87, 0xf0, 0xe7, 0x23, 0xf6, 0x56, 0x72, 0xcf, 0xf8, 0xd9, 0x84, 0x6f, 0x87, 0x71, 0x42,
+	0xd7, 0x75, 0x0e, 0x91, 0xf4, 0x85, 0xfb, 0x85, 0x08, 0x21, 0x4e, 0x4a, 0x9d, 0x2a, 0x9c, 0xed,
+	0xd8, 0xf7, 0xe1, 0x85, 0xd2, 0xf4, 0x15, 0xfa, 0x58, 0x84, 0x2d, 0x47, 0xe5, 0xf0, 0x86, 0x82,
+	0x92, 0x84, 0xab, 0x9c, 0x3c, 0x00, 0x97, 0xa5, 0x2b, 0x75, 0x73, 0x5b, 0x5b, 0x69, 0x8f, 0x47,
+	0xd8, 0xd1, 0x66, 0x0b, 0x37, 0xcf, 0x9b, 0xc9, 0xdb, 0x9f, 0x88, 0xd8, 0x3d, 0xe4, 0xce, 0x5c,
+	0xd8, 0xe6, 0x5e, 0x11, 0x63, 0x69, 0x4c, 0x49, 0x3d, 0x19, 0x61, 0xb7, 0xf2, 0x52, 0xe8, 0x8e,
+	0xb1, 0x7a, 0x4a, 0xe0, 0xa9, 0x88, 0xbd, 0x8d, 0xbc, 0x05, 0x05, 0xe0, 0xb9, 0x53, 0x1a, 0x98,
+	0x1c, 0x3c, 0x83, 0x26, 0xc5, 0x71, 0x8f, 0x11, 0x90, 0x51, 0x93, 0xd2, 0x4f, 0x47, 0x18, 0xe6,
+	0x49, 0x49, 0x23, 0x1f, 0x05, 0x0c, 0x5b, 0x57, 0x9e, 0x89, 0x30, 0x5d, 0xf1, 0x3a, 0x6c, 0xa7,
+	0x53, 0x6f, 0x9c, 0x67, 0x23, 0xac, 0x06, 0x8c, 0xac, 0xd5, 0x90, 0x90, 0x31, 0xb4, 0x0c, 0x87,
+	0x2f, 0x2d, 0x6b, 0x51, 0x0a, 0x3c, 0xa5, 0xcf, 0x1d, 0x2e, 0x61, 0x35, 0x7d, 0x7e, 0x52, 0x22,
+	0x81, 0x7e, 0x3e, 0xa5, 0xe3, 0x85, 0xc3, 0x25, 0x40, 0xc7, 0x8b, 0x1e, 0x97, 0x52, 0x8e, 0xa1,
+	0x9e, 0x9a, 0x0a, 0xf4, 0xa5, 0x08, 0x27, 0xd7, 0x0c, 0x81, 0xd9, 0xc0, 0xbc, 0xec, 0x81, 0x51,
+	0x19, 0xe6, 0x82, 0x82, 0x9a, 0x91, 0x3e, 0x24, 0x93, 0x32, 0xaf, 0xf8, 0x18, 0x43, 0xce, 0xf2,
+	0x89, 0xe4, 0xe4, 0x78, 0x09, 0xe8, 0xc6, 0x97, 0xf8, 0xd4, 0x89, 0xef, 0x46, 0xb0, 0xea, 0x9c,
+	0xb1, 0x0f, 0x60, 0xe3, 0xf3, 0x15, 0xaa, 0xe0, 0xe2, 0x31, 0xd0, 0xd7, 0x3d, 0x77, 0xe0, 0x60,
+	0x40, 0xcc, 0xe0, 0xde, 0xf0, 0x89, 0x8c, 0x81, 0xcd, 0xc1, 0x67, 0x80, 0x00, 0xa8, 0x30, 0x13,
+	0x40, 0xa6, 0x89, 0xc9, 0x58, 0xf4, 0x66, 0xe4, 0x1f, 0x23, 0x59, 0x56, 0x57, 0x73, 0xcb, 0xb9,
+	0x85, 0x5b, 0xc8, 0x72, 0x87, 0xe3, 0x67, 0xc5, 0x6d, 0x2f, 0x8f, 0xf0, 0xe6, 0x72, 0x9f, 0x0b,
+	0x6b, 0x8b, 0x58, 0x79, 0x95, 0xf4, 0x2f, 0x11, 0x36, 0xfc, 0xb2, 0xa9, 0x05, 0xfa, 0x57, 0x7f,
+	0xbe, 0x6d, 0x5d, 0x15, 0xb6, 0x7f, 0x6b, 0xa4, 0x2a, 0x98, 0xe8, 0xdf, 0xbd, 0xbe, 0x19, 0xe1,
+	0xa6, 0xff, 0x68, 0x39, 0x93, 0x41, 0xa4, 0xff, 0xf4, 0xed, 0x00, 0x74, 0xe8, 0x24, 0xef, 0xd4,
+	0x31, 0xfd, 0x57, 0x84, 0x3d, 0x0a, 0x66, 0x05, 0x0e, 0xa8, 0x01, 0x87, 0x06, 0x2f, 0x9a, 0x0d,
+	0xe7, 0xdf, 0x11, 0x8e, 0x16, 0xe8, 0x20, 0xbe, 0xac, 0xe8, 0x7f, 0x22, 0xec, 0xd6, 0x8d, 0x6d,
+	0x1e, 0x41, 0x4b, 0xbf, 0x38, 0x87, 0x6a, 0x01, 0x7b, 0x05, 0x28, 0x14, 0x25, 0xc6, 0xd9, 0x28,
+	0x6d, 0xe9, 0x97, 0xe6, 0x2e, 0x7d, 0x32, 0x24, 0xcb, 0xd5, 0x86, 0xe8, 0x97, 0x59, 0xbf, 0x26,
+	0x12, 0x72, 0x14, 0x9a, 0x03, 0x74, 0x57, 0x58, 0x09, 0xe7, 0xc9, 0x91, 0x58, 0xc0, 0x0c, 0x83,
+	0xdd, 0x6f, 0x91, 0x1c, 0x77, 0xa2, 0xe4, 0x6e, 0xa4, 0x25, 0xac, 0x79, 0xf0, 0x85, 0x46, 0xfa,
+	0xaf, 0x08, 0x8f, 0x88, 0xca, 0xd4, 0x39, 0x76, 0x9c, 0xcc, 0x0d, 0xf1, 0x75, 0x72, 0x04, 0xa9,
+	0xd5, 0x52, 0x02, 0x6b, 0xdb, 0x12, 0x21, 0x1a, 0x57, 0xab, 0x54, 0xee, 0xc9, 0x14, 0x16, 0x36,
+	0x50, 0x9c, 0x29, 0x78, 0xb2, 0xc1, 0x8a, 0x86, 0x3f, 0xc5, 0xa3, 0xf0, 0x73, 0x9e, 0x2d, 0x90,
+	0x63, 0x10, 0x50, 0x8f, 0x05, 0x81, 0x86, 0xb7, 0x84, 0xb9, 0xe7, 0xbb, 0x6a, 0x15, 0x89, 0x05,
+	0x54, 0x09, 0xd1, 0xb2, 0x20, 0xbc, 0x88, 0x2a, 0xab, 0x14, 0x89, 0xa1, 0x62, 0x61, 0xb5, 0x1a,
+	0x7f, 0x7b, 0xa3, 0x96, 0xf0, 0xbb, 0x6a, 0xe7, 0xb8, 0x8e, 0xc3, 0xf2, 0x44, 0xc9, 0x62, 0x03,
+	0x8c, 0xa7, 0x50, 0xbc, 0xae, 0xea, 0xd3, 0x09, 0x5d, 0x41, 0xbb, 0x55, 0x66, 0x15, 0x65, 0x57,
+	0x3e, 0x15, 0x90, 0x95, 0xce, 0x7a, 0x6e, 0x70, 0xa1, 0x32, 0xec, 0x21, 0x72, 0xec, 0xe1, 0x6a,
+	0xb5, 0x62, 0xe7, 0x27, 0x76, 0xef, 0xe9, 0x4d, 0x7e, 0x63, 0x65, 0x82, 0xfd, 0x91, 0x42, 0x25,
+	0x9b, 0x77, 0xb0, 0xf7, 0x92, 0x39, 0x5c, 0xd2, 0xd9, 0xdd, 0x6f, 0xba, 0xb7, 0xff, 0x1f, 0x0d,
+	0xef, 0x3b, 0xfb, 0xd1, 0x75, 0x4f, 0xbd, 0x5c, 0xfd, 0x6d, 0x26, 0x55, 0xbd, 0xcb, 0x83, 0xa2,
+	0xfe, 0x13, 0x4d, 0xef, 0xa8, 0xff, 0xff, 0xea, 0x7f, 0x01, 0x22, 0xe9, 0x1a, 0x2f, 0xf2, 0x11,
+	0x00, 0x00,
 }
 
 // Reference imports to suppress errors if they are not otherwise used.